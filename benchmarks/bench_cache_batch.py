@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+キャッシュの一括取得・一括保存ベンチマーク
+
+SQLiteキャッシュ（L2）の読み書きを、キーの数（1 / 10 / 100件）ごとに比較する。
+
+- 1件ずつ: get_cached_data / set_cached_data をキーの数だけ呼ぶ（キーごとにSELECT・COMMIT）
+- まとめて: get_many（SELECT ... WHERE cache_key IN (...) 1回）/ set_many（executemany + COMMIT 1回）
+
+L1（メモリキャッシュ）を無効にして、SQLiteへの往復の回数の差だけを計測する。
+
+実行方法:
+    python benchmarks/bench_cache_batch.py
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# srcディレクトリをPythonパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from lunch_roulette.models.database import close_all_pools, init_database  # noqa: E402
+from lunch_roulette.services.cache_service import CacheService  # noqa: E402
+
+KEY_COUNTS = (1, 10, 100)
+TOTAL_KEYS = 20_000  # キーの数にかかわらず、合計でこの件数を読み書きする
+PAYLOAD = ['J000000001', 'J000000002', 'J000000003']  # タイルのキャッシュと同じ店舗IDのリスト
+
+
+def run(name, fn, rounds, key_count):
+    """rounds回実行して1キーあたりの所要時間を表示"""
+    fn(0)  # ウォームアップ
+    started = time.perf_counter()
+    for i in range(rounds):
+        fn(i)
+    per_key_us = (time.perf_counter() - started) / (rounds * key_count) * 1_000_000
+    print(f"  [{name}] {per_key_us:,.1f}µs/キー")
+    return per_key_us
+
+
+def bench(cache, key_count):
+    """キーの数ごとに、1件ずつとまとめての読み書きを比較"""
+    rounds = max(1, TOTAL_KEYS // key_count)
+    key_sets = [[f'tile_{(i * key_count + k) % TOTAL_KEYS}' for k in range(key_count)] for i in range(rounds)]
+
+    def set_one_by_one(i):
+        for key in key_sets[i]:
+            cache.set_cached_data(key, PAYLOAD, ttl=3600)
+
+    def set_batch(i):
+        cache.set_many({key: PAYLOAD for key in key_sets[i]}, ttl=3600)
+
+    def get_one_by_one(i):
+        return {key: cache.get_cached_data(key) for key in key_sets[i]}
+
+    def get_batch(i):
+        return cache.get_many(key_sets[i])
+
+    print(f"キーの数={key_count}（{rounds:,}回）")
+    single_set = run('set_cached_data × キーの数', set_one_by_one, rounds, key_count)
+    batch_set = run('set_many', set_batch, rounds, key_count)
+    print(f"    → 保存 {single_set / batch_set:.2f}倍")
+    single_get = run('get_cached_data × キーの数', get_one_by_one, rounds, key_count)
+    batch_get = run('get_many', get_batch, rounds, key_count)
+    print(f"    → 取得 {single_get / batch_get:.2f}倍")
+
+
+def main():
+    print("キャッシュの一括取得・一括保存ベンチマーク")
+    print(f"合計キー数={TOTAL_KEYS:,}（L1無効）")
+    print("=" * 60)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = str(Path(temp_dir) / 'cache.db')
+        init_database(db_path)
+        cache = CacheService(db_path=db_path)
+        cache.memory_cache = None
+        # 最初の計測にだけテーブルの拡張の時間が含まれることがないように、先にすべてのキーを保存しておく
+        cache.set_many({f'tile_{i}': PAYLOAD for i in range(TOTAL_KEYS)}, ttl=3600)
+        for key_count in KEY_COUNTS:
+            bench(cache, key_count)
+            print()
+        close_all_pools()
+
+
+if __name__ == '__main__':
+    main()
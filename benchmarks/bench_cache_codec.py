@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+キャッシュの保存形式（コーデック）ベンチマーク
+
+お店100件分の検索結果（要約）と店舗IDのリストについて、
+JSON・marshal（・msgpack）と圧縮の有無ごとに、エンコード・デコード時間と保存サイズを比較する。
+あわせて CacheService でSQLite（L2）から読み込む時間を比較する（L1は無効）。
+
+実行方法:
+    python benchmarks/bench_cache_codec.py
+"""
+
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# srcディレクトリをPythonパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bench_restaurant_projection import make_api_shop  # noqa: E402
+from lunch_roulette.models.database import close_all_pools, init_database  # noqa: E402
+from lunch_roulette.models.restaurant_index import project_summary  # noqa: E402
+from lunch_roulette.services.cache_codec import CacheCodec, available_codecs  # noqa: E402
+from lunch_roulette.services.cache_service import CacheService  # noqa: E402
+from lunch_roulette.services.restaurant_service import RestaurantService  # noqa: E402
+
+SHOPS = 100
+ROUNDS = 500
+
+
+def timed(fn):
+    """ROUNDS回実行して1回あたりの所要時間（マイクロ秒）を返す"""
+    fn()  # ウォームアップ
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        fn()
+    return (time.perf_counter() - started) / ROUNDS * 1_000_000
+
+
+def main():
+    rng = random.Random(0)
+    service = RestaurantService(api_key='benchmark')
+    shops = [project_summary(r) for r in
+             service._format_restaurant_data([make_api_shop(rng, i) for i in range(SHOPS)])]
+    payloads = {
+        f'お店{SHOPS}件（要約）': shops,
+        f'店舗ID{SHOPS}件': [shop['id'] for shop in shops],
+    }
+    settings = [(codec, compression) for codec in available_codecs() for compression in ('none', 'zlib')]
+
+    print("キャッシュの保存形式ベンチマーク")
+    print(f"繰り返し={ROUNDS}, 使用できるコーデック={', '.join(available_codecs())}")
+    print("=" * 72)
+
+    for label, data in payloads.items():
+        print(f"[{label}]")
+        print(f"{'形式':<16}{'サイズ':>10}{'エンコード':>14}{'デコード':>14}")
+        for codec_name, compression in settings:
+            codec = CacheCodec(codec=codec_name, compression=compression, compress_min_bytes=0)
+            payload, tag = codec.encode(data)
+            encode_us = timed(lambda: codec.encode(data))
+            decode_us = timed(lambda: codec.decode(payload, tag))
+            print(f"{tag:<16}{len(payload):>9,}B{encode_us:>12,.0f}µs{decode_us:>12,.0f}µs")
+        print()
+
+    # CacheService経由でSQLite（L2）から読み込む時間（L1を無効にするため memory_cache=None）
+    print(f"[CacheService L2ヒット（お店{SHOPS}件）]")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for codec_name, compression in settings:
+            db_path = str(Path(temp_dir) / f'{codec_name}_{compression}.db')
+            init_database(db_path)
+            cache = CacheService(db_path=db_path, codec=CacheCodec(codec=codec_name, compression=compression,
+                                                                   compress_min_bytes=0))
+            cache.memory_cache = None
+            cache.set_cached_data('shops', shops, ttl=600)
+            read_us = timed(lambda: cache.get_cached_data('shops'))
+            size = cache.get_cache_info('shops')['data_size']
+            print(f"{codec_name + '+' + compression:<16}{size:>9,}B{read_us:>12,.0f}µs/回")
+        close_all_pools()
+
+
+if __name__ == '__main__':
+    main()
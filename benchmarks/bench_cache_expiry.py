@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+キャッシュの有効期限（UNIX時刻・ミリ秒）ベンチマーク
+
+SQLiteキャッシュ（L2）のヒット時の処理を、有効期限の保存形式ごとに比較する。
+
+- 以前の形式: 日時の文字列で保存し、取得のたびに datetime.fromisoformat で解析して比較
+- 現在の形式: UNIX時刻（ミリ秒）の整数で保存し、期限切れの行はSELECTの条件で除外
+
+あわせて、期限切れの行が多いときの期限切れ削除（cleanup_expired_cache）の時間も計測する。
+
+実行方法:
+    python benchmarks/bench_cache_expiry.py
+"""
+
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# srcディレクトリをPythonパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from lunch_roulette.models.database import (close_all_pools, get_db_connection, init_database,  # noqa: E402
+                                            now_ms, to_epoch_ms)
+from lunch_roulette.services.cache_service import CacheService  # noqa: E402
+
+KEY_COUNT = 10_000
+ROUNDS = 20_000
+PAYLOAD = b'["J000000001", "J000000002", "J000000003"]'  # デコードの時間が目立たない小さなデータ
+
+
+def run(name, fn):
+    """ROUNDS回実行して1回あたりの所要時間を表示"""
+    fn(0)  # ウォームアップ
+    started = time.perf_counter()
+    for i in range(ROUNDS):
+        fn(i)
+    per_call_us = (time.perf_counter() - started) / ROUNDS * 1_000_000
+    print(f"[{name}] {per_call_us:,.1f}µs/回")
+    return per_call_us
+
+
+def prepare_legacy(db_path):
+    """以前の形式（日時の文字列）のテーブルを作成"""
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute('''
+        CREATE TABLE cache (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            cache_key TEXT UNIQUE NOT NULL,
+            data TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            expires_at TIMESTAMP NOT NULL
+        )
+    ''')
+    conn.execute('CREATE INDEX idx_expires_at ON cache(expires_at)')
+    expires_at = (datetime.now() + timedelta(hours=1)).isoformat(' ')
+    conn.executemany('INSERT INTO cache (cache_key, data, expires_at) VALUES (?, ?, ?)',
+                     [(f'key_{i}', PAYLOAD, expires_at) for i in range(KEY_COUNT)])
+    conn.commit()
+    return conn
+
+
+def prepare_current(db_path):
+    """現在の形式（UNIX時刻・ミリ秒）のテーブルを作成"""
+    init_database(db_path)
+    expires_at = now_ms() + 3600 * 1000
+    with get_db_connection(db_path) as conn:
+        conn.executemany('INSERT INTO cache (cache_key, data, codec, expires_at) VALUES (?, ?, ?, ?)',
+                         [(f'key_{i}', PAYLOAD, 'json', expires_at) for i in range(KEY_COUNT)])
+        conn.commit()
+
+
+def bench_hit_path(temp_dir):
+    """ヒット時の有効期限の判定を比較"""
+    legacy = prepare_legacy(str(Path(temp_dir) / 'legacy.db'))
+
+    def legacy_hit(i):
+        row = legacy.execute('SELECT data, expires_at FROM cache WHERE cache_key = ?',
+                             (f'key_{i % KEY_COUNT}',)).fetchone()
+        return row['data'] if datetime.now() < datetime.fromisoformat(row['expires_at']) else None
+
+    current_path = str(Path(temp_dir) / 'current.db')
+    prepare_current(current_path)
+    current = sqlite3.connect(current_path, check_same_thread=False)
+    current.row_factory = sqlite3.Row
+
+    def current_hit(i):
+        row = current.execute('SELECT data, codec, expires_at FROM cache WHERE cache_key = ? AND expires_at > ?',
+                              (f'key_{i % KEY_COUNT}', now_ms())).fetchone()
+        return row['data'] if row is not None else None
+
+    legacy_us = run('以前の形式（文字列 + fromisoformat）', legacy_hit)
+    current_us = run('現在の形式（整数 + SELECTで除外）', current_hit)
+    print(f"  → {legacy_us / current_us:.2f}倍")
+
+    # CacheService全体のL2ヒット（L1を無効にして計測）
+    cache = CacheService(db_path=current_path)
+    cache.memory_cache = None
+    run('CacheService.get_cached_data（L2ヒット）', lambda i: cache.get_cached_data(f'key_{i % KEY_COUNT}'))
+
+    legacy.close()
+    current.close()
+
+
+def bench_cleanup(temp_dir):
+    """半分が期限切れの状態で、期限切れの行の削除を比較"""
+    legacy = sqlite3.connect(str(Path(temp_dir) / 'cleanup_legacy.db'))
+    legacy.execute('CREATE TABLE cache (cache_key TEXT UNIQUE NOT NULL, data TEXT NOT NULL, expires_at TIMESTAMP)')
+    legacy.execute('CREATE INDEX idx_expires_at ON cache(expires_at)')
+    now = datetime.now()
+    legacy.executemany('INSERT INTO cache VALUES (?, ?, ?)',
+                       [(f'key_{i}', PAYLOAD, now + timedelta(seconds=(i % 2 * 2 - 1) * 3600))
+                        for i in range(KEY_COUNT * 10)])
+    legacy.commit()
+    started = time.perf_counter()
+    legacy.execute('DELETE FROM cache WHERE expires_at < ?', (datetime.now(),))
+    legacy.commit()
+    print(f"[期限切れ削除・以前の形式] {(time.perf_counter() - started) * 1000:,.1f}ms（{KEY_COUNT * 5:,}件）")
+    legacy.close()
+
+    current_path = str(Path(temp_dir) / 'cleanup_current.db')
+    init_database(current_path)
+    with get_db_connection(current_path) as conn:
+        conn.executemany('INSERT INTO cache (cache_key, data, expires_at) VALUES (?, ?, ?)',
+                         [(f'key_{i}', PAYLOAD, to_epoch_ms(now + timedelta(seconds=(i % 2 * 2 - 1) * 3600)))
+                          for i in range(KEY_COUNT * 10)])
+        conn.commit()
+    started = time.perf_counter()
+    deleted = CacheService(db_path=current_path).clear_expired_cache()
+    print(f"[期限切れ削除・現在の形式] {(time.perf_counter() - started) * 1000:,.1f}ms（{deleted:,}件）")
+
+
+def main():
+    print("キャッシュの有効期限ベンチマーク")
+    print(f"キーの数={KEY_COUNT:,}, 繰り返し={ROUNDS:,}")
+    print("=" * 60)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        bench_hit_path(temp_dir)
+        print()
+        bench_cleanup(temp_dir)
+        close_all_pools()
+
+
+if __name__ == '__main__':
+    main()
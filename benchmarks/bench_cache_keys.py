@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+キャッシュキー作成のベンチマーク
+
+天気・位置情報・タイルのキャッシュキーを作る速さ（1秒あたりのキー数）を比較する。
+
+- generate_cache_key: パラメータのJSON変換（sort_keys=True）+ SHA-256
+- CacheKey.build: 作っておいた先頭部分に値を "|" でつなげるだけ
+
+実行方法:
+    python benchmarks/bench_cache_keys.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# srcディレクトリをPythonパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from lunch_roulette.services.cache_service import CacheService  # noqa: E402
+from lunch_roulette.services.location_service import LOCATION_CACHE_KEY  # noqa: E402
+from lunch_roulette.services.restaurant_service import TILE_CACHE_KEY  # noqa: E402
+from lunch_roulette.services.weather_service import WEATHER_CACHE_KEY  # noqa: E402
+
+KEYS = 200_000
+ROUNDS = 3
+
+
+def keys_per_second(build):
+    """KEYS個のキーを作る速さ（ROUNDS回のうち最速）"""
+    best = float('inf')
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        for i in range(KEYS):
+            build(i)
+        best = min(best, time.perf_counter() - started)
+    return KEYS / best
+
+
+def main():
+    cache = CacheService(db_path=':memory:')
+    cases = [
+        ('天気（緯度・経度）',
+         lambda i: cache.generate_cache_key('weather', lat=round(35.6812 + i * 1e-4, 4), lon=139.7671),
+         lambda i: WEATHER_CACHE_KEY.build(round(35.6812 + i * 1e-4, 4), 139.7671)),
+        ('位置情報（IP）',
+         lambda i: cache.generate_cache_key('location', ip=f'203.0.113.{i & 255}'),
+         lambda i: LOCATION_CACHE_KEY.build(f'203.0.113.{i & 255}')),
+        ('タイル（検索条件）',
+         lambda i: cache.generate_cache_key('restaurant_tile', tile=f'xn76u{i & 31}', budget_code='B010',
+                                            lunch=1, genre_code='all'),
+         lambda i: TILE_CACHE_KEY.build(f'xn76u{i & 31}', 'B010', 1, 'all')),
+    ]
+
+    print("キャッシュキー作成のベンチマーク")
+    print(f"キー数={KEYS:,} × {ROUNDS}回（最速の回）")
+    print("=" * 60)
+    for name, generic, fast in cases:
+        generic_rate = keys_per_second(generic)
+        fast_rate = keys_per_second(fast)
+        print(f"[{name}]")
+        print(f"  generate_cache_key: {generic_rate:,.0f} キー/秒")
+        print(f"  CacheKey.build:     {fast_rate:,.0f} キー/秒（{fast_rate / generic_rate:.1f}倍）")
+
+
+if __name__ == '__main__':
+    main()
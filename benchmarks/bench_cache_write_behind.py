@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+キャッシュの遅延書き込み（write-behind）ベンチマーク
+
+set_cached_data の呼び出し元（リクエストのスレッド）が待つ時間を、書き込み方式ごとに比較する。
+
+- その場で書き込む: 1回ごとに INSERT OR REPLACE + COMMIT
+- 遅延書き込み: キューに入れてすぐに戻り、バックグラウンドのスレッドがまとめて書き込む
+
+遅延書き込みは、すべての行がSQLiteに書き込まれるまでの時間（shutdown() まで）もあわせて表示する。
+
+実行方法:
+    python benchmarks/bench_cache_write_behind.py
+"""
+
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# srcディレクトリをPythonパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from lunch_roulette.models.database import close_all_pools, get_db_connection, init_database  # noqa: E402
+from lunch_roulette.services.cache_service import CacheService  # noqa: E402
+from lunch_roulette.utils.write_behind import WriteBehindQueue  # noqa: E402
+
+WRITES = 5_000
+PAYLOAD = {'temp': 25.5, 'condition': 'sunny', 'shops': [f'J{i:09d}' for i in range(20)]}
+
+
+def bench(name, cache):
+    """WRITES回保存して、1回あたりの待ち時間（中央値・p99）を表示"""
+    latencies = []
+    started = time.perf_counter()
+    for i in range(WRITES):
+        call_started = time.perf_counter()
+        cache.set_cached_data(f'key_{i}', PAYLOAD, ttl=3600)
+        latencies.append((time.perf_counter() - call_started) * 1_000_000)
+    returned = time.perf_counter() - started
+
+    if cache.write_behind is not None:
+        cache.write_behind.shutdown()
+    drained = time.perf_counter() - started
+
+    with get_db_connection(cache.db_path) as conn:
+        rows = conn.execute('SELECT COUNT(*) FROM cache').fetchone()[0]
+
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99)]
+    print(f"[{name}] 中央値 {statistics.median(latencies):,.1f}µs / p99 {p99:,.1f}µs")
+    print(f"  呼び出し元 {returned * 1000:,.0f}ms、SQLiteへの書き込み完了 {drained * 1000:,.0f}ms（{rows:,}行）")
+    return statistics.median(latencies)
+
+
+def main():
+    print("キャッシュの遅延書き込みベンチマーク")
+    print(f"保存回数={WRITES:,}")
+    print("=" * 60)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        sync_path = str(Path(temp_dir) / 'sync.db')
+        init_database(sync_path)
+        sync_cache = CacheService(db_path=sync_path)
+        sync_cache.write_behind = None
+        sync_us = bench('その場で書き込む', sync_cache)
+
+        behind_path = str(Path(temp_dir) / 'write_behind.db')
+        init_database(behind_path)
+        behind_cache = CacheService(db_path=behind_path)
+        behind_cache.write_behind = WriteBehindQueue(behind_cache._write_rows, max_size=WRITES,
+                                                     batch_size=200, flush_interval=0.2)
+        behind_us = bench('遅延書き込み', behind_cache)
+
+        print(f"  → 呼び出し元の待ち時間 {sync_us / behind_us:.1f}倍短縮")
+        close_all_pools()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+距離計算ベンチマーク
+
+検索結果1回分（最大100件）のお店について、
+calculate_walking_distance を1件ずつ呼ぶ場合と、
+calculate_distances_batch でまとめて計算する場合の所要時間を比較する。
+NumPyがインストールされている場合は、NumPy版と標準ライブラリ版の両方を計測する。
+
+実行方法:
+    python benchmarks/bench_distance_batch.py
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+# srcディレクトリをPythonパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from lunch_roulette.utils import distance_calculator as distance_module  # noqa: E402
+from lunch_roulette.utils.distance_calculator import DistanceCalculator  # noqa: E402
+
+SHOPS = 100  # ホットペッパーAPIの1回の検索で返る最大件数
+ROUNDS = 2000
+USER_LAT, USER_LON = 35.6812, 139.7671  # 東京駅
+
+
+def run(name, fn):
+    """ROUNDS回実行して1回あたりの所要時間を表示"""
+    fn()  # ウォームアップ
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        fn()
+    per_call_us = (time.perf_counter() - started) / ROUNDS * 1_000_000
+    print(f"[{name}] {per_call_us:,.1f}µs/回（{SHOPS}件あたり）")
+    return per_call_us
+
+
+def main():
+    rng = random.Random(0)
+    lats = [USER_LAT + rng.uniform(-0.01, 0.01) for _ in range(SHOPS)]
+    lngs = [USER_LON + rng.uniform(-0.01, 0.01) for _ in range(SHOPS)]
+    calculator = DistanceCalculator()
+
+    def scalar():
+        return [calculator.calculate_walking_distance(USER_LAT, USER_LON, lat, lng)
+                for lat, lng in zip(lats, lngs)]
+
+    def batch():
+        return calculator.calculate_distances_batch(USER_LAT, USER_LON, lats, lngs)
+
+    print("距離計算ベンチマーク")
+    print(f"お店の数={SHOPS}, 繰り返し={ROUNDS}")
+    print("=" * 60)
+    scalar_us = run('1件ずつ（calculate_walking_distance）', scalar)
+    if distance_module.np is not None:
+        numpy_us = run('まとめて計算（NumPy）', batch)
+        print(f"  → {scalar_us / numpy_us:.1f}倍")
+    else:
+        print("（NumPyがインストールされていないため、NumPy版は計測しません）")
+    with patch.object(distance_module, 'np', None):
+        array_us = run('まとめて計算（標準ライブラリ）', batch)
+        print(f"  → {scalar_us / array_us:.1f}倍")
+
+
+if __name__ == '__main__':
+    main()
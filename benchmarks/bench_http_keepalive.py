@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+HTTP keep-alive ベンチマーク
+
+ローカルのスタブサーバー（外部APIの代わり）に対して、
+requests.get() を毎回呼ぶ場合と、共有セッションで接続を使い回す場合の
+レイテンシと新規接続数を比較する。
+
+スタブサーバーは新しい接続ごとに HANDSHAKE_MS の遅延を入れて、
+実際の外部API（TCP + TLS ハンドシェイク）の接続コストを再現する。
+
+実行方法:
+    python benchmarks/bench_http_keepalive.py
+"""
+
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+# srcディレクトリをPythonパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from lunch_roulette.utils.http_client import create_http_session  # noqa: E402
+
+REQUESTS = 200
+HANDSHAKE_MS = 20  # 東京リージョンのHTTPS APIへのTCP + TLSハンドシェイク程度
+BODY = b'{"results": {"shop": []}}'
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """keep-alive対応のスタブAPI"""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True  # ヘッダーと本文の分割送信で遅延ACK待ちが起きないようにする
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+        time.sleep(HANDSHAKE_MS / 1000)
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def run(name, get, server, url):
+    """REQUESTS回のGETを実行して結果を表示"""
+    server.connections = 0
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(REQUESTS):
+        request_started = time.perf_counter()
+        get(url, timeout=(3.05, 10)).raise_for_status()
+        latencies.append((time.perf_counter() - request_started) * 1000)
+    elapsed = time.perf_counter() - started
+
+    print(f"[{name}]")
+    print(f"  合計: {elapsed:.2f}秒 ({REQUESTS / elapsed:,.0f} 件/秒)")
+    print(f"  レイテンシ p50={_percentile(latencies, 50):.2f}ms p99={_percentile(latencies, 99):.2f}ms")
+    print(f"  新規接続数: {server.connections}")
+
+
+def main():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.connections = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f'http://127.0.0.1:{server.server_port}/hotpepper/gourmet/v1/'
+
+    print("HTTP keep-alive ベンチマーク")
+    print(f"リクエスト数={REQUESTS}, 接続あたりのハンドシェイク遅延={HANDSHAKE_MS}ms")
+    print("=" * 60)
+    try:
+        run('requests.get（毎回新規接続）', requests.get, server, url)
+        session = create_http_session()
+        run('共有セッション（keep-alive）', session.get, server, url)
+        session.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
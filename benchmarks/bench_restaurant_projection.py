@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+お店の要約（SUMMARY_FIELDS）ベンチマーク
+
+Hot Pepper APIの全項目を持つお店300件（1回の検索の上限）について、
+全項目を保存する場合と、ルーレットで使う項目だけに要約する場合の
+1件あたりのJSONサイズ、JSONの解析時間、索引からの読み込み時間を比較する。
+
+実行方法:
+    python benchmarks/bench_restaurant_projection.py
+"""
+
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# srcディレクトリをPythonパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from lunch_roulette.models.database import close_all_pools, get_db_connection, init_database  # noqa: E402
+from lunch_roulette.models.restaurant_index import RestaurantIndex, project_summary  # noqa: E402
+from lunch_roulette.services.restaurant_service import RestaurantService  # noqa: E402
+
+SHOPS = 300
+ROUNDS = 200
+
+# Hot Pepper APIの設備・サービス項目（_format_restaurant_data がそのまま保存する項目）
+FACILITY_FIELDS = [
+    'wifi', 'wedding', 'course', 'free_drink', 'free_food', 'private_room', 'horigotatsu', 'tatami',
+    'card', 'non_smoking', 'charter', 'ktai', 'parking', 'barrier_free', 'sommelier', 'open_air',
+    'show', 'equipment', 'karaoke', 'band', 'tv', 'english', 'pet', 'child', 'midnight',
+]
+
+
+def make_api_shop(rng, i):
+    """Hot Pepper APIの検索結果1件に近いお店を作成"""
+    shop = {
+        'id': f'J{i:09d}',
+        'name': f'ランチ食堂 {i}号店',
+        'name_kana': 'らんちしょくどう',
+        'address': f'東京都千代田区丸の内{i % 3 + 1}-{i % 9 + 1}-{i % 20 + 1} 丸の内ビルディング B1F',
+        'lat': 35.6812 + rng.uniform(-0.01, 0.01),
+        'lng': 139.7671 + rng.uniform(-0.01, 0.01),
+        'genre': {'code': 'G004', 'name': '和食', 'catch': '旬の食材を使った和食'},
+        'budget': {'code': 'B010', 'name': '501～1000円', 'average': 'ランチ：1000円'},
+        'catch': '駅直結！日替わり定食が人気のお店',
+        'capacity': 40,
+        'access': 'JR東京駅丸の内北口より徒歩3分',
+        'mobile_access': 'JR東京駅徒歩3分',
+        'urls': {'pc': f'https://www.hotpepper.jp/str{i:09d}/'},
+        'photo': {'pc': {'l': f'https://imgfp.hotp.jp/IMGH/{i:04d}/hgw{i:06d}.jpg'},
+                  'mobile': {'l': f'https://imgfp.hotp.jp/IMGH/{i:04d}/hgw{i:06d}_168.jpg'}},
+        'open': '月～金、祝前日: 11:00～14:00 （料理L.O. 13:30）17:00～23:00 （料理L.O. 22:00）',
+        'close': '日、祝日',
+        'party_capacity': 30,
+        'lunch': 'あり',
+        'other_memo': 'お子様連れ歓迎。ベビーカーでの入店も可能です。',
+        'shop_detail_memo': '混雑時はお席のお時間を2時間とさせていただく場合がございます。',
+    }
+    for field in FACILITY_FIELDS:
+        shop[field] = rng.choice(['あり', 'なし', '利用可', '未確認', '全面禁煙'])
+    return shop
+
+
+def run(name, fn):
+    """ROUNDS回実行して1回あたりの所要時間を表示"""
+    fn()  # ウォームアップ
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        fn()
+    per_call_ms = (time.perf_counter() - started) / ROUNDS * 1000
+    print(f"[{name}] {per_call_ms:,.2f}ms/回（{SHOPS}件あたり）")
+    return per_call_ms
+
+
+def main():
+    rng = random.Random(0)
+    service = RestaurantService(api_key='benchmark')
+    full = service._format_restaurant_data([make_api_shop(rng, i) for i in range(SHOPS)])
+    summary = [project_summary(r) for r in full]
+
+    full_json = json.dumps(full, ensure_ascii=False)
+    summary_json = json.dumps(summary, ensure_ascii=False)
+
+    print("お店の要約ベンチマーク")
+    print(f"お店の数={SHOPS}, 繰り返し={ROUNDS}")
+    print("=" * 60)
+    full_bytes = len(full_json.encode('utf-8')) / SHOPS
+    summary_bytes = len(summary_json.encode('utf-8')) / SHOPS
+    print(f"1件あたりのJSONサイズ: 全項目 {full_bytes:,.0f}バイト → 要約 {summary_bytes:,.0f}バイト "
+          f"（{summary_bytes / full_bytes:.0%}）")
+
+    full_ms = run('JSON解析（全項目）', lambda: json.loads(full_json))
+    summary_ms = run('JSON解析（要約）', lambda: json.loads(summary_json))
+    print(f"  → {full_ms / summary_ms:.1f}倍")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = str(Path(temp_dir) / 'bench.db')
+        init_database(db_path)
+        index = RestaurantIndex(db_path)
+        index.upsert_restaurants(full)
+        ids = [r['id'] for r in full]
+        stats = index.get_size_stats()
+        print(f"索引の1行あたり: data列（要約） {stats['avg_data_bytes']:,.0f}バイト, "
+              f"detail列（詳細） {stats['avg_detail_bytes']:,.0f}バイト")
+
+        summary_read_ms = run('索引から読み込み（要約）', lambda: index.get_restaurants(ids))
+
+        # 以前の形式（data列に全項目）に書き換えて比較する
+        with get_db_connection(db_path) as conn:
+            conn.executemany('UPDATE restaurants SET data = ?, detail = NULL WHERE id = ?',
+                             [(json.dumps(r, ensure_ascii=False), r['id']) for r in full])
+            conn.commit()
+        full_read_ms = run('索引から読み込み（全項目）', lambda: index.get_restaurants(ids))
+        print(f"  → {full_read_ms / summary_read_ms:.1f}倍")
+
+        close_all_pools()
+
+
+if __name__ == '__main__':
+    main()
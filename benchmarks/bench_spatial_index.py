@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+レストラン索引の空間検索ベンチマーク
+
+東京23区付近にランダムに配置した10万件のお店を一時データベースに取り込み、
+「現在地から半径500m以内で、条件（ジャンル・予算・ランチ）に合うお店」を探す時間を、
+次の3つの方法で比較する。
+
+- R*Tree空間インデックス（RestaurantIndex.find_nearby）
+- 緯度・経度のB-treeインデックス（use_spatial_index=False）
+- 全件のJSONを読み込んで距離を計算（インデックスなし）
+
+実行方法:
+    python benchmarks/bench_spatial_index.py
+"""
+
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# srcディレクトリをPythonパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from lunch_roulette.models.database import close_all_pools, get_db_connection, init_database  # noqa: E402
+from lunch_roulette.models.restaurant_index import RestaurantIndex  # noqa: E402
+from lunch_roulette.utils.distance_calculator import DistanceCalculator  # noqa: E402
+
+SHOPS = 100_000
+QUERIES = 200
+RADIUS_KM = 0.5  # 徒歩約8分
+LAT_RANGE = (35.55, 35.80)  # 東京23区付近
+LNG_RANGE = (139.60, 139.90)
+GENRES = ['G001', 'G002', 'G004', 'G005', 'G007', 'G008', 'G013', 'G014']
+BUDGETS = ['B009', 'B010', 'B011', 'B001', 'B002']
+
+
+def make_shops(rng):
+    """ランダムなお店を作成（_format_restaurant_data と同じ形式の一部）"""
+    return [{
+        'id': f'J{i:09d}',
+        'name': f'お店{i}',
+        'lat': rng.uniform(*LAT_RANGE),
+        'lng': rng.uniform(*LNG_RANGE),
+        'genre': 'ジャンル',
+        'genre_code': rng.choice(GENRES),
+        'budget_code': rng.choice(BUDGETS),
+        'budget_average': 1000,
+        'lunch': rng.choice(['あり', 'なし']),
+    } for i in range(SHOPS)]
+
+
+def run(name, fn, points):
+    """全ての検索地点で実行して1回あたりの所要時間を表示"""
+    fn(*points[0])  # ウォームアップ
+    started = time.perf_counter()
+    found = sum(len(fn(lat, lng)) for lat, lng in points)
+    per_query_ms = (time.perf_counter() - started) / len(points) * 1000
+    print(f"[{name}] {per_query_ms:,.2f}ms/回（平均{found / len(points):.1f}件）")
+    return per_query_ms
+
+
+def main():
+    rng = random.Random(0)
+    points = [(rng.uniform(35.60, 35.75), rng.uniform(139.65, 139.85)) for _ in range(QUERIES)]
+    conditions = {'budget_code': 'B010', 'lunch': 1, 'genre_code': 'G004'}
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = str(Path(temp_dir) / 'bench.db')
+        init_database(db_path)
+        rtree_index = RestaurantIndex(db_path)
+        btree_index = RestaurantIndex(db_path, use_spatial_index=False)
+
+        started = time.perf_counter()
+        rtree_index.upsert_restaurants(make_shops(rng))
+        print("レストラン索引 空間検索ベンチマーク")
+        print(f"お店の数={SHOPS:,}（取り込み {time.perf_counter() - started:.1f}秒）, "
+              f"検索回数={QUERIES}, 半径={RADIUS_KM}km, 条件={conditions}")
+        print("=" * 60)
+
+        calculator = DistanceCalculator()
+
+        def full_scan(lat, lng):
+            with get_db_connection(db_path) as conn:
+                rows = conn.execute('SELECT data FROM restaurants').fetchall()
+            result = []
+            for row in rows:
+                shop = json.loads(row['data'])
+                if (shop['budget_code'] == conditions['budget_code']
+                        and shop['genre_code'] == conditions['genre_code']
+                        and shop['lunch'].startswith('あり')
+                        and calculator.calculate_distance(lat, lng, shop['lat'], shop['lng']) <= RADIUS_KM):
+                    result.append(shop)
+            return result
+
+        rtree_ms = run('R*Tree（find_nearby）', lambda lat, lng: rtree_index.find_nearby(
+            lat, lng, RADIUS_KM, **conditions), points)
+        btree_ms = run('B-tree（緯度・経度インデックス）', lambda lat, lng: btree_index.find_nearby(
+            lat, lng, RADIUS_KM, **conditions), points)
+        print(f"  → R*Treeは{btree_ms / rtree_ms:.1f}倍速い")
+        scan_ms = run('全件スキャン', full_scan, points[:5])
+        print(f"  → R*Treeは{scan_ms / rtree_ms:.0f}倍速い")
+
+        close_all_pools()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+SQLiteキャッシュ同時アクセスベンチマーク
+
+書き込みスレッドが INSERT OR REPLACE を繰り返している間に、
+読み込みスレッドのレイテンシがどう変わるかをジャーナルモード別に計測する。
+
+- DELETE（従来のロールバックジャーナル）: 書き込み中は読み込みが待たされる
+- WAL: 書き込み中でも読み込みはブロックされない
+
+実行方法:
+    python benchmarks/bench_sqlite_concurrency.py
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# srcディレクトリをPythonパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from lunch_roulette.models.database import apply_storage_profile  # noqa: E402
+
+DURATION_SEC = 3.0
+WRITER_THREADS = 2
+READER_THREADS = 4
+KEY_COUNT = 200
+
+# 1件あたりのデータ（レストラン検索結果程度の大きさ）
+PAYLOAD = json.dumps([{'id': f'J{i:09d}', 'name': 'テスト店舗' * 5, 'lat': 35.68, 'lng': 139.76}
+                      for i in range(50)], ensure_ascii=False)
+
+PROFILES = {
+    'DELETE / synchronous=FULL': {
+        'journal_mode': 'DELETE', 'synchronous': 'FULL',
+        'mmap_size': 0, 'cache_size': -2000, 'busy_timeout_ms': 5000,
+    },
+    'WAL / synchronous=NORMAL': {
+        'journal_mode': 'WAL', 'synchronous': 'NORMAL',
+        'mmap_size': 64 * 1024 * 1024, 'cache_size': -8000, 'busy_timeout_ms': 5000,
+    },
+}
+
+
+def _connect(db_path, profile):
+    conn = sqlite3.connect(db_path, timeout=profile['busy_timeout_ms'] / 1000, check_same_thread=False)
+    apply_storage_profile(conn, profile)
+    return conn
+
+
+def _prepare(db_path, profile):
+    conn = _connect(db_path, profile)
+    conn.execute(f"PRAGMA journal_mode = {profile['journal_mode']}")
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS cache (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            cache_key TEXT UNIQUE NOT NULL,
+            data TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            expires_at TIMESTAMP NOT NULL
+        )
+    ''')
+    expires_at = datetime.now() + timedelta(hours=1)
+    conn.executemany(
+        'INSERT OR REPLACE INTO cache (cache_key, data, expires_at) VALUES (?, ?, ?)',
+        [(f'key_{i}', PAYLOAD, expires_at) for i in range(KEY_COUNT)]
+    )
+    conn.commit()
+    conn.close()
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, int(len(values) * pct / 100))
+    return values[index]
+
+
+def run_profile(name, profile):
+    """1つのストレージ設定で同時アクセスを計測"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = os.path.join(temp_dir, 'bench.db')
+        _prepare(db_path, profile)
+
+        stop = threading.Event()
+        read_latencies = []
+        write_count = [0]
+        errors = [0]
+        lock = threading.Lock()
+
+        def writer(index):
+            conn = _connect(db_path, profile)
+            i = 0
+            while not stop.is_set():
+                try:
+                    conn.execute(
+                        'INSERT OR REPLACE INTO cache (cache_key, data, expires_at) VALUES (?, ?, ?)',
+                        (f'key_{(i * WRITER_THREADS + index) % KEY_COUNT}', PAYLOAD,
+                         datetime.now() + timedelta(hours=1))
+                    )
+                    conn.commit()
+                    with lock:
+                        write_count[0] += 1
+                except sqlite3.OperationalError:
+                    with lock:
+                        errors[0] += 1
+                i += 1
+            conn.close()
+
+        def reader(index):
+            conn = _connect(db_path, profile)
+            latencies = []
+            i = 0
+            while not stop.is_set():
+                started = time.perf_counter()
+                try:
+                    conn.execute('SELECT data, expires_at FROM cache WHERE cache_key = ?',
+                                 (f'key_{(i + index) % KEY_COUNT}',)).fetchone()
+                    latencies.append((time.perf_counter() - started) * 1000)
+                except sqlite3.OperationalError:
+                    with lock:
+                        errors[0] += 1
+                i += 1
+            conn.close()
+            with lock:
+                read_latencies.extend(latencies)
+
+        threads = [threading.Thread(target=writer, args=(i,)) for i in range(WRITER_THREADS)]
+        threads += [threading.Thread(target=reader, args=(i,)) for i in range(READER_THREADS)]
+        for thread in threads:
+            thread.start()
+        time.sleep(DURATION_SEC)
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+    print(f"[{name}]")
+    print(f"  書き込み: {write_count[0] / DURATION_SEC:,.0f} 件/秒")
+    print(f"  読み込み: {len(read_latencies) / DURATION_SEC:,.0f} 件/秒")
+    print(f"  読み込みレイテンシ p50={_percentile(read_latencies, 50):.3f}ms "
+          f"p99={_percentile(read_latencies, 99):.3f}ms max={max(read_latencies or [0]):.3f}ms")
+    print(f"  ロックエラー: {errors[0]}件")
+
+
+def main():
+    print("SQLiteキャッシュ 同時アクセスベンチマーク")
+    print(f"書き込みスレッド={WRITER_THREADS}, 読み込みスレッド={READER_THREADS}, 計測時間={DURATION_SEC}秒")
+    print("=" * 60)
+    for name, profile in PROFILES.items():
+        run_profile(name, profile)
+
+
+if __name__ == '__main__':
+    main()
@@ -11,11 +11,14 @@ from pathlib import Path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root / "src"))
 
-from lunch_roulette.app import app
+from lunch_roulette.app import app, services
 
 if __name__ == "__main__":
     port = int(os.environ.get('PORT', 5000))
     host = os.environ.get('HOST', '127.0.0.1')
     debug = os.environ.get('FLASK_DEBUG', 'False').lower() == 'true'
+
+    # サービスの起動処理（データベース初期化）
+    services.startup()
     
     app.run(host=host, port=port, debug=debug)
\ No newline at end of file
@@ -6,12 +6,12 @@ Lunch Roulette パッケージのメインエントリーポイント
 python -m lunch_roulette
 """
 
-from .app import app, init_db
+from .app import app, services
 import os
 
 if __name__ == '__main__':
-    # データベース初期化
-    init_db()
+    # サービスの起動処理（データベース初期化）
+    services.startup()
 
     # 開発サーバー起動
     app.run(
@@ -26,8 +26,11 @@ from pathlib import Path  # ファイルパスを扱いやすくする機能
 
 # 自作のモジュールを読み込み
 from .models.database import init_database          # データベース初期化機能
-from .services.cache_service import CacheService    # キャッシュ（一時保存）機能
-from .utils.error_handler import ErrorHandler       # エラー処理機能
+from .container import ServiceContainer, get_services  # 共有サービスの入れ物
+from .services.weather_service import WeatherService  # 天気情報取得部品（標準の天気データ）
+from .utils.fan_out import Deadline, default_fan_out_executor  # 外部APIの並列呼び出し
+from .utils.request_memo import start_request_memo  # リクエスト内の重複取得の防止
+from .config import Config                          # 環境変数からの設定
 
 # ===== アプリケーションの初期設定 =====
 
@@ -52,12 +55,18 @@ app.config['DEBUG'] = os.environ.get('FLASK_DEBUG', 'False').lower() == 'true'
 
 # ===== 共通サービスの初期化 =====
 
+# サービスはアプリ起動時に1回だけ作成し、すべてのリクエストで使い回す
+# （リクエストごとに作り直すと、環境変数の読み込みや警告の表示が毎回発生するため）
+# 終了時にはバックグラウンド処理・HTTPセッション・DB接続プールを自動で閉じる
+services = ServiceContainer.create(db_path=app.config['DATABASE'])
+services.init_app(app)
+
 # キャッシュサービス = 同じデータを何度もAPIから取得しないよう、一時的に保存する仕組み
 # 例: 5分以内に同じ場所の天気を調べた場合、前回の結果を再利用
-cache_service = CacheService(db_path=app.config['DATABASE'])
+cache_service = services.cache_service
 
 # エラーハンドラー = エラーが発生した時に適切な対処をする仕組み
-error_handler = ErrorHandler()
+error_handler = services.error_handler
 
 # ログ設定 = アプリケーションの動作を記録する設定
 # ログレベル INFO = 通常の動作情報を記録（デバッグ情報よりは少なめ）
@@ -81,6 +90,18 @@ def init_db():
     return init_database(app.config['DATABASE'])
 
 
+@app.before_request
+def start_request_scope():
+    """
+    リクエストごとの準備をする関数
+
+    リクエストの開始時に毎回実行されます。
+    1回のリクエストの中で同じ天気・位置情報・レストラン検索を何度も取得しないよう、
+    結果を覚えておくためのメモ（Flaskの g に保存）を新しく用意します。
+    """
+    start_request_memo()
+
+
 @app.route('/')
 def index():
     """
@@ -106,12 +127,10 @@ def index():
     try:
         # ===== ステップ1: 必要なサービスクラスを準備 =====
         # サービスクラス = 特定の機能をまとめたプログラムの部品
-        from .services.location_service import LocationService    # 位置情報を取得する部品
-        from .services.weather_service import WeatherService      # 天気情報を取得する部品
-
-        # サービスクラスのインスタンスを作成（実際に使えるようにする）
-        location_service = LocationService(cache_service)
-        weather_service = WeatherService(cache_service=cache_service)
+        # アプリ起動時に作成済みのものを使う
+        services = get_services()
+        location_service = services.location_service    # 位置情報を取得する部品
+        weather_service = services.weather_service      # 天気情報を取得する部品
 
         # ===== ステップ2: ユーザーのIPアドレスを取得 =====
         # IPアドレス = インターネット上の住所のようなもの
@@ -237,20 +256,12 @@ def roulette():
         # ========================================
         # ステップ1: 必要な部品（サービスクラス）を準備
         # ========================================
-        # それぞれの部品（モジュール）を読み込む
-        from .services.location_service import LocationService      # 位置情報取得部品
-        from .services.weather_service import WeatherService        # 天気情報取得部品
-        from .services.restaurant_service import RestaurantService  # レストラン検索部品
-        from .utils.restaurant_selector import RestaurantSelector   # レストラン選択部品（ルーレット）
-        from .utils.distance_calculator import DistanceCalculator   # 距離計算部品
-
-        # 各部品のインスタンスを作成（実際に使えるようにする）
-        # インスタンス = クラスを実際に使える状態にしたもの
-        location_service = LocationService(cache_service)
-        weather_service = WeatherService(cache_service=cache_service)
-        restaurant_service = RestaurantService(cache_service=cache_service)
-        distance_calculator = DistanceCalculator(error_handler)
-        restaurant_selector = RestaurantSelector(distance_calculator, error_handler)
+        # 各部品はアプリ起動時に作成済み（リクエストごとには作らない）
+        services = get_services()
+        location_service = services.location_service          # 位置情報取得部品
+        weather_service = services.weather_service            # 天気情報取得部品
+        restaurant_service = services.restaurant_service      # レストラン検索部品
+        restaurant_selector = services.restaurant_selector    # レストラン選択部品（ルーレット）
 
         # ========================================
         # ステップ2: ブラウザから送られてきたデータを取得
@@ -358,27 +369,59 @@ def roulette():
             
             print(f"現在地モード: 徒歩{max_walking_time}分以内, 予算={budget_code or 'すべて'}, ランチ={lunch_filter}, ジャンル={genre_code or 'すべて'}")
             
-            # ===== ステップ4: 現在の天気情報を取得 =====
+            # ===== ステップ4〜5: 天気情報とレストランを同時に取得 =====
+            # 天気とレストラン検索は互いに依存しないので、別々のスレッドで同時に呼び出す
+            # （待ち時間が「天気 + レストラン」の合計ではなく、遅い方の1回分になる）
+            deadline = Deadline(Config.ROULETTE_DEADLINE_SECONDS)
+
             # 結果に天気情報も含めるため、天気APIを呼び出す
-            weather_data = weather_service.get_current_weather(user_lat, user_lon)
+            weather_future = default_fan_out_executor.submit(
+                weather_service.get_current_weather, user_lat, user_lon
+            )
 
-            # ===== ステップ5: 近くのレストランを検索 =====
-            # 徒歩時間をrangeコードに変換
-            search_range = restaurant_service.walking_time_to_range(max_walking_time)
-            
             # 条件:
-            # - 徒歩時間内（rangeコードに変換）
+            # - 徒歩時間内（徒歩時間を含む範囲で検索し、実際の徒歩時間で絞り込む）
             # - 予算コード指定（ある場合）
             # - ランチフィルタ
             # - ジャンルコード指定（ある場合）
-            restaurants = restaurant_service.search_restaurants(
+            restaurants_future = default_fan_out_executor.submit(
+                restaurant_service.search_restaurants,
                 user_lat, 
                 user_lon, 
-                radius=search_range,
                 budget_code=budget_code,
                 lunch=lunch_filter,
-                genre_code=genre_code
+                genre_code=genre_code,
+                max_walking_time_min=max_walking_time,
+                deadline=deadline  # キャッシュにないタイルの取得は締め切りの少し前まで待つ
             )
+
+            # レストランは結果に必須なので締め切りまで待つ（過ぎたらタイムアウトとして扱う）
+            try:
+                restaurants = default_fan_out_executor.result(
+                    restaurants_future, deadline.remaining(), raise_on_timeout=True
+                )
+            except TimeoutError as e:
+                app.logger.warning(f'レストラン検索が締め切りまでに完了しませんでした: {str(e)}')
+                error_info = error_handler.handle_restaurant_error(e, fallback_available=False)
+                return jsonify({
+                    'success': False,
+                    'error_info': error_info,
+                    'message': error_info['message'],
+                    'suggestion': error_info['suggestion']
+                }), 504
+
+            # 天気は表示用なので、レストランの取得後は少しだけ待ち、間に合わなければ標準的な天気を使う
+            try:
+                weather_data = default_fan_out_executor.result(
+                    weather_future,
+                    min(deadline.remaining(), Config.ROULETTE_WEATHER_GRACE_SECONDS),
+                    default=None
+                )
+            except Exception as e:
+                app.logger.warning(f'天気情報の取得に失敗しました: {str(e)}')
+                weather_data = None
+            if weather_data is None:
+                weather_data = WeatherService.DEFAULT_WEATHER.copy()
         
         print(f"検索結果: {len(restaurants)}件のレストランが見つかりました")
 
@@ -429,7 +472,7 @@ def roulette():
                 response['weather'] = {
                     'description': weather_data['description'],
                     'temperature': weather_data['temperature'],
-                    'is_good_walking_weather': weather_service.is_good_weather_for_walking(user_lat, user_lon)
+                    'is_good_walking_weather': weather_service.is_good_weather_for_walking(user_lat, user_lon, weather_data)
                 }
             
             return jsonify(response)
@@ -492,7 +535,7 @@ def roulette():
                 response['weather'] = {
                     'description': weather_data['description'],
                     'temperature': weather_data['temperature'],
-                    'is_good_walking_weather': weather_service.is_good_weather_for_walking(user_lat, user_lon)
+                    'is_good_walking_weather': weather_service.is_good_weather_for_walking(user_lat, user_lon, weather_data)
                 }
             
             return jsonify(response)
@@ -539,7 +582,7 @@ def roulette():
                 'description': weather_data['description'],    # 天気の説明
                 'temperature': weather_data['temperature'],    # 気温
                 'uv_index': weather_data['uv_index'],          # UV指数
-                'is_good_walking_weather': weather_service.is_good_weather_for_walking(user_lat, user_lon),  # 歩くのに良い天気か
+                'is_good_walking_weather': weather_service.is_good_weather_for_walking(user_lat, user_lon, weather_data),  # 歩くのに良い天気か
                 'icon': weather_data['icon']                   # 天気アイコン
             }
             
@@ -703,8 +746,9 @@ def internal_error(error):
 if __name__ == '__main__':
     # このファイルを直接実行した時だけ、以下のコードが実行されます
     
-    # データベース初期化（キャッシュ用のテーブルを作成）
-    init_db()
+    # サービスの起動処理（キャッシュ用のテーブルを作成）
+    # 終了処理（接続プールなどのクローズ）は終了時に自動で実行されます
+    services.startup()
 
     # 開発サーバーを起動
     # host='0.0.0.0' = すべてのネットワークインターフェースで待ち受け
@@ -15,13 +15,51 @@ class Config:
     
     # データベース設定
     DATABASE_PATH = os.environ.get('DATABASE_PATH', 'cache.db')
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', '5'))  # SQLite接続プールの最大接続数
+    DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', '5.0'))  # 空き接続を待つ最大秒数
+
+    # SQLiteストレージ設定（init_database と接続プールの各接続に適用）
+    SQLITE_JOURNAL_MODE = os.environ.get('SQLITE_JOURNAL_MODE', 'WAL')  # WAL: 書き込み中も読み込み可能
+    SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL')  # WALと組み合わせてfsyncを削減
+    SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', str(64 * 1024 * 1024)))  # メモリマップサイズ（バイト）
+    SQLITE_CACHE_SIZE = int(os.environ.get('SQLITE_CACHE_SIZE', '-8000'))  # ページキャッシュ（負数はKiB指定、約8MB）
+    SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', '5000'))  # ロック競合時の待機時間（ミリ秒）
     
     # API設定
     WEATHERAPI_KEY = os.environ.get('WEATHERAPI_KEY', 'weather_api_key')  # WeatherAPI.com APIキー
     HOTPEPPER_API_KEY = os.environ.get('HOTPEPPER_API_KEY')
+    HTTP_POOL_SIZE = int(os.environ.get('HTTP_POOL_SIZE', '10'))  # 外部APIごとに保持するHTTP接続の最大数
+    HTTP_MAX_RETRIES = int(os.environ.get('HTTP_MAX_RETRIES', '2'))  # 接続エラー・502/503/504の再試行回数
+    HTTP_CONNECT_TIMEOUT = float(os.environ.get('HTTP_CONNECT_TIMEOUT', '3.05'))  # 接続タイムアウト（秒）
+    HTTP_READ_TIMEOUT = float(os.environ.get('HTTP_READ_TIMEOUT', '10'))  # 応答待ちタイムアウト（秒）
     
     # キャッシュ設定
     CACHE_TTL_MINUTES = int(os.environ.get('CACHE_TTL_MINUTES', '10'))
+    L1_CACHE_ENABLED = os.environ.get('L1_CACHE_ENABLED', 'True').lower() == 'true'  # プロセス内メモリキャッシュ
+    L1_CACHE_MAX_ENTRIES = int(os.environ.get('L1_CACHE_MAX_ENTRIES', '1000'))  # メモリキャッシュの最大件数
+    L1_CACHE_MAX_BYTES = int(os.environ.get('L1_CACHE_MAX_BYTES', str(32 * 1024 * 1024)))  # 概算最大サイズ（バイト）
+    CACHE_STALE_TTL_SECONDS = int(os.environ.get('CACHE_STALE_TTL_SECONDS', '600'))  # 期限切れ後に古いデータを返す猶予期間（0で無効）
+    CACHE_REFRESH_WORKERS = int(os.environ.get('CACHE_REFRESH_WORKERS', '2'))  # バックグラウンド更新のスレッド数
+    CACHE_CODEC = os.environ.get('CACHE_CODEC', 'auto')  # 保存形式（auto / marshal / msgpack / json）
+    CACHE_COMPRESSION = os.environ.get('CACHE_COMPRESSION', 'zlib')  # 圧縮方式（zlib / zstd / none）
+    CACHE_COMPRESS_MIN_BYTES = int(os.environ.get('CACHE_COMPRESS_MIN_BYTES', '4096'))  # 圧縮するデータの最小サイズ（バイト）
+    CACHE_MAX_ROWS = int(os.environ.get('CACHE_MAX_ROWS', '20000'))  # キャッシュの最大件数（0で上限なし）
+    CACHE_MAX_BYTES = int(os.environ.get('CACHE_MAX_BYTES', str(100 * 1024 * 1024)))  # データの合計サイズの上限（0で上限なし）
+    CACHE_EVICTION_POLICY = os.environ.get('CACHE_EVICTION_POLICY', 'lru').lower()  # 上限を超えたときに削除する順番（lru / lfu）
+    CACHE_SWEEP_ENABLED = os.environ.get('CACHE_SWEEP_ENABLED', 'True').lower() == 'true'  # 期限切れ・上限超過分の定期削除
+    CACHE_SWEEP_INTERVAL_SECONDS = int(os.environ.get('CACHE_SWEEP_INTERVAL_SECONDS', '300'))  # 定期削除の間隔（秒）
+    CACHE_SWEEP_BATCH_SIZE = int(os.environ.get('CACHE_SWEEP_BATCH_SIZE', '500'))  # 1回のDELETEで削除する最大件数
+    CACHE_EXPIRED_RETENTION_SECONDS = int(os.environ.get('CACHE_EXPIRED_RETENTION_SECONDS', '3600'))  # 期限切れ後も残す秒数（フォールバック用）
+    CACHE_VACUUM_MIN_FREE_PAGES = int(os.environ.get('CACHE_VACUUM_MIN_FREE_PAGES', '256'))  # 空きページがこの数以上で解放
+    CACHE_WRITE_BEHIND_ENABLED = os.environ.get('CACHE_WRITE_BEHIND_ENABLED', 'False').lower() == 'true'  # キャッシュの保存をバックグラウンドでまとめて書き込む
+    CACHE_WRITE_BEHIND_MAX_QUEUE = int(os.environ.get('CACHE_WRITE_BEHIND_MAX_QUEUE', '5000'))  # 書き込み待ちの最大件数（超えたらその場で書き込む）
+    CACHE_WRITE_BEHIND_BATCH_SIZE = int(os.environ.get('CACHE_WRITE_BEHIND_BATCH_SIZE', '200'))  # 1回のトランザクションで書き込む最大件数
+    CACHE_WRITE_BEHIND_FLUSH_INTERVAL_MS = int(os.environ.get('CACHE_WRITE_BEHIND_FLUSH_INTERVAL_MS', '200'))  # 書き込みの間隔（ミリ秒）
+    CACHE_KEY_VERSION = os.environ.get('CACHE_KEY_VERSION', '1')  # キャッシュキーのバージョン（上げるとすべてのキャッシュを使わなくなる）
+    CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'sqlite').lower()  # L2キャッシュの保存先（sqlite / redis）
+    CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL', 'redis://localhost:6379/0')  # redis://[:パスワード@]ホスト:ポート/DB番号
+    CACHE_REDIS_PREFIX = os.environ.get('CACHE_REDIS_PREFIX', 'lunch_roulette:')  # Redisのキーの先頭に付ける文字列
+    CACHE_REDIS_TIMEOUT_SECONDS = float(os.environ.get('CACHE_REDIS_TIMEOUT_SECONDS', '0.5'))  # 接続・応答待ちタイムアウト（秒）
     
     # 位置情報設定
     DEFAULT_LATITUDE = float(os.environ.get('DEFAULT_LATITUDE', '35.6812'))
@@ -30,11 +68,30 @@ class Config:
     # レストラン検索設定
     SEARCH_RADIUS_KM = float(os.environ.get('SEARCH_RADIUS_KM', '1.0'))
     MAX_BUDGET_YEN = int(os.environ.get('MAX_BUDGET_YEN', '1200'))
+    RESTAURANT_TILE_PRECISION = int(os.environ.get('RESTAURANT_TILE_PRECISION', '6'))  # キャッシュするタイル（ジオハッシュ）の精度
+    RESTAURANT_MAX_RESULTS = int(os.environ.get('RESTAURANT_MAX_RESULTS', '300'))  # 1回の検索で取得するお店の上限（100件ごとに1ページ）
+    RESTAURANT_PAGE_WORKERS = int(os.environ.get('RESTAURANT_PAGE_WORKERS', '4'))  # 2ページ目以降を並列取得するスレッド数
+    RESTAURANT_TILE_WORKERS = int(os.environ.get('RESTAURANT_TILE_WORKERS', '4'))  # キャッシュにないタイルを並列取得するスレッド数
+    RESTAURANT_LOCAL_FILTERING = os.environ.get('RESTAURANT_LOCAL_FILTERING', 'true').lower() == 'true'  # 予算・ランチ・ジャンルは条件なしの検索結果から絞り込む
+    RESTAURANT_STORE_DETAILS = os.environ.get('RESTAURANT_STORE_DETAILS', 'true').lower() == 'true'  # 検索時にお店の詳細（全項目）も索引に保存するか
+    RESTAURANT_INDEX_MAX_AGE_HOURS = float(os.environ.get('RESTAURANT_INDEX_MAX_AGE_HOURS', '6'))  # APIと同期したタイルを索引だけで答える時間
     
     # 新しい検索条件設定
     DEFAULT_BUDGET_CODE = os.environ.get('DEFAULT_BUDGET_CODE', None)  # デフォルトは指定なし（すべての予算）
     DEFAULT_MAX_WALKING_TIME_MIN = int(os.environ.get('DEFAULT_MAX_WALKING_TIME_MIN', '10'))  # デフォルト徒歩10分
 
+    # リクエスト処理設定
+    FAN_OUT_WORKERS = int(os.environ.get('FAN_OUT_WORKERS', '8'))  # 天気・レストランを並列取得するスレッド数
+    ROULETTE_DEADLINE_SECONDS = float(os.environ.get('ROULETTE_DEADLINE_SECONDS', '8'))  # ルーレット1回の待ち時間の上限（秒）
+    ROULETTE_WEATHER_GRACE_SECONDS = float(os.environ.get('ROULETTE_WEATHER_GRACE_SECONDS', '0.5'))  # レストラン取得後に天気を待つ時間（秒）
+
+    # エリア指定検索の事前取得設定
+    AREA_PREWARM_ENABLED = os.environ.get('AREA_PREWARM_ENABLED', 'true').lower() == 'true'  # 毎日の事前取得を行うか
+    AREA_PREWARM_TIME = os.environ.get('AREA_PREWARM_TIME', '11:30')  # 毎日の実行時刻（HH:MM）
+    AREA_PREWARM_COMBOS = os.environ.get('AREA_PREWARM_COMBOS', 'all:all:all,B010:1:all,all:1:all,B011:1:all')  # 予算:ランチ:ジャンル
+    AREA_PREWARM_MAX_API_CALLS = int(os.environ.get('AREA_PREWARM_MAX_API_CALLS', '150'))  # 1回の実行で使うAPI呼び出し回数の上限
+    AREA_PREWARM_TTL_SECONDS = int(os.environ.get('AREA_PREWARM_TTL_SECONDS', '7200'))  # 事前取得したキャッシュの有効期間（秒）
+
 
 class DevelopmentConfig(Config):
     """開発環境設定"""
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ServiceContainer - アプリケーション全体で共有するサービスの入れ物
+
+このクラスは以下の機能を提供します:
+- 起動時に1回だけ各サービス（位置情報・天気・レストラン検索など）を作成
+- Flaskアプリへの登録（app.extensions['services']）とビュー関数からの取得
+- 起動時のエリア指定検索の事前取得・キャッシュの定期削除の開始
+- 終了時の後片付け（バックグラウンド処理の停止・遅延書き込みの書き込み・HTTPセッション・DB接続プールの停止）
+
+【なぜ必要か】
+以前はリクエストのたびにサービスを作り直していたため、
+環境変数の読み込みや警告の表示、オブジェクトの生成が毎回発生していました。
+サービスは状態を持たない（キャッシュ・接続はプロセス共有）ので、1回作れば使い回せます。
+
+使用例:
+    services = ServiceContainer.create(db_path='cache.db')
+    services.init_app(app)
+
+    # ビュー関数の中で
+    weather = get_services().weather_service.get_current_weather(lat, lon)
+"""
+
+import atexit
+import threading
+from typing import Callable, List, Optional
+
+from flask import Flask, current_app
+
+from .config import Config
+from .models.database import close_all_pools, init_database
+from .services.area_prewarmer import AreaPrewarmer
+from .services.cache_service import CacheService
+from .services.cache_sweeper import CacheSweeper
+from .services.location_service import LocationService
+from .services.restaurant_service import RestaurantService
+from .services.weather_service import WeatherService
+from .utils.background_refresher import default_background_refresher
+from .utils.distance_calculator import DistanceCalculator
+from .utils.error_handler import ErrorHandler
+from .utils.fan_out import default_fan_out_executor, default_page_fetch_executor, default_tile_fetch_executor
+from .utils.http_client import close_all_http_sessions
+from .utils.restaurant_selector import RestaurantSelector
+
+# app.extensions に登録するときの名前
+EXTENSION_NAME = 'services'
+
+
+class ServiceContainer:
+    """
+    アプリケーション全体で共有するサービスをまとめたクラス
+
+    各サービスはスレッドセーフで、複数のリクエストから同時に使用できる。
+    """
+
+    def __init__(self, cache_service: CacheService, error_handler: ErrorHandler,
+                 location_service: LocationService, weather_service: WeatherService,
+                 restaurant_service: RestaurantService, distance_calculator: DistanceCalculator,
+                 restaurant_selector: RestaurantSelector,
+                 area_prewarmer: Optional[AreaPrewarmer] = None,
+                 cache_sweeper: Optional[CacheSweeper] = None):
+        """
+        ServiceContainerを初期化
+
+        通常は create() を使用する。テストでは任意のサービス（モック）を渡して作成できる。
+
+        Args:
+            cache_service (CacheService): キャッシュサービス
+            error_handler (ErrorHandler): エラーハンドラー
+            location_service (LocationService): 位置情報サービス
+            weather_service (WeatherService): 天気サービス
+            restaurant_service (RestaurantService): レストラン検索サービス
+            distance_calculator (DistanceCalculator): 距離計算機
+            restaurant_selector (RestaurantSelector): レストラン選択（ルーレット）
+            area_prewarmer (AreaPrewarmer, optional): エリア指定検索の事前取得
+            cache_sweeper (CacheSweeper, optional): キャッシュの定期削除
+        """
+        self.cache_service = cache_service
+        self.error_handler = error_handler
+        self.location_service = location_service
+        self.weather_service = weather_service
+        self.restaurant_service = restaurant_service
+        self.distance_calculator = distance_calculator
+        self.restaurant_selector = restaurant_selector
+        self.area_prewarmer = area_prewarmer
+        self.cache_sweeper = cache_sweeper
+
+        # 終了時に実行する処理（登録の逆順に実行）
+        self._shutdown_hooks: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+        self._started = False
+        self._closed = False
+
+    @classmethod
+    def create(cls, db_path: str = 'cache.db', cache_service: Optional[CacheService] = None,
+               error_handler: Optional[ErrorHandler] = None) -> 'ServiceContainer':
+        """
+        設定（環境変数）に従って各サービスを作成
+
+        Args:
+            db_path (str): キャッシュ用SQLiteデータベースのパス
+            cache_service (CacheService, optional): 既存のキャッシュサービス
+            error_handler (ErrorHandler, optional): 既存のエラーハンドラー
+
+        Returns:
+            ServiceContainer: 作成したコンテナ
+        """
+        cache_service = cache_service or CacheService(db_path=db_path)
+        error_handler = error_handler or ErrorHandler()
+        distance_calculator = DistanceCalculator(error_handler)
+        restaurant_service = RestaurantService(cache_service=cache_service,
+                                               distance_calculator=distance_calculator)
+
+        container = cls(
+            cache_service=cache_service,
+            error_handler=error_handler,
+            location_service=LocationService(cache_service),
+            weather_service=WeatherService(cache_service=cache_service),
+            restaurant_service=restaurant_service,
+            distance_calculator=distance_calculator,
+            restaurant_selector=RestaurantSelector(distance_calculator, error_handler),
+            area_prewarmer=AreaPrewarmer(restaurant_service),
+            # Redisでは期限切れ・上限超過分の削除はRedisが行う
+            cache_sweeper=CacheSweeper(cache_service) if cache_service.backend.supports_eviction else None,
+        )
+
+        # プロセス共有のリソースの後片付けを登録（登録の逆順に実行される）
+        container.add_shutdown_hook(close_all_pools)
+        container.add_shutdown_hook(cache_service.backend.close)
+        if cache_service.write_behind is not None:
+            # 更新・事前取得を止めた後、接続プールを閉じる前に書き込み待ちの行を書き込む
+            container.add_shutdown_hook(lambda: cache_service.write_behind.shutdown(wait=True))
+        container.add_shutdown_hook(close_all_http_sessions)
+        container.add_shutdown_hook(lambda: default_page_fetch_executor.shutdown(wait=False))
+        container.add_shutdown_hook(lambda: default_tile_fetch_executor.shutdown(wait=False))
+        container.add_shutdown_hook(lambda: default_fan_out_executor.shutdown(wait=False))
+        container.add_shutdown_hook(lambda: default_background_refresher.shutdown(wait=True))
+        container.add_shutdown_hook(lambda: container.area_prewarmer.stop(timeout=5))
+        if container.cache_sweeper is not None:
+            container.add_shutdown_hook(lambda: container.cache_sweeper.stop(timeout=5))
+        return container
+
+    def init_app(self, app: Flask) -> None:
+        """
+        Flaskアプリにコンテナを登録
+
+        Args:
+            app (Flask): Flaskアプリケーション
+        """
+        app.extensions[EXTENSION_NAME] = self
+        atexit.register(self.shutdown)
+
+    def add_shutdown_hook(self, hook: Callable[[], None]) -> None:
+        """
+        終了時に実行する処理を登録
+
+        Args:
+            hook (callable): 引数なしの関数（接続プールのクローズなど）
+        """
+        with self._lock:
+            self._shutdown_hooks.append(hook)
+
+    def startup(self) -> None:
+        """
+        起動時の準備（データベースの初期化、エリア指定検索の事前取得・キャッシュの定期削除の開始）
+
+        複数回呼ばれても初期化は1回だけ行う。
+        """
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        init_database(self.cache_service.db_path)
+        if self.area_prewarmer is not None and Config.AREA_PREWARM_ENABLED:
+            self.area_prewarmer.start()
+        if self.cache_sweeper is not None and Config.CACHE_SWEEP_ENABLED:
+            self.cache_sweeper.start()
+
+    def shutdown(self) -> None:
+        """
+        終了時の後片付け
+
+        バックグラウンド更新の完了を待ってから、スレッドプール・HTTPセッション・
+        DB接続プールを閉じる。複数回呼ばれても1回だけ実行する。
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            hooks = list(reversed(self._shutdown_hooks))
+
+        for hook in hooks:
+            try:
+                hook()
+            except Exception as e:
+                print(f"終了処理エラー: {e}")
+
+
+def get_services() -> ServiceContainer:
+    """
+    現在のFlaskアプリに登録されたサービスを取得（ビュー関数から呼ぶ）
+
+    Returns:
+        ServiceContainer: 登録済みのコンテナ
+    """
+    return current_app.extensions[EXTENSION_NAME]
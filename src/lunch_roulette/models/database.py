@@ -6,29 +6,478 @@ Database - SQLiteキャッシュデータベース管理モジュール
 Lunch Roulette用のキャッシュデータベースの初期化と管理を行う
 
 このモジュールは以下の機能を提供します:
-- キャッシュテーブルのスキーマ定義
+- キャッシュテーブル・レストラン索引テーブルのスキーマ定義
 - データベース初期化処理
 - インデックス作成による最適化
+- プロセス内で共有するSQLite接続プール
+- WALモードなどのストレージ設定（PRAGMA）の適用
+- キャッシュの日時（UNIX時刻・ミリ秒）の変換と、以前の形式（日時の文字列）からの移行
+- キャッシュの件数・サイズの上限を超えた分の削除（LRU / LFU）と、空き領域の解放（incremental vacuum）
+- 定期処理の実行権の確保（複数のワーカープロセスのうち1つだけが実行する）
 """
 
+import atexit
 import sqlite3
 import os
+import queue
+import threading
+import time
 from datetime import datetime
+from typing import Any, Dict, Optional
+
+from ..config import Config
+
+
+# SQLiteで許可するジャーナルモード・同期モード（PRAGMAに埋め込むため値を限定する）
+JOURNAL_MODES = ('DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF')
+SYNCHRONOUS_MODES = ('OFF', 'NORMAL', 'FULL', 'EXTRA')
+
+# キャッシュの上限を超えたときに削除する順番（期限切れの行を先に、次に使われていない行から）
+# lru: 最後に使われた日時が古い順 / lfu: 使われた回数が少ない順（同じ回数なら古い順）
+EVICTION_ORDERS = {
+    'lru': '(expires_at < ?) DESC, COALESCE(last_accessed, created_at) ASC',
+    'lfu': '(expires_at < ?) DESC, hit_count ASC, COALESCE(last_accessed, created_at) ASC',
+}
+
+# 日時の文字列をUNIX時刻（ミリ秒）に変換するSQL式（{0}に列名を入れる）
+# 以前のバージョンは expires_at をローカル時刻、created_at をUTC（CURRENT_TIMESTAMP）で保存していた
+_LOCAL_TEXT_TO_EPOCH_MS = "CAST(ROUND((julianday({0}, 'utc') - 2440587.5) * 86400000) AS INTEGER)"
+_UTC_TEXT_TO_EPOCH_MS = "CAST(ROUND((julianday({0}) - 2440587.5) * 86400000) AS INTEGER)"
+
+
+def now_ms() -> int:
+    """現在時刻をUNIX時刻（ミリ秒）で取得"""
+    return int(time.time() * 1000)
+
+
+def to_epoch_ms(value: datetime) -> int:
+    """
+    日時をUNIX時刻（ミリ秒）に変換
+
+    Args:
+        value (datetime): 日時（タイムゾーンなしの場合はローカル時刻として扱う）
+
+    Returns:
+        int: UNIX時刻（ミリ秒）
+    """
+    return int(round(value.timestamp() * 1000))
+
+
+def from_epoch_ms(value: int) -> datetime:
+    """
+    UNIX時刻（ミリ秒）をローカル時刻の日時に変換
+
+    Args:
+        value (int): UNIX時刻（ミリ秒）
+
+    Returns:
+        datetime: ローカル時刻（タイムゾーンなし）
+    """
+    return datetime.fromtimestamp(value / 1000)
+
+
+def get_storage_profile() -> Dict[str, Any]:
+    """
+    Configからストレージ設定（PRAGMA値）を取得
+
+    既定値は複数ワーカーからの同時アクセスを想定した設定:
+    - journal_mode=WAL: 書き込み中でも読み込みがブロックされない
+    - synchronous=NORMAL: WALモードでは安全性を保ったままfsync回数を削減
+    - mmap_size / cache_size: 読み込みのシステムコールとページ読み直しを削減
+    - busy_timeout: 書き込みロック競合時に即エラーにせず待機
+
+    Returns:
+        dict: journal_mode, synchronous, mmap_size, cache_size, busy_timeout_ms
+    """
+    journal_mode = Config.SQLITE_JOURNAL_MODE.upper()
+    synchronous = Config.SQLITE_SYNCHRONOUS.upper()
+
+    if journal_mode not in JOURNAL_MODES:
+        print(f"警告: 不明なジャーナルモード {journal_mode} のためWALを使用します")
+        journal_mode = 'WAL'
+    if synchronous not in SYNCHRONOUS_MODES:
+        print(f"警告: 不明な同期モード {synchronous} のためNORMALを使用します")
+        synchronous = 'NORMAL'
+
+    return {
+        'journal_mode': journal_mode,
+        'synchronous': synchronous,
+        'mmap_size': Config.SQLITE_MMAP_SIZE,
+        'cache_size': Config.SQLITE_CACHE_SIZE,
+        'busy_timeout_ms': Config.SQLITE_BUSY_TIMEOUT_MS,
+    }
+
+
+def apply_storage_profile(conn: sqlite3.Connection, profile: Optional[Dict[str, Any]] = None) -> None:
+    """
+    接続ごとのPRAGMAを適用
+
+    journal_mode はデータベースファイルに永続化されるため init_database() で設定し、
+    ここでは接続単位で有効な設定のみを適用する。
+
+    Args:
+        conn (sqlite3.Connection): 設定を適用する接続
+        profile (dict, optional): get_storage_profile() の戻り値。Noneの場合はConfigから取得
+    """
+    profile = profile or get_storage_profile()
+    conn.execute(f"PRAGMA busy_timeout = {int(profile['busy_timeout_ms'])}")
+    conn.execute(f"PRAGMA synchronous = {profile['synchronous']}")
+    conn.execute(f"PRAGMA mmap_size = {int(profile['mmap_size'])}")
+    conn.execute(f"PRAGMA cache_size = {int(profile['cache_size'])}")
+
+
+class _PooledSQLiteConnection(sqlite3.Connection):
+    """
+    プール管理用のSQLite接続
+
+    接続時のデータベースファイルの識別情報（デバイス番号・inode）を保持し、
+    ファイルが削除・置換された後に古い接続を使い続けないようにする。
+    """
+
+    file_identity: Optional[tuple] = None
+
+
+class ConnectionPool:
+    """
+    SQLite接続プール
+
+    データベースファイルごとに接続を使い回し、リクエストのたびに
+    sqlite3.connect() と切断を繰り返すコストを削減する。
+    接続数は max_size で上限を設け、上限に達した場合は
+    timeout 秒まで空き接続を待つ。
+    """
+
+    def __init__(self, db_path: str, max_size: int = 5, timeout: float = 5.0):
+        """
+        ConnectionPoolを初期化
+
+        Args:
+            db_path (str): データベースファイルのパス
+            max_size (int): プールが保持する最大接続数
+            timeout (float): 空き接続を待つ最大秒数
+        """
+        self.db_path = db_path
+        self.max_size = max(1, max_size)
+        self.timeout = timeout
+        self.pid = os.getpid()
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        # 接続の返却・破棄を acquire() で待っているスレッドに知らせる（self._lock を共有する）
+        self._cond = threading.Condition(self._lock)
+        self._created = 0
+        self._in_use = 0
+        self._closed = False
+
+        # メトリクス
+        self._acquired = 0
+        self._waits = 0
+        self._timeouts = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def _create_connection(self) -> sqlite3.Connection:
+        """
+        新しい接続を作成（内部メソッド）
+
+        プールの接続はスレッド間で受け渡されるため check_same_thread=False で作成する。
+        同時に1スレッドのみが使用することは acquire/release で保証する。
+        """
+        profile = get_storage_profile()
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=profile['busy_timeout_ms'] / 1000,
+            check_same_thread=False,
+            factory=_PooledSQLiteConnection
+        )
+        conn.row_factory = sqlite3.Row  # 辞書形式でのアクセスを可能にする
+        apply_storage_profile(conn, profile)
+        conn.file_identity = self._file_identity()
+        return conn
+
+    def _file_identity(self) -> Optional[tuple]:
+        """データベースファイルの識別情報を取得（内部メソッド）"""
+        if self.db_path == ':memory:':
+            return None
+        try:
+            stat = os.stat(self.db_path)
+        except OSError:
+            return None
+        return (stat.st_dev, stat.st_ino)
+
+    def _is_stale(self, conn: _PooledSQLiteConnection) -> bool:
+        """接続作成後にデータベースファイルが削除・置換されたか判定（内部メソッド）"""
+        if self.db_path == ':memory:':
+            return False
+        return conn.file_identity is None or conn.file_identity != self._file_identity()
+
+    def acquire(self) -> sqlite3.Connection:
+        """
+        プールから接続を借りる
+
+        空き接続がなく上限に達している場合は、release() で接続が返されるか
+        _discard() で枠が空くまで self._cond で待つ。
+
+        Returns:
+            sqlite3.Connection: データベース接続オブジェクト
+
+        Raises:
+            sqlite3.OperationalError: timeout 秒以内に接続を確保できなかった場合
+        """
+        started = None
+        with self._cond:
+            while True:
+                # 空き接続があればそれを使い、なければ上限未満のときだけ新規作成する
+                try:
+                    conn = self._idle.get_nowait()
+                    break
+                except queue.Empty:
+                    conn = None
+                if self._created < self.max_size:
+                    self._created += 1
+                    break
+
+                # 上限に達している場合は空きが出るまで待つ
+                if started is None:
+                    started = time.perf_counter()
+                remaining = self.timeout - (time.perf_counter() - started)
+                if remaining <= 0:
+                    self._waits += 1
+                    self._timeouts += 1
+                    self._total_wait += time.perf_counter() - started
+                    raise sqlite3.OperationalError(
+                        f"接続プールが枯渇しました (db: {self.db_path}, max_size: {self.max_size})"
+                    )
+                self._cond.wait(remaining)
+
+            self._in_use += 1
+            self._acquired += 1
+            if started is not None:
+                waited = time.perf_counter() - started
+                self._waits += 1
+                self._total_wait += waited
+                self._max_wait = max(self._max_wait, waited)
+
+        if conn is not None:
+            if not self._is_stale(conn):
+                return conn
+            # ファイルが置き換えられていれば、その接続の枠を使って新しい接続に差し替える
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+
+        try:
+            return self._create_connection()
+        except Exception:
+            with self._cond:
+                self._created -= 1
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        """
+        借りた接続をプールに返す
+
+        Args:
+            conn (sqlite3.Connection): acquire() で取得した接続
+        """
+        with self._lock:
+            self._in_use -= 1
+            closed = self._closed
+
+        if closed:
+            self._discard(conn)
+            return
+
+        # 未完了のトランザクションが残っていれば破棄してから返却する
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            self._discard(conn)
+            return
+
+        with self._cond:
+            self._idle.put(conn)
+            self._cond.notify()
+
+    def _discard(self, conn: sqlite3.Connection) -> None:
+        """
+        接続を閉じてプールの管理対象から外す（内部メソッド）
+
+        空いた枠で新しい接続を作れるよう、acquire() で待っているスレッドに知らせる。
+        """
+        with self._cond:
+            self._created -= 1
+            self._cond.notify()
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    def close(self) -> None:
+        """
+        プールを閉じ、待機中の接続をすべて切断する
+
+        貸出中の接続は返却時に切断される。
+        """
+        with self._lock:
+            self._closed = True
+
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+        # データベースファイルが削除済みの場合、SQLiteは付随ファイルを残すため削除する
+        if self.db_path != ':memory:' and not os.path.exists(self.db_path):
+            for suffix in ('-wal', '-shm'):
+                try:
+                    os.remove(self.db_path + suffix)
+                except OSError:
+                    pass
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        プールのメトリクスを取得
+
+        Returns:
+            dict: 接続数、待ち回数、待ち時間などの統計情報
+        """
+        with self._lock:
+            return {
+                'max_size': self.max_size,
+                'size': self._created,
+                'in_use': self._in_use,
+                'idle': self._created - self._in_use,
+                'acquired': self._acquired,
+                'waits': self._waits,
+                'timeouts': self._timeouts,
+                'total_wait_ms': round(self._total_wait * 1000, 3),
+                'max_wait_ms': round(self._max_wait * 1000, 3),
+            }
+
+
+class PooledConnection:
+    """
+    プール接続のコンテキストマネージャ
+
+    with ブロックを抜ける際に sqlite3.Connection と同様に
+    正常終了ならコミット、例外ならロールバックを行い、接続をプールに返す。
+    """
+
+    def __init__(self, pool: ConnectionPool):
+        self._pool = pool
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def __enter__(self) -> sqlite3.Connection:
+        self._conn = self._pool.acquire()
+        return self._conn
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        conn, self._conn = self._conn, None
+        try:
+            if exc_type is None:
+                conn.commit()
+            else:
+                conn.rollback()
+        finally:
+            self._pool.release(conn)
+        return False
+
+
+# データベースファイルごとの接続プール（プロセス全体で共有）
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def _pool_key(db_path: str) -> str:
+    """プール管理用のキーを生成（同じファイルを別表記で指定しても同じプールを使う）"""
+    if db_path == ':memory:':
+        return db_path
+    return os.path.abspath(db_path)
+
+
+def get_connection_pool(db_path='cache.db') -> ConnectionPool:
+    """
+    データベースファイルに対応する接続プールを取得
+
+    初回呼び出し時にプールを作成する。fork後の子プロセスでは
+    親プロセスの接続を引き継がないよう新しいプールを作り直す。
+
+    Args:
+        db_path (str): データベースファイルのパス
+
+    Returns:
+        ConnectionPool: 接続プール
+    """
+    key = _pool_key(db_path)
+    pid = os.getpid()
+
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None or pool.pid != pid:
+            pool = ConnectionPool(
+                db_path,
+                max_size=Config.DB_POOL_SIZE,
+                timeout=Config.DB_POOL_TIMEOUT
+            )
+            _pools[key] = pool
+        return pool
 
 
 def get_db_connection(db_path='cache.db'):
     """
     データベース接続を取得
 
+    接続はプールから貸し出され、with ブロックを抜けると
+    コミット（例外時はロールバック）したうえでプールに返却される。
+
     Args:
         db_path (str): データベースファイルのパス
 
     Returns:
-        sqlite3.Connection: データベース接続オブジェクト
+        PooledConnection: with文で sqlite3.Connection を返すコンテキストマネージャ
+
+    Example:
+        >>> with get_db_connection('cache.db') as conn:
+        ...     conn.execute('SELECT COUNT(*) FROM cache').fetchone()
     """
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row  # 辞書形式でのアクセスを可能にする
-    return conn
+    return PooledConnection(get_connection_pool(db_path))
+
+
+def get_pool_stats(db_path='cache.db') -> Dict[str, float]:
+    """
+    接続プールのメトリクスを取得
+
+    Args:
+        db_path (str): データベースファイルのパス
+
+    Returns:
+        dict: プールサイズ、貸出中の接続数、待ち回数・待ち時間など
+    """
+    return get_connection_pool(db_path).get_stats()
+
+
+def close_all_pools() -> None:
+    """
+    すべての接続プールを閉じる
+
+    アプリケーション終了時やテストの後片付けで使用する。
+    """
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+
+    for pool in pools:
+        pool.close()
+
+
+# プロセス終了時に接続を閉じ、WALファイルをチェックポイントさせる
+atexit.register(close_all_pools)
 
 
 def init_database(db_path='cache.db'):
@@ -37,6 +486,7 @@ def init_database(db_path='cache.db'):
 
     キャッシュテーブルを作成し、必要なインデックスを設定する。
     既存のテーブルがある場合は何もしない（CREATE TABLE IF NOT EXISTSを使用）。
+    あわせてストレージ設定のジャーナルモード（既定はWAL）をファイルに設定する。
 
     Args:
         db_path (str): データベースファイルのパス
@@ -46,17 +496,44 @@ def init_database(db_path='cache.db'):
     """
     try:
         with get_db_connection(db_path) as conn:
+            # 削除で空いた領域を少しずつ解放できるようにする（テーブルの作成前に設定）
+            _enable_incremental_vacuum(conn)
+
+            # ジャーナルモードの設定（データベースファイルに永続化される）
+            # WALモードでは書き込み中の読み込みがブロックされず、
+            # 複数ワーカーからの INSERT OR REPLACE が読み込みを待たせない
+            journal_mode = get_storage_profile()['journal_mode']
+            conn.execute(f"PRAGMA journal_mode = {journal_mode}")
+
             # キャッシュテーブルの作成
             conn.execute('''
                 CREATE TABLE IF NOT EXISTS cache (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     cache_key TEXT UNIQUE NOT NULL,
-                    data TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    expires_at TIMESTAMP NOT NULL
+                    data BLOB NOT NULL,
+                    codec TEXT,
+                    created_at INTEGER NOT NULL DEFAULT (CAST((julianday('now') - 2440587.5) * 86400000 AS INTEGER)),
+                    expires_at INTEGER NOT NULL,
+                    last_accessed INTEGER,
+                    hit_count INTEGER NOT NULL DEFAULT 0
                 )
             ''')
 
+            # データの保存形式（例: "marshal+zlib"、NULLは以前のバージョンのJSON文字列）
+            # 以前のバージョンで作成したテーブルには列を追加する（data 列にはバイト列もそのまま保存される）
+            columns = {row[1] for row in conn.execute('PRAGMA table_info(cache)')}
+            if 'codec' not in columns:
+                conn.execute('ALTER TABLE cache ADD COLUMN codec TEXT')
+
+            # 最後に使われた日時と使われた回数（上限を超えたときに削除する行の選択用）
+            if 'last_accessed' not in columns:
+                conn.execute('ALTER TABLE cache ADD COLUMN last_accessed INTEGER')
+            if 'hit_count' not in columns:
+                conn.execute('ALTER TABLE cache ADD COLUMN hit_count INTEGER NOT NULL DEFAULT 0')
+
+            # 日時はUNIX時刻（ミリ秒）の整数で保存する（以前の日時の文字列は変換する）
+            _migrate_cache_timestamps(conn)
+
             # パフォーマンス向上のためのインデックス作成
             # cache_keyでの検索を高速化
             conn.execute('''
@@ -76,6 +553,68 @@ def init_database(db_path='cache.db'):
                 ON cache(created_at)
             ''')
 
+            # レストランの索引テーブル（Hot Pepperの店舗IDごとに1行）
+            # 検索結果のキャッシュには店舗IDだけを保存し、お店の情報はここにまとめて持つ
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS restaurants (
+                    id TEXT PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    lat REAL NOT NULL,
+                    lng REAL NOT NULL,
+                    genre TEXT,
+                    genre_code TEXT,
+                    budget_code TEXT,
+                    budget_average INTEGER,
+                    lunch INTEGER NOT NULL DEFAULT 0,
+                    data TEXT NOT NULL,
+                    first_seen INTEGER NOT NULL,
+                    last_seen INTEGER NOT NULL
+                )
+            ''')
+
+            # お店の詳細（APIの全項目）。検索で読み込む data 列には要約だけを保存する
+            # 以前のバージョンで作成したテーブルには列を追加する
+            columns = {row[1] for row in conn.execute('PRAGMA table_info(restaurants)')}
+            if 'detail' not in columns:
+                conn.execute('ALTER TABLE restaurants ADD COLUMN detail TEXT')
+
+            # 緯度・経度の範囲での検索を高速化
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_restaurants_lat_lng
+                ON restaurants(lat, lng)
+            ''')
+
+            # last_seenでの検索を高速化（長く見かけないお店の削除用）
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_restaurants_last_seen
+                ON restaurants(last_seen)
+            ''')
+
+            # タイルごとの最終同期日時（この日時以降に見かけたお店がタイルの最新の一覧）
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS restaurant_sync (
+                    sync_key TEXT PRIMARY KEY,
+                    synced_at INTEGER NOT NULL
+                )
+            ''')
+
+            # 見かけた日時・同期日時もUNIX時刻（ミリ秒）の整数で保存する（以前の日時の文字列は変換する）
+            _migrate_restaurant_timestamps(conn)
+
+            # 定期処理（毎日の事前取得など）の実行記録
+            # 複数のワーカープロセスが同じ回を実行しないよう、最初に行を追加できたプロセスだけが実行する
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS job_runs (
+                    job TEXT NOT NULL,
+                    run_key TEXT NOT NULL,
+                    claimed_at INTEGER NOT NULL,
+                    owner TEXT,
+                    PRIMARY KEY (job, run_key)
+                )
+            ''')
+
+            _init_restaurant_spatial_index(conn)
+
             conn.commit()
             print(f"データベース初期化完了: {db_path}")
             return True
@@ -85,7 +624,195 @@ def init_database(db_path='cache.db'):
         return False
 
 
-def cleanup_expired_cache(db_path='cache.db'):
+def _enable_incremental_vacuum(conn: sqlite3.Connection) -> bool:
+    """
+    incremental vacuum を有効にする（内部関数）
+
+    新しいデータベースでは設定するだけで有効になる。以前のバージョンで作成した
+    データベースは、設定を反映するために1回だけ VACUUM（ファイル全体の再構築）を行う。
+
+    Args:
+        conn (sqlite3.Connection): データベース接続（トランザクション外）
+
+    Returns:
+        bool: 有効にできた場合True
+    """
+    if conn.execute('PRAGMA auto_vacuum').fetchone()[0] == 2:  # 2 = INCREMENTAL
+        return True
+
+    conn.execute('PRAGMA auto_vacuum = INCREMENTAL')
+    if conn.execute('SELECT COUNT(*) FROM sqlite_master').fetchone()[0] > 0:
+        print("incremental vacuum を有効にするため、データベースを再構築します")
+        conn.execute('VACUUM')
+    return conn.execute('PRAGMA auto_vacuum').fetchone()[0] == 2
+
+
+def _migrate_cache_timestamps(conn: sqlite3.Connection) -> int:
+    """
+    キャッシュの日時をUNIX時刻（ミリ秒）に移行（内部関数）
+
+    以前のバージョンで保存した日時の文字列を整数に変換する。
+    移行中に以前のバージョンのプロセスが日時の文字列で書き込んでも変換されるよう、
+    文字列の日時が挿入されたときに整数に直すトリガーも作成する。
+
+    Args:
+        conn (sqlite3.Connection): データベース接続
+
+    Returns:
+        int: 変換した行数
+    """
+    expires_ms = _LOCAL_TEXT_TO_EPOCH_MS.format('expires_at')
+    created_ms = _UTC_TEXT_TO_EPOCH_MS.format('created_at')
+    cursor = conn.execute(f'''
+        UPDATE cache SET
+            expires_at = CASE WHEN typeof(expires_at) = 'text' THEN {expires_ms} ELSE expires_at END,
+            created_at = CASE WHEN typeof(created_at) = 'text' THEN {created_ms} ELSE created_at END
+        WHERE typeof(expires_at) = 'text' OR typeof(created_at) = 'text'
+    ''')
+    if cursor.rowcount > 0:
+        print(f"キャッシュの日時をUNIX時刻（ミリ秒）に変換: {cursor.rowcount}件")
+
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS cache_timestamps_to_epoch_ms
+        AFTER INSERT ON cache
+        WHEN typeof(NEW.expires_at) = 'text' OR typeof(NEW.created_at) = 'text'
+        BEGIN
+            UPDATE cache SET
+                expires_at = CASE WHEN typeof(expires_at) = 'text' THEN {expires_ms} ELSE expires_at END,
+                created_at = CASE WHEN typeof(created_at) = 'text' THEN {created_ms} ELSE created_at END
+            WHERE id = NEW.id;
+        END
+    ''')
+    return max(cursor.rowcount, 0)
+
+
+def _migrate_restaurant_timestamps(conn: sqlite3.Connection) -> int:
+    """
+    レストラン索引の日時をUNIX時刻（ミリ秒）に移行（内部関数）
+
+    以前のバージョンは first_seen / last_seen / synced_at に datetime を
+    sqlite3 の標準アダプタ（ローカル時刻の文字列）で保存していた。
+    文字列のままでは整数との比較（seen_since・prune）が正しくならないため、整数に変換する。
+
+    Args:
+        conn (sqlite3.Connection): データベース接続
+
+    Returns:
+        int: 変換した行数
+    """
+    first_ms = _LOCAL_TEXT_TO_EPOCH_MS.format('first_seen')
+    last_ms = _LOCAL_TEXT_TO_EPOCH_MS.format('last_seen')
+    restaurants = conn.execute(f'''
+        UPDATE restaurants SET
+            first_seen = CASE WHEN typeof(first_seen) = 'text' THEN {first_ms} ELSE first_seen END,
+            last_seen = CASE WHEN typeof(last_seen) = 'text' THEN {last_ms} ELSE last_seen END
+        WHERE typeof(first_seen) = 'text' OR typeof(last_seen) = 'text'
+    ''').rowcount
+    synced = conn.execute(f'''
+        UPDATE restaurant_sync SET synced_at = {_LOCAL_TEXT_TO_EPOCH_MS.format('synced_at')}
+        WHERE typeof(synced_at) = 'text'
+    ''').rowcount
+    converted = max(restaurants, 0) + max(synced, 0)
+    if converted > 0:
+        print(f"レストラン索引の日時をUNIX時刻（ミリ秒）に変換: {converted}件")
+    return converted
+
+
+def _init_restaurant_spatial_index(conn: sqlite3.Connection) -> bool:
+    """
+    restaurantsテーブルの座標にR*Tree空間インデックスを作成（内部関数）
+
+    R*Treeは「この範囲に入る点」を対数時間で探せるSQLiteの仕組み。
+    restaurantsテーブルへの追加・更新・削除はトリガーで自動的に反映する。
+    SQLiteがR*Treeなしでビルドされている場合は作成せず、(lat, lng) の通常のインデックスを使う。
+
+    Args:
+        conn: SQLite接続
+
+    Returns:
+        bool: R*Treeが使える場合True
+    """
+    try:
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'restaurants_rtree'"
+        ).fetchone()
+
+        conn.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS restaurants_rtree
+            USING rtree(id, min_lat, max_lat, min_lng, max_lng)
+        ''')
+
+        # restaurants の rowid と R*Tree の id を対応させる
+        conn.execute('''
+            CREATE TRIGGER IF NOT EXISTS restaurants_rtree_insert
+            AFTER INSERT ON restaurants
+            BEGIN
+                INSERT OR REPLACE INTO restaurants_rtree
+                VALUES (new.rowid, new.lat, new.lat, new.lng, new.lng);
+            END
+        ''')
+        conn.execute('''
+            CREATE TRIGGER IF NOT EXISTS restaurants_rtree_update
+            AFTER UPDATE OF lat, lng ON restaurants
+            BEGIN
+                UPDATE restaurants_rtree
+                SET min_lat = new.lat, max_lat = new.lat, min_lng = new.lng, max_lng = new.lng
+                WHERE id = new.rowid;
+            END
+        ''')
+        conn.execute('''
+            CREATE TRIGGER IF NOT EXISTS restaurants_rtree_delete
+            AFTER DELETE ON restaurants
+            BEGIN
+                DELETE FROM restaurants_rtree WHERE id = old.rowid;
+            END
+        ''')
+
+        # R*Treeを新しく作った場合は、既存のお店を登録する
+        if not exists:
+            conn.execute('''
+                INSERT INTO restaurants_rtree
+                SELECT rowid, lat, lat, lng, lng FROM restaurants
+            ''')
+        return True
+
+    except sqlite3.OperationalError as e:
+        print(f"R*Tree空間インデックスを使用できません（通常のインデックスを使用）: {e}")
+        return False
+
+
+def claim_job_run(db_path: str, job: str, run_key: str, owner: Optional[str] = None) -> bool:
+    """
+    定期処理の1回分の実行権を確保
+
+    (job, run_key) の行を INSERT ... ON CONFLICT DO NOTHING で追加し、追加できた場合だけ実行権を得る。
+    同じデータベースを使う他のワーカープロセスが先に確保していた場合は False を返す。
+
+    Args:
+        db_path (str): データベースファイルのパス
+        job (str): 処理の名前（例: "area_prewarm"）
+        run_key (str): 実行の回を表す文字列（例: 実行日 "2025-01-01"）
+        owner (str, optional): 確保したプロセス（ホスト名:プロセスIDなど、確認用）
+
+    Returns:
+        bool: 実行権を確保できた場合True（データベースのエラー時は実行しないようFalse）
+    """
+    try:
+        with get_db_connection(db_path) as conn:
+            cursor = conn.execute('''
+                INSERT INTO job_runs (job, run_key, claimed_at, owner) VALUES (?, ?, ?, ?)
+                ON CONFLICT(job, run_key) DO NOTHING
+            ''', (job, run_key, now_ms(), owner))
+            conn.commit()
+            return cursor.rowcount == 1
+
+    except sqlite3.Error as e:
+        print(f"定期処理の実行権の確保エラー ({job}): {e}")
+        return False
+
+
+def cleanup_expired_cache(db_path='cache.db', grace_seconds: int = 0,
+                          batch_size: Optional[int] = None):
     """
     期限切れのキャッシュデータを削除
 
@@ -94,19 +821,33 @@ def cleanup_expired_cache(db_path='cache.db'):
 
     Args:
         db_path (str): データベースファイルのパス
+        grace_seconds (int): 期限切れ後も残しておく秒数（古いデータの返却・フォールバック用）
+        batch_size (int, optional): 1回のDELETEで削除する最大件数
+            - 指定した場合は分割して削除し、削除の合間に他のプロセスの書き込みを待たせない
 
     Returns:
         int: 削除されたレコード数
     """
+    threshold = now_ms() - max(0, grace_seconds) * 1000
+    deleted_count = 0
     try:
         with get_db_connection(db_path) as conn:
-            cursor = conn.execute('''
-                DELETE FROM cache
-                WHERE expires_at < ?
-            ''', (datetime.now(),))
-
-            deleted_count = cursor.rowcount
-            conn.commit()
+            while True:
+                if batch_size:
+                    cursor = conn.execute('''
+                        DELETE FROM cache WHERE id IN (
+                            SELECT id FROM cache WHERE expires_at < ? LIMIT ?
+                        )
+                    ''', (threshold, batch_size))
+                else:
+                    cursor = conn.execute('''
+                        DELETE FROM cache
+                        WHERE expires_at < ?
+                    ''', (threshold,))
+                conn.commit()
+                deleted_count += cursor.rowcount
+                if not batch_size or cursor.rowcount < batch_size:
+                    break
 
             if deleted_count > 0:
                 print(f"期限切れキャッシュを削除: {deleted_count}件")
@@ -115,6 +856,106 @@ def cleanup_expired_cache(db_path='cache.db'):
 
     except sqlite3.Error as e:
         print(f"キャッシュクリーンアップエラー: {e}")
+        return deleted_count
+
+
+def evict_cache_entries(db_path='cache.db', max_rows: int = 0, max_bytes: int = 0,
+                        policy: str = 'lru', batch_size: int = 500) -> int:
+    """
+    キャッシュの件数・データサイズが上限を超えている分を削除
+
+    期限切れの行を先に、次に policy の順番（lru: 最後に使われた日時が古い順、
+    lfu: 使われた回数が少ない順）で削除する。
+
+    Args:
+        db_path (str): データベースファイルのパス
+        max_rows (int): 最大件数（0以下は上限なし）
+        max_bytes (int): data 列の合計バイト数の上限（0以下は上限なし）
+        policy (str): 削除する順番（'lru' または 'lfu'）
+        batch_size (int): 1回のDELETEで削除する最大件数
+
+    Returns:
+        int: 削除されたレコード数
+
+    Raises:
+        ValueError: policy が正しくない場合
+    """
+    if policy not in EVICTION_ORDERS:
+        raise ValueError(f"キャッシュの削除方式が正しくありません: {policy}")
+    order = EVICTION_ORDERS[policy]
+    batch_size = max(1, batch_size)
+    evicted = 0
+
+    try:
+        with get_db_connection(db_path) as conn:
+            # 件数の上限
+            if max_rows > 0:
+                excess = conn.execute('SELECT COUNT(*) FROM cache').fetchone()[0] - max_rows
+                while excess > 0:
+                    cursor = conn.execute(f'''
+                        DELETE FROM cache WHERE id IN (
+                            SELECT id FROM cache ORDER BY {order} LIMIT ?
+                        )
+                    ''', (now_ms(), min(excess, batch_size)))
+                    conn.commit()
+                    if cursor.rowcount <= 0:
+                        break
+                    evicted += cursor.rowcount
+                    excess -= cursor.rowcount
+
+            # データサイズの上限（削除する順番に、超えた分のサイズになるまで選ぶ）
+            if max_bytes > 0:
+                excess = (conn.execute('SELECT COALESCE(SUM(LENGTH(data)), 0) FROM cache').fetchone()[0]
+                          - max_bytes)
+                if excess > 0:
+                    ids = []
+                    rows = conn.execute(f'SELECT id, LENGTH(data) FROM cache ORDER BY {order}', (now_ms(),))
+                    for row_id, size in rows:
+                        if excess <= 0:
+                            break
+                        ids.append(row_id)
+                        excess -= size or 0
+                    rows.close()
+                    for start in range(0, len(ids), batch_size):
+                        batch = ids[start:start + batch_size]
+                        placeholders = ','.join('?' * len(batch))
+                        cursor = conn.execute(f'DELETE FROM cache WHERE id IN ({placeholders})', batch)
+                        conn.commit()
+                        evicted += cursor.rowcount
+
+        if evicted > 0:
+            print(f"キャッシュの上限を超えた分を削除 ({policy}): {evicted}件")
+        return evicted
+
+    except sqlite3.Error as e:
+        print(f"キャッシュの上限超過分の削除エラー: {e}")
+        return evicted
+
+
+def incremental_vacuum(db_path='cache.db', min_free_pages: int = 0) -> int:
+    """
+    削除で空いたページをファイルから解放（incremental vacuum）
+
+    Args:
+        db_path (str): データベースファイルのパス
+        min_free_pages (int): 空きページがこの数以上ある場合だけ解放する
+
+    Returns:
+        int: 解放したページ数（incremental vacuum が無効なデータベースでは0）
+    """
+    try:
+        with get_db_connection(db_path) as conn:
+            if conn.execute('PRAGMA auto_vacuum').fetchone()[0] != 2:
+                return 0
+            free_pages = conn.execute('PRAGMA freelist_count').fetchone()[0]
+            if free_pages == 0 or free_pages < min_free_pages:
+                return 0
+            # execute() では1ページずつしか解放されないため、最後まで実行される executescript() を使う
+            conn.executescript('PRAGMA incremental_vacuum;')
+            return free_pages - conn.execute('PRAGMA freelist_count').fetchone()[0]
+
+    except sqlite3.Error as e:
+        print(f"incremental vacuum エラー: {e}")
         return 0
 
 
@@ -133,12 +974,11 @@ def get_cache_stats(db_path='cache.db'):
             # 総レコード数
             total_count = conn.execute('SELECT COUNT(*) FROM cache').fetchone()[0]
 
-            # 有効レコード数（ISO形式の文字列として比較）
-            current_time_str = datetime.now().isoformat()
+            # 有効レコード数（UNIX時刻・ミリ秒で比較、expires_at のインデックスを使用）
             valid_count = conn.execute('''
                 SELECT COUNT(*) FROM cache
                 WHERE expires_at > ?
-            ''', (current_time_str,)).fetchone()[0]
+            ''', (now_ms(),)).fetchone()[0]
 
             # 期限切れレコード数
             expired_count = total_count - valid_count
@@ -147,7 +987,8 @@ def get_cache_stats(db_path='cache.db'):
                 'total_records': total_count,
                 'valid_records': valid_count,
                 'expired_records': expired_count,
-                'database_size': os.path.getsize(db_path) if os.path.exists(db_path) else 0
+                'database_size': os.path.getsize(db_path) if os.path.exists(db_path) else 0,
+                'pool': get_pool_stats(db_path)
             }
 
     except sqlite3.Error as e:
@@ -156,7 +997,8 @@ def get_cache_stats(db_path='cache.db'):
             'total_records': 0,
             'valid_records': 0,
             'expired_records': 0,
-            'database_size': 0
+            'database_size': 0,
+            'pool': {}
         }
 
 
@@ -179,6 +1021,7 @@ if __name__ == '__main__':
         print(f"  - 有効レコード数: {stats['valid_records']}")
         print(f"  - 期限切れレコード数: {stats['expired_records']}")
         print(f"  - データベースサイズ: {stats['database_size']} bytes")
+        print(f"  - 接続プール: {stats['pool']['size']}/{stats['pool']['max_size']}接続")
 
         # 期限切れデータのクリーンアップ
         cleanup_expired_cache()
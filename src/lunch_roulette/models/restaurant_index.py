@@ -0,0 +1,476 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+RestaurantIndex - ローカルのレストラン索引（restaurantsテーブル）
+Hot Pepper APIから取得したお店を、店舗IDごとに1行で保存・検索する
+
+このモジュールは以下の機能を提供します:
+- APIの検索結果の取り込み（店舗IDでUPSERTし、最後に見かけた日時を更新）
+- 店舗IDのリストからのお店の取得（キャッシュには店舗IDだけを保存するため）
+- 緯度・経度の範囲や現在地からの半径と、検索条件（ジャンル・予算・ランチ）でのお店の検索
+  （R*Tree空間インデックスで対数時間で探す）
+- タイルごとの最終同期日時の記録（索引だけで検索に答えてよいかの判定用）
+- 長く見かけないお店の削除
+- ルーレットで使う項目だけの要約（data列）と、APIの全項目の詳細（detail列）の分離
+
+【なぜ必要か】
+以前は検索結果をJSONのまま cache テーブルに保存していたため、
+重なり合う検索（近くの地点・別の予算・別のジャンル）ごとに同じお店が何度も保存されていました。
+お店の情報は1か所にまとめ、検索結果のキャッシュは店舗IDのリストだけにします。
+また、検索のたびに読み込む data 列には SUMMARY_FIELDS の項目だけを保存し、
+カラオケ・ウェディングなどの詳細は detail 列に分けて、店舗IDで1件ずつ取得するときだけ読み込みます。
+"""
+
+import json
+import math
+import sqlite3
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from .database import from_epoch_ms, get_db_connection, now_ms, to_epoch_ms
+
+# SQLiteの IN (...) に一度に渡す店舗IDの数（古いSQLiteの変数上限999より小さくする）
+_ID_CHUNK_SIZE = 500
+
+# 検索結果（data列）に保存する項目。ルーレットの選択・表示と検索条件での絞り込みに使うもの
+# （距離計算: lat/lng、表示: name/genre/address/catch/access/open/photo/urls/budget_*、絞り込み: *_code/lunch）
+SUMMARY_FIELDS = (
+    'id', 'name', 'address', 'lat', 'lng',
+    'genre', 'genre_code', 'budget_average', 'budget_name', 'budget_code',
+    'catch', 'access', 'open', 'photo', 'urls', 'lunch', 'source',
+)
+
+# 要約したお店1件の概算バイト数（JSONで保存したときの目安、L1キャッシュのサイズの見積もり用）
+SUMMARY_SIZE_ESTIMATE = 800
+
+
+def project_summary(restaurant: Dict) -> Dict:
+    """
+    お店の情報から SUMMARY_FIELDS の項目だけを取り出す
+
+    Args:
+        restaurant: _format_restaurant_data で整形したお店（全項目）
+
+    Returns:
+        dict: 要約したお店（元のお店にない項目は含めない）
+    """
+    return {field: restaurant[field] for field in SUMMARY_FIELDS if field in restaurant}
+
+
+# 半径検索で使う定数（DistanceCalculator と同じ値）
+_EARTH_RADIUS_KM = 6371.0
+_KM_PER_LAT_DEGREE = 111.32
+
+
+class RestaurantIndex:
+    """
+    restaurantsテーブルの読み書きを行うクラス
+
+    各メソッドはスレッドセーフ（接続プールから接続を借りて使う）。
+    データベースエラーは呼び出し元に伝えず、ログを出して空の結果を返す。
+    """
+
+    def __init__(self, db_path: str = 'cache.db', use_spatial_index: bool = True,
+                 store_details: bool = True):
+        """
+        RestaurantIndexを初期化
+
+        Args:
+            db_path (str): SQLiteデータベースファイルのパス（キャッシュと同じファイル）
+            use_spatial_index (bool): R*Tree空間インデックスを使うか（ベンチマークでの比較用）
+            store_details (bool): 取り込み時にAPIの全項目（detail列）も保存するか
+                - False の場合は要約だけを保存し、詳細は get_restaurant_by_id で必要になったときに取得する
+        """
+        self.db_path = db_path
+        self.use_spatial_index = use_spatial_index
+        self.store_details = store_details
+        self._has_rtree: Optional[bool] = None  # 最初の検索時に確認する
+
+    def upsert_restaurants(self, restaurants: Iterable[Dict], seen_at: Optional[datetime] = None,
+                           store_details: Optional[bool] = None) -> int:
+        """
+        お店を索引に取り込む（新しいお店は追加、既存のお店は更新）
+
+        Args:
+            restaurants: _format_restaurant_data で整形したお店のリスト
+            seen_at: 見かけた日時（省略時は現在時刻）
+            store_details: 詳細（detail列）も保存するか（省略時は初期化時の設定）
+                - 保存しない場合も、以前に保存した詳細は残す
+
+        Returns:
+            int: 取り込んだお店の数
+        """
+        seen_at_ms = to_epoch_ms(seen_at) if seen_at is not None else now_ms()
+        store_details = self.store_details if store_details is None else store_details
+        rows = []
+        for restaurant in restaurants:
+            row = self._to_row(restaurant, seen_at_ms, store_details)
+            if row is not None:
+                rows.append(row)
+        if not rows:
+            return 0
+
+        try:
+            with get_db_connection(self.db_path) as conn:
+                conn.executemany('''
+                    INSERT INTO restaurants (
+                        id, name, lat, lng, genre, genre_code, budget_code, budget_average,
+                        lunch, data, first_seen, last_seen, detail
+                    )
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(id) DO UPDATE SET
+                        name = excluded.name,
+                        lat = excluded.lat,
+                        lng = excluded.lng,
+                        genre = excluded.genre,
+                        genre_code = excluded.genre_code,
+                        budget_code = excluded.budget_code,
+                        budget_average = excluded.budget_average,
+                        lunch = excluded.lunch,
+                        data = excluded.data,
+                        last_seen = excluded.last_seen,
+                        detail = COALESCE(excluded.detail, restaurants.detail)
+                ''', rows)
+                conn.commit()
+                return len(rows)
+
+        except sqlite3.Error as e:
+            print(f"レストラン索引の更新エラー: {e}")
+            return 0
+
+    def get_restaurants(self, restaurant_ids: List[str]) -> List[Dict]:
+        """
+        店舗IDのリストからお店を取得
+
+        Args:
+            restaurant_ids: 店舗IDのリスト
+
+        Returns:
+            list: お店のリスト（restaurant_ids と同じ順番。索引にないお店は含まない）
+        """
+        if not restaurant_ids:
+            return []
+
+        found = {}
+        try:
+            with get_db_connection(self.db_path) as conn:
+                for start in range(0, len(restaurant_ids), _ID_CHUNK_SIZE):
+                    chunk = restaurant_ids[start:start + _ID_CHUNK_SIZE]
+                    placeholders = ','.join('?' * len(chunk))
+                    cursor = conn.execute(
+                        f'SELECT id, data FROM restaurants WHERE id IN ({placeholders})', chunk
+                    )
+                    for row in cursor:
+                        found[row['id']] = json.loads(row['data'])
+
+        except (sqlite3.Error, ValueError) as e:
+            print(f"レストラン索引の取得エラー: {e}")
+            return []
+
+        return [found[restaurant_id] for restaurant_id in restaurant_ids if restaurant_id in found]
+
+    def get_restaurant(self, restaurant_id: str) -> Optional[Dict]:
+        """
+        店舗IDからお店を1件取得
+
+        Args:
+            restaurant_id: 店舗ID
+
+        Returns:
+            dict: お店の情報、索引にない場合はNone
+        """
+        restaurants = self.get_restaurants([restaurant_id])
+        return restaurants[0] if restaurants else None
+
+    def get_restaurant_detail(self, restaurant_id: str) -> Optional[Dict]:
+        """
+        店舗IDからお店の詳細（APIの全項目）を取得
+
+        Args:
+            restaurant_id: 店舗ID
+
+        Returns:
+            dict: お店の詳細、索引にない・詳細を保存していない場合はNone
+        """
+        try:
+            with get_db_connection(self.db_path) as conn:
+                row = conn.execute(
+                    'SELECT detail FROM restaurants WHERE id = ?', (restaurant_id,)
+                ).fetchone()
+            if row is None or row['detail'] is None:
+                return None
+            return json.loads(row['detail'])
+
+        except (sqlite3.Error, ValueError) as e:
+            print(f"レストラン索引の詳細取得エラー: {e}")
+            return None
+
+    def find_in_bounds(self, lat_min: float, lat_max: float, lng_min: float, lng_max: float,
+                       budget_code: Optional[str] = None, lunch: Optional[int] = None,
+                       genre_code: Optional[str] = None, seen_since: Optional[datetime] = None,
+                       limit: Optional[int] = None) -> List[Dict]:
+        """
+        緯度・経度の範囲と検索条件でお店を検索
+
+        検索条件は Hot Pepper API の budget / lunch / genre パラメータと同じ意味。
+
+        Args:
+            lat_min, lat_max: 緯度の範囲
+            lng_min, lng_max: 経度の範囲
+            budget_code: 予算コード（例: "B010"）
+            lunch: 1 の場合はランチありのお店だけ
+            genre_code: ジャンルコード（例: "G007"）
+            seen_since: この日時以降に見かけたお店だけ
+            limit: 最大件数
+
+        Returns:
+            list: 条件に合うお店のリスト
+        """
+        return [data for data, _, _ in self._query_bounds(
+            lat_min, lat_max, lng_min, lng_max, budget_code, lunch, genre_code, seen_since, limit
+        )]
+
+    def find_nearby(self, lat: float, lng: float, radius_km: float,
+                    budget_code: Optional[str] = None, lunch: Optional[int] = None,
+                    genre_code: Optional[str] = None, seen_since: Optional[datetime] = None,
+                    limit: Optional[int] = None) -> List[Dict]:
+        """
+        現在地から半径 radius_km 以内のお店を近い順に検索
+
+        R*Treeで半径を囲む四角形の中のお店を探し、ハバースイン公式で円の外のお店を除く。
+
+        Args:
+            lat, lng: 現在地の緯度・経度
+            radius_km: 半径（直線距離km）
+            budget_code, lunch, genre_code, seen_since: find_in_bounds と同じ検索条件
+            limit: 最大件数（近い順）
+
+        Returns:
+            list: 条件に合うお店のリスト（近い順）
+        """
+        lat_delta = radius_km / _KM_PER_LAT_DEGREE
+        lng_delta = radius_km / (_KM_PER_LAT_DEGREE * max(math.cos(math.radians(lat)), 1e-6))
+        rows = self._query_bounds(lat - lat_delta, lat + lat_delta, lng - lng_delta, lng + lng_delta,
+                                  budget_code, lunch, genre_code, seen_since, None)
+
+        lat_rad = math.radians(lat)
+        cos_lat = math.cos(lat_rad)
+        nearby = []
+        for data, shop_lat, shop_lng in rows:
+            shop_lat_rad = math.radians(shop_lat)
+            a = (math.sin((shop_lat_rad - lat_rad) / 2) ** 2
+                 + cos_lat * math.cos(shop_lat_rad) * math.sin(math.radians(shop_lng - lng) / 2) ** 2)
+            distance_km = _EARTH_RADIUS_KM * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+            if distance_km <= radius_km:
+                nearby.append((distance_km, data))
+
+        nearby.sort(key=lambda item: item[0])
+        if limit is not None:
+            nearby = nearby[:limit]
+        return [data for _, data in nearby]
+
+    def _query_bounds(self, lat_min: float, lat_max: float, lng_min: float, lng_max: float,
+                      budget_code: Optional[str], lunch: Optional[int], genre_code: Optional[str],
+                      seen_since: Optional[datetime], limit: Optional[int]) -> List[tuple]:
+        """
+        範囲と検索条件に合うお店を (お店の辞書, 緯度, 経度) のリストで返す（内部メソッド）
+
+        R*Treeが使える場合はR*Treeで候補を絞り、座標は restaurants テーブルの値で改めて判定する
+        （R*Treeは座標を32ビット浮動小数点で少し広めに保存するため）。
+        """
+        conditions = ['r.lat BETWEEN ? AND ?', 'r.lng BETWEEN ? AND ?']
+        params: List = [lat_min, lat_max, lng_min, lng_max]
+        if budget_code:
+            conditions.append('r.budget_code = ?')
+            params.append(budget_code)
+        if lunch:
+            conditions.append('r.lunch = 1')
+        if genre_code:
+            conditions.append('r.genre_code = ?')
+            params.append(genre_code)
+        if seen_since is not None:
+            conditions.append('r.last_seen >= ?')
+            params.append(to_epoch_ms(seen_since))
+
+        try:
+            with get_db_connection(self.db_path) as conn:
+                if self._spatial_index_available(conn):
+                    sql = ('SELECT r.data, r.lat, r.lng FROM restaurants_rtree t '
+                           'JOIN restaurants r ON r.rowid = t.id '
+                           'WHERE t.max_lat >= ? AND t.min_lat <= ? AND t.max_lng >= ? AND t.min_lng <= ? AND ')
+                    params = [lat_min, lat_max, lng_min, lng_max] + params
+                else:
+                    sql = 'SELECT r.data, r.lat, r.lng FROM restaurants r WHERE '
+                sql += ' AND '.join(conditions)
+                if limit is not None:
+                    sql += ' LIMIT ?'
+                    params.append(limit)
+
+                return [(json.loads(row['data']), row['lat'], row['lng']) for row in conn.execute(sql, params)]
+
+        except (sqlite3.Error, ValueError) as e:
+            print(f"レストラン索引の検索エラー: {e}")
+            return []
+
+    def _spatial_index_available(self, conn: sqlite3.Connection) -> bool:
+        """R*Tree空間インデックス（restaurants_rtree）が使えるか確認（内部メソッド）"""
+        if not self.use_spatial_index:
+            return False
+        if self._has_rtree is None:
+            self._has_rtree = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'restaurants_rtree'"
+            ).fetchone() is not None
+        return self._has_rtree
+
+    def mark_synced(self, sync_key: str, synced_at: datetime) -> None:
+        """
+        タイル（検索条件ごと）をAPIと同期した日時を記録
+
+        Args:
+            sync_key: 同期の単位を表すキー（タイルのキャッシュキー）
+            synced_at: 同期を始めた日時（このとき取り込んだお店の last_seen と同じ値）
+        """
+        try:
+            with get_db_connection(self.db_path) as conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO restaurant_sync (sync_key, synced_at) VALUES (?, ?)',
+                    (sync_key, to_epoch_ms(synced_at))
+                )
+                conn.commit()
+
+        except sqlite3.Error as e:
+            print(f"レストラン索引の同期日時の記録エラー: {e}")
+
+    def clear_synced(self, sync_key: str) -> None:
+        """
+        同期日時の記録を消す（全件を取得できなかった場合）
+
+        Args:
+            sync_key: 同期の単位を表すキー
+        """
+        try:
+            with get_db_connection(self.db_path) as conn:
+                conn.execute('DELETE FROM restaurant_sync WHERE sync_key = ?', (sync_key,))
+                conn.commit()
+
+        except sqlite3.Error as e:
+            print(f"レストラン索引の同期日時の削除エラー: {e}")
+
+    def get_synced_at(self, sync_key: str) -> Optional[datetime]:
+        """
+        タイル（検索条件ごと）を最後にAPIと同期した日時を取得
+
+        Args:
+            sync_key: 同期の単位を表すキー
+
+        Returns:
+            datetime: 最終同期日時、同期したことがない場合はNone
+        """
+        try:
+            with get_db_connection(self.db_path) as conn:
+                row = conn.execute(
+                    'SELECT synced_at FROM restaurant_sync WHERE sync_key = ?', (sync_key,)
+                ).fetchone()
+            if row is None:
+                return None
+            return from_epoch_ms(row['synced_at'])
+
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            print(f"レストラン索引の同期日時の取得エラー: {e}")
+            return None
+
+    def prune(self, max_age_days: int) -> int:
+        """
+        長く見かけないお店を削除（閉店したお店などを残さないため）
+
+        Args:
+            max_age_days: この日数より前に最後に見かけたお店を削除
+
+        Returns:
+            int: 削除したお店の数
+        """
+        try:
+            with get_db_connection(self.db_path) as conn:
+                cursor = conn.execute(
+                    'DELETE FROM restaurants WHERE last_seen < ?',
+                    (to_epoch_ms(datetime.now() - timedelta(days=max_age_days)),)
+                )
+                conn.commit()
+                if cursor.rowcount > 0:
+                    print(f"長く見かけないお店を索引から削除: {cursor.rowcount}件")
+                return cursor.rowcount
+
+        except sqlite3.Error as e:
+            print(f"レストラン索引の削除エラー: {e}")
+            return 0
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        索引の統計情報を取得
+
+        Returns:
+            dict: 索引に登録されているお店の数
+        """
+        try:
+            with get_db_connection(self.db_path) as conn:
+                return {'restaurants': conn.execute('SELECT COUNT(*) FROM restaurants').fetchone()[0]}
+
+        except sqlite3.Error as e:
+            print(f"レストラン索引の統計情報取得エラー: {e}")
+            return {'restaurants': 0}
+
+    def get_size_stats(self) -> Dict[str, float]:
+        """
+        索引の1行あたりのサイズを取得（要約・詳細の効果の確認用）
+
+        Returns:
+            dict: お店の数、data列（要約）とdetail列（詳細）の平均バイト数、詳細を保存しているお店の数
+        """
+        try:
+            with get_db_connection(self.db_path) as conn:
+                row = conn.execute(
+                    'SELECT COUNT(*) AS restaurants, '
+                    'AVG(LENGTH(CAST(data AS BLOB))) AS data_bytes, '
+                    'AVG(LENGTH(CAST(detail AS BLOB))) AS detail_bytes, '
+                    'COUNT(detail) AS with_detail '
+                    'FROM restaurants'
+                ).fetchone()
+            return {
+                'restaurants': row['restaurants'],
+                'avg_data_bytes': row['data_bytes'] or 0.0,
+                'avg_detail_bytes': row['detail_bytes'] or 0.0,
+                'with_detail': row['with_detail'],
+            }
+
+        except sqlite3.Error as e:
+            print(f"レストラン索引のサイズ取得エラー: {e}")
+            return {'restaurants': 0, 'avg_data_bytes': 0.0, 'avg_detail_bytes': 0.0, 'with_detail': 0}
+
+    @staticmethod
+    def _to_row(restaurant: Dict, seen_at_ms: int, store_details: bool = True) -> Optional[tuple]:
+        """お店の辞書をrestaurantsテーブルの1行に変換（見かけた日時はUNIX時刻・ミリ秒、店舗IDや座標がない場合はNone）"""
+        try:
+            restaurant_id = restaurant['id']
+            lat = float(restaurant['lat'])
+            lng = float(restaurant['lng'])
+        except (KeyError, TypeError, ValueError):
+            return None
+        if not restaurant_id:
+            return None
+
+        return (
+            restaurant_id,
+            restaurant.get('name', ''),
+            lat,
+            lng,
+            restaurant.get('genre', ''),
+            restaurant.get('genre_code') or None,
+            restaurant.get('budget_code') or None,
+            restaurant.get('budget_average'),
+            1 if str(restaurant.get('lunch', '')).startswith('あり') else 0,
+            json.dumps(project_summary(restaurant), ensure_ascii=False),
+            seen_at_ms,
+            seen_at_ms,
+            json.dumps(restaurant, ensure_ascii=False) if store_details else None,
+        )
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+AreaPrewarmer - エリア指定検索のキャッシュをお昼前に事前取得するサービス
+
+このクラスは以下の機能を提供します:
+- 毎日決まった時刻（AREA_PREWARM_TIME）にバックグラウンドで事前取得を実行
+- data/areas_tokyo.json の全エリア × よく使われる検索条件の組み合わせを順番に取得
+- 1回の実行で使うAPI呼び出し回数の上限（AREA_PREWARM_MAX_API_CALLS）を守る
+- キャッシュ済みの割合（カバー率）の報告
+- 複数のワーカープロセスで起動しても、毎日の実行は1つのプロセスだけが行う
+  （CACHE_BACKEND=redis ではRedisで全サーバーに1つ、sqlite ではサーバーごとに1つ）
+
+【なぜ必要か】
+エリア指定モードの検索結果は「エリア・予算・ランチ・ジャンル」の組み合わせごとにキャッシュされるため、
+お昼どきに最初に検索した人は毎回APIの応答を待つことになります。
+アクセスが集中する前に取得しておけば、お昼のルーレットはキャッシュから答えられます。
+
+使用例:
+    prewarmer = AreaPrewarmer(restaurant_service)
+    prewarmer.start()  # 毎日 11:30 に実行
+
+    report = prewarmer.run_once()  # 今すぐ1回実行
+    print(report['coverage'])
+"""
+
+import json
+import math
+import os
+import socket
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from ..config import Config
+from .restaurant_service import RestaurantService
+
+# エリアマスタファイル（/api/areas と同じファイル）
+DEFAULT_AREAS_PATH = Path(__file__).parent.parent / 'data' / 'areas_tokyo.json'
+
+# 毎日の実行を確保するときの処理の名前（job_runs テーブルの job 列）
+PREWARM_JOB = 'area_prewarm'
+
+# 実行権の記録を残す時間（Redisのキーの有効期限。日付ごとのキーなので、その日の実行が終わるまで残れば十分）
+PREWARM_CLAIM_TTL_MS = 2 * 24 * 60 * 60 * 1000
+
+# 検索条件の組み合わせ（予算コード, ランチ, ジャンルコード）。None は指定なし
+SearchCombo = Tuple[Optional[str], Optional[int], Optional[str]]
+
+
+def parse_combos(value: str) -> List[SearchCombo]:
+    """
+    検索条件の組み合わせの設定値を解析
+
+    Args:
+        value (str): "予算:ランチ:ジャンル" をカンマ区切りで並べた文字列（all は指定なし）
+            例: "B010:1:all,all:1:all"
+
+    Returns:
+        list: (予算コード, ランチ, ジャンルコード) のリスト（書いた順番）
+
+    Raises:
+        ValueError: 形式が正しくない場合
+    """
+    combos = []
+    for item in value.split(','):
+        item = item.strip()
+        if not item:
+            continue
+        parts = item.split(':')
+        if len(parts) != 3:
+            raise ValueError(f"検索条件の組み合わせの形式が正しくありません: {item}")
+        budget_code, lunch, genre_code = (part.strip() for part in parts)
+        combos.append((
+            None if budget_code in ('', 'all') else budget_code,
+            None if lunch in ('', 'all') else int(lunch),
+            None if genre_code in ('', 'all') else genre_code,
+        ))
+    return combos
+
+
+class AreaPrewarmer:
+    """
+    エリア指定検索のキャッシュを事前取得するクラス
+
+    実行中のカバー率は get_coverage()、最後の実行結果は get_last_report() で確認できる。
+    """
+
+    def __init__(self, restaurant_service: RestaurantService, areas_path: Optional[Path] = None,
+                 combos: Optional[List[SearchCombo]] = None, max_api_calls: Optional[int] = None,
+                 ttl: Optional[int] = None, run_at: Optional[str] = None):
+        """
+        AreaPrewarmerを初期化
+
+        Args:
+            restaurant_service (RestaurantService): レストラン検索サービス
+            areas_path (Path, optional): エリアマスタファイルのパス
+            combos (list, optional): 検索条件の組み合わせ（省略時は AREA_PREWARM_COMBOS）
+            max_api_calls (int, optional): 1回の実行で使うAPI呼び出し回数の上限
+            ttl (int, optional): 事前取得したキャッシュの有効期間（秒）
+            run_at (str, optional): 毎日の実行時刻（"HH:MM"）
+        """
+        self.restaurant_service = restaurant_service
+        self.cache_service = restaurant_service.cache_service
+        self.areas_path = Path(areas_path or DEFAULT_AREAS_PATH)
+        self.combos = combos if combos is not None else parse_combos(Config.AREA_PREWARM_COMBOS)
+        self.max_api_calls = max_api_calls if max_api_calls is not None else Config.AREA_PREWARM_MAX_API_CALLS
+        self.ttl = ttl if ttl is not None else Config.AREA_PREWARM_TTL_SECONDS
+        self.run_at = datetime.strptime(run_at or Config.AREA_PREWARM_TIME, '%H:%M').time()
+
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_report: Optional[Dict] = None
+
+    def load_areas(self) -> List[str]:
+        """
+        エリアマスタファイルからエリアコードの一覧を読み込む
+
+        Returns:
+            list: エリアコードのリスト（ファイルに書かれた順番、読み込めない場合は空リスト）
+        """
+        try:
+            with open(self.areas_path, 'r', encoding='utf-8') as f:
+                areas_data = json.load(f)
+            return [area['code'] for area in areas_data['middle_areas']]
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"エリアマスタの読み込みエラー: {e}")
+            return []
+
+    def targets(self) -> List[Tuple[str, Optional[str], Optional[int], Optional[str]]]:
+        """
+        事前取得する (エリア, 予算, ランチ, ジャンル) の一覧
+
+        よく使われる検索条件（設定の先頭）から順に、全エリア分を並べる。
+        API呼び出し回数の上限に達しても、よく使われる条件から埋まる。
+
+        Returns:
+            list: (エリアコード, 予算コード, ランチ, ジャンルコード) のリスト
+        """
+        areas = self.load_areas()
+        return [(area, *combo) for combo in self.combos for area in areas]
+
+    def run_once(self) -> Dict:
+        """
+        事前取得を1回実行
+
+        【処理の流れ】
+        1. 全エリア × 検索条件の組み合わせを、よく使われる条件から順に確認
+        2. キャッシュの残り時間が有効期間の半分以上ある組み合わせは取得しない
+           （条件なしの検索結果から絞り込める組み合わせは、条件なしのキャッシュで判定する）
+        3. API呼び出し回数の上限に達するまで、APIから取得してキャッシュに保存
+
+        Returns:
+            dict: 実行結果（組み合わせの数、取得・スキップした数、API呼び出し回数、カバー率）
+        """
+        started_at = datetime.now()
+        targets = self.targets()
+        # 1回の検索で使う可能性のある最大ページ数（この分の残りがなければ取得しない）
+        pages_per_search = math.ceil(self.restaurant_service.max_results
+                                     / self.restaurant_service.MAX_RESULTS_PER_REQUEST)
+        report = {
+            'started_at': started_at.isoformat(),
+            'combinations': len(targets),
+            'already_warm': 0,
+            'refreshed': 0,
+            'failed': 0,
+            'skipped_quota': 0,
+            'api_calls': 0,
+        }
+
+        # 全組み合わせのキャッシュの状態を、開始時に1回のSELECTでまとめて確認しておく
+        prefetched_keys = {cache_key for _, cache_key in (self._search_for(*target) for target in targets)}
+        infos = self.cache_service.get_cache_info_many(prefetched_keys)
+
+        for target in targets:
+            if self._stop_event.is_set():
+                break
+
+            # 実行中に条件なしの検索を全件取得できたエリアは、条件なしのキャッシュで判定する
+            (middle_area, budget_code, lunch, genre_code), cache_key = self._search_for(*target)
+            if cache_key in prefetched_keys:
+                info = infos.get(cache_key)
+            else:
+                info = self.cache_service.get_cache_info(cache_key)
+            if info is not None and info['is_valid'] and info['ttl_remaining'] >= self.ttl / 2:
+                report['already_warm'] += 1
+                continue
+
+            if self.max_api_calls - report['api_calls'] < pages_per_search:
+                report['skipped_quota'] += 1
+                continue
+
+            # ページ取得の統計の増分を、この組み合わせで使ったAPI呼び出し回数とする
+            # （同時に届いたユーザーの検索も数えるので、実際より多めに数える）
+            pages_before = self.restaurant_service.get_page_stats()['pages']
+            try:
+                self.restaurant_service.refresh_area_restaurants(
+                    middle_area, budget_code, lunch, genre_code, ttl=self.ttl
+                )
+            except Exception as e:
+                print(f"エリアの事前取得エラー ({middle_area}): {e}")
+            used = self.restaurant_service.get_page_stats()['pages'] - pages_before
+            report['api_calls'] += max(used, 1)
+
+            info = self.cache_service.get_cache_info(cache_key)
+            if info is not None:
+                infos[cache_key] = info
+            if info is not None and info['is_valid']:
+                report['refreshed'] += 1
+            else:
+                report['failed'] += 1
+
+        warm = report['already_warm'] + report['refreshed']
+        report['coverage'] = warm / len(targets) if targets else 0.0
+        report['finished_at'] = datetime.now().isoformat()
+        print(f"エリアの事前取得完了: {warm}/{len(targets)}件キャッシュ済み "
+              f"(取得 {report['refreshed']}件, API呼び出し {report['api_calls']}回, "
+              f"上限でスキップ {report['skipped_quota']}件)")
+
+        with self._lock:
+            self._last_report = report
+        return report
+
+    def get_coverage(self) -> Dict:
+        """
+        現在のカバー率（有効なキャッシュがある組み合わせの割合）を取得
+
+        Returns:
+            dict: 組み合わせの数、キャッシュ済みの数、カバー率
+        """
+        targets = self.targets()
+        cache_keys = [cache_key for _, cache_key in (self._search_for(*target) for target in targets)]
+        infos = self.cache_service.get_cache_info_many(cache_keys)
+        warm = sum(1 for cache_key in cache_keys if cache_key in infos and infos[cache_key]['is_valid'])
+        return {
+            'combinations': len(targets),
+            'warm': warm,
+            'coverage': warm / len(targets) if targets else 0.0,
+        }
+
+    def _search_for(self, middle_area: str, budget_code: Optional[str], lunch: Optional[int],
+                    genre_code: Optional[str]) -> Tuple[Tuple[str, Optional[str], Optional[int], Optional[str]], str]:
+        """
+        組み合わせを実際に取得する検索とそのキャッシュキーに変換（内部メソッド）
+
+        条件なしの検索結果から絞り込める組み合わせは、条件なしの検索を確認・取得する。
+
+        Returns:
+            tuple: ((エリアコード, 予算コード, ランチ, ジャンルコード), キャッシュキー)
+        """
+        budget_code, lunch, genre_code = self.restaurant_service.area_search_conditions(
+            middle_area, budget_code, lunch, genre_code
+        )
+        search = (middle_area, budget_code, lunch, genre_code)
+        return search, self.restaurant_service.area_cache_key(*search)
+
+    def get_last_report(self) -> Optional[Dict]:
+        """最後の実行結果を取得（まだ実行していない場合はNone）"""
+        with self._lock:
+            return dict(self._last_report) if self._last_report is not None else None
+
+    def seconds_until_next_run(self, now: Optional[datetime] = None) -> float:
+        """
+        次の実行時刻までの秒数を計算
+
+        Args:
+            now (datetime, optional): 現在時刻（テスト用）
+
+        Returns:
+            float: 次の実行までの秒数（今日の実行時刻を過ぎていれば明日の実行時刻まで）
+        """
+        now = now or datetime.now()
+        next_run = datetime.combine(now.date(), self.run_at)
+        if next_run <= now:
+            next_run += timedelta(days=1)
+        return (next_run - now).total_seconds()
+
+    def start(self) -> bool:
+        """
+        毎日の事前取得をバックグラウンドで開始
+
+        APIキーがない場合は取得できないので開始しない。複数回呼ばれてもスレッドは1つだけ。
+
+        Returns:
+            bool: 開始した場合True
+        """
+        if not self.restaurant_service.api_key:
+            return False
+
+        with self._lock:
+            if self._thread is not None:
+                return False
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run_forever, name='area-prewarmer', daemon=True)
+            self._thread.start()
+
+        print(f"エリアの事前取得を開始: 毎日 {self.run_at.strftime('%H:%M')}")
+        return True
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        バックグラウンドの事前取得を停止（実行中の場合は次の組み合わせに進む前に止まる）
+
+        Args:
+            timeout (float, optional): スレッドの終了を待つ最大時間（秒）
+        """
+        self._stop_event.set()
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout)
+
+    def run_scheduled(self, now: Optional[datetime] = None) -> Optional[Dict]:
+        """
+        毎日の事前取得を、その日の実行権を確保できた場合だけ実行
+
+        WSGIサーバーのワーカープロセスごとに start() されるため、API呼び出し回数の上限や
+        同時リクエストの集約（プロセスごと）だけではAPI呼び出しがワーカーの数だけ増えてしまう。
+        キャッシュの保存先（L2）でその日の実行権を最初に確保できたプロセスだけが実行する。
+        - CACHE_BACKEND=redis: Redisの SET NX で確保するので、複数のサーバーでも全体で1回
+        - CACHE_BACKEND=sqlite: データベースファイルの job_runs で確保するので、サーバー（ホスト）ごとに1回
+
+        Args:
+            now (datetime, optional): 現在時刻（テスト用）
+
+        Returns:
+            dict: 実行結果。他のプロセスがその日の実行を確保済みの場合はNone
+        """
+        run_date = (now or datetime.now()).date().isoformat()
+        owner = f"{socket.gethostname()}:{os.getpid()}"
+        if not self.cache_service.claim_job_run(PREWARM_JOB, run_date, owner, PREWARM_CLAIM_TTL_MS):
+            print(f"エリアの事前取得をスキップ: {run_date} の実行は他のプロセスが確保済み")
+            return None
+        return self.run_once()
+
+    def _run_forever(self) -> None:
+        """実行時刻まで待って事前取得を実行することを繰り返す（内部メソッド）"""
+        while not self._stop_event.wait(self.seconds_until_next_run()):
+            try:
+                self.run_scheduled()
+            except Exception as e:
+                print(f"エリアの事前取得で予期しないエラー: {e}")
@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CacheBackend - キャッシュの保存先（L2）
+CacheService が使う保存先を差し替えられるようにする
+
+このモジュールは以下の機能を提供します:
+- 保存先の共通インターフェース（取得・保存・削除・有効期限の確認と、それぞれの一括処理）
+- SQLiteの cache テーブルに保存する SqliteCacheBackend（標準）
+- Redis（RESP互換のサーバー）に保存する RedisCacheBackend
+- 定期処理の1回分の実行権の確保（Redisでは全サーバーで1つ、SQLiteではサーバーごと）
+- 設定（CACHE_BACKEND）に従った保存先の作成
+
+【なぜ必要か】
+SQLiteのキャッシュはサーバー（プロセス）ごとのファイルなので、複数台で動かすと
+それぞれが別々に外部APIを呼んでキャッシュを温めることになります。
+Redisを保存先にすれば、すべてのサーバーで1つの温まったキャッシュを共有できます。
+
+【保存する行】
+どの保存先も、CacheService が作成した次の形のタプルを保存する:
+    (cache_key, data, expires_at, codec, created_at, last_accessed)
+data はコーデックで変換したバイト列、日時はUNIX時刻（ミリ秒）の整数。
+取得した行は 'data', 'codec', 'expires_at', 'created_at' を持つ辞書（SQLiteでは sqlite3.Row）。
+
+使用例:
+    backend = create_cache_backend('cache.db')
+    backend.set_many([row1, row2])
+    rows = backend.get_many(['key1', 'key2'], min_expires_at=now_ms())
+"""
+
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ..config import Config
+from ..models.database import claim_job_run, cleanup_expired_cache, get_db_connection
+from ..utils.redis_client import RedisClient
+
+# get_many() の1回のSELECT・MGETで指定するキーの最大数（SQLiteのパラメータ数の上限より少なくする）
+MAX_KEYS_PER_QUERY = 500
+
+INSERT_CACHE_SQL = '''
+    INSERT OR REPLACE INTO cache
+    (cache_key, data, expires_at, codec, created_at, last_accessed)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+
+
+class CacheBackend:
+    """
+    キャッシュの保存先の共通インターフェース
+
+    各メソッドはエラー時に例外を送出する（CacheService 側でログを出して、キャッシュなしとして扱う）。
+    """
+
+    # 保存先の名前（統計情報・ログ用）
+    name = ''
+    # 複数のサーバーで共有する保存先か（共有する場合、サーバーごとの索引に頼るデータは保存しない）
+    shared = False
+    # 件数・サイズの上限による削除（CacheSweeper）と利用記録に対応しているか
+    supports_eviction = False
+
+    def get(self, key: str, min_expires_at: int) -> Optional[Any]:
+        """
+        1件の行を取得
+
+        Args:
+            key (str): キャッシュキー
+            min_expires_at (int): この時刻（UNIX時刻・ミリ秒）より後に期限が切れる行だけを返す
+
+        Returns:
+            行（見つからない・期限切れの場合None）
+        """
+        raise NotImplementedError
+
+    def get_many(self, keys: Sequence[str], min_expires_at: int) -> Dict[str, Any]:
+        """
+        複数の行をまとめて取得
+
+        Returns:
+            dict: 見つかったキー → 行
+        """
+        raise NotImplementedError
+
+    def set(self, row: Tuple) -> None:
+        """1件の行を保存（同じキーの行は置き換える）"""
+        raise NotImplementedError
+
+    def set_many(self, rows: List[Tuple]) -> None:
+        """複数の行をまとめて保存（同じキーの行は置き換える）"""
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        """1件の行を削除"""
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        """すべての行を削除"""
+        raise NotImplementedError
+
+    def get_info(self, key: str) -> Optional[Any]:
+        """
+        有効期限を過ぎた行も含めて、1件の行の作成日時・有効期限・データサイズを取得
+
+        Returns:
+            'created_at', 'expires_at', 'data_size' を持つ行（見つからない場合None）
+        """
+        return self.get_info_many([key]).get(key)
+
+    def get_info_many(self, keys: Sequence[str]) -> Dict[str, Any]:
+        """
+        有効期限を過ぎた行も含めて、複数の行の作成日時・有効期限・データサイズを取得
+
+        Returns:
+            dict: 見つかったキー → 'created_at', 'expires_at', 'data_size' を持つ行
+        """
+        raise NotImplementedError
+
+    def get_fallback(self, key: str) -> Optional[Any]:
+        """
+        有効期限を過ぎていても残っている行を取得（外部APIのエラー時のフォールバック用）
+
+        Returns:
+            行（残っていない場合None）
+        """
+        return self.get(key, min_expires_at=0)
+
+    def cleanup_expired(self) -> int:
+        """
+        期限切れの行を削除
+
+        Returns:
+            int: 削除した行数（保存先が自動で削除する場合は0）
+        """
+        return 0
+
+    def update_access(self, pending: Dict[str, list]) -> int:
+        """
+        利用記録（キー → [最後に使われた日時, 使われた回数]）を書き込む
+
+        Returns:
+            int: 書き込んだキーの数（対応していない保存先は0）
+        """
+        return 0
+
+    def claim_job_run(self, job: str, run_key: str, owner: str, ttl_ms: int) -> bool:
+        """
+        定期処理の1回分の実行権を確保（同じ保存先を使うプロセスのうち最初の1つだけがTrue）
+
+        Args:
+            job (str): 処理の名前（例: "area_prewarm"）
+            run_key (str): 実行の回を表す文字列（例: 実行日 "2025-01-01"）
+            owner (str): 確保したプロセス（ホスト名:プロセスIDなど、確認用）
+            ttl_ms (int): 確保した記録を残すミリ秒数（その回の実行が終わるまでより長くする）
+
+        Returns:
+            bool: 実行権を確保できた場合True
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """接続を閉じる（アプリ終了時）"""
+
+
+class SqliteCacheBackend(CacheBackend):
+    """
+    SQLiteの cache テーブルに保存する保存先（標準）
+
+    接続は models.database の接続プールを使用する。
+    """
+
+    name = 'sqlite'
+    shared = False
+    supports_eviction = True
+
+    def __init__(self, db_path: str):
+        """
+        Args:
+            db_path (str): SQLiteデータベースファイルのパス
+        """
+        self.db_path = db_path
+
+    def get(self, key: str, min_expires_at: int) -> Optional[Any]:
+        with get_db_connection(self.db_path) as conn:
+            # 期限切れの行はSELECTの時点で除外する（行の削除は cleanup_expired で行う）
+            cursor = conn.execute('''
+                SELECT data, codec, expires_at FROM cache
+                WHERE cache_key = ? AND expires_at > ?
+            ''', (key, min_expires_at))
+            return cursor.fetchone()
+
+    def get_many(self, keys: Sequence[str], min_expires_at: int) -> Dict[str, Any]:
+        rows = {}
+        with get_db_connection(self.db_path) as conn:
+            for start in range(0, len(keys), MAX_KEYS_PER_QUERY):
+                batch = keys[start:start + MAX_KEYS_PER_QUERY]
+                placeholders = ','.join('?' * len(batch))
+                cursor = conn.execute(f'''
+                    SELECT cache_key, data, codec, expires_at FROM cache
+                    WHERE cache_key IN ({placeholders}) AND expires_at > ?
+                ''', (*batch, min_expires_at))
+                rows.update((row['cache_key'], row) for row in cursor)
+        return rows
+
+    def set(self, row: Tuple) -> None:
+        with get_db_connection(self.db_path) as conn:
+            conn.execute(INSERT_CACHE_SQL, row)
+            conn.commit()
+
+    def set_many(self, rows: List[Tuple]) -> None:
+        with get_db_connection(self.db_path) as conn:
+            conn.executemany(INSERT_CACHE_SQL, rows)
+            conn.commit()
+
+    def delete(self, key: str) -> None:
+        with get_db_connection(self.db_path) as conn:
+            conn.execute('DELETE FROM cache WHERE cache_key = ?', (key,))
+            conn.commit()
+
+    def clear(self) -> None:
+        with get_db_connection(self.db_path) as conn:
+            conn.execute('DELETE FROM cache')
+            conn.commit()
+
+    def get_info(self, key: str) -> Optional[Any]:
+        with get_db_connection(self.db_path) as conn:
+            cursor = conn.execute('''
+                SELECT created_at, expires_at, LENGTH(data) as data_size
+                FROM cache WHERE cache_key = ?
+            ''', (key,))
+            return cursor.fetchone()
+
+    def get_info_many(self, keys: Sequence[str]) -> Dict[str, Any]:
+        infos = {}
+        with get_db_connection(self.db_path) as conn:
+            for start in range(0, len(keys), MAX_KEYS_PER_QUERY):
+                batch = keys[start:start + MAX_KEYS_PER_QUERY]
+                placeholders = ','.join('?' * len(batch))
+                cursor = conn.execute(f'''
+                    SELECT cache_key, created_at, expires_at, LENGTH(data) as data_size
+                    FROM cache WHERE cache_key IN ({placeholders})
+                ''', batch)
+                infos.update((row['cache_key'], row) for row in cursor)
+        return infos
+
+    def get_fallback(self, key: str) -> Optional[Any]:
+        with get_db_connection(self.db_path) as conn:
+            cursor = conn.execute('''
+                SELECT data, codec, expires_at, created_at FROM cache
+                WHERE cache_key = ?
+            ''', (key,))
+            return cursor.fetchone()
+
+    def cleanup_expired(self) -> int:
+        return cleanup_expired_cache(self.db_path)
+
+    def update_access(self, pending: Dict[str, list]) -> int:
+        with get_db_connection(self.db_path) as conn:
+            conn.executemany('''
+                UPDATE cache
+                SET last_accessed = MAX(COALESCE(last_accessed, 0), ?), hit_count = hit_count + ?
+                WHERE cache_key = ?
+            ''', [(last_accessed, hits, key) for key, (last_accessed, hits) in pending.items()])
+            conn.commit()
+        return len(pending)
+
+    def claim_job_run(self, job: str, run_key: str, owner: str, ttl_ms: int) -> bool:
+        # job_runs テーブルはサーバーごとのファイルにあるため、確保はこのサーバーのプロセスの間だけで有効
+        return claim_job_run(self.db_path, job, run_key, owner)
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Redis（RESP互換のサーバー）に保存する保存先
+
+    1つの行を1つの文字列型のキーに保存する。値は "有効期限:作成日時:コーデック:" の後にデータを続けたもの。
+    Redisのキーには、期限切れ後も retention 秒残すように有効期限（PX）を付けるので、
+    期限切れの削除はRedisが行う。件数・サイズの上限はRedisの maxmemory / maxmemory-policy で設定する。
+    """
+
+    name = 'redis'
+    shared = True
+    supports_eviction = False
+
+    def __init__(self, client: RedisClient, prefix: str = 'lunch_roulette:', retention: int = 3600):
+        """
+        Args:
+            client (RedisClient): Redisクライアント
+            prefix (str): キーの先頭に付ける文字列（同じRedisを使う他のアプリと区別する）
+            retention (int): 期限切れ後もRedisに残す秒数（古いデータの返却・フォールバック用）
+        """
+        self.client = client
+        self.prefix = prefix
+        self.retention_ms = max(0, retention) * 1000
+
+    def _redis_key(self, key: str) -> str:
+        """Redisに保存するときのキー（内部メソッド）"""
+        return self.prefix + key
+
+    @staticmethod
+    def _encode_value(row: Tuple) -> bytes:
+        """行をRedisに保存する値に変換（内部メソッド）"""
+        _, data, expires_at, codec, created_at, _ = row
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        return b'%d:%d:%s:%s' % (expires_at, created_at, (codec or '').encode('ascii'), data)
+
+    @staticmethod
+    def _decode_value(value: Optional[bytes]) -> Optional[Dict[str, Any]]:
+        """Redisから取得した値を行（辞書）に戻す（内部メソッド）"""
+        if value is None:
+            return None
+        expires_at, created_at, codec, data = value.split(b':', 3)
+        return {
+            'data': data,
+            'codec': codec.decode('ascii') or None,
+            'expires_at': int(expires_at),
+            'created_at': int(created_at),
+            'data_size': len(data),
+        }
+
+    def _set_command(self, row: Tuple, now: int) -> Tuple:
+        """行を保存するSETコマンド（内部メソッド）"""
+        ttl_ms = max(1, row[2] + self.retention_ms - now)
+        return ('SET', self._redis_key(row[0]), self._encode_value(row), 'PX', ttl_ms)
+
+    def get(self, key: str, min_expires_at: int) -> Optional[Any]:
+        row = self._decode_value(self.client.execute('GET', self._redis_key(key)))
+        if row is None or row['expires_at'] <= min_expires_at:
+            return None
+        return row
+
+    def get_many(self, keys: Sequence[str], min_expires_at: int) -> Dict[str, Any]:
+        return {key: row for key, row in self.get_info_many(keys).items()
+                if row['expires_at'] > min_expires_at}
+
+    def set(self, row: Tuple) -> None:
+        self.client.execute(*self._set_command(row, int(time.time() * 1000)))
+
+    def set_many(self, rows: List[Tuple]) -> None:
+        now = int(time.time() * 1000)
+        self.client.pipeline([self._set_command(row, now) for row in rows])
+
+    def delete(self, key: str) -> None:
+        self.client.execute('DEL', self._redis_key(key))
+
+    def clear(self) -> None:
+        # 他のアプリのキーを消さないように、FLUSHDB ではなく prefix の付いたキーだけを削除する
+        pattern = ''.join('\\' + c if c in '*?[]\\' else c for c in self.prefix) + '*'
+        cursor = '0'
+        while True:
+            cursor, keys = self.client.execute('SCAN', cursor, 'MATCH', pattern, 'COUNT', MAX_KEYS_PER_QUERY)
+            if keys:
+                self.client.execute('DEL', *keys)
+            cursor = cursor.decode('ascii') if isinstance(cursor, bytes) else str(cursor)
+            if cursor == '0':
+                return
+
+    def get_info_many(self, keys: Sequence[str]) -> Dict[str, Any]:
+        keys = list(keys)
+        rows = {}
+        for start in range(0, len(keys), MAX_KEYS_PER_QUERY):
+            batch = keys[start:start + MAX_KEYS_PER_QUERY]
+            values = self.client.execute('MGET', *(self._redis_key(key) for key in batch))
+            for key, value in zip(batch, values):
+                row = self._decode_value(value)
+                if row is not None:
+                    rows[key] = row
+        return rows
+
+    def claim_job_run(self, job: str, run_key: str, owner: str, ttl_ms: int) -> bool:
+        # SET NX はキーがない場合だけ保存するので、Redisを共有するすべてのサーバーで1つのプロセスだけが確保できる
+        key = self._redis_key(f'job_run:{job}:{run_key}')
+        return self.client.execute('SET', key, owner, 'NX', 'PX', max(1, ttl_ms)) is not None
+
+    def close(self) -> None:
+        self.client.close()
+
+
+def create_cache_backend(db_path: str, backend: Optional[str] = None) -> CacheBackend:
+    """
+    設定に従ってキャッシュの保存先を作成
+
+    Args:
+        db_path (str): SQLiteデータベースファイルのパス（SQLiteを使う場合）
+        backend (str, optional): 保存先の名前（'sqlite' または 'redis'、省略時は Config.CACHE_BACKEND）
+            - 使用できない名前の場合は SQLite を使用
+
+    Returns:
+        CacheBackend: キャッシュの保存先
+    """
+    backend = (backend or Config.CACHE_BACKEND).lower()
+    if backend == 'redis':
+        client = RedisClient(Config.CACHE_REDIS_URL, timeout=Config.CACHE_REDIS_TIMEOUT_SECONDS)
+        # 古いデータを返す猶予期間の間は、期限切れの行も残しておく
+        retention = max(Config.CACHE_EXPIRED_RETENTION_SECONDS, Config.CACHE_STALE_TTL_SECONDS)
+        return RedisCacheBackend(client, prefix=Config.CACHE_REDIS_PREFIX, retention=retention)
+    if backend != 'sqlite':
+        print(f"警告: キャッシュの保存先 '{backend}' は使用できません（sqliteを使用）")
+    return SqliteCacheBackend(db_path)
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CacheCodec - キャッシュデータの保存形式（コーデック）
+SQLiteキャッシュ（L2）に保存するデータのエンコード・デコードを提供
+
+このクラスは以下の機能を提供します:
+- 差し替え可能なエンコード形式（json / marshal / msgpack）
+- 一定サイズ以上のデータの圧縮（zlib、zstandardがあればzstdも選択可）
+- 行ごとのコーデック名（例: "marshal+zlib"）の付与と、その名前に従ったデコード
+- コーデック名のない以前の行（JSON文字列）の読み込み
+
+【なぜ必要か】
+以前はすべてのデータをJSON文字列で保存していたため、キャッシュにヒットするたびに
+お店100件分のJSONを解析していました。marshal形式はJSONより小さく、解析も数倍速くなります。
+コーデック名を行ごとに保存するので、設定を変えても以前の行をそのまま読み込めます。
+
+使用例:
+    codec = CacheCodec(codec='marshal', compression='zlib', compress_min_bytes=4096)
+    payload, tag = codec.encode({'temp': 25})
+    data = codec.decode(payload, tag)
+"""
+
+import json
+import marshal
+import zlib
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from ..config import Config
+
+try:
+    import msgpack  # あればコーデックに追加する（requirements.txt には含めない）
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard  # あれば圧縮方式に追加する
+except ImportError:
+    zstandard = None
+
+# コーデック名がない行（以前のバージョンで保存したJSON文字列）の扱い
+LEGACY_CODEC = 'json'
+
+# zlibの圧縮レベル（1〜9、6は速度とサイズのバランスが良い標準値）
+ZLIB_LEVEL = 6
+
+# コーデック名 → (エンコード関数, デコード関数)
+_CODECS: Dict[str, Tuple[Callable[[Any], bytes], Callable[[bytes], Any]]] = {}
+
+# 圧縮方式の名前 → (圧縮関数, 展開関数)
+_COMPRESSORS: Dict[str, Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]] = {}
+
+
+def register_codec(name: str, dumps: Callable[[Any], bytes], loads: Callable[[bytes], Any]) -> None:
+    """
+    コーデックを登録
+
+    Args:
+        name (str): コーデック名（"+" は圧縮方式の区切りに使うので含めない）
+        dumps (callable): データをバイト列に変換する関数
+        loads (callable): バイト列をデータに戻す関数
+
+    Raises:
+        ValueError: コーデック名が正しくない場合
+    """
+    if not name or '+' in name:
+        raise ValueError(f"コーデック名が正しくありません: {name}")
+    _CODECS[name] = (dumps, loads)
+
+
+def register_compressor(name: str, compress: Callable[[bytes], bytes],
+                        decompress: Callable[[bytes], bytes]) -> None:
+    """
+    圧縮方式を登録
+
+    Args:
+        name (str): 圧縮方式の名前
+        compress (callable): バイト列を圧縮する関数
+        decompress (callable): 圧縮したバイト列を展開する関数
+
+    Raises:
+        ValueError: 名前が正しくない場合
+    """
+    if not name or '+' in name:
+        raise ValueError(f"圧縮方式の名前が正しくありません: {name}")
+    _COMPRESSORS[name] = (compress, decompress)
+
+
+def available_codecs() -> Tuple[str, ...]:
+    """使用できるコーデック名の一覧を取得"""
+    return tuple(_CODECS)
+
+
+def available_compressors() -> Tuple[str, ...]:
+    """使用できる圧縮方式の一覧を取得"""
+    return tuple(_COMPRESSORS)
+
+
+def _json_dumps(data: Any) -> bytes:
+    """JSON（UTF-8）に変換（日時などは文字列にする）"""
+    return json.dumps(data, ensure_ascii=False, default=str).encode('utf-8')
+
+
+register_codec('json', _json_dumps, json.loads)
+# marshal は標準ライブラリの高速な形式（このアプリ自身が書いた行だけを読むので安全に使える）
+register_codec('marshal', marshal.dumps, marshal.loads)
+if msgpack is not None:
+    register_codec('msgpack',
+                   lambda data: msgpack.packb(data, use_bin_type=True, default=str),
+                   lambda payload: msgpack.unpackb(payload, raw=False, strict_map_key=False))
+
+register_compressor('zlib', lambda payload: zlib.compress(payload, ZLIB_LEVEL), zlib.decompress)
+if zstandard is not None:
+    register_compressor('zstd',
+                        lambda payload: zstandard.ZstdCompressor().compress(payload),
+                        lambda payload: zstandard.ZstdDecompressor().decompress(payload))
+
+
+class CacheCodec:
+    """
+    キャッシュデータのエンコード・デコードを行うクラス
+
+    状態を持たないので、複数のスレッドから同時に使用できる。
+    """
+
+    def __init__(self, codec: Optional[str] = None, compression: Optional[str] = None,
+                 compress_min_bytes: Optional[int] = None):
+        """
+        CacheCodecを初期化
+
+        Args:
+            codec (str, optional): エンコード形式（省略時は Config.CACHE_CODEC）
+                - 'auto' の場合は msgpack があれば msgpack、なければ marshal
+            compression (str, optional): 圧縮方式（省略時は Config.CACHE_COMPRESSION、'none'で圧縮しない）
+                - 使用できない方式の場合は zlib を使用
+            compress_min_bytes (int, optional): 圧縮するデータの最小サイズ（バイト）
+        """
+        codec = (codec or Config.CACHE_CODEC).lower()
+        if codec == 'auto':
+            codec = 'msgpack' if 'msgpack' in _CODECS else 'marshal'
+        if codec not in _CODECS:
+            print(f"警告: キャッシュのコーデック '{codec}' は使用できません（jsonを使用）")
+            codec = 'json'
+
+        compression = (compression or Config.CACHE_COMPRESSION).lower()
+        if compression == 'none':
+            compression = None
+        elif compression not in _COMPRESSORS:
+            print(f"警告: キャッシュの圧縮方式 '{compression}' は使用できません（zlibを使用）")
+            compression = 'zlib'
+
+        self.codec = codec
+        self.compression = compression
+        self.compress_min_bytes = max(0, Config.CACHE_COMPRESS_MIN_BYTES
+                                      if compress_min_bytes is None else compress_min_bytes)
+
+    def encode(self, data: Any) -> Tuple[bytes, str]:
+        """
+        データを保存用のバイト列に変換
+
+        設定したコーデックで変換できないデータ（日時などを含む場合）はJSONで変換する。
+
+        Args:
+            data (Any): 保存するデータ
+
+        Returns:
+            tuple: (バイト列, コーデック名)
+
+        Raises:
+            ValueError: 変換できないデータの場合
+        """
+        codec = self.codec
+        try:
+            payload = _CODECS[codec][0](data)
+        except (TypeError, ValueError) as e:
+            if codec == 'json':
+                raise ValueError(f"データのエンコードに失敗しました: {e}")
+            codec = 'json'
+            try:
+                payload = _json_dumps(data)
+            except (TypeError, ValueError) as json_error:
+                raise ValueError(f"データのエンコードに失敗しました: {json_error}")
+
+        if self.compression is not None and len(payload) >= self.compress_min_bytes:
+            compressed = _COMPRESSORS[self.compression][0](payload)
+            # 圧縮しても小さくならないデータは、圧縮せずに保存する
+            if len(compressed) < len(payload):
+                return compressed, f"{codec}+{self.compression}"
+
+        return payload, codec
+
+    def decode(self, payload: Union[bytes, str], tag: Optional[str] = None) -> Any:
+        """
+        保存したバイト列をデータに戻す
+
+        Args:
+            payload (bytes or str): 保存したデータ（以前の行はJSON文字列）
+            tag (str, optional): 保存時のコーデック名（Noneは以前の行）
+
+        Returns:
+            Any: 元のデータ
+
+        Raises:
+            ValueError: 戻せないデータ、または使用できないコーデックの場合
+        """
+        codec, _, compression = (tag or LEGACY_CODEC).partition('+')
+        try:
+            if isinstance(payload, str):
+                payload = payload.encode('utf-8')
+            if compression:
+                if compression not in _COMPRESSORS:
+                    raise ValueError(f"圧縮方式 '{compression}' は使用できません")
+                payload = _COMPRESSORS[compression][1](payload)
+            if codec not in _CODECS:
+                raise ValueError(f"コーデック '{codec}' は使用できません")
+            return _CODECS[codec][1](payload)
+        except (TypeError, ValueError, EOFError, zlib.error) as e:
+            raise ValueError(f"データのデコードに失敗しました ({tag or LEGACY_CODEC}): {e}")
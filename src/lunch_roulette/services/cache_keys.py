@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CacheKey - 決まった形のキャッシュキーを速く作る
+天気（緯度・経度）、位置情報（IP）、レストラン検索（検索条件）のように、
+項目が決まっているキャッシュキーを、値をつなげるだけで作成する
+
+このクラスは以下の機能を提供します:
+- キーの種類ごとに先頭部分（"weather:v1:" など）を作っておき、値を "|" でつなげるだけでキーを作る
+- バージョン番号（CACHE_KEY_VERSION）をキーに含め、上げるとすべてのキャッシュを使わなくする
+- 値に含まれる区切り文字の置き換え（別の値の組み合わせが同じキーにならない）
+
+【なぜ必要か】
+以前は CacheService.generate_cache_key() で、キーを作るたびにパラメータの
+JSON変換（sort_keys=True）とSHA-256の計算をしていました。1回の検索で天気・位置情報・
+タイルの数だけキーを作るため、この処理をなくして文字列の連結だけにします。
+キーの中身がそのまま読めるので、キャッシュの中身を調べるときにも分かりやすくなります。
+
+使用例:
+    WEATHER_CACHE_KEY = CacheKey('weather', ('lat', 'lon'))
+    WEATHER_CACHE_KEY.build(35.6812, 139.7671)  # → "weather:v1:35.6812|139.7671"
+"""
+
+from typing import Any, Optional, Sequence
+
+from ..config import Config
+
+# 値の区切り文字
+SEPARATOR = '|'
+
+# 値が None の場合の表記（文字列の "%" は必ず置き換えるので、文字列の値とは重ならない）
+NONE_VALUE = '%N'
+
+
+def format_key_value(value: Any) -> str:
+    """
+    キャッシュキーに含める値を文字列に変換
+
+    文字列の "%" と "|" は置き換えるので、どの値の組み合わせでも別のキーになる。
+    整数・小数は str()（小数は元の値に戻せる最短の表記）で変換する。
+
+    Args:
+        value (Any): 値（文字列・整数・小数・None）
+
+    Returns:
+        str: キーに含める文字列
+    """
+    if isinstance(value, str):
+        if '%' in value or SEPARATOR in value:
+            return value.replace('%', '%25').replace(SEPARATOR, '%7C')
+        return value
+    if value is None:
+        return NONE_VALUE
+    return str(value)
+
+
+class CacheKey:
+    """
+    項目が決まったキャッシュキーの作成
+
+    キーは "種類:vバージョン:値1|値2|..." の形式になる。
+    項目の順番は固定なので、同じ値からは常に同じキーが作られる。
+    1つの項目には同じ型の値を渡すこと（整数の 1 と文字列の "1" は同じキーになる）。
+    """
+
+    __slots__ = ('name', 'fields', 'version', 'prefix')
+
+    def __init__(self, name: str, fields: Sequence[str], version: Optional[str] = None):
+        """
+        キャッシュキーの種類を定義
+
+        Args:
+            name (str): キーの種類（例: "weather"、"restaurant_tile"）
+            fields (Sequence[str]): 値の項目名（build() に渡す順番）
+            version (str, optional): キーのバージョン
+                - 指定しない場合は Config.CACHE_KEY_VERSION
+        """
+        if ':' in name:
+            raise ValueError(f"キャッシュキーの種類に ':' は使えません: {name}")
+        self.name = name
+        self.fields = tuple(fields)
+        self.version = str(Config.CACHE_KEY_VERSION if version is None else version)
+        self.prefix = f"{name}:v{self.version}:"
+
+    def build(self, *values: Any) -> str:
+        """
+        値からキャッシュキーを作成
+
+        Args:
+            *values: fields と同じ順番の値
+
+        Returns:
+            str: キャッシュキー
+
+        Raises:
+            TypeError: 値の数が fields と合わない場合
+        """
+        if len(values) != len(self.fields):
+            raise TypeError(
+                f"{self.name} のキャッシュキーには {len(self.fields)} 個の値が必要です"
+                f"（{', '.join(self.fields)}）: {len(values)} 個"
+            )
+        return self.prefix + SEPARATOR.join(map(format_key_value, values))
+
+    def __repr__(self) -> str:
+        return f"CacheKey({self.prefix}{SEPARATOR.join(self.fields)})"
@@ -3,20 +3,37 @@
 
 """
 CacheService - キャッシュサービスクラス
-SQLiteを使用したキャッシング機能を提供
+SQLite（または共有のRedis）を使用したキャッシング機能を提供
 
 このクラスは以下の機能を提供します:
 - キャッシュデータの保存と取得
-- TTL（Time To Live）ベースの有効期限チェック
-- キャッシュキーの生成とデータシリアライゼーション
+- TTL（Time To Live）ベースの有効期限チェック（UNIX時刻・ミリ秒の整数で比較）
+- キャッシュキーの生成（バージョン付き）とデータシリアライゼーション
+- 差し替え可能な保存形式（コーデック）と圧縮（CacheCodec）
 - 自動的な期限切れデータクリーンアップ
+- プロセス内メモリキャッシュ（L1）とSQLite（L2）の2階層構成
+- L2の保存先の差し替え（CACHE_BACKEND: sqlite / redis、CacheBackend）
+- 有効期限切れ直後は古いデータを返し、バックグラウンドで更新（stale-while-revalidate）
+- 最後に使われた日時・使われた回数の記録（上限を超えたときのLRU / LFU削除用）
+- 保存をバックグラウンドでまとめて書き込む遅延書き込み（write-behind、任意）
 """
 
 import json
 import hashlib
-from datetime import datetime, timedelta
-from typing import Any, Optional, Dict
-from ..models.database import get_db_connection, cleanup_expired_cache
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Optional, Dict, Iterable, List, Tuple, Union
+from ..config import Config
+from ..models.database import get_pool_stats, now_ms, from_epoch_ms
+from .cache_backend import CacheBackend, create_cache_backend
+from .cache_codec import CacheCodec
+from .memory_cache import MemoryCache
+from ..utils.background_refresher import BackgroundRefresher, default_background_refresher
+from ..utils.write_behind import WriteBehindQueue
+
+# SQLiteへの書き込みを待っている利用記録の最大キー数（超えた分の新しいキーは次の書き込みまで記録しない）
+MAX_PENDING_ACCESS = 10000
 
 
 class CacheService:
@@ -25,18 +42,75 @@ class CacheService:
 
     外部API呼び出しの結果をキャッシュし、レート制限対策と
     パフォーマンス向上を実現する。
+
+    取得時はまずプロセス内のメモリキャッシュ（L1）を参照し、
+    なければL2（標準はSQLite、設定でRedisに変更可）から読み込んでL1に載せる。
+    L1から返るデータは共有オブジェクトのため、呼び出し側で変更しないこと。
+
+    有効期限（ソフトTTL）を過ぎても stale_ttl 秒（ハードTTL）以内のデータは、
+    更新処理（refresh）が渡された場合に限り、そのまま返しつつ裏で更新を予約する。
+
+    遅延書き込みが有効な場合、保存したデータはすぐにL1と書き込み待ちのキューに入り、
+    SQLiteへの書き込みはバックグラウンドで行われる。取得時はキューの値も参照するので、
+    保存した直後から新しい値が返る。
     """
 
-    def __init__(self, db_path: str = 'cache.db', default_ttl: int = 600):
+    def __init__(self, db_path: str = 'cache.db', default_ttl: int = 600,
+                 memory_cache: Optional[MemoryCache] = None,
+                 stale_ttl: Optional[int] = None,
+                 refresher: Optional[BackgroundRefresher] = None,
+                 codec: Optional[CacheCodec] = None,
+                 write_behind: Optional[WriteBehindQueue] = None,
+                 backend: Optional[CacheBackend] = None):
         """
         CacheServiceを初期化
 
         Args:
             db_path (str): SQLiteデータベースファイルのパス
             default_ttl (int): デフォルトTTL（秒）、デフォルトは600秒
+            memory_cache (MemoryCache, optional): L1キャッシュ
+                - 指定しない場合は Config.L1_CACHE_ENABLED に従って作成する
+            stale_ttl (int, optional): 有効期限切れ後に古いデータを返す猶予期間（秒）
+                - 指定しない場合は Config.CACHE_STALE_TTL_SECONDS、0で無効
+            refresher (BackgroundRefresher, optional): バックグラウンド更新の実行先
+                - 指定しない場合はプロセス共通のインスタンスを使用
+            codec (CacheCodec, optional): SQLiteに保存するデータの形式
+                - 指定しない場合は Config.CACHE_CODEC / CACHE_COMPRESSION に従って作成する
+            write_behind (WriteBehindQueue, optional): 遅延書き込みのキュー
+                - 指定しない場合は Config.CACHE_WRITE_BEHIND_ENABLED がTrueのときだけ作成する
+                - 行をSQLiteに書き込む関数は _write_rows() を渡す
+            backend (CacheBackend, optional): L2の保存先
+                - 指定しない場合は Config.CACHE_BACKEND に従って作成する（標準は db_path のSQLite）
         """
         self.db_path = db_path
         self.default_ttl = default_ttl
+        self.stale_ttl = max(0, Config.CACHE_STALE_TTL_SECONDS if stale_ttl is None else stale_ttl)
+        self.refresher = refresher or default_background_refresher
+        self.codec = codec or CacheCodec()
+        self.backend = backend or create_cache_backend(db_path)
+
+        if memory_cache is None and Config.L1_CACHE_ENABLED:
+            memory_cache = MemoryCache(
+                max_entries=Config.L1_CACHE_MAX_ENTRIES,
+                max_bytes=Config.L1_CACHE_MAX_BYTES
+            )
+        self.memory_cache = memory_cache
+
+        if write_behind is None and Config.CACHE_WRITE_BEHIND_ENABLED:
+            write_behind = WriteBehindQueue(self._write_rows, name='cache-write-behind')
+        self.write_behind = write_behind
+
+        # L2（SQLite）の統計情報
+        self._stats_lock = threading.Lock()
+        self._l2_hits = 0
+        self._l2_misses = 0
+        self._stale_served = 0
+
+        # 最後に使われた日時・使われた回数（キャッシュの上限を設定した場合のみ記録）
+        # 取得のたびにSQLiteへ書き込まないよう、メモリにためて flush_access_stats() でまとめて書き込む
+        self.track_access = self.backend.supports_eviction and (Config.CACHE_MAX_ROWS > 0 or Config.CACHE_MAX_BYTES > 0)
+        self._access_lock = threading.Lock()
+        self._pending_access: Dict[str, list] = {}
 
     def generate_cache_key(self, prefix: str, **kwargs) -> str:
         """
@@ -44,6 +118,10 @@ class CacheService:
 
         プレフィックスとキーワード引数からユニークなキャッシュキーを生成する。
         同じパラメータに対しては常に同じキーが生成される。
+        Config.CACHE_KEY_VERSION もハッシュに含めるので、バージョンを上げると別のキーになる。
+
+        天気・位置情報・レストラン検索のように項目が決まったキーは、
+        JSON変換とハッシュ計算のいらない CacheKey（cache_keys.py）で作成する。
 
         Args:
             prefix (str): キャッシュキーのプレフィックス（例: "weather", "restaurant"）
@@ -58,7 +136,7 @@ class CacheService:
             >>> print(key)  # "weather_a1b2c3d4e5f6..."
         """
         # パラメータを文字列に変換してソート（一貫性のため）
-        params_str = json.dumps(kwargs, sort_keys=True, ensure_ascii=False)
+        params_str = f"{Config.CACHE_KEY_VERSION}:" + json.dumps(kwargs, sort_keys=True, ensure_ascii=False)
 
         # SHA256ハッシュを生成
         hash_object = hashlib.sha256(params_str.encode('utf-8'))
@@ -84,22 +162,41 @@ class CacheService:
         except (TypeError, ValueError) as e:
             raise ValueError(f"データのシリアライズに失敗しました: {e}")
 
-    def deserialize_data(self, data_str: str) -> Any:
+    def encode_data(self, data: Any) -> Tuple[bytes, str]:
+        """
+        データをSQLiteに保存する形式（コーデック）に変換
+
+        Args:
+            data (Any): 保存するデータ
+
+        Returns:
+            tuple: (バイト列, コーデック名)。cache テーブルの data 列と codec 列に保存する
+
+        Raises:
+            ValueError: シリアライズできないデータの場合
+        """
+        try:
+            return self.codec.encode(data)
+        except ValueError as e:
+            raise ValueError(f"データのシリアライズに失敗しました: {e}")
+
+    def deserialize_data(self, data_str: Union[str, bytes], codec: Optional[str] = None) -> Any:
         """
-        JSON形式をデータにデシリアライズ
+        保存したデータをデシリアライズ
 
         Args:
-            data_str (str): JSON形式
+            data_str (str or bytes): cache テーブルの data 列の値
+            codec (str, optional): codec 列の値（Noneの場合はJSON文字列として扱う）
 
         Returns:
             Any: デシリアライズされたデータ
 
         Raises:
-            ValueError: デシリアライズできない文字列の場合
+            ValueError: デシリアライズできないデータの場合
         """
         try:
-            return json.loads(data_str)
-        except (TypeError, ValueError) as e:
+            return self.codec.decode(data_str, codec)
+        except ValueError as e:
             raise ValueError(f"データのデシリアライズに失敗しました: {e}")
 
     def is_cache_valid(self, expires_at: datetime) -> bool:
@@ -114,6 +211,125 @@ class CacheService:
         """
         return datetime.now() < expires_at
 
+    def _build_row(self, key: str, data: Any, ttl: Optional[int]) -> Tuple:
+        """
+        cache テーブルに保存する行を作成（内部メソッド）
+
+        Returns:
+            tuple: (cache_key, data, expires_at, codec, created_at, last_accessed)
+        """
+        # TTLが指定されていない場合はデフォルト値を使用
+        if ttl is None:
+            ttl = self.default_ttl
+
+        # 作成日時・有効期限を計算（UNIX時刻・ミリ秒）
+        created_at = now_ms()
+        expires_at = created_at + int(ttl * 1000)
+
+        # データを保存形式（コーデック）に変換
+        serialized_data, codec = self.encode_data(data)
+        return key, serialized_data, expires_at, codec, created_at, created_at
+
+    def _remember(self, key: str, data: Any, expires_at: int, size: int) -> None:
+        """L1キャッシュにSQLiteと同じ有効期限で保存（内部メソッド）"""
+        if self.memory_cache is not None:
+            self.memory_cache.set(key, data, expires_at / 1000, size,
+                                  stale_until=(expires_at + self.stale_ttl * 1000) / 1000)
+
+    def replace_in_memory(self, key: str, expected: Any, data: Any, size: int) -> bool:
+        """
+        L1キャッシュのデータだけを、取得したデータを変換した結果に置き換える（L2はそのまま）
+
+        L2には小さな形（店舗IDのリストなど）で保存し、L1には変換済みの形（お店の情報）を
+        保持することで、L1にヒットしたときの変換を省く。有効期限はL1のデータのまま変えない。
+
+        Args:
+            key (str): キャッシュキー
+            expected (Any): get_cached_data() / get_many() で取得したデータ（オブジェクトそのもの）
+            data (Any): 変換済みのデータ
+            size (int): 変換済みのデータの概算バイト数（呼び出し側で見積もる。シリアライズし直さないため）
+
+        Returns:
+            bool: 置き換えた場合True（L1が無効・L1にない・その間に新しい値が保存された場合はFalse）
+        """
+        if self.memory_cache is None:
+            return False
+        return self.memory_cache.replace(key, expected, data, size)
+
+    @property
+    def is_shared(self) -> bool:
+        """L2を複数のサーバーで共有しているか（Redisなど）"""
+        return self.backend.shared
+
+    def claim_job_run(self, job: str, run_key: str, owner: str, ttl_ms: int) -> bool:
+        """
+        定期処理の1回分の実行権をL2で確保
+
+        Redisなど共有の保存先では全サーバーのプロセスのうち1つだけが、
+        SQLiteではこのサーバー（同じデータベースファイル）のプロセスのうち1つだけが確保できる。
+
+        Args:
+            job (str): 処理の名前（例: "area_prewarm"）
+            run_key (str): 実行の回を表す文字列（例: 実行日 "2025-01-01"）
+            owner (str): 確保したプロセス（ホスト名:プロセスIDなど、確認用）
+            ttl_ms (int): 確保した記録を残すミリ秒数（共有の保存先の場合）
+
+        Returns:
+            bool: 実行権を確保できた場合True（エラー時は実行しないようFalse）
+        """
+        try:
+            return self.backend.claim_job_run(job, run_key, owner, ttl_ms)
+        except Exception as e:
+            print(f"定期処理の実行権の確保エラー ({job}): {e}")
+            return False
+
+    def _write_rows(self, rows: List[Tuple]) -> None:
+        """行をまとめてL2に書き込む（内部メソッド、遅延書き込みからも呼ばれる）"""
+        self.backend.set_many(rows)
+
+    def _enqueue_writes(self, rows: List[Tuple]) -> bool:
+        """
+        遅延書き込みのキューに行を入れる（内部メソッド）
+
+        Returns:
+            bool: キューに入れた場合True。遅延書き込みが無効・キューがいっぱいの場合False
+                  （呼び出し側でその場で書き込む）
+        """
+        if self.write_behind is None:
+            return False
+        if self.write_behind.enqueue(rows):
+            return True
+        # その場で書き込む値が、書き込み中の古い値で上書きされないようにする
+        self.write_behind.discard(row[0] for row in rows)
+        return False
+
+    def _get_pending_row(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        遅延書き込みのキューにある（まだSQLiteにない）行を取得（内部メソッド）
+
+        Returns:
+            dict: SQLiteの行と同じ列名（data, codec, expires_at, created_at, data_size）。ない場合None
+        """
+        if self.write_behind is None:
+            return None
+        row = self.write_behind.get(key)
+        if row is None:
+            return None
+        _, data, expires_at, codec, created_at, _ = row
+        return {'data': data, 'codec': codec, 'expires_at': expires_at,
+                'created_at': created_at, 'data_size': len(data)}
+
+    def flush_writes(self) -> int:
+        """
+        遅延書き込みのキューにある行を今すぐSQLiteに書き込む
+
+        Returns:
+            int: 書き込んだ行数（遅延書き込みが無効な場合は0）
+        """
+        if self.write_behind is None:
+            return 0
+        return self.write_behind.flush()
+
     def set_cached_data(self, key: str, data: Any, ttl: Optional[int] = None) -> bool:
         """
         キャッシュデータを保存
@@ -124,7 +340,7 @@ class CacheService:
             ttl (int, optional): TTL（秒）、Noneの場合はdefault_ttlを使用
 
         Returns:
-            bool: 保存が成功した場合True
+            bool: 保存が成功した場合True（遅延書き込みの場合はキューに入れた時点でTrue）
 
         Example:
             >>> cache = CacheService()
@@ -132,37 +348,116 @@ class CacheService:
             >>> print(success)  # True
         """
         try:
-            # TTLが指定されていない場合はデフォルト値を使用
-            if ttl is None:
-                ttl = self.default_ttl
+            row = self._build_row(key, data, ttl)
+
+            # データベースに保存（遅延書き込みの場合はキューに入れるだけ）
+            if not self._enqueue_writes([row]):
+                self.backend.set(row)
+
+            self._remember(key, data, row[2], len(row[1]))
+            return True
+
+        except Exception as e:
+            print(f"キャッシュ保存エラー (key: {key}): {e}")
+            return False
 
-            # 有効期限を計算
-            expires_at = datetime.now() + timedelta(seconds=ttl)
+    def set_many(self, items: Union[Dict[str, Any], Iterable[Tuple[str, Any]]], ttl: Optional[int] = None) -> bool:
+        """
+        複数のキャッシュデータを1回のトランザクションでまとめて保存
 
-            # データをシリアライズ
-            serialized_data = self.serialize_data(data)
+        Args:
+            items (dict or iterable): キャッシュキー → 保存するデータ（または (キー, データ) の組）
+            ttl (int, optional): TTL（秒）、Noneの場合はdefault_ttlを使用
 
-            # データベースに保存
-            with get_db_connection(self.db_path) as conn:
-                conn.execute('''
-                    INSERT OR REPLACE INTO cache
-                    (cache_key, data, expires_at)
-                    VALUES (?, ?, ?)
-                ''', (key, serialized_data, expires_at))
-                conn.commit()
+        Returns:
+            bool: すべての保存が成功した場合True（失敗した場合は1件も保存されない）
 
+        Example:
+            >>> cache = CacheService()
+            >>> cache.set_many({"tile_a": ["J001"], "tile_b": []}, ttl=600)
+            True
+        """
+        pairs = list(items.items() if isinstance(items, dict) else items)
+        if not pairs:
+            return True
+
+        try:
+            rows = [self._build_row(key, data, ttl) for key, data in pairs]
+
+            if not self._enqueue_writes(rows):
+                self._write_rows(rows)
+
+            for (key, data), row in zip(pairs, rows):
+                self._remember(key, data, row[2], len(row[1]))
             return True
 
         except Exception as e:
-            print(f"キャッシュ保存エラー (key: {key}): {e}")
+            print(f"キャッシュ一括保存エラー ({len(pairs)}件): {e}")
             return False
 
-    def get_cached_data(self, key: str) -> Optional[Any]:
+    def _get_from_memory(self, key: str, refresh: Optional[Callable[[], Any]]) -> Tuple[bool, Any]:
+        """
+        L1キャッシュから取得（内部メソッド）
+
+        Returns:
+            tuple: (見つかったか, データ)
+        """
+        if self.memory_cache is None:
+            return False, None
+        entry = self.memory_cache.get_entry(key, allow_stale=refresh is not None)
+        if entry is None:
+            return False, None
+        value, expires_at = entry
+        if expires_at <= time.time():
+            self._schedule_refresh(key, refresh)
+        self._record_access(key)
+        return True, value
+
+    def _load_row(self, key: str, row, now: int, refresh: Optional[Callable[[], Any]]) -> Optional[Any]:
+        """
+        SQLiteから読み込んだ行をデシリアライズしてL1に載せる（内部メソッド）
+
+        Args:
+            key (str): キャッシュキー
+            row: data, codec, expires_at を含む行（見つからない場合はNone）
+            now (int): 現在時刻（UNIX時刻・ミリ秒）
+            refresh (callable, optional): 猶予期間内の古いデータを返すときに予約する更新処理
+
+        Returns:
+            Any: データ。見つからない・期限切れの場合None
+        """
+        if row is None:
+            self._record_l2_lookup(hit=False)
+            return None
+
+        expires_at = row['expires_at']
+        is_valid = expires_at > now
+        if not is_valid:
+            self._record_l2_lookup(hit=False)
+            if refresh is None or expires_at + self.stale_ttl * 1000 <= now:
+                return None
+
+        # データをデシリアライズしてL1に載せてから返す
+        data = self.deserialize_data(row['data'], row['codec'])
+        if is_valid:
+            self._record_l2_lookup(hit=True)
+        self._remember(key, data, expires_at, len(row['data']))
+        if not is_valid:
+            self._schedule_refresh(key, refresh)
+        self._record_access(key)
+        return data
+
+    def get_cached_data(self, key: str, refresh: Optional[Callable[[], Any]] = None) -> Optional[Any]:
         """
         キャッシュデータを取得
 
+        有効期限切れでも猶予期間（stale_ttl）内で refresh が指定されている場合は、
+        古いデータをすぐに返し、refresh をバックグラウンドで実行する。
+        期限切れの行はSELECTの条件で除外する（行の削除は clear_expired_cache で行う）。
+
         Args:
             key (str): キャッシュキー
+            refresh (callable, optional): 最新データを取得してキャッシュに保存する関数
 
         Returns:
             Any: キャッシュされたデータ。存在しないまたは期限切れの場合None
@@ -173,31 +468,104 @@ class CacheService:
             >>> if data:
             ...     print(f"Temperature: {data['temp']}")
         """
+        # L1キャッシュを優先して参照（デシリアライズ不要）
+        found, value = self._get_from_memory(key, refresh)
+        if found:
+            return value
+
         try:
-            with get_db_connection(self.db_path) as conn:
-                cursor = conn.execute('''
-                    SELECT data, expires_at FROM cache
-                    WHERE cache_key = ?
-                ''', (key,))
+            now = now_ms()
+            # L1から追い出されていても、書き込み待ちの新しい値があればそれを返す
+            pending_row = self._get_pending_row(key)
+            if pending_row is not None:
+                return self._load_row(key, pending_row, now, refresh)
+
+            # 有効期限（refreshがある場合は猶予期間）を過ぎた行は取得の時点で除外する
+            # 期限切れの行はエラー時のフォールバック用に残しておく
+            row = self.backend.get(key, now - self.stale_ttl * 1000 if refresh is not None else now)
+            return self._load_row(key, row, now, refresh)
+
+        except Exception as e:
+            print(f"キャッシュ取得エラー (key: {key}): {e}")
+            return None
+
+    def get_many(self, keys: Iterable[str],
+                 refreshes: Optional[Dict[str, Callable[[], Any]]] = None) -> Dict[str, Any]:
+        """
+        複数のキャッシュデータをまとめて取得
 
-                row = cursor.fetchone()
+        L1にないキーはL2からまとめて読み込む（SQLiteは1回の SELECT ... WHERE cache_key IN (...)、Redisは MGET）。
+        期限切れ・猶予期間の扱いはキーごとに get_cached_data() と同じ。
 
-                if row is None:
-                    return None
+        Args:
+            keys (iterable): キャッシュキーのリスト
+            refreshes (dict, optional): キャッシュキー → 最新データを取得してキャッシュに保存する関数
+                - 指定したキーだけ、猶予期間内の古いデータを返して裏で更新する
+
+        Returns:
+            dict: 見つかったキー → データ（見つからない・期限切れのキーは含まない）
 
-                # 有効期限をチェック
-                expires_at = datetime.fromisoformat(row['expires_at'])
-                if not self.is_cache_valid(expires_at):
-                    # 期限切れの場合は削除
-                    self._delete_cache_entry(key)
-                    return None
+        Example:
+            >>> cache = CacheService()
+            >>> found = cache.get_many(["tile_a", "tile_b"])
+            >>> missing = [key for key in ["tile_a", "tile_b"] if key not in found]
+        """
+        refreshes = refreshes or {}
+        results = {}
+        pending = []
+        for key in dict.fromkeys(keys):
+            found, value = self._get_from_memory(key, refreshes.get(key))
+            if found:
+                results[key] = value
+            else:
+                pending.append(key)
+        if not pending:
+            return results
 
-                # データをデシリアライズして返す
-                return self.deserialize_data(row['data'])
+        try:
+            now = now_ms()
+            # 猶予期間内の行も読み込み、refresh のないキーは _load_row で期限切れとして扱う
+            min_expires_at = now - self.stale_ttl * 1000 if refreshes else now
+            rows = {}
+            for key in pending:
+                pending_row = self._get_pending_row(key)
+                if pending_row is not None:
+                    rows[key] = pending_row
+            unwritten = [key for key in pending if key not in rows]
+            if unwritten:
+                rows.update(self.backend.get_many(unwritten, min_expires_at))
+
+            for key in pending:
+                try:
+                    data = self._load_row(key, rows.get(key), now, refreshes.get(key))
+                except ValueError as e:
+                    print(f"キャッシュ取得エラー (key: {key}): {e}")
+                    continue
+                if data is not None:
+                    results[key] = data
 
         except Exception as e:
-            print(f"キャッシュ取得エラー (key: {key}): {e}")
+            print(f"キャッシュ一括取得エラー ({len(pending)}件): {e}")
+
+        return results
+
+    def get_fallback_data(self, key: str) -> Optional[Any]:
+        """
+        有効期限を過ぎていても残っているデータを取得（外部APIのエラー時のフォールバック用）
+
+        Args:
+            key (str): キャッシュキー
+
+        Returns:
+            Any: 残っているデータ。ない場合None
+
+        Raises:
+            ValueError: デシリアライズできないデータの場合
+        """
+        row = self._get_pending_row(key) or self.backend.get_fallback(key)
+        if row is None:
             return None
+        return self.deserialize_data(row['data'], row['codec'])
 
     def _delete_cache_entry(self, key: str) -> bool:
         """
@@ -209,10 +577,13 @@ class CacheService:
         Returns:
             bool: 削除が成功した場合True
         """
+        if self.memory_cache is not None:
+            self.memory_cache.delete(key)
+        if self.write_behind is not None:
+            self.write_behind.discard([key])
+
         try:
-            with get_db_connection(self.db_path) as conn:
-                conn.execute('DELETE FROM cache WHERE cache_key = ?', (key,))
-                conn.commit()
+            self.backend.delete(key)
             return True
         except Exception as e:
             print(f"キャッシュ削除エラー (key: {key}): {e}")
@@ -235,9 +606,11 @@ class CacheService:
         期限切れのキャッシュデータをすべて削除
 
         Returns:
-            int: 削除されたレコード数
+            int: 削除されたレコード数（L2側、Redisは自動で削除されるので0）
         """
-        return cleanup_expired_cache(self.db_path)
+        if self.memory_cache is not None:
+            self.memory_cache.purge_expired()
+        return self.backend.cleanup_expired()
 
     def clear_all_cache(self) -> bool:
         """
@@ -246,15 +619,102 @@ class CacheService:
         Returns:
             bool: 削除が成功した場合True
         """
+        if self.memory_cache is not None:
+            self.memory_cache.clear()
+        if self.write_behind is not None:
+            self.write_behind.clear()
+
         try:
-            with get_db_connection(self.db_path) as conn:
-                conn.execute('DELETE FROM cache')
-                conn.commit()
+            self.backend.clear()
             return True
         except Exception as e:
             print(f"全キャッシュ削除エラー: {e}")
             return False
 
+    def _schedule_refresh(self, key: str, refresh: Callable[[], Any]) -> None:
+        """古いデータを返したことを記録し、更新を予約（内部メソッド）"""
+        with self._stats_lock:
+            self._stale_served += 1
+        self.refresher.schedule(key, refresh)
+
+    def _record_access(self, key: str) -> None:
+        """キャッシュが使われたことをメモリに記録（内部メソッド）"""
+        if not self.track_access:
+            return
+        now = int(time.time() * 1000)
+        with self._access_lock:
+            entry = self._pending_access.get(key)
+            if entry is not None:
+                entry[0] = now
+                entry[1] += 1
+            elif len(self._pending_access) < MAX_PENDING_ACCESS:
+                self._pending_access[key] = [now, 1]
+
+    def flush_access_stats(self) -> int:
+        """
+        メモリにためた利用記録（最後に使われた日時・使われた回数）をSQLiteに書き込む
+
+        Returns:
+            int: 書き込んだキーの数
+        """
+        with self._access_lock:
+            pending, self._pending_access = self._pending_access, {}
+        if not pending:
+            return 0
+
+        try:
+            return self.backend.update_access(pending)
+        except Exception as e:
+            print(f"キャッシュの利用記録の書き込みエラー: {e}")
+            return 0
+
+    def _record_l2_lookup(self, hit: bool) -> None:
+        """L2（SQLite）の参照結果を統計情報に記録（内部メソッド）"""
+        with self._stats_lock:
+            if hit:
+                self._l2_hits += 1
+            else:
+                self._l2_misses += 1
+
+    def get_tier_stats(self) -> Dict[str, Any]:
+        """
+        キャッシュ階層ごとの統計情報を取得
+
+        Returns:
+            dict: 'l1'（メモリ、無効時はNone）と 'l2'（保存先の名前とヒット・ミス数）、
+                  'stale'（古いデータを返した回数とバックグラウンド更新の状況）、
+                  'write_behind'（遅延書き込みの状況、無効時はNone）
+        """
+        with self._stats_lock:
+            l2_hits, l2_misses = self._l2_hits, self._l2_misses
+            stale_served = self._stale_served
+        l2_lookups = l2_hits + l2_misses
+
+        return {
+            'l1': self.memory_cache.get_stats() if self.memory_cache is not None else None,
+            'l2': {
+                'backend': self.backend.name,
+                'hits': l2_hits,
+                'misses': l2_misses,
+                'hit_rate': round(l2_hits / l2_lookups, 4) if l2_lookups else 0.0,
+            },
+            'stale': {
+                'served': stale_served,
+                'stale_ttl': self.stale_ttl,
+                'refresh': self.refresher.get_stats(),
+            },
+            'write_behind': self.write_behind.get_stats() if self.write_behind is not None else None,
+        }
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """
+        このキャッシュが使用している接続プールのメトリクスを取得
+
+        Returns:
+            dict: プールサイズ、貸出中の接続数、待ち回数・待ち時間など
+        """
+        return get_pool_stats(self.db_path)
+
     def get_cache_info(self, key: str) -> Optional[Dict[str, Any]]:
         """
         キャッシュの詳細情報を取得
@@ -265,33 +725,58 @@ class CacheService:
         Returns:
             dict: キャッシュ情報（作成日時、有効期限、データサイズなど）
         """
-        try:
-            with get_db_connection(self.db_path) as conn:
-                cursor = conn.execute('''
-                    SELECT created_at, expires_at, LENGTH(data) as data_size
-                    FROM cache WHERE cache_key = ?
-                ''', (key,))
+        pending_row = self._get_pending_row(key)
+        if pending_row is not None:
+            return self._build_info(key, pending_row)
 
-                row = cursor.fetchone()
+        try:
+            row = self.backend.get_info(key)
+            if row is None:
+                return None
+            return self._build_info(key, row)
 
-                if row is None:
-                    return None
+        except Exception as e:
+            print(f"キャッシュ情報取得エラー (key: {key}): {e}")
+            return None
 
-                expires_at = datetime.fromisoformat(row['expires_at'])
-                created_at = datetime.fromisoformat(row['created_at'])
+    def get_cache_info_many(self, keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        複数のキャッシュの詳細情報をまとめて取得（SQLiteは1回の SELECT ... WHERE cache_key IN (...)）
 
-                return {
-                    'key': key,
-                    'created_at': created_at,
-                    'expires_at': expires_at,
-                    'is_valid': self.is_cache_valid(expires_at),
-                    'data_size': row['data_size'],
-                    'ttl_remaining': max(0, (expires_at - datetime.now()).total_seconds())
-                }
+        Args:
+            keys (iterable): キャッシュキーのリスト
 
+        Returns:
+            dict: 見つかったキー → キャッシュ情報（get_cache_info() と同じ形式）
+        """
+        infos = {}
+        keys = list(dict.fromkeys(keys))
+        for key in keys:
+            pending_row = self._get_pending_row(key)
+            if pending_row is not None:
+                infos[key] = self._build_info(key, pending_row)
+        keys = [key for key in keys if key not in infos]
+        try:
+            if keys:
+                for key, row in self.backend.get_info_many(keys).items():
+                    infos[key] = self._build_info(key, row)
         except Exception as e:
-            print(f"キャッシュ情報取得エラー (key: {key}): {e}")
-            return None
+            print(f"キャッシュ情報一括取得エラー ({len(keys)}件): {e}")
+        return infos
+
+    def _build_info(self, key: str, row) -> Dict[str, Any]:
+        """SQLiteの行からキャッシュ情報を作成（内部メソッド）"""
+        expires_at = from_epoch_ms(row['expires_at'])
+        created_at = from_epoch_ms(row['created_at'])
+
+        return {
+            'key': key,
+            'created_at': created_at,
+            'expires_at': expires_at,
+            'is_valid': self.is_cache_valid(expires_at),
+            'data_size': row['data_size'],
+            'ttl_remaining': max(0, (expires_at - datetime.now()).total_seconds())
+        }
 
 
 # 使用例とテスト用コード
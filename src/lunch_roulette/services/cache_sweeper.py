@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CacheSweeper - キャッシュの定期削除サービス
+
+このクラスは以下の機能を提供します:
+- 一定間隔（CACHE_SWEEP_INTERVAL_SECONDS）でバックグラウンド実行
+- 遅延書き込みのキューに残っている行と、メモリにためたキャッシュの利用記録（最後に使われた日時・回数）の書き込み
+- 期限切れのキャッシュの分割削除（期限切れ後 CACHE_EXPIRED_RETENTION_SECONDS は残す）
+- 件数・サイズの上限（CACHE_MAX_ROWS / CACHE_MAX_BYTES）を超えた分の LRU / LFU 削除
+- 削除で空いた領域の解放（incremental vacuum）
+
+【なぜ必要か】
+キャッシュのキーにはIPアドレスや座標が含まれるため、一度しか使われない行がたまり続け、
+期限切れの行も誰かが読むか cleanup_expired_cache を実行するまで残っていました。
+定期的に削除することで cache.db の大きさに上限ができます。
+保存先がRedisの場合（CACHE_BACKEND=redis）は、期限切れ・上限超過分の削除をRedisが行うので使用しません。
+
+使用例:
+    sweeper = CacheSweeper(cache_service)
+    sweeper.start()  # 5分ごとに実行
+
+    report = sweeper.run_once()  # 今すぐ1回実行
+    print(report['evicted'])
+"""
+
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+
+from ..config import Config
+from ..models.database import cleanup_expired_cache, evict_cache_entries, incremental_vacuum
+from .cache_service import CacheService
+
+
+class CacheSweeper:
+    """
+    キャッシュの期限切れ・上限超過分を定期的に削除するクラス
+
+    最後の実行結果は get_last_report() で確認できる。
+    """
+
+    def __init__(self, cache_service: CacheService, interval: Optional[int] = None,
+                 max_rows: Optional[int] = None, max_bytes: Optional[int] = None,
+                 policy: Optional[str] = None, batch_size: Optional[int] = None,
+                 retention: Optional[int] = None):
+        """
+        CacheSweeperを初期化
+
+        Args:
+            cache_service (CacheService): 対象のキャッシュサービス
+            interval (int, optional): 実行間隔（秒）
+            max_rows (int, optional): キャッシュの最大件数（0で上限なし）
+            max_bytes (int, optional): データの合計サイズの上限（バイト、0で上限なし）
+            policy (str, optional): 上限を超えたときに削除する順番（'lru' または 'lfu'）
+            batch_size (int, optional): 1回のDELETEで削除する最大件数
+            retention (int, optional): 期限切れ後も残す秒数
+                - 古いデータを返す猶予期間（stale_ttl）より短くはしない
+        """
+        self.cache_service = cache_service
+        self.interval = max(1, interval if interval is not None else Config.CACHE_SWEEP_INTERVAL_SECONDS)
+        self.max_rows = max_rows if max_rows is not None else Config.CACHE_MAX_ROWS
+        self.max_bytes = max_bytes if max_bytes is not None else Config.CACHE_MAX_BYTES
+        self.policy = policy or Config.CACHE_EVICTION_POLICY
+        self.batch_size = max(1, batch_size if batch_size is not None else Config.CACHE_SWEEP_BATCH_SIZE)
+        retention = retention if retention is not None else Config.CACHE_EXPIRED_RETENTION_SECONDS
+        self.retention = max(retention, cache_service.stale_ttl)
+
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_report: Optional[Dict] = None
+
+    def run_once(self) -> Dict:
+        """
+        定期削除を1回実行
+
+        【処理の流れ】
+        1. 遅延書き込みの行と、メモリにためた利用記録をSQLiteに書き込む（LRU / LFU の判定に使う）
+        2. 期限切れから retention 秒を過ぎた行を batch_size 件ずつ削除
+        3. 件数・サイズの上限を超えている分を、使われていない行から削除
+        4. 空きページが CACHE_VACUUM_MIN_FREE_PAGES 以上あれば解放
+
+        Returns:
+            dict: 実行結果（書き込んだ行・利用記録・削除した件数、解放したページ数）
+        """
+        db_path = self.cache_service.db_path
+        report = {'started_at': datetime.now().isoformat()}
+
+        # 利用記録は行の UPDATE なので、先に書き込み待ちの行を書き込んでおく
+        report['writes_flushed'] = self.cache_service.flush_writes()
+        report['access_flushed'] = self.cache_service.flush_access_stats()
+        if self.cache_service.memory_cache is not None:
+            self.cache_service.memory_cache.purge_expired()
+        report['expired'] = cleanup_expired_cache(db_path, grace_seconds=self.retention,
+                                                  batch_size=self.batch_size)
+        report['evicted'] = evict_cache_entries(db_path, max_rows=self.max_rows, max_bytes=self.max_bytes,
+                                                policy=self.policy, batch_size=self.batch_size)
+        report['vacuumed_pages'] = incremental_vacuum(db_path, Config.CACHE_VACUUM_MIN_FREE_PAGES)
+        report['finished_at'] = datetime.now().isoformat()
+
+        with self._lock:
+            self._last_report = report
+        return report
+
+    def get_last_report(self) -> Optional[Dict]:
+        """最後の実行結果を取得（まだ実行していない場合はNone）"""
+        with self._lock:
+            return dict(self._last_report) if self._last_report is not None else None
+
+    def start(self) -> bool:
+        """
+        定期削除をバックグラウンドで開始
+
+        複数回呼ばれてもスレッドは1つだけ。
+
+        Returns:
+            bool: 開始した場合True
+        """
+        with self._lock:
+            if self._thread is not None:
+                return False
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run_forever, name='cache-sweeper', daemon=True)
+            self._thread.start()
+
+        print(f"キャッシュの定期削除を開始: {self.interval}秒ごと")
+        return True
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        バックグラウンドの定期削除を停止
+
+        Args:
+            timeout (float, optional): スレッドの終了を待つ最大時間（秒）
+        """
+        self._stop_event.set()
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout)
+
+    def _run_forever(self) -> None:
+        """実行間隔ごとに定期削除を実行することを繰り返す（内部メソッド）"""
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"キャッシュの定期削除で予期しないエラー: {e}")
@@ -13,7 +13,15 @@ IPアドレスから位置情報を取得する機能を提供
 
 import requests
 from typing import Dict, Optional, Tuple
+from .cache_keys import CacheKey
 from .cache_service import CacheService
+from ..config import Config
+from ..utils.http_client import get_http_session
+from ..utils.request_memo import request_memoized
+from ..utils.single_flight import SingleFlight, default_single_flight
+
+# 位置情報のキャッシュキー（IPアドレスを指定しない場合は 'auto'）
+LOCATION_CACHE_KEY = CacheKey('location', ('ip',))
 
 
 class LocationService:
@@ -34,17 +42,25 @@ class LocationService:
         'country_code': 'JP'
     }
 
-    def __init__(self, cache_service: Optional[CacheService] = None):
+    def __init__(self, cache_service: Optional[CacheService] = None,
+                 single_flight: Optional[SingleFlight] = None,
+                 session: Optional[requests.Session] = None):
         """
         LocationServiceを初期化
 
         Args:
             cache_service (CacheService, optional): キャッシュサービス
+            single_flight (SingleFlight, optional): 同時リクエスト集約（省略時はプロセス共有のもの）
+            session (requests.Session, optional): HTTPセッション（省略時はipapi用の共有セッション）
         """
         self.cache_service = cache_service or CacheService()
+        self.single_flight = single_flight or default_single_flight
+        self.session = session or get_http_session('ipapi')
         self.api_base_url = "https://ipapi.co"
-        self.timeout = 10  # APIリクエストのタイムアウト（秒）
+        self.connect_timeout = Config.HTTP_CONNECT_TIMEOUT  # 接続タイムアウト（秒）
+        self.timeout = Config.HTTP_READ_TIMEOUT  # 応答待ちタイムアウト（秒）
 
+    @request_memoized('location')
     def get_location_from_ip(self, ip_address: Optional[str] = None) -> Dict[str, any]:
         """
         IPアドレスから位置情報を取得
@@ -61,17 +77,35 @@ class LocationService:
             >>> print(f"Location: {location['city']}, {location['region']}")
         """
         # キャッシュキーを生成
-        cache_key = self.cache_service.generate_cache_key(
-            'location',
-            ip=ip_address or 'auto'
-        )
+        cache_key = LOCATION_CACHE_KEY.build(ip_address or 'auto')
+
+        # 同じIPへの同時問い合わせは、API呼び出しを1回にまとめて結果を共有する
+        def fetch():
+            return self.single_flight.do(
+                cache_key,
+                lambda: self._fetch_location(ip_address, cache_key)
+            )
 
-        # キャッシュから取得を試行
-        cached_data = self.cache_service.get_cached_data(cache_key)
+        # キャッシュから取得を試行（期限切れ直後なら古いデータを返して裏で更新）
+        cached_data = self.cache_service.get_cached_data(cache_key, refresh=fetch)
         if cached_data:
             print(f"位置情報をキャッシュから取得: {cached_data['city']}")
             return cached_data
 
+        # APIから取得
+        return fetch()
+
+    def _fetch_location(self, ip_address: Optional[str], cache_key: str) -> Dict[str, any]:
+        """
+        ipapi.co APIから位置情報を取得してキャッシュに保存（内部メソッド）
+
+        Args:
+            ip_address (str, optional): IPアドレス。Noneの場合は自動検出。
+            cache_key (str): 保存先のキャッシュキー
+
+        Returns:
+            dict: 位置情報（エラー時はフォールバックまたはデフォルト位置）
+        """
         try:
             # API URLを構築
             if ip_address:
@@ -82,7 +116,7 @@ class LocationService:
             print(f"位置情報API呼び出し: {url}")
 
             # APIリクエストを実行
-            response = requests.get(url, timeout=self.timeout)
+            response = self.session.get(url, timeout=(self.connect_timeout, self.timeout))
             response.raise_for_status()
 
             # レスポンスを解析
@@ -168,27 +202,15 @@ class LocationService:
             dict: キャッシュされた位置情報、存在しない場合はNone
         """
         try:
-            from ..models.database import get_db_connection
-
-            with get_db_connection(self.cache_service.db_path) as conn:
-                cursor = conn.execute('''
-                    SELECT data FROM cache
-                    WHERE cache_key = ?
-                    ORDER BY created_at DESC
-                    LIMIT 1
-                ''', (cache_key,))
+            # 期限切れでもデータを返す（フォールバック用）
+            fallback_data = self.cache_service.get_fallback_data(cache_key)
+            if fallback_data is None:
+                return None
 
-                row = cursor.fetchone()
+            fallback_data['source'] = 'fallback_cache'
 
-                if row is None:
-                    return None
-
-                # 期限切れでもデータを返す（フォールバック用）
-                fallback_data = self.cache_service.deserialize_data(row['data'])
-                fallback_data['source'] = 'fallback_cache'
-
-                print("フォールバック用キャッシュデータを使用（期限切れ）")
-                return fallback_data
+            print("フォールバック用キャッシュデータを使用（期限切れ）")
+            return fallback_data
 
         except Exception as e:
             print(f"フォールバックキャッシュ取得エラー: {e}")
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+MemoryCache - プロセス内メモリキャッシュ（L1キャッシュ）
+SQLiteキャッシュ（L2）の手前に置く、件数・サイズ上限付きのLRUキャッシュ
+
+このクラスは以下の機能を提供します:
+- デシリアライズ済みデータの保持（ホットなキーでJSONデコードを省略）
+- SQLiteと同じ有効期限（expires_at）による期限切れ判定
+- 期限切れ後も猶予期間（stale_until）までは古いデータとして保持
+- 件数・概算バイト数の上限を超えた場合のLRU追い出し
+- ヒット・ミス・追い出し回数の統計情報
+
+注意:
+    get() が返す値はキャッシュ内のオブジェクトそのものです。
+    呼び出し側で変更する場合は必ずコピーしてから変更してください。
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class MemoryCache:
+    """
+    件数・サイズ上限付きのTTL対応LRUキャッシュ
+
+    スレッドセーフで、1つのCacheServiceインスタンスから
+    複数のリクエストスレッドが同時に使用できる。
+    """
+
+    def __init__(self, max_entries: int = 1000, max_bytes: int = 32 * 1024 * 1024):
+        """
+        MemoryCacheを初期化
+
+        Args:
+            max_entries (int): 保持する最大件数
+            max_bytes (int): 保持するデータの概算合計バイト数の上限
+        """
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max(1, max_bytes)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+
+        # 統計情報
+        self._hits = 0
+        self._stale_hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        キャッシュから有効期限内のデータを取得
+
+        Args:
+            key (str): キャッシュキー
+            default (Any): 存在しない・期限切れの場合に返す値
+
+        Returns:
+            Any: キャッシュされたデータ、または default
+        """
+        entry = self.get_entry(key, allow_stale=False)
+        return default if entry is None else entry[0]
+
+    def get_entry(self, key: str, allow_stale: bool = True) -> Optional[Tuple[Any, float]]:
+        """
+        キャッシュからデータと有効期限を取得
+
+        Args:
+            key (str): キャッシュキー
+            allow_stale (bool): 期限切れでも猶予期間内のデータを返す場合True
+
+        Returns:
+            tuple: (データ, 有効期限のUNIX時刻)。存在しない場合None
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+
+            value, expires_at, stale_until, size = entry
+            if stale_until <= now:
+                # 猶予期間も過ぎたデータはその場で削除
+                del self._entries[key]
+                self._bytes -= size
+                self._expirations += 1
+                self._misses += 1
+                return None
+
+            if expires_at <= now and not allow_stale:
+                self._misses += 1
+                return None
+
+            # 最近使用したキーとして末尾に移動
+            self._entries.move_to_end(key)
+            if expires_at > now:
+                self._hits += 1
+            else:
+                self._stale_hits += 1
+            return value, expires_at
+
+    def set(self, key: str, value: Any, expires_at: float, size: int = 0,
+            stale_until: Optional[float] = None) -> None:
+        """
+        キャッシュにデータを保存
+
+        Args:
+            key (str): キャッシュキー
+            value (Any): 保存するデータ（デシリアライズ済み）
+            expires_at (float): 有効期限（UNIX時刻・秒）
+            size (int): データの概算バイト数（シリアライズ後の長さなど）
+            stale_until (float, optional): 古いデータとして保持する期限（UNIX時刻・秒）
+                - 指定しない場合は expires_at と同じ
+        """
+        stale_until = max(expires_at, stale_until or expires_at)
+        if stale_until <= time.time():
+            self.delete(key)
+            return
+
+        with self._lock:
+            # 単体で上限を超えるデータは保持しない
+            if size > self.max_bytes:
+                self._remove_locked(key)
+                return
+
+            self._remove_locked(key)
+            self._entries[key] = (value, expires_at, stale_until, size)
+            self._bytes += size
+            self._evict_locked()
+
+    def replace(self, key: str, expected: Any, value: Any, size: int = 0) -> bool:
+        """
+        保持しているデータが expected のときだけ、有効期限はそのままでデータを置き換える
+
+        読み込んだデータを変換した結果（店舗ID → お店の情報など）を保持し直すために使う。
+        変換している間に別のスレッドが新しいデータを保存していた場合は置き換えない。
+
+        Args:
+            key (str): キャッシュキー
+            expected (Any): 置き換える前のデータ（get() で取得したオブジェクトそのもの）
+            value (Any): 新しいデータ
+            size (int): 新しいデータの概算バイト数
+
+        Returns:
+            bool: 置き換えた場合True
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] is not expected:
+                return False
+            if size > self.max_bytes:
+                self._remove_locked(key)
+                return False
+
+            _, expires_at, stale_until, old_size = entry
+            self._entries[key] = (value, expires_at, stale_until, size)
+            self._bytes += size - old_size
+            self._evict_locked()
+            return True
+
+    def delete(self, key: str) -> None:
+        """
+        指定されたキーを削除
+
+        Args:
+            key (str): キャッシュキー
+        """
+        with self._lock:
+            self._remove_locked(key)
+
+    def clear(self) -> None:
+        """すべてのデータを削除"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def purge_expired(self) -> int:
+        """
+        猶予期間も過ぎたデータをすべて削除
+
+        Returns:
+            int: 削除された件数
+        """
+        now = time.time()
+        with self._lock:
+            expired_keys = [key for key, (_, _, stale_until, _) in self._entries.items() if stale_until <= now]
+            for key in expired_keys:
+                self._remove_locked(key)
+            self._expirations += len(expired_keys)
+            return len(expired_keys)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        統計情報を取得
+
+        Returns:
+            dict: 件数、概算バイト数、ヒット数（期限切れデータのヒットは stale_hits）、ミス数、追い出し数など
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'hits': self._hits,
+                'stale_hits': self._stale_hits,
+                'misses': self._misses,
+                'hit_rate': round(self._hits / lookups, 4) if lookups else 0.0,
+                'evictions': self._evictions,
+                'expirations': self._expirations,
+            }
+
+    def _remove_locked(self, key: str) -> None:
+        """キーを削除（内部メソッド、ロック取得済みで呼ぶ）"""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[3]
+
+    def _evict_locked(self) -> None:
+        """上限を超えた分を古い順に追い出す（内部メソッド、ロック取得済みで呼ぶ）"""
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, (_, _, _, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self._evictions += 1
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            entry: Optional[tuple] = self._entries.get(key)
+            return entry is not None and entry[1] > time.time()
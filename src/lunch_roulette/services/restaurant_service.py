@@ -9,7 +9,7 @@ Hot Pepper Gourmet APIからレストラン情報を取得する機能を提供
 1. 指定した場所の近くのレストランを検索（半径1km以内）
 2. 予算で絞り込み（ランチ予算1200円以下）
 3. レストランの詳細情報を整形
-4. キャッシュを使ってAPI呼び出しを節約
+4. キャッシュを使ってAPI呼び出しを節約（座標指定の検索は地図のタイルごとにキャッシュ）
 
 使用例:
     service = RestaurantService()
@@ -19,8 +19,25 @@ Hot Pepper Gourmet APIからレストラン情報を取得する機能を提供
 
 import requests
 import os
-from typing import Dict, List, Optional
+import threading
+from concurrent.futures import as_completed
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from .cache_keys import CacheKey
 from .cache_service import CacheService
+from ..models.restaurant_index import SUMMARY_SIZE_ESTIMATE, RestaurantIndex, project_summary
+from ..config import Config
+from ..utils.distance_calculator import DistanceCalculator
+from ..utils.geohash import covering_tiles, decode_bbox, tile_center, tile_half_diagonal_km
+from ..utils.geohash import encode as geohash_encode
+from ..utils.fan_out import Deadline, FanOutExecutor, default_page_fetch_executor, default_tile_fetch_executor
+from ..utils.http_client import get_http_session
+from ..utils.request_memo import request_memoized
+from ..utils.single_flight import SingleFlight, default_single_flight
+
+# 検索結果のキャッシュキー（条件を指定しない項目は 'all' / 0）
+AREA_CACHE_KEY = CacheKey('restaurants', ('middle_area', 'budget_code', 'lunch', 'genre_code'))
+TILE_CACHE_KEY = CacheKey('restaurant_tile', ('tile', 'budget_code', 'lunch', 'genre_code'))
 
 
 class RestaurantService:
@@ -64,7 +81,25 @@ class RestaurantService:
     # - これより高いと「ランチ」ではなく「ディナー」扱いになることが多い
     LUNCH_BUDGET_LIMIT = 1200
 
-    def __init__(self, api_key: Optional[str] = None, cache_service: Optional[CacheService] = None):
+    # 1回のAPI呼び出し（1ページ）で取得する最大件数（Hot Pepper APIの上限）
+    # これより多いお店がある場合は start を指定して次のページを取得する
+    MAX_RESULTS_PER_REQUEST = 100
+
+    # Hot Pepper APIの検索範囲（半径km）。range コード 1〜5 に対応
+    # タイルを取得する場合は、この中からタイル全体を含む最小のものを使う
+    SEARCH_RADII_KM = (0.3, 0.5, 1, 2, 3)
+
+    # タイルの取得を待つのをやめる時刻は、リクエストの締め切りよりこの秒数だけ前にする
+    # （取得できたタイルで絞り込み・並べ替えをして、締め切りまでに結果を返すため）
+    TILE_DEADLINE_MARGIN_SECONDS = 0.5
+
+    def __init__(self, api_key: Optional[str] = None, cache_service: Optional[CacheService] = None,
+                 single_flight: Optional[SingleFlight] = None,
+                 session: Optional[requests.Session] = None,
+                 distance_calculator: Optional[DistanceCalculator] = None,
+                 restaurant_index: Optional[RestaurantIndex] = None,
+                 page_executor: Optional[FanOutExecutor] = None,
+                 tile_executor: Optional[FanOutExecutor] = None):
         """
         RestaurantServiceを初期化
         
@@ -79,23 +114,67 @@ class RestaurantService:
                 - 指定しない場合は環境変数 HOTPEPPER_API_KEY から取得
             cache_service (CacheService, optional): キャッシュサービス
                 - 指定しない場合は新しいCacheServiceインスタンスを作成
+            single_flight (SingleFlight, optional): 同時リクエスト集約
+                - 指定しない場合はプロセス共有のインスタンスを使用
+            session (requests.Session, optional): HTTPセッション
+                - 指定しない場合はHot Pepper用の共有セッションを使用（接続を使い回す）
+            distance_calculator (DistanceCalculator, optional): 距離計算機
+                - 徒歩時間での絞り込みに使用。指定しない場合は新しく作成
+            restaurant_index (RestaurantIndex, optional): ローカルのレストラン索引
+                - 指定しない場合はキャッシュと同じデータベースの索引を使用
+            page_executor (FanOutExecutor, optional): 2ページ目以降を並列に取得するスレッドプール
+                - 指定しない場合はプロセス共有のページ取得用スレッドプールを使用
+            tile_executor (FanOutExecutor, optional): キャッシュにないタイルを並列に取得するスレッドプール
+                - 指定しない場合はプロセス共有のタイル取得用スレッドプールを使用
         """
         # 1. APIキーの取得（引数で渡されていれば優先、なければ環境変数から）
         self.api_key = api_key or os.getenv('HOTPEPPER_API_KEY')
         
         # 2. キャッシュサービスの設定（API呼び出しを減らして高速化）
         self.cache_service = cache_service or CacheService()
+
+        # お店の情報は索引（restaurantsテーブル）に1件ずつ保存し、キャッシュには店舗IDだけを保存する
+        self.restaurant_index = restaurant_index or RestaurantIndex(
+            getattr(self.cache_service, 'db_path', Config.DATABASE_PATH),
+            store_details=Config.RESTAURANT_STORE_DETAILS
+        )
+
+        # 同じ検索条件の同時API呼び出しを1回にまとめる仕組み
+        self.single_flight = single_flight or default_single_flight
+
+        # 徒歩時間での絞り込み用（お店までの正確な徒歩時間を計算する）
+        self.distance_calculator = distance_calculator or DistanceCalculator()
+
+        # 座標指定の検索で使うタイル（ジオハッシュ）の精度
+        self.tile_precision = Config.RESTAURANT_TILE_PRECISION
+
+        # 予算・ランチ・ジャンルを指定した検索を、条件なしの検索結果から絞り込むか
+        self.local_filtering = Config.RESTAURANT_LOCAL_FILTERING
+
+        # 1回の検索で取得するお店の上限（100件を超える分は複数ページに分けて並列に取得）
+        self.max_results = max(self.MAX_RESULTS_PER_REQUEST, Config.RESTAURANT_MAX_RESULTS)
+        self.page_executor = page_executor or default_page_fetch_executor
+        self.tile_executor = tile_executor or default_tile_fetch_executor
+
+        # ページ取得の統計情報（get_page_stats() で確認）
+        self._page_stats = {'searches': 0, 'pages': 0, 'max_pages': 0, 'truncated': 0, 'page_errors': 0,
+                            'local_filtered': 0, 'tile_fetches': 0, 'tile_timeouts': 0}
+        self._page_stats_lock = threading.Lock()
         
         # 3. API接続情報の設定
+        self.session = session or get_http_session('hotpepper')
         self.api_base_url = "https://webservice.recruit.co.jp/hotpepper/gourmet/v1/"
-        self.timeout = 10  # APIリクエストのタイムアウト（10秒）
+        self.connect_timeout = Config.HTTP_CONNECT_TIMEOUT  # 接続タイムアウト（3.05秒）
+        self.timeout = Config.HTTP_READ_TIMEOUT  # 応答待ちタイムアウト（10秒）
         # ※タイムアウトを設定する理由: APIサーバーが応答しない時に永遠に待たないため
 
         # 4. APIキーの存在確認（ないと検索できないので警告）
         if not self.api_key:
             print("警告: Hot Pepper Gourmet APIキーが設定されていません。")
 
-    def search_restaurants(self, lat: float = None, lon: float = None, radius: int = 1, budget_code: str = None, lunch: int = None, genre_code: str = None, middle_area: str = None) -> List[Dict]:
+    @request_memoized('restaurants')
+    def search_restaurants(self, lat: float = None, lon: float = None, radius: int = 1, budget_code: str = None, lunch: int = None, genre_code: str = None, middle_area: str = None, max_walking_time_min: int = None,
+                           deadline: Optional[Deadline] = None) -> List[Dict]:
         """
         指定された座標周辺のレストランを検索
         
@@ -127,6 +206,13 @@ class RestaurantService:
                 - None の場合はジャンルフィルタなし
             middle_area (str, optional): Hot Pepperエリアコード（例: "Y005"）
                 - 指定時は lat/lon/radius は使用されない
+            max_walking_time_min (int, optional): 徒歩時間の上限（分）
+                - 指定時は radius の代わりに、徒歩時間を含む範囲で検索してから
+                  実際の徒歩時間で絞り込み、近い順に並べて返す
+                - middle_area 指定時は無視される
+            deadline (Deadline, optional): リクエストの締め切り
+                - キャッシュにないタイルの取得は、締め切りの TILE_DEADLINE_MARGIN_SECONDS 秒前まで待つ
+                - 指定しない場合は ROULETTE_DEADLINE_SECONDS を締め切りとする
 
         Returns:
             list: レストラン情報のリスト
@@ -150,38 +236,49 @@ class RestaurantService:
             ...     middle_area="Y005"  # 新宿エリア
             ... )
         """
+        # 座標指定の場合は、タイル（地図のマス目）ごとのキャッシュを組み合わせて検索する
+        if not middle_area:
+            if lat is None or lon is None:
+                print("緯度・経度が指定されていないため、レストラン検索をスキップします。")
+                return []
+            if max_walking_time_min is not None:
+                return self._search_within_walking_time(
+                    lat, lon, max_walking_time_min, budget_code, lunch, genre_code, deadline
+                )
+            restaurants = self._search_tiles(lat, lon, radius, budget_code, lunch, genre_code, deadline)
+            return self._filter_by_distance(restaurants, lat, lon, max_distance_km=radius)
+
+        # 予算・ランチ・ジャンルを指定した検索は、条件なしの検索結果から絞り込む
+        # （条件なしの検索でエリアのお店を全件取得できている場合だけ。できていない場合は条件付きでAPIを呼ぶ）
+        if self._use_local_filters(budget_code, lunch, genre_code):
+            superset = self.search_restaurants(middle_area=middle_area)
+            if self._is_complete(self.area_cache_key(middle_area)):
+                return self._filter_locally(superset, budget_code, lunch, genre_code)
+
         # ====== ステップ1: キャッシュキーを生成 ======
-        # 同じ場所・同じ半径の検索結果は再利用できるようにキャッシュキーを作る
-        # round(lat, 4) で小数点以下4桁に丸める理由:
-        #   - 緯度経度の0.0001度 ≒ 約10m の違いなので、この程度の誤差は許容
-        #   - 細かすぎるとキャッシュが効きにくくなる
-        
-        # エリア指定と座標指定で異なるキャッシュキーを生成
-        if middle_area:
-            cache_key = self.cache_service.generate_cache_key(
-                'restaurants',
-                middle_area=middle_area,
-                budget_code=budget_code or 'all',
-                lunch=lunch or 0,
-                genre_code=genre_code or 'all'
-            )
-        else:
-            cache_key = self.cache_service.generate_cache_key(
-                'restaurants',
-                lat=round(lat, 4) if lat else 0,
-                lon=round(lon, 4) if lon else 0,
-                radius=radius,
-                budget_code=budget_code or 'all',
-                lunch=lunch or 0,
-                genre_code=genre_code or 'all'
+        # 同じエリア・同じ条件の検索結果は再利用できるようにキャッシュキーを作る
+        cache_key = self.area_cache_key(middle_area, budget_code, lunch, genre_code)
+
+        # 同じ条件の検索が同時に届いた場合は、API呼び出しを1回にまとめて結果を共有する
+        # （お昼どきに同じオフィスから一斉にアクセスされてもAPI利用回数を消費しない）
+        def fetch():
+            return self.single_flight.do(
+                cache_key,
+                lambda: self._fetch_restaurants(
+                    cache_key, lat, lon, radius, budget_code, lunch, genre_code, middle_area
+                )
             )
 
         # ====== ステップ2: キャッシュから取得を試みる ======
         # 過去に同じ検索をしていれば、そのデータを再利用（API呼び出しを節約）
-        cached_data = self.cache_service.get_cached_data(cache_key)
+        # 有効期限切れ直後なら古いデータを返し、APIからの再取得はバックグラウンドで行う
+        cached_data = self.cache_service.get_cached_data(
+            cache_key, refresh=fetch if self.api_key else None
+        )
         if cached_data:
-            print(f"レストラン情報をキャッシュから取得: {len(cached_data)}件")
-            return cached_data
+            restaurants = self._resolve_cached_restaurants(cached_data, cache_key)
+            print(f"レストラン情報をキャッシュから取得: {len(restaurants)}件")
+            return restaurants
 
         # ====== ステップ3: APIキーが設定されていない場合は空のリストを返す ======
         # APIキーがないとHot Pepper APIを使えないので、検索できない
@@ -189,12 +286,452 @@ class RestaurantService:
             print("APIキーが設定されていないため、レストラン検索をスキップします。")
             return []
 
+        # ====== ステップ4〜10: APIから取得 ======
+        return fetch()
+
+    def area_cache_key(self, middle_area: str, budget_code: str = None, lunch: int = None,
+                       genre_code: str = None) -> str:
+        """
+        エリア指定の検索結果のキャッシュキーを生成
+
+        Args:
+            middle_area, budget_code, lunch, genre_code: search_restaurants() と同じ検索条件
+
+        Returns:
+            str: キャッシュキー
+        """
+        return AREA_CACHE_KEY.build(middle_area, budget_code or 'all', lunch or 0, genre_code or 'all')
+
+    def area_search_conditions(self, middle_area: str, budget_code: str = None, lunch: int = None,
+                               genre_code: str = None) -> Tuple[Optional[str], Optional[int], Optional[str]]:
+        """
+        エリア指定の検索で、実際にキャッシュ・APIで使う検索条件を取得
+
+        条件なしの検索結果から絞り込める場合（RESTAURANT_LOCAL_FILTERING）は条件なしを返す。
+
+        Args:
+            middle_area, budget_code, lunch, genre_code: search_restaurants() と同じ検索条件
+
+        Returns:
+            tuple: (予算コード, ランチ, ジャンルコード)
+        """
+        if self._use_local_filters(budget_code, lunch, genre_code) and \
+                self._is_complete(self.area_cache_key(middle_area)):
+            return None, None, None
+        return budget_code, lunch, genre_code
+
+    def refresh_area_restaurants(self, middle_area: str, budget_code: str = None, lunch: int = None,
+                                 genre_code: str = None, ttl: int = 600) -> List[Dict]:
+        """
+        エリア指定の検索結果をAPIから取得し直してキャッシュに保存（事前取得用）
+
+        キャッシュの有無にかかわらずAPIを呼び出す。同じ条件の検索が同時に届いた場合は1回にまとめる。
+
+        Args:
+            middle_area, budget_code, lunch, genre_code: search_restaurants() と同じ検索条件
+            ttl (int): キャッシュの有効期間（秒）
+
+        Returns:
+            list: レストラン情報のリスト（エラー時はフォールバックまたは空リスト）
+        """
+        if not self.api_key:
+            return []
+
+        cache_key = self.area_cache_key(middle_area, budget_code, lunch, genre_code)
+        return self.single_flight.do(
+            cache_key,
+            lambda: self._fetch_restaurants(
+                cache_key, None, None, 1, budget_code, lunch, genre_code, middle_area, ttl=ttl
+            )
+        )
+
+    def _search_within_walking_time(self, lat: float, lon: float, max_walking_time_min: int,
+                                    budget_code: str, lunch: int, genre_code: str,
+                                    deadline: Optional[Deadline] = None) -> List[Dict]:
+        """
+        徒歩時間の上限以内のレストランを検索（内部メソッド）
+
+        【処理の流れ】
+        1. 徒歩時間をカバーする半径（直線距離）を求める
+        2. その円と重なるタイルのお店を集める（徒歩5分と徒歩10分の検索で同じタイルを共有できる）
+        3. 実際の徒歩時間で絞り込み、近い順に並べる
+
+        Returns:
+            list: 徒歩時間の上限以内のレストラン情報のリスト（近い順）
+        """
+        radius_km = self.walking_time_to_radius_km(max_walking_time_min)
+        restaurants = self._search_tiles(lat, lon, radius_km, budget_code, lunch, genre_code, deadline)
+        return self._filter_by_distance(restaurants, lat, lon, max_walking_time_min=max_walking_time_min)
+
+    def _search_tiles(self, lat: float, lon: float, radius_km: float, budget_code: str,
+                      lunch: int, genre_code: str, deadline: Optional[Deadline] = None) -> List[Dict]:
+        """
+        検索範囲（円）と重なるタイルのお店を集める（内部メソッド）
+
+        【タイルキャッシュの仕組み】
+        地図をジオハッシュのタイル（精度6で東京付近は約1.0km×0.6km）に区切り、
+        お店をタイルごとにキャッシュする。検索地点が少し違っても同じタイルを使うので、
+        同じオフィス街で検索する人全員がキャッシュを共有できる。
+        キャッシュにないタイルだけをAPIから並列に取得する。リクエストの締め切り（deadline、
+        指定しない場合は ROULETTE_DEADLINE_SECONDS）の TILE_DEADLINE_MARGIN_SECONDS 秒前までに
+        取得できなかったタイルは、この検索では使わない（取得は裏で続き、キャッシュに保存される）。
+        APIキーがない場合は、ローカルの索引（R*Tree）から円の中のお店を直接探す。
+
+        Returns:
+            list: 重なるタイルのお店のリスト（重複なし、円の外のお店も含む）
+        """
+        if not self.api_key:
+            return self.restaurant_index.find_nearby(
+                lat, lon, radius_km, budget_code=budget_code, lunch=lunch, genre_code=genre_code
+            )
+
+        # キャッシュ済みのタイルは店舗IDのリストなので、全タイル分をまとめて索引から取得する
+        # 条件付きの検索では、条件なしでお店を全件取得できているタイルは条件なしのキャッシュから絞り込む
+        use_local_filters = self._use_local_filters(budget_code, lunch, genre_code)
+        tiles = covering_tiles(lat, lon, radius_km, self.tile_precision)
+        conditions = [(budget_code, lunch, genre_code)]
+        if use_local_filters:
+            conditions.insert(0, (None, None, None))
+        cached = self._get_cached_tiles(tiles, conditions)
+        remaining = deadline.remaining() if deadline is not None else Config.ROULETTE_DEADLINE_SECONDS
+        tile_deadline = Deadline(max(0.0, remaining - self.TILE_DEADLINE_MARGIN_SECONDS))
+
+        # キャッシュキー → タイルのキャッシュの内容（条件なしから絞り込むタイルは superset に分ける）
+        # 条件なしでお店を全件取得できたかは取得してみないと分からないので、条件なしのタイルを先に取得する
+        superset = {}
+        exact_tiles = tiles
+        if use_local_filters:
+            unfiltered = self._get_tiles_entries(tiles, None, None, None, cached, tile_deadline)
+            superset = {key: entries for key, entries in unfiltered.items() if self._is_complete(key)}
+            exact_tiles = [tile for tile in tiles if self._tile_cache_key(tile, None, None, None) not in superset]
+        exact = self._get_tiles_entries(exact_tiles, budget_code, lunch, genre_code, cached, tile_deadline)
+
+        resolved = self._resolve_cached_many({**exact, **superset})
+        found = [restaurant for cache_key in exact for restaurant in resolved[cache_key]]
+        superset_found = [restaurant for cache_key in superset for restaurant in resolved[cache_key]]
+        if superset_found:
+            found += self._filter_locally(superset_found, budget_code, lunch, genre_code)
+
+        restaurants = {}
+        for restaurant in found:
+            restaurants.setdefault(restaurant.get('id'), restaurant)
+        return list(restaurants.values())
+
+    def _use_local_filters(self, budget_code: str, lunch: int, genre_code: str) -> bool:
+        """条件なしの検索結果から絞り込むか（RESTAURANT_LOCAL_FILTERING が有効で、条件がある場合）（内部メソッド）"""
+        return self.local_filtering and bool(budget_code or lunch or genre_code)
+
+    def _is_complete(self, cache_key: str) -> bool:
+        """
+        キャッシュキーの検索で、条件に合うお店を最後に全件取得できたか（内部メソッド）
+
+        全ページを取得できた場合だけ同期日時が記録される（途中までの場合は記録が消される）。
+        """
+        return self.restaurant_index.get_synced_at(cache_key) is not None
+
+    def _filter_locally(self, restaurants: List[Dict], budget_code: str, lunch: int,
+                        genre_code: str) -> List[Dict]:
+        """
+        お店のリストを予算・ランチ・ジャンルで絞り込む（Hot Pepper APIの検索条件と同じ意味）（内部メソッド）
+
+        Args:
+            restaurants (list): 条件なしの検索で取得したお店のリスト
+            budget_code (str): 予算コード（例: "B010"）。お店の予算コードが一致するものだけ
+            lunch (int): 1 の場合はランチありのお店だけ
+            genre_code (str): ジャンルコード（例: "G007"）。お店のジャンルコードが一致するものだけ
+
+        Returns:
+            list: 条件に合うお店のリスト（元の順番）
+        """
+        filtered = [
+            r for r in restaurants
+            if (not budget_code or r.get('budget_code') == budget_code)
+            and (not lunch or str(r.get('lunch', '')).startswith('あり'))
+            and (not genre_code or r.get('genre_code') == genre_code)
+        ]
+        with self._page_stats_lock:
+            self._page_stats['local_filtered'] += 1
+        return filtered
+
+    def _get_tile_restaurants(self, tile: str, budget_code: str, lunch: int, genre_code: str) -> List[Dict]:
+        """
+        1つのタイルのお店を取得（キャッシュになければAPIから取得）（内部メソッド）
+
+        Args:
+            tile (str): ジオハッシュ
+            budget_code, lunch, genre_code: search_restaurants() と同じ検索条件
+
+        Returns:
+            list: タイルの中のお店のリスト
+        """
+        return self._resolve_cached_restaurants(
+            self._get_tile_entries(tile, budget_code, lunch, genre_code),
+            self._tile_cache_key(tile, budget_code, lunch, genre_code)
+        )
+
+    def _get_cached_tiles(self, tiles: List[str], conditions: List[Tuple]) -> Dict[str, Any]:
+        """
+        複数のタイル・検索条件のキャッシュを1回のSELECTでまとめて取得（内部メソッド）
+
+        Args:
+            tiles (list): ジオハッシュのリスト
+            conditions (list): (予算コード, ランチ, ジャンルコード) のリスト
+
+        Returns:
+            dict: キャッシュにあったタイルのキャッシュキー → 店舗IDのリスト
+        """
+        refreshes = {}
+        for tile in tiles:
+            for budget_code, lunch, genre_code in conditions:
+                cache_key = self._tile_cache_key(tile, budget_code, lunch, genre_code)
+                refreshes[cache_key] = self._tile_fetcher(tile, cache_key, budget_code, lunch, genre_code)
+        return self.cache_service.get_many(list(refreshes), refreshes=refreshes if self.api_key else None)
+
+    def _tile_fetcher(self, tile: str, cache_key: str, budget_code: str, lunch: int,
+                      genre_code: str) -> Callable[[], List[Dict]]:
+        """
+        タイルのお店をAPIから取得してキャッシュに保存する関数を作成（内部メソッド）
+
+        APIでタイルの中心からタイル全体を含む範囲を検索し、タイルの中のお店だけを保存する。
+        同じタイルの取得が同時に始まった場合は、1回だけAPIを呼ぶ。
+        """
+        # タイル全体を含む最小の検索範囲（精度6で東京付近は1km）
+        half_diagonal_km = tile_half_diagonal_km(tile)
+        radius_km = next((r for r in self.SEARCH_RADII_KM if r >= half_diagonal_km), self.SEARCH_RADII_KM[-1])
+        center_lat, center_lon = tile_center(tile)
+
+        def fetch():
+            return self.single_flight.do(
+                cache_key,
+                lambda: self._fetch_restaurants(
+                    cache_key, center_lat, center_lon, radius_km, budget_code, lunch, genre_code, None,
+                    tile=tile
+                )
+            )
+
+        return fetch
+
+    def _get_tiles_entries(self, tiles: List[str], budget_code: str, lunch: int, genre_code: str,
+                           cached: Dict[str, Any], deadline: Deadline) -> Dict[str, List]:
+        """
+        複数のタイルのキャッシュを取得し、キャッシュにないタイルはAPIから並列に取得（内部メソッド）
+
+        タイルごとに1回（最大 RESTAURANT_MAX_RESULTS / 100 ページ）のAPI検索になるため、
+        順番に取得すると徒歩10分の検索（6タイル前後）で待ち時間がタイルの数だけ積み重なる。
+        キャッシュにないタイルはタイル取得用のスレッドプールで同時に取得し（1つだけの場合も同じ）、
+        締め切りまでに終わらなかったタイルは結果を待たない（取得は裏で続き、キャッシュに保存される）。
+
+        Args:
+            tiles (list): ジオハッシュのリスト
+            budget_code, lunch, genre_code: search_restaurants() と同じ検索条件
+            cached (dict): _get_cached_tiles() でまとめて取得したキャッシュ
+            deadline (Deadline): APIからの取得を待つ締め切り
+
+        Returns:
+            dict: キャッシュキー → タイルのキャッシュの内容（tiles の順番。締め切りに間に合わなかったタイルは含まない）
+        """
+        found = {}
+        missing = []
+        for tile in tiles:
+            cache_key = self._tile_cache_key(tile, budget_code, lunch, genre_code)
+            entries = self._get_tile_entries(tile, budget_code, lunch, genre_code, cached, defer_fetch=True)
+            if entries is None:
+                missing.append((tile, cache_key))
+            else:
+                found[cache_key] = entries
+
+        timeouts = 0
+        futures = {
+            cache_key: self.tile_executor.submit(self._tile_fetcher(tile, cache_key, budget_code, lunch, genre_code))
+            for tile, cache_key in missing
+        }
+        for cache_key, future in futures.items():
+            try:
+                entries = self.tile_executor.result(future, deadline.remaining())
+            except Exception as e:
+                print(f"タイルの取得エラー ({cache_key}): {e}")
+                continue
+            if entries is None:
+                timeouts += 1
+            else:
+                found[cache_key] = entries
+        if timeouts:
+            print(f"タイルの取得が締め切りに間に合いませんでした: {timeouts}/{len(missing)}タイル（取得は裏で継続）")
+        with self._page_stats_lock:
+            self._page_stats['tile_fetches'] += len(missing)
+            self._page_stats['tile_timeouts'] += timeouts
+
+        ordered = (self._tile_cache_key(tile, budget_code, lunch, genre_code) for tile in tiles)
+        return {cache_key: found[cache_key] for cache_key in ordered if cache_key in found}
+
+    def _get_tile_entries(self, tile: str, budget_code: str, lunch: int, genre_code: str,
+                          cached: Optional[Dict[str, Any]] = None, defer_fetch: bool = False) -> Optional[List]:
+        """
+        1つのタイルのキャッシュを取得（キャッシュになければAPIから取得）（内部メソッド）
+
+        最近（RESTAURANT_INDEX_MAX_AGE_HOURS 以内）APIと同期したタイルは、ローカルの索引から答える。
+        それ以外はAPIでタイルの中心からタイル全体を含む範囲を検索し、タイルの中のお店だけを保存する。
+
+        Args:
+            tile (str): ジオハッシュ
+            budget_code, lunch, genre_code: search_restaurants() と同じ検索条件
+            cached (dict, optional): _get_cached_tiles() でまとめて取得したキャッシュ
+                - 指定した場合は、ここにないタイルをキャッシュにないものとして扱う
+            defer_fetch (bool): True の場合はAPIから取得せずにNoneを返す（呼び出し側でまとめて取得する）
+
+        Returns:
+            list: キャッシュ済みの場合は店舗IDのリスト、取得した場合はお店のリスト
+                （defer_fetch=True でAPIからの取得が必要な場合はNone）
+        """
+        cache_key = self._tile_cache_key(tile, budget_code, lunch, genre_code)
+        fetch = self._tile_fetcher(tile, cache_key, budget_code, lunch, genre_code)
+
+        # お店のないタイル（公園や川など）も空のリストとしてキャッシュされているのでNoneで判定する
+        if cached is not None:
+            cached_data = cached.get(cache_key)
+        else:
+            cached_data = self.cache_service.get_cached_data(
+                cache_key, refresh=fetch if self.api_key else None
+            )
+        if cached_data is not None:
+            return cached_data
+
+        indexed = self._find_synced_tile_restaurants(cache_key, tile, budget_code, lunch, genre_code)
+        if indexed is not None:
+            self.cache_service.set_cached_data(cache_key, self._to_cache_entries(indexed), ttl=600)
+            return indexed
+
+        if defer_fetch:
+            return None
+        return fetch()
+
+    def _tile_cache_key(self, tile: str, budget_code: str, lunch: int, genre_code: str) -> str:
+        """タイルのキャッシュキーを生成（内部メソッド）"""
+        return TILE_CACHE_KEY.build(tile, budget_code or 'all', lunch or 0, genre_code or 'all')
+
+    def _find_synced_tile_restaurants(self, cache_key: str, tile: str, budget_code: str,
+                                      lunch: int, genre_code: str) -> Optional[List[Dict]]:
+        """
+        最近APIと同期したタイルのお店をローカルの索引から探す（内部メソッド）
+
+        同期のときに見かけたお店（last_seen が同期日時以降）だけを返すので、
+        閉店などでAPIの結果から消えたお店は含まれない。
+
+        Returns:
+            list: タイルの中のお店のリスト、同期していない・同期が古い場合はNone
+        """
+        max_age_hours = Config.RESTAURANT_INDEX_MAX_AGE_HOURS
+        if max_age_hours <= 0:
+            return None
+        synced_at = self.restaurant_index.get_synced_at(cache_key)
+        if synced_at is None or datetime.now() - synced_at > timedelta(hours=max_age_hours):
+            return None
+
+        lat_min, lat_max, lng_min, lng_max = decode_bbox(tile)
+        restaurants = self.restaurant_index.find_in_bounds(
+            lat_min, lat_max, lng_min, lng_max,
+            budget_code=budget_code, lunch=lunch, genre_code=genre_code, seen_since=synced_at
+        )
+        # 境界線上のお店は隣のタイルと重複しないよう、ジオハッシュで判定し直す
+        return [r for r in restaurants if self._restaurant_tile(r, len(tile)) == tile]
+
+    def _to_cache_entries(self, restaurants: List[Dict]) -> List:
+        """
+        キャッシュに保存する内容を作成（内部メソッド）
+
+        通常は店舗IDのリストだけを保存し、お店の情報はこのサーバーの索引から読み込む。
+        キャッシュを複数のサーバーで共有している場合（Redis）は、他のサーバーの索引には
+        お店がないことがあるので、お店の要約をそのまま保存する。
+
+        Args:
+            restaurants (list): お店（要約）のリスト
+
+        Returns:
+            list: 店舗IDのリスト、またはお店の要約のリスト
+        """
+        if self.cache_service.is_shared:
+            return restaurants
+        return [r['id'] for r in restaurants]
+
+    def _resolve_cached_restaurants(self, entries: List, cache_key: Optional[str] = None) -> List[Dict]:
+        """
+        キャッシュの内容（店舗IDのリスト）をお店のリストに戻す（内部メソッド）
+
+        以前の形式（お店の辞書をそのまま保存したキャッシュ）が混ざっていてもそのまま使う。
+
+        Args:
+            entries (list): 店舗ID（文字列）またはお店の辞書のリスト
+            cache_key (str, optional): entries を取得したキャッシュキー
+                - 指定した場合は、L1キャッシュの内容を戻したお店のリストに置き換える
+
+        Returns:
+            list: お店のリスト（entries と同じ順番。索引にないお店は含まない）
+        """
+        return self._resolve_cached_many({cache_key: entries})[cache_key]
+
+    def _resolve_cached_many(self, cached: Dict[Optional[str], List]) -> Dict[Optional[str], List[Dict]]:
+        """
+        複数のキャッシュの内容を、1回の索引の検索でまとめてお店のリストに戻す（内部メソッド）
+
+        店舗IDを戻したキャッシュは、L1キャッシュの内容をお店のリストに置き換える。
+        次にL1にヒットしたときは、索引（SQLite）の検索とお店ごとのJSONの解析をしない。
+        L2には店舗IDのリストのまま残すので、保存サイズは変わらない。
+
+        Args:
+            cached (dict): キャッシュキー → 店舗ID（文字列）またはお店の辞書のリスト
+                - キャッシュキーが None の内容はL1を置き換えない
+
+        Returns:
+            dict: キャッシュキー → お店のリスト（元の順番。索引にないお店は含まない）
+        """
+        restaurant_ids = list(dict.fromkeys(
+            entry for entries in cached.values() for entry in entries if isinstance(entry, str)
+        ))
+        found = {}
+        if restaurant_ids:
+            found = {r['id']: r for r in self.restaurant_index.get_restaurants(restaurant_ids)}
+
+        resolved = {}
+        for cache_key, entries in cached.items():
+            restaurants = []
+            has_ids = False
+            for entry in entries:
+                if isinstance(entry, dict):
+                    restaurants.append(entry)
+                elif isinstance(entry, str):
+                    has_ids = True
+                    if entry in found:
+                        restaurants.append(found[entry])
+            if has_ids and cache_key is not None:
+                # サイズはお店の数からの見積もり（変換のたびにシリアライズし直さない）
+                self.cache_service.replace_in_memory(
+                    cache_key, entries, restaurants, len(restaurants) * SUMMARY_SIZE_ESTIMATE
+                )
+            resolved[cache_key] = restaurants
+        return resolved
+
+    def _fetch_restaurants(self, cache_key: str, lat: float, lon: float, radius: int,
+                           budget_code: str, lunch: int, genre_code: str, middle_area: str,
+                           tile: Optional[str] = None, ttl: int = 600) -> List[Dict]:
+        """
+        Hot Pepper APIからレストランを検索してキャッシュに保存（内部メソッド）
+
+        Args:
+            cache_key (str): 保存先のキャッシュキー
+            lat, lon, radius, budget_code, lunch, genre_code, middle_area:
+                search_restaurants() と同じ検索条件
+            tile (str, optional): ジオハッシュ。指定時はタイルの中のお店だけを保存して返す
+            ttl (int): キャッシュの有効期間（秒）
+
+        Returns:
+            list: レストラン情報のリスト（エラー時はフォールバックまたは空リスト）
+        """
         try:
             # ====== ステップ4: APIリクエストのパラメータを準備 ======
             # Hot Pepper APIに送信するパラメータを辞書形式で作成
             params = {
                 'key': self.api_key,           # APIキー（認証用）
-                'count': 100,                  # 最大取得件数（100件まで一度に取得）
+                'count': self.MAX_RESULTS_PER_REQUEST,  # 最大取得件数（100件まで一度に取得）
                 'format': 'json'               # レスポンス形式（JSON形式で受け取る）
             }
             
@@ -227,33 +764,27 @@ class RestaurantService:
             else:
                 print(f"レストラン検索API呼び出し: lat={lat}, lon={lon}, radius={radius}km, budget={budget_code}, lunch={lunch}, genre={genre_code}")
 
-            # ====== ステップ5: Hot Pepper APIにHTTPリクエストを送信 ======
-            # requests.get() でAPIサーバーにアクセス
-            # timeout=10秒 を設定してサーバーが応答しない時は諦める
-            response = requests.get(self.api_base_url, params=params, timeout=self.timeout)
-            
-            # ====== ステップ6: レスポンスのステータスコードを確認 ======
-            # raise_for_status() でエラーレスポンス（404, 500など）が来たら例外を投げる
-            response.raise_for_status()
-
-            # ====== ステップ7: JSONデータを解析 ======
-            # APIからのレスポンスはJSON形式なので、Pythonの辞書に変換
-            data = response.json()
+            # ====== ステップ5〜8: Hot Pepper APIからお店を取得 ======
+            # 100件を超える場合は2ページ目以降を並列に取得する（ページごとに索引へ取り込む）
+            seen_at = datetime.now()
+            restaurants, complete = self._fetch_all_pages(params, seen_at)
 
-            # エラーレスポンスをチェック
-            # Hot Pepper APIは 'results' キーに検索結果を入れて返すので、これがないとエラー
-            if 'results' not in data:
-                raise ValueError("APIレスポンスに結果が含まれていません")
+            # 全ページを取得できた場合は条件に合うお店を全て取り込めたので、同期日時を記録する
+            # （タイルは次回キャッシュが切れても、同期から間もなければAPIを呼ばずに索引から答えられる。
+            #  条件なしの検索を全件取得できていれば、条件付きの検索はそこから絞り込める）
+            if complete:
+                self.restaurant_index.mark_synced(cache_key, seen_at)
+            else:
+                self.restaurant_index.clear_synced(cache_key)
 
-            # ====== ステップ8: レストランリストを抽出 ======
-            # data['results']['shop'] にレストラン情報の配列が入っている
-            # _format_restaurant_data() で使いやすい形式に整形
-            restaurants = self._format_restaurant_data(data['results'].get('shop', []))
+            if tile:
+                restaurants = [r for r in restaurants if self._restaurant_tile(r, len(tile)) == tile]
 
             # ====== ステップ9: データをキャッシュに保存（次回の高速化のため) ======
-            # TTL（Time To Live）= 600秒（10分間）有効
-            # 10分後には古いデータになるので、再度APIから取得する
-            self.cache_service.set_cached_data(cache_key, restaurants, ttl=600)
+            # TTL（Time To Live）= 600秒（10分間）有効（事前取得ではランチの時間帯が終わるまで有効）
+            # 有効期間が過ぎると古いデータになるので、再度APIから取得する
+            # お店の情報は索引にあるので、キャッシュには店舗IDのリストだけを保存する
+            self.cache_service.set_cached_data(cache_key, self._to_cache_entries(restaurants), ttl=ttl)
 
             # ====== ステップ10: レストランリストを返す ======
             print(f"レストラン検索成功: {len(restaurants)}件取得")
@@ -295,6 +826,144 @@ class RestaurantService:
             print(f"レストラン検索で予期しないエラー: {e}")
             return []
 
+    def _fetch_all_pages(self, params: Dict, seen_at: datetime) -> Tuple[List[Dict], bool]:
+        """
+        検索条件に合うお店を、必要なページ数だけ取得（内部メソッド）
+
+        【処理の流れ】
+        1. 1ページ目を取得し、検索条件に合うお店の総数（results_available）を確認
+        2. 総数が100件を超える場合は、上限（RESTAURANT_MAX_RESULTS）までの残りのページを並列に取得
+        3. ページが届いた順に索引へ取り込み、最後にページの順番どおりに並べる
+        4. 検索結果はルーレットで使う項目だけに要約する（SUMMARY_FIELDS、詳細は索引の detail 列）
+
+        2ページ目以降の取得に失敗した場合は、取得できたページのお店だけを返す。
+
+        Args:
+            params (dict): APIリクエストのパラメータ（key, count, 検索条件）
+            seen_at (datetime): 索引に記録する「見かけた日時」
+
+        Returns:
+            tuple: (要約したお店のリスト, 検索条件に合うお店を全て取得できた場合True)
+
+        Raises:
+            requests.exceptions.RequestException, ValueError: 1ページ目の取得に失敗した場合
+        """
+        first_page = self._request_page(params, start=1)
+        first_restaurants = self._format_restaurant_data(first_page.get('shop', []))
+        # 取得したお店は全て索引に取り込む（タイルの外のお店も、最新の情報として保存）
+        self.restaurant_index.upsert_restaurants(first_restaurants, seen_at=seen_at)
+        pages = {1: [project_summary(r) for r in first_restaurants]}
+
+        available = self._parse_results_available(first_page, len(pages[1]))
+        target = min(available, self.max_results)
+        starts = list(range(1 + self.MAX_RESULTS_PER_REQUEST, target + 1, self.MAX_RESULTS_PER_REQUEST))
+
+        page_errors = 0
+        futures = {self.page_executor.submit(self._request_page, params, start): start for start in starts}
+        for future in as_completed(futures):
+            start = futures[future]
+            try:
+                page = self._format_restaurant_data(future.result().get('shop', []))
+            except (requests.exceptions.RequestException, ValueError, KeyError) as e:
+                print(f"レストラン検索API ページ取得エラー (start={start}): {e}")
+                page_errors += 1
+                continue
+            self.restaurant_index.upsert_restaurants(page, seen_at=seen_at)
+            pages[start] = [project_summary(r) for r in page]
+
+        # ページの順番どおりに並べる（ページの境目でお店が重複した場合は1件にまとめる）
+        restaurants = []
+        seen_ids = set()
+        for start in sorted(pages):
+            for restaurant in pages[start]:
+                if restaurant.get('id') not in seen_ids:
+                    seen_ids.add(restaurant.get('id'))
+                    restaurants.append(restaurant)
+
+        self._record_page_stats(pages=len(pages), truncated=available > self.max_results, page_errors=page_errors)
+        if len(pages) > 1 or available > self.max_results:
+            print(f"レストラン検索 ページ取得: {len(pages)}ページ, {len(restaurants)}/{available}件")
+
+        complete = page_errors == 0 and available <= self.max_results
+        return restaurants, complete
+
+    def _request_page(self, params: Dict, start: int) -> Dict:
+        """
+        Hot Pepper APIから1ページ分の検索結果を取得（内部メソッド）
+
+        Args:
+            params (dict): APIリクエストのパラメータ
+            start (int): 何件目から取得するか（1から始まる）
+
+        Returns:
+            dict: APIレスポンスの results（shop, results_available など）
+
+        Raises:
+            requests.exceptions.RequestException: HTTPエラー・ネットワークエラーの場合
+            ValueError: レスポンスに結果が含まれていない場合
+        """
+        if start > 1:
+            params = dict(params, start=start)
+
+        # session.get() でAPIサーバーにアクセス（keep-aliveで接続を使い回す）
+        # 接続3.05秒・応答待ち10秒のタイムアウトを設定してサーバーが応答しない時は諦める
+        response = self.session.get(self.api_base_url, params=params,
+                                    timeout=(self.connect_timeout, self.timeout))
+
+        # raise_for_status() でエラーレスポンス（404, 500など）が来たら例外を投げる
+        response.raise_for_status()
+
+        # APIからのレスポンスはJSON形式なので、Pythonの辞書に変換
+        data = response.json()
+
+        # Hot Pepper APIは 'results' キーに検索結果を入れて返すので、これがないとエラー
+        if 'results' not in data:
+            raise ValueError("APIレスポンスに結果が含まれていません")
+        return data['results']
+
+    @staticmethod
+    def _parse_results_available(results: Dict, default: int) -> int:
+        """
+        検索条件に合うお店の総数（results_available）を取得（内部メソッド）
+
+        Args:
+            results (dict): APIレスポンスの results
+            default (int): 総数が含まれていない場合の値
+
+        Returns:
+            int: お店の総数
+        """
+        try:
+            return max(int(results.get('results_available', default)), default)
+        except (TypeError, ValueError):
+            return default
+
+    def _record_page_stats(self, pages: int, truncated: bool, page_errors: int) -> None:
+        """ページ取得の統計情報を記録（内部メソッド）"""
+        with self._page_stats_lock:
+            self._page_stats['searches'] += 1
+            self._page_stats['pages'] += pages
+            self._page_stats['max_pages'] = max(self._page_stats['max_pages'], pages)
+            self._page_stats['page_errors'] += page_errors
+            if truncated:
+                self._page_stats['truncated'] += 1
+
+    def get_page_stats(self) -> Dict[str, float]:
+        """
+        ページ取得の統計情報を取得
+
+        Returns:
+            dict: API検索の回数、取得したページ数、1回あたりの平均・最大ページ数、
+                上限で打ち切った検索の数、ページ取得エラーの数、
+                条件なしの検索結果から絞り込んだ（APIを呼ばなかった）回数、
+                APIから取得したタイルの数、締め切りに間に合わなかったタイルの数
+        """
+        with self._page_stats_lock:
+            stats = dict(self._page_stats)
+        stats['pages_per_search'] = stats['pages'] / stats['searches'] if stats['searches'] else 0.0
+        stats['max_results'] = self.max_results
+        return stats
+
     def filter_by_budget(self, restaurants: List[Dict], max_budget: int = None) -> List[Dict]:
         """
         予算でレストランをフィルタリング
@@ -453,6 +1122,114 @@ class RestaurantService:
         else:
             return 5  # 3000m以内（2400m以上）
 
+    def walking_time_to_radius_km(self, minutes: int) -> float:
+        """
+        徒歩時間（分）をカバーする半径（直線距離km）に変換
+
+        DistanceCalculator と同じ基準（道のり = 直線距離×1.3、時速4km）で
+        徒歩時間から直線距離を求める。
+        徒歩時間は分単位で切り捨てて表示されるため、1分ぶん余裕を持たせる。
+
+        Args:
+            minutes (int): 徒歩時間（分）
+
+        Returns:
+            float: 半径（km、小数点以下3桁）
+
+        Example:
+            >>> service.walking_time_to_radius_km(10)
+            0.564
+        """
+        calculator = self.distance_calculator
+        walking_km = (minutes + 1) * calculator.WALKING_SPEED_KM_PER_HOUR / 60
+        return round(walking_km / calculator.WALKING_DISTANCE_MULTIPLIER, 3)
+
+    def filter_by_walking_time(self, restaurants: List[Dict], lat: float, lon: float,
+                               max_walking_time_min: int) -> List[Dict]:
+        """
+        レストランリストを実際の徒歩時間で絞り込み、近い順に並べる
+
+        Args:
+            restaurants (list): レストラン情報のリスト
+            lat (float): 現在地の緯度
+            lon (float): 現在地の経度
+            max_walking_time_min (int): 徒歩時間の上限（分）
+
+        Returns:
+            list: 徒歩時間の上限以内のレストラン情報のリスト（近い順）
+        """
+        return self._filter_by_distance(restaurants, lat, lon, max_walking_time_min=max_walking_time_min)
+
+    def _filter_by_distance(self, restaurants: List[Dict], lat: float, lon: float,
+                            max_distance_km: Optional[float] = None,
+                            max_walking_time_min: Optional[int] = None) -> List[Dict]:
+        """
+        レストランリストを直線距離または徒歩時間で絞り込み、近い順に並べる（内部メソッド）
+
+        距離は DistanceCalculator.calculate_distances_batch で全件まとめて計算する
+        （calculate_walking_distance と同じ値になる）。
+        元のリスト（キャッシュと共有）や各レストランの辞書は変更しない。
+
+        Args:
+            restaurants (list): レストラン情報のリスト
+            lat (float): 現在地の緯度
+            lon (float): 現在地の経度
+            max_distance_km (float, optional): 直線距離の上限（km）
+            max_walking_time_min (int, optional): 徒歩時間の上限（分）
+
+        Returns:
+            list: 条件を満たすレストラン情報のリスト（近い順）
+        """
+        candidates = []
+        lats = []
+        lngs = []
+        for restaurant in restaurants:
+            try:
+                restaurant_lat = float(restaurant.get('lat'))
+                restaurant_lng = float(restaurant.get('lng'))
+            except (TypeError, ValueError):
+                continue
+            if not (-90 <= restaurant_lat <= 90) or not (-180 <= restaurant_lng <= 180):
+                continue
+            candidates.append(restaurant)
+            lats.append(restaurant_lat)
+            lngs.append(restaurant_lng)
+
+        try:
+            distances = self.distance_calculator.calculate_distances_batch(lat, lon, lats, lngs)
+        except ValueError as e:
+            print(f"距離での絞り込みエラー（絞り込まずに返します）: {e}")
+            return restaurants
+
+        within = []
+        for restaurant, straight_km, minutes in zip(
+                candidates, distances['straight_km'], distances['walking_time_minutes']):
+            if max_distance_km is not None and straight_km > max_distance_km:
+                continue
+            if max_walking_time_min is not None and minutes > max_walking_time_min:
+                continue
+            within.append((straight_km, restaurant))
+        within.sort(key=lambda item: item[0])
+
+        if max_walking_time_min is not None:
+            print(f"徒歩{max_walking_time_min}分以内で絞り込み: {len(restaurants)}件 → {len(within)}件")
+        else:
+            print(f"半径{max_distance_km}km以内で絞り込み: {len(restaurants)}件 → {len(within)}件")
+        return [restaurant for _, restaurant in within]
+
+    @staticmethod
+    def _restaurant_tile(restaurant: Dict, precision: int) -> Optional[str]:
+        """
+        お店の座標が入っているタイル（ジオハッシュ）を取得（内部メソッド）
+
+        Returns:
+            str: ジオハッシュ、座標が正しくない場合はNone
+        """
+        try:
+            return geohash_encode(float(restaurant['lat']), float(restaurant['lng']), precision)
+        except (KeyError, TypeError, ValueError):
+            return None
+
     def _format_restaurant_data(self, api_restaurants: List[Dict]) -> List[Dict]:
         """
         APIレスポンスを標準形式に整形
@@ -499,10 +1276,12 @@ class RestaurantService:
                     'lat': float(restaurant.get('lat', 0)),                      # 緯度
                     'lng': float(restaurant.get('lng', 0)),                      # 経度
                     'genre': restaurant.get('genre', {}).get('name', ''),        # ジャンル（例: 居酒屋、イタリアン）
+                    'genre_code': restaurant.get('genre', {}).get('code', ''),   # ジャンルコード（例: G001）
                     
                     # === 予算情報 ===
                     'budget_average': budget_average,                            # 平均予算（円）
                     'budget_name': restaurant.get('budget', {}).get('name', ''), # 予算名（例: 〜1000円）
+                    'budget_code': restaurant.get('budget', {}).get('code', ''),  # 予算コード（例: B010）
                     
                     # === お店の特徴 ===
                     'catch': restaurant.get('catch', ''),                        # キャッチコピー
@@ -641,17 +1420,29 @@ class RestaurantService:
 
     def get_restaurant_by_id(self, restaurant_id: str) -> Optional[Dict]:
         """
-        レストランIDから詳細情報を取得
+        レストランIDから詳細情報（APIの全項目）を取得
+
+        検索結果はルーレットで使う項目だけに要約しているため、
+        設備・サービスなどの詳細が必要な場合はこのメソッドで1件ずつ取得する。
 
         Args:
             restaurant_id (str): レストランID
 
         Returns:
             dict: レストラン詳細情報、見つからない場合はNone
+                - 詳細を取得できない場合（APIキーなし・APIエラー）は、索引にある要約を返す
         """
-        # APIキーが設定されていない場合はNoneを返す
+        # ローカルの索引に詳細があればAPIを呼ばずに返す
+        restaurant = self.restaurant_index.get_restaurant_detail(restaurant_id)
+        if restaurant:
+            return restaurant
+
+        # 詳細がない場合（RESTAURANT_STORE_DETAILS=false）はAPIから取得し、取得できなければ要約を返す
+        summary = self.restaurant_index.get_restaurant(restaurant_id)
+
+        # APIキーが設定されていない場合は要約（索引にもなければNone）を返す
         if not self.api_key:
-            return None
+            return summary
 
         try:
             params = {
@@ -660,7 +1451,8 @@ class RestaurantService:
                 'format': 'json'
             }
 
-            response = requests.get(self.api_base_url, params=params, timeout=self.timeout)
+            response = self.session.get(self.api_base_url, params=params,
+                                        timeout=(self.connect_timeout, self.timeout))
             response.raise_for_status()
 
             data = response.json()
@@ -668,13 +1460,15 @@ class RestaurantService:
             if 'results' in data and 'shop' in data['results']:
                 shops = data['results']['shop']
                 if shops:
-                    return self._format_restaurant_data([shops[0]])[0]
+                    restaurant = self._format_restaurant_data([shops[0]])[0]
+                    self.restaurant_index.upsert_restaurants([restaurant], store_details=True)
+                    return restaurant
 
-            return None
+            return summary
 
         except Exception as e:
             print(f"レストラン詳細取得エラー (ID: {restaurant_id}): {e}")
-            return None
+            return summary
 
     def _get_fallback_cache_data(self, cache_key: str) -> List[Dict]:
         """
@@ -687,30 +1481,19 @@ class RestaurantService:
             list: キャッシュされたレストラン情報、存在しない場合は空リスト
         """
         try:
-            from ..models.database import get_db_connection
-
-            with get_db_connection(self.cache_service.db_path) as conn:
-                cursor = conn.execute('''
-                    SELECT data FROM cache
-                    WHERE cache_key = ?
-                    ORDER BY created_at DESC
-                    LIMIT 1
-                ''', (cache_key,))
+            cached_data = self.cache_service.get_fallback_data(cache_key)
+            if cached_data is None:
+                return []
 
-                row = cursor.fetchone()
+            # 期限切れでもデータを返す（フォールバック用）
+            fallback_data = self._resolve_cached_restaurants(cached_data)
 
-                if row is None:
-                    return []
+            # ソース情報を更新
+            for restaurant in fallback_data:
+                restaurant['source'] = 'fallback_cache'
 
-                # 期限切れでもデータを返す（フォールバック用）
-                fallback_data = self.cache_service.deserialize_data(row['data'])
-
-                # ソース情報を更新
-                for restaurant in fallback_data:
-                    restaurant['source'] = 'fallback_cache'
-
-                print(f"フォールバック用キャッシュデータを使用: {len(fallback_data)}件")
-                return fallback_data
+            print(f"フォールバック用キャッシュデータを使用: {len(fallback_data)}件")
+            return fallback_data
 
         except Exception as e:
             print(f"フォールバックキャッシュ取得エラー: {e}")
@@ -21,7 +21,15 @@ import requests
 import os
 from typing import Dict, Optional
 from datetime import datetime
+from .cache_keys import CacheKey
 from .cache_service import CacheService
+from ..config import Config
+from ..utils.http_client import get_http_session
+from ..utils.request_memo import request_memoized
+from ..utils.single_flight import SingleFlight, default_single_flight
+
+# 天気のキャッシュキー（緯度・経度は小数点以下4桁に丸めた値）
+WEATHER_CACHE_KEY = CacheKey('weather', ('lat', 'lon'))
 
 
 class WeatherService:
@@ -108,7 +116,9 @@ class WeatherService:
         'thundery outbreaks nearby': '近くで雷雨'  # 新しく追加
     }
 
-    def __init__(self, api_key: Optional[str] = None, cache_service: Optional[CacheService] = None):
+    def __init__(self, api_key: Optional[str] = None, cache_service: Optional[CacheService] = None,
+                 single_flight: Optional[SingleFlight] = None,
+                 session: Optional[requests.Session] = None):
         """
         天気サービスを初期化します
         
@@ -116,10 +126,13 @@ class WeatherService:
         - WeatherAPI.comのAPIキー（外部サービスへのアクセスに必要）
         - キャッシュサービス（同じデータを何度も取得しないため）
         - APIのURLとタイムアウト設定
+        - 同時リクエスト集約（同じ場所への同時問い合わせを1回にまとめるため）
 
         Args:
             api_key: WeatherAPI.comのAPIキー（省略可、環境変数から取得）
             cache_service: キャッシュサービス（省略可、自動作成）
+            single_flight: 同時リクエスト集約（省略可、プロセス共有のものを使用）
+            session: HTTPセッション（省略可、WeatherAPI用の共有セッションを使用）
         """
         # APIキーの取得（2つの方法を試す）
         # 1. 引数で渡されたAPIキーを使用
@@ -129,18 +142,26 @@ class WeatherService:
         
         # キャッシュサービスの設定（同じデータを繰り返し取得しないため）
         self.cache_service = cache_service or CacheService()
+
+        # 同時リクエスト集約（キャッシュが切れた瞬間の一斉アクセス対策）
+        self.single_flight = single_flight or default_single_flight
+
+        # HTTPセッション（接続を使い回してTCP/TLSのハンドシェイクを省略するため）
+        self.session = session or get_http_session('weatherapi')
         
         # WeatherAPI.comのAPIエンドポイント（URL）
         self.api_base_url = "http://api.weatherapi.com/v1/current.json"
         
-        # APIリクエストのタイムアウト設定（10秒）
+        # APIリクエストのタイムアウト設定（接続3.05秒、応答待ち10秒）
         # タイムアウト = サーバーからの応答を待つ最大時間
-        self.timeout = 10
+        self.connect_timeout = Config.HTTP_CONNECT_TIMEOUT
+        self.timeout = Config.HTTP_READ_TIMEOUT
 
         # APIキーが設定されていない場合は警告を表示
         if not self.api_key:
             print("警告: WeatherAPI.com APIキーが設定されていません。デフォルト天気情報を使用します。")
 
+    @request_memoized('weather')
     def get_current_weather(self, lat: float, lon: float) -> Dict[str, any]:
         """
         指定された場所の現在の天気情報を取得します
@@ -172,14 +193,23 @@ class WeatherService:
         # ===== ステップ1: キャッシュキーを生成 =====
         # キャッシュキー = データを識別するための文字列
         # 同じ場所の天気は、少しの時間（10分）なら同じデータを使い回す
-        cache_key = self.cache_service.generate_cache_key(
-            'weather',
-            lat=round(lat, 4),  # 小数点以下4桁に丸める（例: 35.681234 → 35.6812）
-            lon=round(lon, 4)   # これにより、ほぼ同じ場所の天気は同じキャッシュを使える
+        cache_key = WEATHER_CACHE_KEY.build(
+            round(lat, 4),  # 小数点以下4桁に丸める（例: 35.681234 → 35.6812）
+            round(lon, 4)   # これにより、ほぼ同じ場所の天気は同じキャッシュを使える
         )
 
+        # 同じ場所の天気を同時に問い合わせた場合は、API呼び出しを1回にまとめて結果を共有する
+        def fetch():
+            return self.single_flight.do(
+                cache_key,
+                lambda: self._fetch_current_weather(lat, lon, cache_key)
+            )
+
         # ===== ステップ2: キャッシュからデータ取得を試みる =====
-        cached_data = self.cache_service.get_cached_data(cache_key)
+        # 有効期限切れ直後なら古いデータを返し、APIからの再取得はバックグラウンドで行う
+        cached_data = self.cache_service.get_cached_data(
+            cache_key, refresh=fetch if self.api_key else None
+        )
         if cached_data:
             # キャッシュにデータがあった → APIを呼ばずに済む
             desc = cached_data.get('description', cached_data.get('condition', '天気'))
@@ -192,8 +222,23 @@ class WeatherService:
             print("APIキーが未設定のため、デフォルト天気情報を返します")
             return self._get_default_weather()
 
+        # ===== ステップ4: APIから取得 =====
+        return fetch()
+
+    def _fetch_current_weather(self, lat: float, lon: float, cache_key: str) -> Dict[str, any]:
+        """
+        WeatherAPI.comから天気情報を取得してキャッシュに保存（内部メソッド）
+
+        Args:
+            lat: 緯度
+            lon: 経度
+            cache_key: 保存先のキャッシュキー
+
+        Returns:
+            dict: 天気情報の辞書（エラー時はフォールバックまたはデフォルト天気）
+        """
         try:
-            # ===== ステップ4: APIリクエストのパラメータを準備 =====
+            # ===== ステップ1: APIリクエストのパラメータを準備 =====
             params = {
                 'key': self.api_key,        # 認証用のAPIキー
                 'q': f"{lat},{lon}",        # 緯度・経度を「35.6812,139.7671」の形式で指定
@@ -202,18 +247,19 @@ class WeatherService:
 
             print(f"天気情報APIを呼び出します: 緯度={lat}, 経度={lon}")
 
-            # ===== ステップ5: APIリクエストを実行 =====
-            # requests.get = HTTPのGETリクエストを送信する関数
-            response = requests.get(self.api_base_url, params=params, timeout=self.timeout)
+            # ===== ステップ2: APIリクエストを実行 =====
+            # session.get = HTTPのGETリクエストを送信する関数（接続は前回のものを使い回す）
+            response = self.session.get(self.api_base_url, params=params,
+                                        timeout=(self.connect_timeout, self.timeout))
             response.raise_for_status()  # エラーがあれば例外を発生させる
 
-            # ===== ステップ6: レスポンスをJSON形式で解析 =====
+            # ===== ステップ3: レスポンスをJSON形式で解析 =====
             data = response.json()
 
-            # ===== ステップ7: データを使いやすい形式に整形 =====
+            # ===== ステップ4: データを使いやすい形式に整形 =====
             weather_data = self._format_weather_data(data)
 
-            # ===== ステップ8: データをキャッシュに保存 =====
+            # ===== ステップ5: データをキャッシュに保存 =====
             # ttl=600 → 600秒（10分）間キャッシュを保持
             self.cache_service.set_cached_data(cache_key, weather_data, ttl=600)
 
@@ -320,19 +366,10 @@ class WeatherService:
             dict or None: 古いキャッシュデータ（存在する場合）
         """
         try:
-            from ..models.database import get_db_connection
-
-            with get_db_connection(self.cache_service.db_path) as conn:
-                cursor = conn.execute('''
-                    SELECT data FROM cache WHERE cache_key = ?
-                    ORDER BY created_at DESC LIMIT 1
-                ''', (cache_key,))
-                result = cursor.fetchone()
-
-                if result:
-                    data = self.cache_service.deserialize_data(result[0])
-                    print(f"期限切れキャッシュデータを使用: {data.get('description', '不明')}")
-                    return data
+            data = self.cache_service.get_fallback_data(cache_key)
+            if data:
+                print(f"期限切れキャッシュデータを使用: {data.get('description', '不明')}")
+                return data
 
         except Exception as e:
             print(f"フォールバックキャッシュデータ取得エラー: {e}")
@@ -361,18 +398,20 @@ class WeatherService:
         else:
             return f"{description}、気温{temp}°C"
 
-    def is_good_weather_for_walking(self, lat: float, lon: float) -> bool:
+    def is_good_weather_for_walking(self, lat: float, lon: float, weather: Optional[Dict] = None) -> bool:
         """
         徒歩に適した天気かどうかを判定
 
         Args:
             lat (float): 緯度
             lon (float): 経度
+            weather (dict, optional): 取得済みの天気データ（指定した場合は再取得しない）
 
         Returns:
             bool: 徒歩に適している場合True
         """
-        weather = self.get_current_weather(lat, lon)
+        if weather is None:
+            weather = self.get_current_weather(lat, lon)
         
         # 雨や雪が降っている場合は適さない
         condition = weather['condition'].lower()
@@ -0,0 +1,142 @@
+"""バックグラウンド更新モジュール - 古いキャッシュを返しつつ裏で最新データを取得する
+
+【このモジュールがやること】
+キャッシュの有効期限が切れた直後のリクエストには古いデータ（stale）をすぐに返し、
+外部APIからの再取得はバックグラウンドのスレッドで行います。
+
+【なぜ必要か】
+有効期限切れのたびにユーザーが外部APIの応答（最大10秒）を待つと、
+ページ表示やルーレットの結果表示が遅くなってしまいます。
+
+【ポイント】
+・同じキーの更新が既に予約されている場合は重複して予約しません
+・更新処理で例外が発生してもリクエスト処理には影響しません
+・スレッド数は上限付きで、アプリ終了時に shutdown() で停止します
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from ..config import Config
+
+
+class BackgroundRefresher:
+    """
+    キャッシュ更新をバックグラウンドで実行するクラス
+
+    【使い方の例】
+        refresher = BackgroundRefresher(max_workers=2)
+        refresher.schedule(cache_key, lambda: fetch_weather(lat, lon))
+    """
+
+    def __init__(self, max_workers: int = 2):
+        """
+        バックグラウンド更新を初期化
+
+        Args:
+            max_workers: 同時に実行する更新処理の最大数
+        """
+        self.max_workers = max(1, max_workers)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = set()
+
+        # 統計情報
+        self._scheduled = 0
+        self._deduplicated = 0
+        self._completed = 0
+        self._failed = 0
+
+    def schedule(self, key: str, fn: Callable[[], Any]) -> bool:
+        """
+        更新処理を予約する
+
+        Args:
+            key: 更新対象のキー（キャッシュキー）
+            fn: 更新処理（外部APIから取得してキャッシュに保存する関数）
+
+        Returns:
+            予約した場合True、同じキーの更新が既に予約済みの場合False
+        """
+        with self._lock:
+            if key in self._pending:
+                self._deduplicated += 1
+                return False
+            if self._executor is None:
+                # 初回の予約時にスレッドプールを作成（使わない場合はスレッドを起動しない）
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix='cache-refresh'
+                )
+            self._pending.add(key)
+            self._scheduled += 1
+            executor = self._executor
+
+        try:
+            executor.submit(self._run, key, fn)
+        except RuntimeError:
+            # shutdown() 後に予約された場合
+            with self._lock:
+                self._pending.discard(key)
+            return False
+        return True
+
+    def _run(self, key: str, fn: Callable[[], Any]) -> None:
+        """更新処理を実行（内部メソッド、ワーカースレッドで実行される）"""
+        try:
+            fn()
+            with self._lock:
+                self._completed += 1
+        except Exception as e:
+            print(f"バックグラウンド更新エラー (key: {key}): {e}")
+            with self._lock:
+                self._failed += 1
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+
+    def is_pending(self, key: str) -> bool:
+        """
+        キーの更新が予約・実行中かどうか
+
+        Args:
+            key: キャッシュキー
+
+        Returns:
+            予約・実行中の場合True
+        """
+        with self._lock:
+            return key in self._pending
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        スレッドプールを停止する
+
+        Args:
+            wait: 実行中の更新処理の完了を待つ場合True
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        統計情報を取得
+
+        Returns:
+            dict: 予約数、重複のため予約しなかった数、完了数、失敗数、実行待ち数
+        """
+        with self._lock:
+            return {
+                'scheduled': self._scheduled,
+                'deduplicated': self._deduplicated,
+                'completed': self._completed,
+                'failed': self._failed,
+                'pending': len(self._pending),
+            }
+
+
+# プロセス全体で共有するインスタンス
+default_background_refresher = BackgroundRefresher(max_workers=Config.CACHE_REFRESH_WORKERS)
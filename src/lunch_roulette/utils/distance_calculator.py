@@ -11,12 +11,20 @@ Googleマップで「ここから〇〇まで何km」と表示されるのと同
 ・地球は丸い（球体）ので、特別な計算式を使います
 ・直線距離だけでなく、実際に歩く距離も計算します
 ・緯度・経度という座標から距離を求めます
+・検索結果のお店全部（最大100件）の距離を1回でまとめて計算することもできます
+  （NumPyがあればNumPyで、なければ標準ライブラリの array で計算します）
 """
 
 import math  # 数学の計算に使うライブラリ（sin, cos, 平方根など）
-from typing import Optional  # 型ヒント用（プログラムをわかりやすくするため）
+from array import array  # NumPyがない環境でのまとめて計算用（float配列）
+from typing import Dict, List, Optional, Sequence  # 型ヒント用（プログラムをわかりやすくするため）
 from .error_handler import ErrorHandler  # エラー処理用
 
+try:
+    import numpy as np  # あれば使う（PythonAnywhere無料プランなどでは入っていないことがある）
+except ImportError:
+    np = None
+
 
 class DistanceCalculator:
     """
@@ -215,37 +223,8 @@ class DistanceCalculator:
             # ステップ1: 2地点間の直線距離を計算
             straight_distance_km = self.calculate_distance(lat1, lon1, lat2, lon2)
 
-            # ステップ2: 実際の徒歩距離を計算
-            # 道路は曲がっているので、直線距離の1.3倍を実際の歩行距離とします
-            # （例: 直線で1kmなら、実際には1.3km歩くことになる）
-            walking_distance_km = straight_distance_km * self.WALKING_DISTANCE_MULTIPLIER
-            
-            # キロメートルをメートルに変換（1km = 1000m）
-            walking_distance_m = walking_distance_km * 1000
-
-            # ステップ3: 徒歩所要時間を計算
-            # 平均的な歩行速度は時速4kmなので:
-            # 時間（時間）= 距離（km）÷ 速度（km/時）
-            # 時間（分）= 時間（時間）× 60
-            # つまり、距離（km）× 15 = 時間（分）
-            walking_time_hours = walking_distance_km / self.WALKING_SPEED_KM_PER_HOUR
-            walking_time_minutes = int(walking_time_hours * 60)
-
-            # ステップ4: 画面に表示しやすい形式に整形
-            # 1km未満なら「○○m」、1km以上なら「○.○km」と表示
-            if walking_distance_m < 1000:
-                distance_display = f"{int(walking_distance_m)}m"
-            else:
-                distance_display = f"{walking_distance_km:.1f}km"
-
-            # 計算結果をまとめて返す
-            return {
-                'distance_km': round(walking_distance_km, 3),      # 例: 1.234
-                'distance_m': int(walking_distance_m),              # 例: 1234
-                'walking_time_minutes': walking_time_minutes,       # 例: 18
-                'distance_display': distance_display,               # 例: "1.2km"
-                'time_display': f"徒歩約{walking_time_minutes}分"  # 例: "徒歩約18分"
-            }
+            # ステップ2以降: 徒歩距離・所要時間・表示用の文字列を作る
+            return self.walking_info_from_distance(straight_distance_km)
 
         except Exception as e:
             # エラーが発生した場合は、標準的な値を返す
@@ -262,6 +241,100 @@ class DistanceCalculator:
                 'error_info': error_info
             }
 
+    def walking_info_from_distance(self, straight_distance_km: float) -> dict:
+        """
+        直線距離から徒歩距離・所要時間・表示用の文字列を作ります
+
+        calculate_walking_distance から使います（calculate_distances_batch は同じ計算を配列全体に対して行います）。
+
+        Args:
+            straight_distance_km: 直線距離（キロメートル、calculate_distance の戻り値）
+
+        Returns:
+            dict: calculate_walking_distance と同じ形式の辞書
+        """
+        # ステップ2: 実際の徒歩距離を計算
+        # 道路は曲がっているので、直線距離の1.3倍を実際の歩行距離とします
+        # （例: 直線で1kmなら、実際には1.3km歩くことになる）
+        walking_distance_km = straight_distance_km * self.WALKING_DISTANCE_MULTIPLIER
+
+        # キロメートルをメートルに変換（1km = 1000m）
+        walking_distance_m = walking_distance_km * 1000
+
+        # ステップ3: 徒歩所要時間を計算
+        # 平均的な歩行速度は時速4kmなので:
+        # 時間（時間）= 距離（km）÷ 速度（km/時）
+        # 時間（分）= 時間（時間）× 60
+        # つまり、距離（km）× 15 = 時間（分）
+        walking_time_hours = walking_distance_km / self.WALKING_SPEED_KM_PER_HOUR
+        walking_time_minutes = int(walking_time_hours * 60)
+
+        # ステップ4: 画面に表示しやすい形式に整形
+        # 1km未満なら「○○m」、1km以上なら「○.○km」と表示
+        if walking_distance_m < 1000:
+            distance_display = f"{int(walking_distance_m)}m"
+        else:
+            distance_display = f"{walking_distance_km:.1f}km"
+
+        # 計算結果をまとめて返す
+        return {
+            'distance_km': round(walking_distance_km, 3),      # 例: 1.234
+            'distance_m': int(walking_distance_m),              # 例: 1234
+            'walking_time_minutes': walking_time_minutes,       # 例: 18
+            'distance_display': distance_display,               # 例: "1.2km"
+            'time_display': f"徒歩約{walking_time_minutes}分"  # 例: "徒歩約18分"
+        }
+
+    def calculate_distances_batch(self, user_lat: float, user_lon: float,
+                                  lats: Sequence[float], lngs: Sequence[float]) -> Dict[str, List]:
+        """
+        現在地から複数のお店までの距離をまとめて計算します
+
+        calculate_walking_distance を1件ずつ呼ぶと、お店の数だけ
+        座標チェック・例外処理・関数呼び出しが発生します。
+        この関数は座標チェックを1回にまとめ、ハバースイン公式を配列全体に対して計算します。
+        NumPyがあればNumPyの配列演算で、なければ標準ライブラリの array とループで計算します。
+
+        Args:
+            user_lat: 現在地の緯度
+            user_lon: 現在地の経度
+            lats: お店の緯度のリスト
+            lngs: お店の経度のリスト（lats と同じ長さ）
+
+        Returns:
+            dict: 以下のリストを含む辞書（どれも lats と同じ順番・同じ長さ）
+                - straight_km: 直線距離（キロメートル、calculate_distance と同じ値）
+                - distance_km: 徒歩距離（キロメートル）
+                - distance_m: 徒歩距離（メートル）
+                - walking_time_minutes: 徒歩所要時間（分）
+                - distance_display: 表示用の徒歩距離（例: "850m"、"1.2km"）
+
+        Raises:
+            ValueError: 緯度や経度の値が正しくない場合、lats と lngs の長さが違う場合
+
+        使用例:
+            result = calculator.calculate_distances_batch(35.6812, 139.7671, [35.6896], [139.7006])
+            print(result['walking_time_minutes'])  # 例: [24]
+        """
+        self._validate_coordinates(user_lat, user_lon)
+        if len(lats) != len(lngs):
+            raise ValueError(f"緯度と経度の件数が一致しません（緯度: {len(lats)}件, 経度: {len(lngs)}件）")
+
+        if np is not None:
+            straight_km = self._haversine_numpy(user_lat, user_lon, lats, lngs)
+        else:
+            straight_km = self._haversine_array(user_lat, user_lon, lats, lngs)
+
+        # 徒歩距離と所要時間（walking_info_from_distance と同じ計算）
+        walking_km = [km * self.WALKING_DISTANCE_MULTIPLIER for km in straight_km]
+        return {
+            'straight_km': straight_km,
+            'distance_km': [round(km, 3) for km in walking_km],
+            'distance_m': [int(km * 1000) for km in walking_km],
+            'walking_time_minutes': [int(km / self.WALKING_SPEED_KM_PER_HOUR * 60) for km in walking_km],
+            'distance_display': [f"{int(km * 1000)}m" if km * 1000 < 1000 else f"{km:.1f}km" for km in walking_km],
+        }
+
     def _validate_coordinates(self, lat: float, lon: float) -> None:
         """
         緯度・経度の値が正しいかチェックします
@@ -288,6 +361,63 @@ class DistanceCalculator:
         if not (-180 <= lon <= 180):
             raise ValueError(f"経度は-180から180の範囲である必要があります（入力された値: {lon}）")
 
+    def _haversine_numpy(self, user_lat: float, user_lon: float,
+                         lats: Sequence[float], lngs: Sequence[float]) -> List[float]:
+        """
+        NumPyの配列演算でハバースイン公式をまとめて計算します（内部用）
+
+        Returns:
+            直線距離（キロメートル、小数点以下3桁）のリスト
+        """
+        lat_deg = np.asarray(lats, dtype=float)
+        lon_deg = np.asarray(lngs, dtype=float)
+
+        # 範囲外・NaN の座標が1つでもあればエラー（NaN は比較が常にFalseになるので否定で判定）
+        if not (np.all((lat_deg >= -90) & (lat_deg <= 90)) and np.all((lon_deg >= -180) & (lon_deg <= 180))):
+            raise ValueError("緯度は-90から90、経度は-180から180の範囲である必要があります")
+
+        user_lat_rad = math.radians(user_lat)
+        lat_rad = np.radians(lat_deg)
+        dlat = lat_rad - user_lat_rad
+        dlon = np.radians(lon_deg) - math.radians(user_lon)
+
+        a = np.sin(dlat / 2) ** 2 + math.cos(user_lat_rad) * np.cos(lat_rad) * np.sin(dlon / 2) ** 2
+        c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+        return [round(km, 3) for km in (self.EARTH_RADIUS_KM * c).tolist()]
+
+    def _haversine_array(self, user_lat: float, user_lon: float,
+                         lats: Sequence[float], lngs: Sequence[float]) -> List[float]:
+        """
+        NumPyがない場合に、標準ライブラリだけでハバースイン公式をまとめて計算します（内部用）
+
+        現在地側の値（ラジアン変換・cos）は1回だけ計算し、
+        math の関数はローカル変数に入れてループ内の属性参照を減らします。
+
+        Returns:
+            直線距離（キロメートル、小数点以下3桁）のリスト
+        """
+        lat_deg = array('d', lats)
+        lon_deg = array('d', lngs)
+
+        for lat, lon in zip(lat_deg, lon_deg):
+            if not (-90 <= lat <= 90) or not (-180 <= lon <= 180):
+                raise ValueError(f"緯度・経度の範囲が正しくありません（入力された値: {lat}, {lon}）")
+
+        sin, cos, atan2, sqrt, radians = math.sin, math.cos, math.atan2, math.sqrt, math.radians
+        user_lat_rad = radians(user_lat)
+        user_lon_rad = radians(user_lon)
+        cos_user_lat = cos(user_lat_rad)
+        radius = self.EARTH_RADIUS_KM
+
+        distances = []
+        for lat, lon in zip(lat_deg, lon_deg):
+            lat_rad = radians(lat)
+            dlat = lat_rad - user_lat_rad
+            dlon = radians(lon) - user_lon_rad
+            a = sin(dlat / 2) ** 2 + cos_user_lat * cos(lat_rad) * sin(dlon / 2) ** 2
+            distances.append(round(radius * 2 * atan2(sqrt(a), sqrt(1 - a)), 3))
+        return distances
+
     def _calculate_approximate_distance(self, lat1: float, lon1: float, lat2: float, lon2: float) -> float:
         """
         簡易的な方法で距離を計算します（エラー時の予備手段）
@@ -147,7 +147,8 @@ class ErrorHandler:
                 return ErrorType.API_AUTH_ERROR
             else:
                 return ErrorType.API_NETWORK_ERROR
-        elif isinstance(error, requests.exceptions.Timeout):
+        elif isinstance(error, (requests.exceptions.Timeout, TimeoutError)):
+            # TimeoutError: リクエスト全体の締め切り（Deadline）を過ぎた場合
             return ErrorType.API_TIMEOUT
         elif isinstance(error, requests.exceptions.RequestException):
             return ErrorType.API_NETWORK_ERROR
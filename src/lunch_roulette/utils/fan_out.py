@@ -0,0 +1,171 @@
+"""並列実行モジュール - 1つのリクエスト内で独立した外部API呼び出しを同時に行う
+
+【このモジュールがやること】
+ルーレットで必要な「天気」と「レストラン検索」は互いに依存しないため、
+別々のスレッドで同時に実行し、両方の待ち時間を重ねます。
+
+【なぜ必要か】
+キャッシュが空のとき、順番に呼び出すと待ち時間は「天気API + Hot Pepper API」の合計になります。
+同時に呼び出せば、待ち時間は遅い方の1回分だけになります。
+
+【ポイント】
+・スレッド数には上限があり、アプリ全体で1つのスレッドプールを共有します
+・Deadline で1リクエストあたりの待ち時間の上限（締め切り）を管理します
+・締め切りまでに終わらなかった処理は結果を待たずに次へ進みます
+  （スレッドはそのまま最後まで実行され、取得した結果はキャッシュに保存されます）
+"""
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Optional
+
+from ..config import Config
+
+
+class Deadline:
+    """
+    1リクエストあたりの締め切りを表すクラス
+
+    【使い方の例】
+        deadline = Deadline(8.0)
+        restaurants = future.result(timeout=deadline.remaining())
+    """
+
+    def __init__(self, seconds: float):
+        """
+        締め切りを設定
+
+        Args:
+            seconds: 現在からの制限時間（秒）
+        """
+        self.seconds = seconds
+        self._expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        """
+        締め切りまでの残り時間を取得
+
+        Returns:
+            残り時間（秒）。締め切りを過ぎている場合は0
+        """
+        return max(0.0, self._expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        """締め切りを過ぎている場合True"""
+        return self.remaining() <= 0
+
+
+class FanOutExecutor:
+    """
+    リクエスト内の外部API呼び出しを並列実行するクラス
+
+    【使い方の例】
+        fan_out = FanOutExecutor(max_workers=8)
+        weather_future = fan_out.submit(weather_service.get_current_weather, lat, lon)
+        weather = fan_out.result(weather_future, timeout=0.5, default=default_weather)
+    """
+
+    def __init__(self, max_workers: int = 8):
+        """
+        並列実行を初期化
+
+        Args:
+            max_workers: 同時に実行する処理の最大数（アプリ全体）
+        """
+        self.max_workers = max(1, max_workers)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+        # 統計情報
+        self._submitted = 0
+        self._timeouts = 0
+
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """
+        処理をスレッドプールで実行する
+
+        Args:
+            fn: 実行する関数
+            *args, **kwargs: fn に渡す引数
+
+        Returns:
+            Future: 結果を受け取るためのオブジェクト
+        """
+        with self._lock:
+            if self._executor is None:
+                # 初回の実行時にスレッドプールを作成
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix='fan-out'
+                )
+            self._submitted += 1
+            executor = self._executor
+        return executor.submit(fn, *args, **kwargs)
+
+    def result(self, future: Future, timeout: float, default: Any = None,
+               raise_on_timeout: bool = False) -> Any:
+        """
+        制限時間内に処理の結果を取得する
+
+        Args:
+            future: submit() の戻り値
+            timeout: 待つ最大時間（秒）
+            default: 時間切れの場合に返す値
+            raise_on_timeout: 時間切れの場合に TimeoutError を送出する場合True
+
+        Returns:
+            処理の戻り値、または時間切れの場合 default
+
+        Raises:
+            TimeoutError: raise_on_timeout=True で時間切れの場合
+            処理中に発生した例外
+        """
+        try:
+            return future.result(timeout=max(0.0, timeout))
+        except FutureTimeoutError:
+            with self._lock:
+                self._timeouts += 1
+            if raise_on_timeout:
+                raise TimeoutError(f"{timeout:.2f}秒以内に処理が完了しませんでした")
+            return default
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        スレッドプールを停止する
+
+        Args:
+            wait: 実行中の処理の完了を待つ場合True
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        統計情報を取得
+
+        Returns:
+            dict: 実行した処理の数、時間切れになった数
+        """
+        with self._lock:
+            return {
+                'max_workers': self.max_workers,
+                'submitted': self._submitted,
+                'timeouts': self._timeouts,
+            }
+
+
+# プロセス全体で共有するインスタンス
+default_fan_out_executor = FanOutExecutor(max_workers=Config.FAN_OUT_WORKERS)
+
+# レストラン検索の2ページ目以降を並列に取得するためのインスタンス
+# （レストラン検索自体が default_fan_out_executor の中で実行されるため、
+#  同じスレッドプールにページ取得を追加すると、スレッドが足りずに待ち続けることがある）
+default_page_fetch_executor = FanOutExecutor(max_workers=Config.RESTAURANT_PAGE_WORKERS)
+
+# 検索範囲のタイルのうち、キャッシュにないタイルを並列に取得するためのインスタンス
+# （タイルの取得の中で2ページ目以降を default_page_fetch_executor に追加するため、別のスレッドプールにする）
+default_tile_fetch_executor = FanOutExecutor(max_workers=Config.RESTAURANT_TILE_WORKERS)
@@ -0,0 +1,198 @@
+"""ジオハッシュモジュール - 地図を小さなマス目（タイル）に区切る
+
+【このモジュールがやること】
+緯度・経度を「xn76ur」のような短い文字列（ジオハッシュ）に変換します。
+同じ文字列になる地点は、地図上の同じマス目（タイル）に入っています。
+
+【なぜ必要か】
+レストラン検索の結果を「検索した地点」ごとにキャッシュすると、
+隣の席の同僚が検索しただけで座標が少しずれて、別の検索として外部APIを呼んでしまいます。
+お店をタイルごとに保存しておけば、同じ地域で検索する人全員がキャッシュを共有できます。
+
+【ポイント】
+・文字数（精度）が多いほどタイルが小さくなります（6文字で東京付近は約1.0km×0.6km）
+・検索範囲（円）と重なるタイルの一覧を求められます
+・外部ライブラリは使わず、標準ライブラリだけで計算します
+"""
+
+import math
+from typing import List, Tuple
+
+# ジオハッシュで使う32種類の文字（a, i, l, o は使わない）
+_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+_BASE32_INDEX = {char: index for index, char in enumerate(_BASE32)}
+
+# 緯度1度あたりの距離（km、地球のどこでもほぼ同じ）
+KM_PER_LAT_DEGREE = 111.32
+
+
+def encode(lat: float, lon: float, precision: int = 6) -> str:
+    """
+    緯度・経度をジオハッシュに変換
+
+    Args:
+        lat: 緯度（-90〜90）
+        lon: 経度（-180〜180）
+        precision: ジオハッシュの文字数
+
+    Returns:
+        str: ジオハッシュ（例: 東京駅付近は 'xn76ur'）
+    """
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True  # 経度 → 緯度 → 経度 … の順に範囲を半分にしていく
+
+    while len(chars) < precision:
+        value_range, value = (lon_range, lon) if even else (lat_range, lat)
+        mid = (value_range[0] + value_range[1]) / 2
+        if value >= mid:
+            bits = bits * 2 + 1
+            value_range[0] = mid
+        else:
+            bits = bits * 2
+            value_range[1] = mid
+        even = not even
+
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits = 0
+            bit_count = 0
+
+    return ''.join(chars)
+
+
+def decode_bbox(geohash: str) -> Tuple[float, float, float, float]:
+    """
+    ジオハッシュのタイルの範囲を取得
+
+    Args:
+        geohash: ジオハッシュ
+
+    Returns:
+        tuple: (最小緯度, 最大緯度, 最小経度, 最大経度)
+
+    Raises:
+        ValueError: ジオハッシュに使えない文字が含まれている場合
+    """
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    even = True
+
+    for char in geohash:
+        if char not in _BASE32_INDEX:
+            raise ValueError(f"ジオハッシュに使えない文字です: {char}")
+        index = _BASE32_INDEX[char]
+        for shift in range(4, -1, -1):
+            value_range = lon_range if even else lat_range
+            mid = (value_range[0] + value_range[1]) / 2
+            if (index >> shift) & 1:
+                value_range[0] = mid
+            else:
+                value_range[1] = mid
+            even = not even
+
+    return lat_range[0], lat_range[1], lon_range[0], lon_range[1]
+
+
+def tile_center(geohash: str) -> Tuple[float, float]:
+    """
+    タイルの中心の座標を取得
+
+    Args:
+        geohash: ジオハッシュ
+
+    Returns:
+        tuple: (緯度, 経度)
+    """
+    lat_min, lat_max, lon_min, lon_max = decode_bbox(geohash)
+    return (lat_min + lat_max) / 2, (lon_min + lon_max) / 2
+
+
+def tile_size_degrees(precision: int) -> Tuple[float, float]:
+    """
+    指定した精度のタイル1枚の大きさ（度）を取得
+
+    Args:
+        precision: ジオハッシュの文字数
+
+    Returns:
+        tuple: (緯度方向の高さ, 経度方向の幅)
+    """
+    total_bits = precision * 5
+    lon_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 180.0 / (2 ** lat_bits), 360.0 / (2 ** lon_bits)
+
+
+def tile_half_diagonal_km(geohash: str) -> float:
+    """
+    タイルの中心から角までの距離（km）を取得
+
+    タイルの中心でこの半径以上の範囲を検索すれば、タイル全体をカバーできる。
+
+    Args:
+        geohash: ジオハッシュ
+
+    Returns:
+        float: 中心から角までの距離（km、東京付近の近距離では十分な精度の近似）
+    """
+    lat_min, lat_max, lon_min, lon_max = decode_bbox(geohash)
+    # 赤道から遠い側の辺ほど経度1度が短いので、赤道に近い側の緯度で幅を計算する
+    widest_lat = min(abs(lat_min), abs(lat_max)) if lat_min * lat_max > 0 else 0.0
+    height_km = (lat_max - lat_min) * KM_PER_LAT_DEGREE
+    width_km = (lon_max - lon_min) * KM_PER_LAT_DEGREE * math.cos(math.radians(widest_lat))
+    return math.hypot(height_km, width_km) / 2
+
+
+def covering_tiles(lat: float, lon: float, radius_km: float, precision: int = 6) -> List[str]:
+    """
+    指定した地点を中心とする円（検索範囲）と重なるタイルの一覧を取得
+
+    Args:
+        lat: 中心の緯度
+        lon: 中心の経度
+        radius_km: 円の半径（km）
+        precision: ジオハッシュの文字数
+
+    Returns:
+        list: ジオハッシュのリスト（中心を含むタイルが先頭、以降は近い順）
+    """
+    km_per_lon_degree = KM_PER_LAT_DEGREE * max(math.cos(math.radians(lat)), 1e-6)
+    lat_delta = radius_km / KM_PER_LAT_DEGREE
+    lon_delta = radius_km / km_per_lon_degree
+    tile_height, tile_width = tile_size_degrees(precision)
+
+    # 検索範囲を囲む四角形の中にあるタイルを、格子の番号で順番に調べる
+    row_start = math.floor((max(lat - lat_delta, -90.0) + 90.0) / tile_height)
+    row_end = math.floor((min(lat + lat_delta, 90.0 - 1e-9) + 90.0) / tile_height)
+    col_start = math.floor((lon - lon_delta + 180.0) / tile_width)
+    col_end = math.floor((lon + lon_delta + 180.0) / tile_width)
+
+    tiles = []
+    for row in range(row_start, row_end + 1):
+        cell_lat_min = row * tile_height - 90.0
+        cell_lat_max = cell_lat_min + tile_height
+        for col in range(col_start, col_end + 1):
+            cell_lon_min = col * tile_width - 180.0
+            cell_lon_max = cell_lon_min + tile_width
+
+            # タイルの中で中心に一番近い点までの距離が半径以内なら、円と重なっている
+            nearest_lat = min(max(lat, cell_lat_min), cell_lat_max)
+            nearest_lon = min(max(lon, cell_lon_min), cell_lon_max)
+            distance_km = math.hypot((nearest_lat - lat) * KM_PER_LAT_DEGREE,
+                                     (nearest_lon - lon) * km_per_lon_degree)
+            if distance_km > radius_km:
+                continue
+
+            # 経度が180度を越える場合は反対側（-180度側）に折り返す
+            center_lon = (cell_lon_min + cell_lon_max) / 2
+            center_lon = (center_lon + 180.0) % 360.0 - 180.0
+            geohash = encode((cell_lat_min + cell_lat_max) / 2, center_lon, precision)
+            tiles.append((distance_km, geohash))
+
+    tiles.sort()
+    return [geohash for _, geohash in tiles]
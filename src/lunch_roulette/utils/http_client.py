@@ -0,0 +1,95 @@
+"""HTTP接続モジュール - 外部APIごとに接続を使い回すセッションを管理する
+
+【このモジュールがやること】
+Hot Pepper・WeatherAPI・ipapi の外部APIごとに requests.Session を1つずつ用意し、
+プロセス内のすべてのリクエストで共有します。
+
+【なぜ必要か】
+requests.get() を直接呼ぶと、毎回TCP接続とTLSハンドシェイクをやり直すため、
+HTTPSのAPIでは1回あたり数十〜数百ミリ秒が余計にかかってしまいます。
+Sessionを使うと接続が keep-alive で再利用され、2回目以降はハンドシェイクが不要になります。
+
+【ポイント】
+・接続プールのサイズは HTTP_POOL_SIZE で設定します（同時に使う接続の最大数）
+・接続エラーと 502/503/504 は HTTP_MAX_RETRIES 回まで自動で再試行します
+  （429はAPI利用回数をさらに消費するため再試行しません）
+・タイムアウトは「接続」と「応答待ち」を分けて設定します（HTTP_CONNECT_TIMEOUT / HTTP_READ_TIMEOUT）
+"""
+
+import threading
+from typing import Dict
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from ..config import Config
+
+# 再試行する HTTPステータスコード（一時的なサーバー側の障害）
+RETRY_STATUS_CODES = (502, 503, 504)
+
+_sessions: Dict[str, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def create_http_session(pool_size: int = None, max_retries: int = None) -> requests.Session:
+    """
+    接続プールと再試行設定付きのセッションを作成
+
+    Args:
+        pool_size: 1ホストあたりに保持する接続の最大数（省略時は Config.HTTP_POOL_SIZE）
+        max_retries: 接続エラー・一時的なエラーの再試行回数（省略時は Config.HTTP_MAX_RETRIES）
+
+    Returns:
+        requests.Session: 設定済みのセッション
+    """
+    pool_size = Config.HTTP_POOL_SIZE if pool_size is None else pool_size
+    max_retries = Config.HTTP_MAX_RETRIES if max_retries is None else max_retries
+
+    retry = Retry(
+        total=max_retries,
+        connect=max_retries,
+        read=0,  # 応答待ちのタイムアウトは再試行しない（待ち時間が倍になるため）
+        status=max_retries,
+        backoff_factor=0.1,  # 2回目以降の再試行前に 0.2秒, 0.4秒... 待つ
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=frozenset(['GET']),
+        raise_on_status=False,  # 最後の応答はそのまま返し、raise_for_status() で判定する
+    )
+    adapter = HTTPAdapter(
+        pool_connections=max(1, pool_size),
+        pool_maxsize=max(1, pool_size),
+        max_retries=retry,
+    )
+
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def get_http_session(name: str) -> requests.Session:
+    """
+    外部APIごとの共有セッションを取得（なければ作成）
+
+    Args:
+        name: 外部APIの名前（'hotpepper', 'weatherapi', 'ipapi' など）
+
+    Returns:
+        requests.Session: プロセス内で共有されるセッション
+    """
+    with _sessions_lock:
+        session = _sessions.get(name)
+        if session is None:
+            session = create_http_session()
+            _sessions[name] = session
+        return session
+
+
+def close_all_http_sessions() -> None:
+    """共有セッションをすべて閉じる（アプリ終了時・テスト用）"""
+    with _sessions_lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session in sessions:
+        session.close()
@@ -0,0 +1,236 @@
+"""Redisクライアントモジュール - RESP（Redisの通信プロトコル）でRedisサーバーと通信する
+
+【このモジュールがやること】
+キャッシュの保存先をRedis（またはRedis互換のサーバー: Valkey、KeyDB、Dragonflyなど）にするための、
+最小限のクライアントです。コマンドの送信、パイプライン（複数のコマンドをまとめて送信）、
+接続の使い回しだけを行います。
+
+【なぜ必要か】
+本番環境（PythonAnywhere）では追加のパッケージを増やしたくないため、redis-py は使わずに
+標準ライブラリの socket だけで実装しています。使うコマンドは GET / MGET / SET / DEL / SCAN 程度です。
+
+【ポイント】
+・接続は使い終わったらプールに戻して使い回します（スレッドセーフ）
+・通信エラーが起きた接続は捨てて、例外をそのまま呼び出し元に返します
+  （プールにあった接続がサーバー側で切れていた場合だけ、新しい接続で1回送り直します）
+・URLは redis://[:パスワード@]ホスト:ポート/DB番号 の形式です
+"""
+
+import socket
+import threading
+from typing import Any, List, Sequence, Tuple
+from urllib.parse import unquote, urlparse
+
+
+class RedisError(Exception):
+    """Redisサーバーがエラーを返した場合の例外"""
+
+
+class RedisClient:
+    """
+    RESPでRedisサーバーと通信するクライアント
+
+    【使い方の例】
+        client = RedisClient('redis://localhost:6379/0')
+        client.execute('SET', 'key', b'value', 'PX', 60000)
+        client.execute('GET', 'key')  # → b'value'
+    """
+
+    def __init__(self, url: str = 'redis://localhost:6379/0', timeout: float = 0.5,
+                 max_idle_connections: int = 8):
+        """
+        Redisクライアントを初期化（接続は最初のコマンドの送信時に作成する）
+
+        Args:
+            url: 接続先（redis://[:パスワード@]ホスト:ポート/DB番号）
+            timeout: 接続・応答の待ち時間の上限（秒）
+            max_idle_connections: プールに残しておく接続の最大数
+        """
+        parsed = urlparse(url)
+        if parsed.scheme != 'redis':
+            raise ValueError(f"RedisのURLが正しくありません: {url}")
+        self.host = parsed.hostname or 'localhost'
+        self.port = parsed.port or 6379
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.db = int(parsed.path.lstrip('/') or 0)
+        self.timeout = timeout
+        self.max_idle_connections = max(1, max_idle_connections)
+
+        self._lock = threading.Lock()
+        # (ソケット, 読み込み用のファイルオブジェクト) の組
+        self._idle: List[Tuple[socket.socket, Any]] = []
+
+    def execute(self, *args) -> Any:
+        """
+        コマンドを1つ送信して応答を受け取る
+
+        Args:
+            *args: コマンドと引数（str / bytes / int / float）
+
+        Returns:
+            応答（文字列・整数・バイト列・None・リスト）
+
+        Raises:
+            RedisError: サーバーがエラーを返した場合
+            OSError: 接続・通信に失敗した場合
+        """
+        return self.pipeline([args])[0]
+
+    def pipeline(self, commands: Sequence[Sequence]) -> List[Any]:
+        """
+        複数のコマンドをまとめて送信し、応答をまとめて受け取る（往復1回）
+
+        Args:
+            commands: コマンドと引数のリストのリスト
+
+        Returns:
+            list: コマンドごとの応答（commands と同じ順番）
+
+        Raises:
+            RedisError: いずれかのコマンドでサーバーがエラーを返した場合（すべての応答を受け取った後）
+            OSError: 接続・通信に失敗した場合
+        """
+        if not commands:
+            return []
+        payload = b''.join(encode_command(command) for command in commands)
+        while True:
+            conn, reused = self._acquire()
+            sock, reader = conn
+            try:
+                sock.sendall(payload)
+                replies = [read_reply(reader) for _ in commands]
+                break
+            except ConnectionError:
+                # 切れていた接続は捨てる。使うコマンドは何回実行しても結果が同じなので送り直せる
+                self._close_connection(conn)
+                if not reused:
+                    raise
+            except Exception:
+                # 応答の途中で失敗した接続は、次の応答と混ざらないように捨てる
+                self._close_connection(conn)
+                raise
+        self._release(conn)
+
+        for reply in replies:
+            if isinstance(reply, RedisError):
+                raise reply
+        return replies
+
+    def close(self) -> None:
+        """プールにある接続をすべて閉じる（アプリ終了時・テスト用）"""
+        with self._lock:
+            connections, self._idle = self._idle, []
+        for conn in connections:
+            self._close_connection(conn)
+
+    def _acquire(self) -> Tuple[Tuple[socket.socket, Any], bool]:
+        """
+        プールから接続を取り出す（なければ新しく接続する）（内部メソッド）
+
+        Returns:
+            tuple: (接続, プールにあった接続か)
+        """
+        with self._lock:
+            if self._idle:
+                return self._idle.pop(), True
+        return self._connect(), False
+
+    def _release(self, conn: Tuple[socket.socket, Any]) -> None:
+        """使い終わった接続をプールに戻す（内部メソッド）"""
+        with self._lock:
+            if len(self._idle) < self.max_idle_connections:
+                self._idle.append(conn)
+                return
+        self._close_connection(conn)
+
+    def _connect(self) -> Tuple[socket.socket, Any]:
+        """新しく接続して、認証・DBの選択を行う（内部メソッド）"""
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        conn = (sock, sock.makefile('rb'))
+        setup = []
+        if self.password:
+            setup.append(('AUTH', self.password))
+        if self.db:
+            setup.append(('SELECT', self.db))
+        try:
+            if setup:
+                sock.sendall(b''.join(encode_command(command) for command in setup))
+                for _ in setup:
+                    reply = read_reply(conn[1])
+                    if isinstance(reply, RedisError):
+                        raise reply
+        except Exception:
+            self._close_connection(conn)
+            raise
+        return conn
+
+    @staticmethod
+    def _close_connection(conn: Tuple[socket.socket, Any]) -> None:
+        """接続を閉じる（内部メソッド）"""
+        sock, reader = conn
+        reader.close()
+        sock.close()
+
+
+def encode_command(args: Sequence) -> bytes:
+    """
+    コマンドをRESPの配列（*引数の数 → $長さ + 値）に変換
+
+    Args:
+        args: コマンドと引数（str / bytes / int / float）
+
+    Returns:
+        bytes: 送信するバイト列
+    """
+    parts = [b'*%d\r\n' % len(args)]
+    for arg in args:
+        if isinstance(arg, bytes):
+            value = arg
+        elif isinstance(arg, str):
+            value = arg.encode('utf-8')
+        else:
+            value = str(arg).encode('ascii')
+        parts.append(b'$%d\r\n%s\r\n' % (len(value), value))
+    return b''.join(parts)
+
+
+def read_reply(reader) -> Any:
+    """
+    RESPの応答を1つ読み込む
+
+    Args:
+        reader: ソケットから読み込むファイルオブジェクト（makefile('rb')）
+
+    Returns:
+        応答。エラー応答は例外にせず RedisError のインスタンスを返す
+        （パイプラインで残りの応答を読み終えてから呼び出し元で送出する）
+
+    Raises:
+        ConnectionError: 接続が切れた、または応答の形式が正しくない場合
+    """
+    line = reader.readline()
+    if not line.endswith(b'\r\n'):
+        raise ConnectionError("Redisサーバーとの接続が切れました")
+    prefix, body = line[:1], line[1:-2]
+
+    if prefix == b'+':
+        return body.decode('utf-8')
+    if prefix == b'-':
+        return RedisError(body.decode('utf-8'))
+    if prefix == b':':
+        return int(body)
+    if prefix == b'$':
+        length = int(body)
+        if length < 0:
+            return None
+        value = reader.read(length + 2)
+        if len(value) != length + 2:
+            raise ConnectionError("Redisサーバーとの接続が切れました")
+        return value[:-2]
+    if prefix == b'*':
+        length = int(body)
+        if length < 0:
+            return None
+        return [read_reply(reader) for _ in range(length)]
+    raise ConnectionError(f"Redisの応答の形式が正しくありません: {line[:20]!r}")
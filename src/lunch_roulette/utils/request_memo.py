@@ -0,0 +1,155 @@
+"""リクエスト内メモ化モジュール - 1回のリクエストで同じデータを何度も取得しない
+
+【このモジュールがやること】
+1回のリクエストの中で、同じ引数の天気・位置情報・レストラン検索が何度呼ばれても、
+実際に取得するのは最初の1回だけにして、2回目以降は結果を使い回します。
+
+【なぜ必要か】
+トップページでは get_current_weather を直接呼んだ後、
+get_weather_summary や is_good_weather_for_walking の中でも同じ天気を取得しています。
+そのたびにキャッシュキーの計算・SQLite接続・JSONのデコードが発生していました。
+
+【ポイント】
+・メモはFlaskの g に保存し、リクエストの開始時（before_request）に毎回作り直します
+・リクエストの外（バッチ処理やワーカースレッド）では何もせず、そのまま元の処理を呼びます
+・ヒット数・ミス数はリクエストごとと、プロセス全体の合計の両方を記録します
+"""
+
+import functools
+import inspect
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from flask import g, has_request_context
+
+# プロセス全体の合計（get_request_memo_stats で参照）
+_totals_lock = threading.Lock()
+_totals = {'requests': 0, 'hits': 0, 'misses': 0}
+
+
+class RequestMemo:
+    """
+    1リクエスト分のメモ（キー → 結果）
+
+    【使い方の例】
+        memo = RequestMemo()
+        weather = memo.get_or_compute(('weather', lat, lon), lambda: fetch_weather(lat, lon))
+    """
+
+    def __init__(self):
+        """メモを初期化"""
+        self._results: Dict[Hashable, Any] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        メモに結果があれば返し、なければ fn を実行して保存する
+
+        Args:
+            key: メモのキー（呼び出し先と引数の組み合わせ）
+            fn: 結果を求める処理
+
+        Returns:
+            メモした結果、または fn の戻り値
+        """
+        if key in self._results:
+            self.hits += 1
+            _add_totals(hits=1)
+            return self._results[key]
+
+        self.misses += 1
+        _add_totals(misses=1)
+        result = fn()
+        self._results[key] = result
+        return result
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        このリクエストの統計情報を取得
+
+        Returns:
+            dict: メモした件数、ヒット数、ミス数
+        """
+        return {'entries': len(self._results), 'hits': self.hits, 'misses': self.misses}
+
+
+def _add_totals(requests: int = 0, hits: int = 0, misses: int = 0) -> None:
+    """プロセス全体の合計に加算（内部関数）"""
+    with _totals_lock:
+        _totals['requests'] += requests
+        _totals['hits'] += hits
+        _totals['misses'] += misses
+
+
+def start_request_memo() -> RequestMemo:
+    """
+    現在のリクエスト用に新しいメモを作成する（before_request から呼ぶ）
+
+    Returns:
+        RequestMemo: 作成したメモ
+    """
+    memo = RequestMemo()
+    g.request_memo = memo
+    _add_totals(requests=1)
+    return memo
+
+
+def current_request_memo() -> Optional[RequestMemo]:
+    """
+    現在のリクエストのメモを取得
+
+    Returns:
+        RequestMemo: リクエスト処理中の場合はそのメモ、リクエストの外ではNone
+    """
+    if not has_request_context():
+        return None
+    return g.get('request_memo')
+
+
+def request_memoized(name: str) -> Callable:
+    """
+    サービスのメソッドの結果をリクエスト内でメモ化するデコレーター
+
+    同じリクエスト内で同じ引数の呼び出しがあった場合は、2回目以降は最初の結果を返す。
+    引数は名前付き・位置指定のどちらで渡しても同じキーになる。
+
+    Args:
+        name: メモのキーの先頭に付ける名前（'weather' など）
+
+    Returns:
+        デコレーター
+    """
+    def decorator(method: Callable) -> Callable:
+        signature = inspect.signature(method)
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            memo = current_request_memo()
+            if memo is None:
+                return method(self, *args, **kwargs)
+
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            key = (name,) + tuple(list(bound.arguments.items())[1:])
+            try:
+                hash(key)
+            except TypeError:
+                # ハッシュできない引数（リストなど）の場合はメモ化しない
+                return method(self, *args, **kwargs)
+            return memo.get_or_compute(key, lambda: method(self, *args, **kwargs))
+
+        return wrapper
+
+    return decorator
+
+
+def get_request_memo_stats() -> Dict[str, int]:
+    """
+    プロセス全体の統計情報を取得
+
+    Returns:
+        dict: メモを作成したリクエスト数、ヒット数（省略できた取得の回数）、ミス数
+    """
+    with _totals_lock:
+        return dict(_totals)
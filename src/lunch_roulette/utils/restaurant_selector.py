@@ -163,14 +163,10 @@ class RestaurantSelector:
 
             print(f"{actual_count}件のレストランを選択")
 
-            # 各レストランに距離情報を統合
-            restaurants_with_distance = []
-            for restaurant in selected_restaurants:
-                restaurant_with_distance = self._integrate_distance_info(
-                    restaurant, user_lat, user_lon
-                )
-                if restaurant_with_distance:
-                    restaurants_with_distance.append(restaurant_with_distance)
+            # 各レストランに距離情報を統合（距離は全件まとめて計算）
+            restaurants_with_distance = self._integrate_distance_info_batch(
+                selected_restaurants, user_lat, user_lon
+            )
 
             # 距離順にソート（近い順）
             restaurants_with_distance.sort(key=lambda r: r['distance_info']['distance_km'])
@@ -287,6 +283,50 @@ class RestaurantSelector:
 
             return restaurant_with_distance
 
+    def _integrate_distance_info_batch(self, restaurants: List[Dict], user_lat: float,
+                                       user_lon: float) -> List[Dict]:
+        """
+        複数のレストランデータに距離情報をまとめて統合
+
+        距離は DistanceCalculator.calculate_distances_batch で1回で計算する。
+        まとめて計算できなかった場合は1件ずつの計算（_integrate_distance_info）に切り替える。
+
+        Args:
+            restaurants (list): 有効なレストラン情報のリスト
+            user_lat (float): ユーザーの緯度
+            user_lon (float): ユーザーの経度
+
+        Returns:
+            list: 距離情報が統合されたレストラン情報のリスト（入力と同じ順番）
+        """
+        try:
+            distances = self.distance_calculator.calculate_distances_batch(
+                user_lat, user_lon,
+                [float(restaurant['lat']) for restaurant in restaurants],
+                [float(restaurant['lng']) for restaurant in restaurants]
+            )
+        except Exception as e:
+            print(f"距離の一括計算エラー（1件ずつ計算します）: {e}")
+            results = [self._integrate_distance_info(r, user_lat, user_lon) for r in restaurants]
+            return [r for r in results if r]
+
+        # 一括計算の結果を同じ番号で取り出す（walking_info_from_distance と同じ形式の辞書）
+        restaurants_with_distance = []
+        for i, restaurant in enumerate(restaurants):
+            walking_time_minutes = distances['walking_time_minutes'][i]
+            restaurant_with_distance = restaurant.copy()
+            restaurant_with_distance['distance_info'] = {
+                'distance_km': distances['distance_km'][i],
+                'distance_m': distances['distance_m'][i],
+                'walking_time_minutes': walking_time_minutes,
+                'distance_display': distances['distance_display'][i],
+                'time_display': f"徒歩約{walking_time_minutes}分",
+            }
+            restaurant_with_distance['display_info'] = self._generate_display_info(restaurant_with_distance)
+            restaurants_with_distance.append(restaurant_with_distance)
+
+        return restaurants_with_distance
+
     def _generate_display_info(self, restaurant: Dict) -> Dict:
         """
         表示用の追加情報を生成
@@ -0,0 +1,124 @@
+"""同時リクエスト集約モジュール - 同じキーへの外部API呼び出しを1回にまとめる
+
+【このモジュールがやること】
+キャッシュが切れた瞬間に同じ場所・同じ条件の検索が大量に届いても、
+外部APIを呼び出すのは最初の1リクエストだけにし、残りはその結果を待って共有します。
+
+【なぜ必要か】
+お昼の12:00ちょうどに同じオフィスの人が一斉にルーレットを回すと、
+キャッシュが空の状態で全員がHot Pepper APIを呼び出してしまい、
+API利用回数の上限（429エラー）に達してしまいます。
+
+【ポイント】
+・キーはキャッシュキーと同じものを使います
+・集約は同じプロセス内のスレッド間で行われます
+・先頭のリクエストで例外が発生した場合は、待っていたリクエストにも同じ例外を返します
+"""
+
+import threading
+from typing import Any, Callable, Dict
+
+
+class _Call:
+    """実行中の呼び出し1件分の状態"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    同じキーの同時呼び出しを1回にまとめるクラス
+
+    【使い方の例】
+        single_flight = SingleFlight()
+        weather = single_flight.do(cache_key, lambda: fetch_weather(lat, lon))
+
+    同じ cache_key で同時に do() が呼ばれた場合、fetch_weather は1回だけ実行され、
+    すべての呼び出し元が同じ結果を受け取ります（結果は共有オブジェクトなので変更しないこと）。
+    """
+
+    def __init__(self):
+        """同時リクエスト集約を初期化"""
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+
+        # 統計情報
+        self._executions = 0
+        self._shared = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        キーごとに1回だけ fn を実行し、結果を共有する
+
+        Args:
+            key: 集約に使うキー（キャッシュキーなど）
+            fn: 実際の処理（外部API呼び出しなど）
+
+        Returns:
+            fn の戻り値（同時に呼び出した全員で同じ値）
+
+        Raises:
+            fn が送出した例外
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                # 実行中の呼び出しがあれば、その結果を待つ
+                call.waiters += 1
+                self._shared += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self._executions += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def in_flight(self) -> int:
+        """
+        実行中の呼び出し数を取得
+
+        Returns:
+            現在実行中のキーの数
+        """
+        with self._lock:
+            return len(self._calls)
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        統計情報を取得
+
+        Returns:
+            dict: 実際の実行回数（executions）と、結果を共有した回数（shared）
+        """
+        with self._lock:
+            return {
+                'executions': self._executions,
+                'shared': self._shared,
+                'in_flight': len(self._calls),
+            }
+
+
+# プロセス全体で共有するインスタンス
+# キャッシュキーには 'weather_' などのプレフィックスが付くため、サービス間でキーは衝突しない
+default_single_flight = SingleFlight()
@@ -0,0 +1,229 @@
+"""遅延書き込みモジュール - 書き込みをメモリにためてバックグラウンドでまとめて保存する
+
+【このモジュールがやること】
+キャッシュの保存（INSERT + COMMIT）をリクエストのスレッドで行わず、メモリのキューに入れて
+すぐに戻ります。キューはバックグラウンドのスレッドが一定間隔（または一定件数たまったとき）に
+まとめて1回のトランザクションで書き込みます。
+
+【なぜ必要か】
+外部APIの応答をキャッシュに保存するたびにCOMMIT（ディスクへの同期）を待つと、
+ユーザーへの応答がその分だけ遅くなります。まとめて書き込めばCOMMITの回数も減ります。
+
+【ポイント】
+・同じキーの書き込みがキューにある場合は新しい値で置き換えます（書き込みは最新の1回だけ）
+・キューの大きさには上限があり、いっぱいのときは enqueue() が False を返します
+  （呼び出し側でその場で書き込む）
+・書き込み前・書き込み中の値は get() で取得できます（読み込み側で最新の値を返すため）
+・アプリ終了時に shutdown() でキューに残った分を書き込みます
+・プロセスが強制終了した場合、キューに残った分は失われます（キャッシュなので再取得できる）
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from ..config import Config
+
+
+class WriteBehindQueue:
+    """
+    書き込みをキューにためてバックグラウンドでまとめて実行するクラス
+
+    キューに入れる行はタプルで、先頭の要素をキーとして扱う。
+
+    【使い方の例】
+        queue = WriteBehindQueue(lambda rows: write_rows_to_db(rows))
+        if not queue.enqueue([(key, data, expires_at)]):
+            write_rows_to_db([(key, data, expires_at)])  # キューがいっぱいならその場で書き込む
+    """
+
+    def __init__(self, write_batch: Callable[[List[Tuple]], None], max_size: Optional[int] = None,
+                 batch_size: Optional[int] = None, flush_interval: Optional[float] = None,
+                 name: str = 'write-behind'):
+        """
+        遅延書き込みを初期化
+
+        Args:
+            write_batch: 行のリストを1回のトランザクションで書き込む関数
+            max_size: キューに入れられる最大キー数（省略時は Config.CACHE_WRITE_BEHIND_MAX_QUEUE）
+            batch_size: 1回のトランザクションで書き込む最大行数、この数たまったらすぐに書き込む
+                （省略時は Config.CACHE_WRITE_BEHIND_BATCH_SIZE）
+            flush_interval: 書き込みの間隔（秒、省略時は Config.CACHE_WRITE_BEHIND_FLUSH_INTERVAL_MS）
+            name: バックグラウンドスレッドの名前
+        """
+        self.write_batch = write_batch
+        self.max_size = max(1, max_size if max_size is not None else Config.CACHE_WRITE_BEHIND_MAX_QUEUE)
+        self.batch_size = max(1, batch_size if batch_size is not None else Config.CACHE_WRITE_BEHIND_BATCH_SIZE)
+        if flush_interval is None:
+            flush_interval = Config.CACHE_WRITE_BEHIND_FLUSH_INTERVAL_MS / 1000
+        self.flush_interval = max(0.001, flush_interval)
+        self.name = name
+
+        # キーの状態を変更するときは _cond、書き込み中の行を確定させるときは _flush_lock を使う
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._pending: 'OrderedDict[Any, Tuple]' = OrderedDict()
+        self._in_flight: Dict[Any, Tuple] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+        # 統計情報
+        self._enqueued = 0
+        self._coalesced = 0
+        self._rejected = 0
+        self._written = 0
+        self._batches = 0
+        self._failed = 0
+
+    def enqueue(self, rows: Iterable[Tuple]) -> bool:
+        """
+        行をキューに入れる
+
+        すべての行を入れられない場合（キューがいっぱい・停止後）は1行も入れない。
+
+        Args:
+            rows: 書き込む行（先頭の要素がキー）
+
+        Returns:
+            キューに入れた場合True、入れなかった場合False（呼び出し側でその場で書き込む）
+        """
+        rows = list(rows)
+        with self._cond:
+            if self._closed:
+                return False
+            new_keys = {row[0] for row in rows if row[0] not in self._pending}
+            if len(self._pending) + len(new_keys) > self.max_size:
+                self._rejected += len(rows)
+                return False
+
+            for row in rows:
+                if row[0] in self._pending:
+                    self._coalesced += 1
+                self._pending[row[0]] = row
+            self._enqueued += len(rows)
+
+            if self._thread is None:
+                # 初回の書き込み時にスレッドを起動（使わない場合はスレッドを起動しない）
+                self._thread = threading.Thread(target=self._run_forever, name=self.name, daemon=True)
+                self._thread.start()
+            if len(self._pending) >= self.batch_size:
+                self._cond.notify()
+        return True
+
+    def get(self, key: Any) -> Optional[Tuple]:
+        """
+        まだ書き込みが完了していない行を取得
+
+        Args:
+            key: キー
+
+        Returns:
+            キューにある（または書き込み中の）行。ない場合None
+        """
+        with self._cond:
+            row = self._pending.get(key)
+            return row if row is not None else self._in_flight.get(key)
+
+    def discard(self, keys: Iterable[Any]) -> None:
+        """
+        キーの書き込みを取り消す
+
+        書き込み中の行がある場合は、書き込みが終わるのを待ってから戻る。
+        呼び出し後に行を削除・上書きすれば、古い行が後から書き込まれることはない。
+
+        Args:
+            keys: 取り消すキーのリスト
+        """
+        with self._flush_lock:
+            with self._cond:
+                for key in keys:
+                    self._pending.pop(key, None)
+
+    def clear(self) -> None:
+        """キューにあるすべての書き込みを取り消す（書き込み中の行は書き込みが終わるまで待つ）"""
+        with self._flush_lock:
+            with self._cond:
+                self._pending.clear()
+
+    def flush(self) -> int:
+        """
+        キューにある行を batch_size 行ずつ書き込む
+
+        書き込みに失敗した行は捨てる（呼び出し元のメモリキャッシュには残っている）。
+
+        Returns:
+            書き込んだ行数
+        """
+        written = 0
+        while True:
+            with self._flush_lock:
+                with self._cond:
+                    if not self._pending:
+                        return written
+                    batch = [self._pending.popitem(last=False)[1]
+                             for _ in range(min(self.batch_size, len(self._pending)))]
+                    self._in_flight = {row[0]: row for row in batch}
+
+                try:
+                    self.write_batch(batch)
+                    written += len(batch)
+                    with self._cond:
+                        self._written += len(batch)
+                        self._batches += 1
+                except Exception as e:
+                    print(f"遅延書き込みエラー ({self.name}, {len(batch)}件): {e}")
+                    with self._cond:
+                        self._failed += len(batch)
+                finally:
+                    with self._cond:
+                        self._in_flight = {}
+
+    def shutdown(self, wait: bool = True) -> int:
+        """
+        バックグラウンドの書き込みを停止し、キューに残った行を書き込む
+
+        停止後の enqueue() は False を返す（呼び出し側でその場で書き込む）。
+
+        Args:
+            wait: スレッドの終了を待つ場合True
+
+        Returns:
+            停止時に書き込んだ行数
+        """
+        with self._cond:
+            self._closed = True
+            thread, self._thread = self._thread, None
+            self._cond.notify()
+        if thread is not None and wait:
+            thread.join()
+        return self.flush()
+
+    def _run_forever(self) -> None:
+        """一定間隔、または batch_size 行たまるごとに書き込むことを繰り返す（内部メソッド）"""
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._closed or len(self._pending) >= self.batch_size,
+                                    timeout=self.flush_interval)
+                closed = self._closed
+            if closed:
+                return  # 残りは shutdown() で書き込む
+            self.flush()
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        統計情報を取得
+
+        Returns:
+            dict: キューに入れた行数、置き換えた行数、キューがいっぱいで入れなかった行数、
+                  書き込んだ行数・トランザクション数、失敗した行数、書き込み待ちの行数
+        """
+        with self._cond:
+            return {
+                'enqueued': self._enqueued,
+                'coalesced': self._coalesced,
+                'rejected': self._rejected,
+                'written': self._written,
+                'batches': self._batches,
+                'failed': self._failed,
+                'pending': len(self._pending) + len(self._in_flight),
+            }
@@ -30,17 +30,18 @@ if src_path not in sys.path:
 # 作業ディレクトリを設定
 os.chdir(project_home)
 
-# データベース初期化（初回デプロイ時）
+# Flaskアプリケーションをインポート
+# サービス（天気・レストラン検索など）はインポート時に1回だけ作成され、全リクエストで共有されます
+from lunch_roulette.app import app as application, services
+
+# サービスの起動処理（初回デプロイ時のデータベース初期化）
+# 終了処理（バックグラウンド処理・接続プールの停止）はプロセス終了時に自動で実行されます
 try:
-    from lunch_roulette.models.database import init_database
-    init_database(os.path.join(project_home, 'cache.db'))
+    services.startup()
     print("データベース初期化完了")
 except Exception as e:
     print(f"データベース初期化エラー: 既に存在する可能性があります。 {e}")
 
-# Flaskアプリケーションをインポート
-from lunch_roulette.app import app as application
-
 # 本番環境設定を確認
 if not os.environ.get('SECRET_KEY'):
     print("警告: SECRET_KEYが設定されていません")
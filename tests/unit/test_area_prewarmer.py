@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+AreaPrewarmer（エリア指定検索の事前取得）の単体テスト
+全エリア × 検索条件の取得、API呼び出し回数の上限、カバー率、実行時刻の計算を検証
+"""
+
+import json
+import os
+import pytest
+from datetime import datetime
+from unittest.mock import Mock, patch
+from lunch_roulette.models.database import init_database
+from lunch_roulette.services.area_prewarmer import AreaPrewarmer, parse_combos
+from lunch_roulette.services.cache_service import CacheService
+from lunch_roulette.services.restaurant_service import RestaurantService
+
+
+def _area_api(url, params=None, timeout=None):
+    """エリアごとに1件のお店を返すAPIのモック"""
+    area = params['middle_area']
+    mock_response = Mock()
+    mock_response.json.return_value = {'results': {'results_available': 1, 'shop': [
+        {'id': f'{area}-{params.get("budget", "all")}', 'name': f'{area}のお店', 'lat': 35.69, 'lng': 139.70},
+    ]}}
+    mock_response.raise_for_status.return_value = None
+    return mock_response
+
+
+class TestAreaPrewarmer:
+    """AreaPrewarmerクラスの単体テスト"""
+
+    @pytest.fixture
+    def restaurant_service(self, tmp_path):
+        """一時データベースを使うRestaurantServiceインスタンス"""
+        db_path = str(tmp_path / 'cache.db')
+        init_database(db_path)
+        service = RestaurantService(api_key='test_api_key', cache_service=CacheService(db_path=db_path))
+        service.max_results = 100
+        service.local_filtering = False  # 検索条件の組み合わせごとにキャッシュする
+        return service
+
+    @pytest.fixture
+    def areas_path(self, tmp_path):
+        """3エリアだけのエリアマスタファイル"""
+        path = tmp_path / 'areas.json'
+        path.write_text(json.dumps({'middle_areas': [
+            {'code': 'Y055', 'name': '新宿'}, {'code': 'Y030', 'name': '渋谷'}, {'code': 'Y050', 'name': '池袋'},
+        ]}), encoding='utf-8')
+        return path
+
+    def _prewarmer(self, restaurant_service, areas_path, **kwargs):
+        kwargs.setdefault('max_api_calls', 100)
+        return AreaPrewarmer(restaurant_service, areas_path=areas_path,
+                             combos=[('B010', 1, None), (None, 1, None)], ttl=3600, run_at='11:30', **kwargs)
+
+    def test_parse_combos(self):
+        """検索条件の組み合わせの設定値を解析できる"""
+        assert parse_combos('B010:1:all, all:1:G001,') == [('B010', 1, None), (None, 1, 'G001')]
+        with pytest.raises(ValueError):
+            parse_combos('B010:1')
+
+    @patch('lunch_roulette.services.restaurant_service.requests.Session.get')
+    def test_run_once_warms_all_combinations(self, mock_get, restaurant_service, areas_path):
+        """全エリア × 検索条件を取得し、お昼の検索はキャッシュから答えることを確認"""
+        mock_get.side_effect = _area_api
+        prewarmer = self._prewarmer(restaurant_service, areas_path)
+
+        report = prewarmer.run_once()
+
+        assert report['combinations'] == 6
+        assert report['refreshed'] == 6
+        assert report['api_calls'] == 6
+        assert report['coverage'] == 1.0
+        assert prewarmer.get_last_report() == report
+
+        result = restaurant_service.search_restaurants(middle_area='Y030', budget_code='B010', lunch=1)
+        assert [r['id'] for r in result] == ['Y030-B010']
+        assert mock_get.call_count == 6
+
+        # キャッシュが十分に残っている組み合わせは取得し直さない
+        second = prewarmer.run_once()
+        assert second['already_warm'] == 6
+        assert second['api_calls'] == 0
+        assert mock_get.call_count == 6
+
+    @patch('lunch_roulette.services.restaurant_service.requests.Session.get')
+    def test_run_once_respects_api_quota(self, mock_get, restaurant_service, areas_path):
+        """API呼び出し回数の上限に達したら、残りの組み合わせは取得しないことを確認"""
+        mock_get.side_effect = _area_api
+        prewarmer = self._prewarmer(restaurant_service, areas_path, max_api_calls=4)
+
+        report = prewarmer.run_once()
+
+        assert report['refreshed'] == 4
+        assert report['skipped_quota'] == 2
+        assert mock_get.call_count == 4
+        # よく使われる検索条件（先頭の組み合わせ）から全エリア分が埋まる
+        assert {call.kwargs['params'].get('budget') for call in mock_get.call_args_list[:3]} == {'B010'}
+        assert prewarmer.get_coverage() == {'combinations': 6, 'warm': 4, 'coverage': pytest.approx(4 / 6)}
+
+    @patch('lunch_roulette.services.restaurant_service.requests.Session.get')
+    def test_run_once_counts_failures(self, mock_get, restaurant_service, areas_path):
+        """APIエラーで取得できなかった組み合わせを失敗として数えることを確認"""
+        mock_get.side_effect = Exception('API error')
+        prewarmer = self._prewarmer(restaurant_service, areas_path)
+
+        report = prewarmer.run_once()
+
+        assert report['failed'] == 6
+        assert report['coverage'] == 0.0
+
+    @patch('lunch_roulette.services.restaurant_service.requests.Session.get')
+    def test_run_once_with_local_filtering(self, mock_get, restaurant_service, areas_path):
+        """条件なしで全件取得できたエリアは、条件付きの組み合わせのAPI呼び出しを省くことを確認"""
+        mock_get.side_effect = _area_api
+        restaurant_service.local_filtering = True
+        prewarmer = AreaPrewarmer(restaurant_service, areas_path=areas_path, max_api_calls=100,
+                                  combos=[(None, None, None), ('B010', 1, None)], ttl=3600)
+
+        report = prewarmer.run_once()
+
+        assert report['refreshed'] == 3
+        assert report['already_warm'] == 3
+        assert report['api_calls'] == 3
+        assert prewarmer.get_coverage()['coverage'] == 1.0
+
+    @patch('lunch_roulette.services.restaurant_service.requests.Session.get')
+    def test_scheduled_run_claimed_by_one_process(self, mock_get, restaurant_service, areas_path):
+        """同じデータベースを使う2つ目のプロセスは、確保済みの日の事前取得をスキップすることを確認"""
+        mock_get.side_effect = _area_api
+        first = self._prewarmer(restaurant_service, areas_path)
+        # 別のワーカープロセス（同じデータベースを使う別のインスタンス）
+        other_service = RestaurantService(api_key='test_api_key',
+                                          cache_service=CacheService(db_path=restaurant_service.cache_service.db_path))
+        second = self._prewarmer(other_service, areas_path)
+
+        assert first.run_scheduled(datetime(2024, 1, 1, 11, 30))['refreshed'] == 6
+        assert second.run_scheduled(datetime(2024, 1, 1, 11, 30)) is None
+        assert mock_get.call_count == 6
+
+        # 次の日はもう一度確保できる
+        assert second.run_scheduled(datetime(2024, 1, 2, 11, 30)) is not None
+
+    def test_seconds_until_next_run(self, restaurant_service, areas_path):
+        """今日の実行時刻を過ぎていれば、明日の実行時刻までの秒数を返す"""
+        prewarmer = self._prewarmer(restaurant_service, areas_path)
+
+        assert prewarmer.seconds_until_next_run(datetime(2024, 1, 1, 11, 0)) == 30 * 60
+        assert prewarmer.seconds_until_next_run(datetime(2024, 1, 1, 11, 30)) == 24 * 60 * 60
+        assert prewarmer.seconds_until_next_run(datetime(2024, 1, 1, 12, 0)) == 23.5 * 60 * 60
+
+    def test_start_and_stop(self, restaurant_service, areas_path):
+        """バックグラウンドの実行は1つだけ開始し、停止できることを確認"""
+        prewarmer = self._prewarmer(restaurant_service, areas_path)
+
+        assert prewarmer.start() is True
+        assert prewarmer.start() is False
+        prewarmer.stop(timeout=1)
+        assert prewarmer._thread is None
+
+    def test_start_without_api_key(self, areas_path, tmp_path):
+        """APIキーがない場合は開始しないことを確認"""
+        with patch.dict(os.environ, {}, clear=True):
+            service = RestaurantService(cache_service=CacheService(db_path=str(tmp_path / 'cache.db')))
+
+        assert self._prewarmer(service, areas_path).start() is False
+
+    def test_missing_areas_file(self, restaurant_service, tmp_path):
+        """エリアマスタファイルがない場合は何もしない"""
+        prewarmer = self._prewarmer(restaurant_service, tmp_path / 'missing.json')
+
+        assert prewarmer.run_once()['combinations'] == 0
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -248,7 +248,7 @@ def test_restaurant_service_search_with_middle_area(mocker):
     mock_response.status_code = 200
     mock_response.json.return_value = mock_api_response
     
-    mock_get = mocker.patch('requests.get', return_value=mock_response)
+    mock_get = mocker.patch('requests.Session.get', return_value=mock_response)
     
     # RestaurantServiceインスタンスを作成（実際のインスタンス）
     from lunch_roulette.services.restaurant_service import RestaurantService
@@ -256,6 +256,8 @@ def test_restaurant_service_search_with_middle_area(mocker):
     
     cache_service = CacheService(':memory:')
     service = RestaurantService(api_key='test_key', cache_service=cache_service)
+    # 条件付きの検索をAPIに送る場合のパラメータを確認する（条件なしの結果からの絞り込みは使わない）
+    service.local_filtering = False
     
     # middle_areaパラメータでレストラン検索
     restaurants = service.search_restaurants(
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+BackgroundRefresher（バックグラウンド更新）の単体テスト
+更新処理の予約・重複排除・例外時の動作を検証
+"""
+
+import threading
+import pytest
+from lunch_roulette.utils.background_refresher import BackgroundRefresher
+
+
+class TestBackgroundRefresher:
+    """BackgroundRefresherクラスの単体テスト"""
+
+    @pytest.fixture
+    def refresher(self):
+        """テスト用BackgroundRefresherインスタンス"""
+        refresher = BackgroundRefresher(max_workers=2)
+        yield refresher
+        refresher.shutdown()
+
+    def test_schedule_runs_in_background(self, refresher):
+        """予約した更新処理が別スレッドで実行されることを確認"""
+        done = threading.Event()
+        thread_names = []
+
+        def refresh():
+            thread_names.append(threading.current_thread().name)
+            done.set()
+
+        assert refresher.schedule('key', refresh) is True
+        assert done.wait(2)
+        refresher.shutdown()
+
+        assert thread_names[0].startswith('cache-refresh')
+        assert refresher.get_stats()['completed'] == 1
+        assert refresher.is_pending('key') is False
+
+    def test_duplicate_key_is_not_scheduled(self, refresher):
+        """同じキーの更新が実行中の場合は重複して予約しないことを確認"""
+        release = threading.Event()
+        calls = []
+
+        def refresh():
+            calls.append(1)
+            release.wait(2)
+
+        assert refresher.schedule('key', refresh) is True
+        assert refresher.schedule('key', refresh) is False
+        release.set()
+        refresher.shutdown()
+
+        stats = refresher.get_stats()
+        assert len(calls) == 1
+        assert stats['scheduled'] == 1
+        assert stats['deduplicated'] == 1
+
+    def test_failure_is_recorded(self, refresher):
+        """更新処理の例外は呼び出し元に伝わらず、失敗数として記録されることを確認"""
+        def refresh():
+            raise RuntimeError('API error')
+
+        refresher.schedule('key', refresh)
+        refresher.shutdown()
+
+        stats = refresher.get_stats()
+        assert stats['failed'] == 1
+        assert stats['pending'] == 0
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
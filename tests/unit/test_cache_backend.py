@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CacheBackend（キャッシュの保存先）の単体テスト
+Redisの保存先は、テスト内で起動する簡易的なRESPサーバー（FakeRedisServer）に対して検証する
+"""
+
+import fnmatch
+import os
+import socketserver
+import tempfile
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from lunch_roulette.config import Config
+from lunch_roulette.models.database import init_database, now_ms
+from lunch_roulette.models.restaurant_index import RestaurantIndex
+from lunch_roulette.services.cache_backend import (RedisCacheBackend, SqliteCacheBackend,
+                                                   create_cache_backend)
+from lunch_roulette.services.cache_service import CacheService
+from lunch_roulette.services.restaurant_service import RestaurantService
+from lunch_roulette.utils.redis_client import RedisClient, RedisError
+
+
+class FakeRedisServer(socketserver.ThreadingTCPServer):
+    """GET / MGET / SET（NX・PX）/ DEL / SCAN / AUTH / SELECT / PING だけに応答する簡易的なRedisサーバー"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, password=None):
+        super().__init__(('127.0.0.1', 0), FakeRedisHandler)
+        self.password = password
+        self.data = {}  # キー → (値, 期限切れの時刻（ミリ秒）)
+        self.lock = threading.Lock()
+        self.commands = []
+        self.connections = 0
+        self.thread = threading.Thread(target=self.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+        self.thread.start()
+
+    @property
+    def url(self):
+        host, port = self.server_address
+        auth = f':{self.password}@' if self.password else ''
+        return f'redis://{auth}{host}:{port}/0'
+
+    def get(self, key):
+        """期限切れでない値を取得"""
+        value, expires_at = self.data.get(key, (None, None))
+        if expires_at is not None and expires_at <= time.time() * 1000:
+            self.data.pop(key, None)
+            return None
+        return value
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class FakeRedisHandler(socketserver.StreamRequestHandler):
+    """1つの接続のコマンドを順に処理する"""
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        while True:
+            command = self._read_command()
+            if command is None:
+                return
+            with server.lock:
+                server.commands.append(command[0].upper())
+                self.wfile.write(self._execute(server, command))
+
+    def _read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        args = []
+        for _ in range(int(line[1:-2])):
+            length = int(self.rfile.readline()[1:-2])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+    @staticmethod
+    def _bulk(value):
+        return b'$-1\r\n' if value is None else b'$%d\r\n%s\r\n' % (len(value), value)
+
+    def _execute(self, server, args):
+        name = args[0].upper()
+        if name == b'PING':
+            return b'+PONG\r\n'
+        if name == b'AUTH':
+            return b'+OK\r\n' if args[1].decode() == server.password else b'-WRONGPASS invalid password\r\n'
+        if name == b'SELECT':
+            return b'+OK\r\n'
+        if name == b'GET':
+            return self._bulk(server.get(args[1]))
+        if name == b'MGET':
+            return b'*%d\r\n' % (len(args) - 1) + b''.join(self._bulk(server.get(key)) for key in args[1:])
+        if name == b'SET':
+            options = [arg.upper() for arg in args[3:]]
+            if b'NX' in options and server.get(args[1]) is not None:
+                return self._bulk(None)
+            expires_at = None
+            if b'PX' in options:
+                expires_at = time.time() * 1000 + int(args[3 + options.index(b'PX') + 1])
+            server.data[args[1]] = (args[2], expires_at)
+            return b'+OK\r\n'
+        if name == b'DEL':
+            deleted = sum(server.data.pop(key, None) is not None for key in args[1:])
+            return b':%d\r\n' % deleted
+        if name == b'SCAN':
+            pattern = args[args.index(b'MATCH') + 1].decode() if b'MATCH' in args else '*'
+            keys = [key for key in server.data if fnmatch.fnmatchcase(key.decode(), pattern)]
+            return b'*2\r\n$1\r\n0\r\n*%d\r\n' % len(keys) + b''.join(self._bulk(key) for key in keys)
+        return b'-ERR unknown command\r\n'
+
+
+@pytest.fixture
+def redis_server():
+    """テスト用の簡易Redisサーバー"""
+    server = FakeRedisServer()
+    yield server
+    server.stop()
+
+
+def make_cache(redis_server, prefix='test:', memory=True):
+    """Redisを保存先にしたCacheService（サーバー1台分）"""
+    backend = RedisCacheBackend(RedisClient(redis_server.url), prefix=prefix, retention=60)
+    cache = CacheService(db_path=':memory:', backend=backend, stale_ttl=30)
+    if not memory:
+        cache.memory_cache = None
+    return cache
+
+
+class TestRedisClient:
+    """RedisClient（RESPクライアント）の単体テスト"""
+
+    def test_execute_and_pipeline(self, redis_server):
+        """コマンドとパイプラインの応答を受け取れ、接続を使い回す"""
+        client = RedisClient(redis_server.url)
+
+        assert client.execute('PING') == 'PONG'
+        assert client.pipeline([('SET', 'a', b'1'), ('SET', 'b', 2), ('MGET', 'a', 'b', 'c')]) == \
+            ['OK', 'OK', [b'1', b'2', None]]
+        assert client.execute('DEL', 'a', 'b') == 2
+        assert redis_server.connections == 1
+        client.close()
+
+    def test_error_reply_raises(self, redis_server):
+        """サーバーのエラー応答は RedisError になり、接続はそのまま使える"""
+        client = RedisClient(redis_server.url)
+
+        with pytest.raises(RedisError):
+            client.execute('UNKNOWN')
+        assert client.execute('PING') == 'PONG'
+        client.close()
+
+    def test_auth_on_connect(self):
+        """URLにパスワードがある場合は接続時に認証する"""
+        server = FakeRedisServer(password='secret')
+        try:
+            assert RedisClient(server.url).execute('PING') == 'PONG'
+            with pytest.raises(RedisError):
+                RedisClient(server.url.replace('secret', 'wrong')).execute('PING')
+        finally:
+            server.stop()
+
+    def test_reconnects_when_pooled_connection_closed(self, redis_server):
+        """プールにあった接続がサーバー側で切れていた場合は、新しい接続で送り直す"""
+        client = RedisClient(redis_server.url)
+        client.execute('SET', 'a', b'1')
+        # サーバー側で接続が切れた状態にする
+        for sock, _ in client._idle:
+            sock.shutdown(2)
+
+        assert client.execute('GET', 'a') == b'1'
+        client.close()
+
+    def test_invalid_url_raises(self):
+        """redis:// 以外のURLは ValueError"""
+        with pytest.raises(ValueError):
+            RedisClient('http://localhost:6379')
+
+
+class TestRedisCacheBackend:
+    """RedisCacheBackend（複数のサーバーで共有するキャッシュ）の単体テスト"""
+
+    def test_nodes_share_one_cache(self, redis_server):
+        """1台目のサーバーが保存したデータを、2台目のサーバーが読み込める"""
+        node_a = make_cache(redis_server)
+        node_b = make_cache(redis_server)
+
+        node_a.set_cached_data('weather', {'temp': 25}, ttl=300)
+        node_a.set_many({'tile_a': ['J001'], 'tile_b': []}, ttl=300)
+
+        assert node_b.get_cached_data('weather') == {'temp': 25}
+        assert node_b.get_many(['tile_a', 'tile_b', 'missing']) == {'tile_a': ['J001'], 'tile_b': []}
+        assert node_b.get_tier_stats()['l2']['backend'] == 'redis'
+        assert node_b.is_shared is True
+
+    def test_expired_rows_kept_for_stale_and_fallback(self, redis_server):
+        """期限切れの行は retention の間Redisに残り、猶予期間内の古いデータ・フォールバックに使える"""
+        cache = make_cache(redis_server, memory=False)
+        cache.refresher = MagicMock()
+        cache.set_cached_data('key', {'temp': 18}, ttl=300)
+        backend = cache.backend
+        # 有効期限を10秒前にした行を保存し直す
+        now = now_ms()
+        backend.set(('key', cache.encode_data({'temp': 18})[0], now - 10000, cache.codec.codec, now, now))
+
+        assert cache.get_cached_data('key') is None
+        assert cache.get_cached_data('key', refresh=lambda: None) == {'temp': 18}
+        assert cache.get_fallback_data('key') == {'temp': 18}
+        assert cache.get_cache_info('key')['is_valid'] is False
+        _, expires_at = redis_server.data[b'test:key']
+        assert 49000 < expires_at - time.time() * 1000 <= 50000  # 期限切れから retention（60秒）後に削除される
+
+    def test_delete_and_clear_only_own_prefix(self, redis_server):
+        """削除・全削除は prefix の付いたキーだけを対象にする"""
+        cache = make_cache(redis_server)
+        other_app = make_cache(redis_server, prefix='other:')
+        cache.set_many({'a': 1, 'b': 2}, ttl=300)
+        other_app.set_cached_data('a', 3, ttl=300)
+
+        cache.delete_cached_data('a')
+        assert cache.get_cache_info('a') is None
+        assert cache.clear_all_cache() is True
+
+        assert cache.get_cache_info_many(['a', 'b']) == {}
+        assert set(redis_server.data) == {b'other:a'}
+
+    def test_unreachable_server_is_treated_as_cache_miss(self):
+        """Redisに接続できない場合はキャッシュなしとして扱い、例外を出さない"""
+        backend = RedisCacheBackend(RedisClient('redis://127.0.0.1:1/0', timeout=0.2), prefix='test:')
+        cache = CacheService(db_path=':memory:', backend=backend)
+        cache.memory_cache = None
+
+        assert cache.set_cached_data('key', {'a': 1}) is False
+        assert cache.get_cached_data('key') is None
+        assert cache.get_many(['key']) == {}
+
+    def test_shared_cache_stores_restaurant_summaries(self, redis_server):
+        """共有のキャッシュには店舗IDではなくお店の要約を保存する（他のサーバーの索引にはないため）"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = os.path.join(temp_dir, 'index.db')
+            init_database(db_path)
+            service = RestaurantService(api_key='test_key', cache_service=make_cache(redis_server),
+                                        restaurant_index=RestaurantIndex(db_path))
+            restaurants = [{'id': 'J001', 'name': 'お店'}]
+
+            assert service._to_cache_entries(restaurants) == restaurants
+            assert service._resolve_cached_restaurants(restaurants) == restaurants
+
+    def test_job_run_claimed_once_across_nodes(self, redis_server):
+        """定期処理の実行権は、Redisを共有するすべてのサーバーのうち1つだけが確保できる"""
+        node_a = make_cache(redis_server)
+        node_b = make_cache(redis_server)
+
+        assert node_a.claim_job_run('area_prewarm', '2024-01-01', 'host-a:1', ttl_ms=60000) is True
+        assert node_b.claim_job_run('area_prewarm', '2024-01-01', 'host-b:1', ttl_ms=60000) is False
+        assert node_b.claim_job_run('area_prewarm', '2024-01-02', 'host-b:1', ttl_ms=60000) is True
+
+        value, expires_at = redis_server.data[b'test:job_run:area_prewarm:2024-01-01']
+        assert value == b'host-a:1'
+        assert 59000 < expires_at - time.time() * 1000 <= 60000
+
+        # Redisに接続できない場合は実行しない
+        unreachable = RedisCacheBackend(RedisClient('redis://127.0.0.1:1/0', timeout=0.2), prefix='test:')
+        assert CacheService(db_path=':memory:', backend=unreachable).claim_job_run(
+            'area_prewarm', '2024-01-03', 'host-c:1', ttl_ms=60000) is False
+
+
+class TestCreateCacheBackend:
+    """設定に従った保存先の作成を検証"""
+
+    def test_default_is_sqlite(self):
+        """標準ではSQLiteを使い、件数・サイズの上限による削除に対応する"""
+        backend = create_cache_backend('cache.db', 'sqlite')
+
+        assert isinstance(backend, SqliteCacheBackend)
+        assert backend.db_path == 'cache.db'
+        assert backend.supports_eviction is True
+        assert isinstance(create_cache_backend('cache.db', 'unknown'), SqliteCacheBackend)
+
+    def test_redis_from_config(self, redis_server):
+        """CACHE_BACKEND=redis の場合は設定のURL・prefixでRedisを使う"""
+        with patch.object(Config, 'CACHE_BACKEND', 'redis'), \
+                patch.object(Config, 'CACHE_REDIS_URL', redis_server.url), \
+                patch.object(Config, 'CACHE_REDIS_PREFIX', 'config:'):
+            cache = CacheService(db_path=':memory:')
+
+        cache.set_cached_data('key', {'a': 1}, ttl=300)
+
+        assert isinstance(cache.backend, RedisCacheBackend)
+        assert b'config:key' in redis_server.data
+        assert cache.track_access is False
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CacheCodec（キャッシュの保存形式）の単体テスト
+エンコード・デコード、圧縮、以前の行（JSON文字列）との互換性を検証
+"""
+
+import json
+import os
+import sqlite3
+import tempfile
+from datetime import datetime
+
+import pytest
+
+from lunch_roulette.models.database import get_db_connection, init_database
+from lunch_roulette.services.cache_codec import CacheCodec, available_codecs, register_codec
+from lunch_roulette.services.cache_service import CacheService
+
+SHOPS = [{'id': f'J{i:09d}', 'name': f'テストレストラン{i}', 'lat': 35.68, 'lunch': 'あり'} for i in range(100)]
+
+
+class TestCacheCodec:
+    """CacheCodecクラスの単体テスト"""
+
+    @pytest.mark.parametrize('codec', ['json', 'marshal'])
+    def test_round_trip(self, codec):
+        """エンコードしたデータを元に戻せることを確認"""
+        cache_codec = CacheCodec(codec=codec, compression='none')
+        payload, tag = cache_codec.encode(SHOPS)
+
+        assert isinstance(payload, bytes)
+        assert tag == codec
+        assert cache_codec.decode(payload, tag) == SHOPS
+
+    def test_compresses_large_payload(self):
+        """最小サイズ以上のデータは圧縮し、コーデック名に圧縮方式を付ける"""
+        cache_codec = CacheCodec(codec='marshal', compression='zlib', compress_min_bytes=1024)
+
+        payload, tag = cache_codec.encode(SHOPS)
+        small_payload, small_tag = cache_codec.encode({'temp': 25})
+
+        assert tag == 'marshal+zlib'
+        assert len(payload) < len(CacheCodec(codec='marshal', compression='none').encode(SHOPS)[0])
+        assert cache_codec.decode(payload, tag) == SHOPS
+        assert small_tag == 'marshal'
+
+    def test_unsupported_values_fall_back_to_json(self):
+        """marshalで変換できないデータ（日時）はJSONで保存する"""
+        cache_codec = CacheCodec(codec='marshal', compression='none')
+        now = datetime(2024, 1, 1, 12, 0)
+
+        payload, tag = cache_codec.encode({'timestamp': now})
+
+        assert tag == 'json'
+        assert cache_codec.decode(payload, tag) == {'timestamp': str(now)}
+
+    def test_decode_legacy_json_text(self):
+        """コーデック名のない行はJSON文字列として読み込む"""
+        assert CacheCodec().decode('{"temp": 25}', None) == {'temp': 25}
+
+    def test_decode_unknown_codec_raises(self):
+        """使用できないコーデックの行は ValueError になる"""
+        with pytest.raises(ValueError):
+            CacheCodec().decode(b'...', 'unknown+zlib')
+
+    def test_unknown_settings_fall_back(self):
+        """使用できないコーデック・圧縮方式の設定は json / zlib になる"""
+        cache_codec = CacheCodec(codec='unknown', compression='unknown')
+
+        assert cache_codec.codec == 'json'
+        assert cache_codec.compression == 'zlib'
+
+    def test_register_codec(self):
+        """独自のコーデックを登録して使用できることを確認"""
+        register_codec('test-upper', lambda data: data.upper().encode('utf-8'),
+                       lambda payload: payload.decode('utf-8'))
+        cache_codec = CacheCodec(codec='test-upper', compression='none')
+
+        assert 'test-upper' in available_codecs()
+        assert cache_codec.decode(*cache_codec.encode('abc')) == 'ABC'
+
+
+class TestCacheServiceCodec:
+    """CacheServiceでのコーデックの使用を検証"""
+
+    @pytest.fixture
+    def temp_db_path(self):
+        """テスト用の一時データベースファイルパス"""
+        with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as temp_file:
+            temp_path = temp_file.name
+        init_database(temp_path)
+        yield temp_path
+        try:
+            os.unlink(temp_path)
+        except (PermissionError, OSError):
+            pass
+
+    def test_rows_store_codec_and_blob(self, temp_db_path):
+        """保存した行にはバイト列とコーデック名が入り、L2から読み込める"""
+        cache = CacheService(db_path=temp_db_path,
+                             codec=CacheCodec(codec='marshal', compression='zlib', compress_min_bytes=1024))
+        cache.set_cached_data('shops', SHOPS, ttl=300)
+        cache.memory_cache.clear()
+
+        with sqlite3.connect(temp_db_path) as conn:
+            data, codec = conn.execute("SELECT data, codec FROM cache WHERE cache_key = 'shops'").fetchone()
+
+        assert isinstance(data, bytes)
+        assert codec == 'marshal+zlib'
+        assert cache.get_cached_data('shops') == SHOPS
+
+    def test_reads_legacy_json_rows(self, temp_db_path):
+        """コーデック名のない以前の行（JSON文字列）もそのまま読み込める"""
+        cache = CacheService(db_path=temp_db_path)
+        with get_db_connection(temp_db_path) as conn:
+            conn.execute("INSERT INTO cache (cache_key, data, expires_at) VALUES (?, ?, ?)",
+                         ('legacy', json.dumps({'temp': 25}), datetime(2099, 1, 1)))
+            conn.commit()
+
+        assert cache.get_cached_data('legacy') == {'temp': 25}
+
+    def test_init_database_adds_codec_column(self):
+        """以前のバージョンのcacheテーブルに codec 列が追加される"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = os.path.join(temp_dir, 'old.db')
+            with sqlite3.connect(db_path) as conn:
+                conn.execute('''
+                    CREATE TABLE cache (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        cache_key TEXT UNIQUE NOT NULL,
+                        data TEXT NOT NULL,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        expires_at TIMESTAMP NOT NULL
+                    )
+                ''')
+
+            assert init_database(db_path) is True
+            with sqlite3.connect(db_path) as conn:
+                columns = {row[1] for row in conn.execute('PRAGMA table_info(cache)')}
+            assert 'codec' in columns
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CacheKey（決まった形のキャッシュキーの作成）の単体テスト
+キーの形式、値の置き換え、バージョンによる切り替えを検証
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from lunch_roulette.config import Config
+from lunch_roulette.services.cache_keys import CacheKey, format_key_value
+from lunch_roulette.services.cache_service import CacheService
+from lunch_roulette.services.restaurant_service import TILE_CACHE_KEY
+from lunch_roulette.services.weather_service import WEATHER_CACHE_KEY
+
+
+class TestCacheKey:
+    """CacheKeyクラスの単体テスト"""
+
+    def test_build_joins_values_after_prefix(self):
+        """キーは "種類:vバージョン:値1|値2" の形式で、同じ値からは同じキーになる"""
+        key = CacheKey('weather', ('lat', 'lon'), version='1')
+
+        assert key.build(35.6812, 139.7671) == 'weather:v1:35.6812|139.7671'
+        assert key.build(35.6812, 139.7671) == key.build(35.6812, 139.7671)
+        assert key.build(35.6812, 139.7672) != key.build(35.6812, 139.7671)
+
+    def test_separator_in_values_does_not_collide(self):
+        """値に区切り文字が含まれていても、別の値の組み合わせと同じキーにならない"""
+        key = CacheKey('test', ('a', 'b'), version='1')
+
+        assert key.build('x|y', 'z') != key.build('x', 'y|z')
+        assert key.build('%7C', '') != key.build('|', '')
+        assert key.build(None, 'x') != key.build('%N', 'x')
+        assert format_key_value('2001:db8::1') == '2001:db8::1'
+
+    def test_version_changes_every_key(self):
+        """バージョンを上げると、同じ値でも別のキーになる（generate_cache_key() も同様）"""
+        assert CacheKey('weather', ('lat',), version='1').build(35.0) != \
+            CacheKey('weather', ('lat',), version='2').build(35.0)
+
+        cache = CacheService(db_path=':memory:')
+        with patch.object(Config, 'CACHE_KEY_VERSION', '1'):
+            old_key = cache.generate_cache_key('test', param='value')
+        with patch.object(Config, 'CACHE_KEY_VERSION', '2'):
+            assert cache.generate_cache_key('test', param='value') != old_key
+
+    def test_wrong_number_of_values_raises(self):
+        """値の数が項目の数と合わない場合は TypeError"""
+        with pytest.raises(TypeError):
+            TILE_CACHE_KEY.build('xn76ur', 'all')
+        with pytest.raises(ValueError):
+            CacheKey('bad:name', ('a',))
+
+    def test_service_keys_use_configured_version(self):
+        """各サービスのキーは設定のバージョンを先頭に含む"""
+        assert WEATHER_CACHE_KEY.prefix == f'weather:v{Config.CACHE_KEY_VERSION}:'
+        assert TILE_CACHE_KEY.build('xn76ur', 'all', 0, 'all').endswith(':xn76ur|all|0|all')
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
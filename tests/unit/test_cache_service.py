@@ -12,6 +12,7 @@ import tempfile
 import os
 from datetime import datetime, timedelta
 from unittest.mock import patch, MagicMock
+from lunch_roulette.models.database import from_epoch_ms, to_epoch_ms
 from lunch_roulette.services.cache_service import CacheService
 
 
@@ -101,7 +102,7 @@ class TestCacheService:
         result = cache_service.is_cache_valid(current_time + timedelta(seconds=1))
         assert result is True
 
-    @patch("lunch_roulette.services.cache_service.get_db_connection")
+    @patch("lunch_roulette.services.cache_backend.get_db_connection")
     def test_set_cached_data_success(self, mock_get_db_connection, cache_service):
         """キャッシュデータ保存成功テスト"""
         # モックデータベース接続を設定
@@ -115,7 +116,7 @@ class TestCacheService:
         mock_conn.execute.assert_called_once()
         mock_conn.commit.assert_called_once()
 
-    @patch("lunch_roulette.services.cache_service.get_db_connection")
+    @patch("lunch_roulette.services.cache_backend.get_db_connection")
     def test_set_cached_data_failure(self, mock_get_db_connection, cache_service):
         """キャッシュデータ保存失敗テスト"""
         # データベースエラーをシミュレート
@@ -126,7 +127,7 @@ class TestCacheService:
 
         assert result is False
 
-    @patch("lunch_roulette.services.cache_service.get_db_connection")
+    @patch("lunch_roulette.services.cache_backend.get_db_connection")
     def test_get_cached_data_success(self, mock_get_db_connection, cache_service):
         """キャッシュデータ取得成功テスト"""
         # モックデータベース接続を設定
@@ -140,7 +141,8 @@ class TestCacheService:
         test_data = {'test': 'data'}
         mock_cursor.fetchone.return_value = {
             'data': json.dumps(test_data),
-            'expires_at': future_time.isoformat()
+            'codec': None,  # 以前のバージョンで保存したJSON文字列の行
+            'expires_at': to_epoch_ms(future_time)
         }
 
         result = cache_service.get_cached_data('test_key')
@@ -148,7 +150,7 @@ class TestCacheService:
         assert result == test_data
         mock_conn.execute.assert_called_once()
 
-    @patch("lunch_roulette.services.cache_service.get_db_connection")
+    @patch("lunch_roulette.services.cache_backend.get_db_connection")
     def test_get_cached_data_expired(self, mock_get_db_connection, cache_service):
         """期限切れキャッシュデータ取得テスト"""
         # モックデータベース接続を設定
@@ -162,7 +164,8 @@ class TestCacheService:
         test_data = {'test': 'data'}
         mock_cursor.fetchone.return_value = {
             'data': json.dumps(test_data),
-            'expires_at': past_time.isoformat()
+            'codec': None,  # 以前のバージョンで保存したJSON文字列の行
+            'expires_at': to_epoch_ms(past_time)
         }
 
         result = cache_service.get_cached_data('test_key')
@@ -171,7 +174,7 @@ class TestCacheService:
         # 期限切れデータの削除が呼ばれることを確認
         assert mock_conn.execute.call_count >= 1
 
-    @patch("lunch_roulette.services.cache_service.get_db_connection")
+    @patch("lunch_roulette.services.cache_backend.get_db_connection")
     def test_get_cached_data_not_found(self, mock_get_db_connection, cache_service):
         """存在しないキャッシュデータ取得テスト"""
         # モックデータベース接続を設定
@@ -187,7 +190,7 @@ class TestCacheService:
 
         assert result is None
 
-    @patch("lunch_roulette.services.cache_service.get_db_connection")
+    @patch("lunch_roulette.services.cache_backend.get_db_connection")
     def test_get_cached_data_error(self, mock_get_db_connection, cache_service):
         """キャッシュデータ取得エラーテスト"""
         # データベースエラーをシミュレート
@@ -197,7 +200,7 @@ class TestCacheService:
 
         assert result is None
 
-    @patch("lunch_roulette.services.cache_service.get_db_connection")
+    @patch("lunch_roulette.services.cache_backend.get_db_connection")
     def test_delete_cached_data(self, mock_get_db_connection, cache_service):
         """キャッシュデータ削除テスト"""
         # モックデータベース接続を設定
@@ -210,7 +213,7 @@ class TestCacheService:
         mock_conn.execute.assert_called_once()
         mock_conn.commit.assert_called_once()
 
-    @patch("lunch_roulette.services.cache_service.cleanup_expired_cache")
+    @patch("lunch_roulette.services.cache_backend.cleanup_expired_cache")
     def test_clear_expired_cache(self, mock_cleanup, cache_service):
         """期限切れキャッシュクリアテスト"""
         mock_cleanup.return_value = 5
@@ -220,7 +223,7 @@ class TestCacheService:
         assert result == 5
         mock_cleanup.assert_called_once_with(cache_service.db_path)
 
-    @patch("lunch_roulette.services.cache_service.get_db_connection")
+    @patch("lunch_roulette.services.cache_backend.get_db_connection")
     def test_clear_all_cache(self, mock_get_db_connection, cache_service):
         """全キャッシュクリアテスト"""
         # モックデータベース接続を設定
@@ -233,7 +236,7 @@ class TestCacheService:
         mock_conn.execute.assert_called_once_with('DELETE FROM cache')
         mock_conn.commit.assert_called_once()
 
-    @patch("lunch_roulette.services.cache_service.get_db_connection")
+    @patch("lunch_roulette.services.cache_backend.get_db_connection")
     def test_get_cache_info(self, mock_get_db_connection, cache_service):
         """キャッシュ情報取得テスト"""
         # モックデータベース接続を設定
@@ -246,8 +249,8 @@ class TestCacheService:
         created_time = datetime.now() - timedelta(minutes=2)
         expires_time = datetime.now() + timedelta(minutes=8)
         mock_cursor.fetchone.return_value = {
-            'created_at': created_time.isoformat(),
-            'expires_at': expires_time.isoformat(),
+            'created_at': to_epoch_ms(created_time),
+            'expires_at': to_epoch_ms(expires_time),
             'data_size': 100
         }
 
@@ -261,7 +264,7 @@ class TestCacheService:
 
     def test_default_ttl_usage(self, cache_service):
         """デフォルトTTL使用テスト"""
-        with patch('lunch_roulette.services.cache_service.get_db_connection') as mock_get_db_connection:
+        with patch('lunch_roulette.services.cache_backend.get_db_connection') as mock_get_db_connection:
             mock_conn = MagicMock()
             mock_get_db_connection.return_value.__enter__.return_value = mock_conn
 
@@ -271,13 +274,207 @@ class TestCacheService:
             # デフォルトTTL（300秒）が使用されることを確認
             call_args = mock_conn.execute.call_args[0]
             # 有効期限が現在時刻 + 300秒程度になっていることを確認
-            expires_at = call_args[1][2]  # expires_at パラメータ (datetime object)
+            expires_at = from_epoch_ms(call_args[1][2])  # expires_at パラメータ (UNIX時刻・ミリ秒)
             expected_expires = datetime.now() + timedelta(seconds=300)
 
             # 実行時間の誤差を考慮して±10秒以内で確認
             time_diff = abs((expires_at - expected_expires).total_seconds())
             assert time_diff < 10
 
+    def test_memory_cache_hit_skips_database(self, cache_service):
+        """L1キャッシュにヒットした場合はSQLiteを参照しないことを確認"""
+        with patch('lunch_roulette.services.cache_backend.get_db_connection') as mock_get_db_connection:
+            mock_conn = MagicMock()
+            mock_get_db_connection.return_value.__enter__.return_value = mock_conn
+
+            cache_service.set_cached_data('hot_key', {'temp': 25}, ttl=300)
+            mock_get_db_connection.reset_mock()
+
+            result = cache_service.get_cached_data('hot_key')
+
+            assert result == {'temp': 25}
+            mock_get_db_connection.assert_not_called()
+
+        stats = cache_service.get_tier_stats()
+        assert stats['l1']['hits'] == 1
+        assert stats['l2']['hits'] == 0
+
+    def test_database_hit_populates_memory_cache(self, cache_service):
+        """SQLiteから取得したデータがL1キャッシュに載ることを確認"""
+        from lunch_roulette.models.database import init_database
+        init_database(cache_service.db_path)
+        cache_service.set_cached_data('warm_key', {'temp': 20}, ttl=300)
+        cache_service.memory_cache.clear()
+
+        assert cache_service.get_cached_data('warm_key') == {'temp': 20}
+        assert cache_service.get_cached_data('warm_key') == {'temp': 20}
+
+        stats = cache_service.get_tier_stats()
+        assert stats['l2']['hits'] == 1
+        assert stats['l1']['hits'] == 1
+
+    def test_delete_removes_from_memory_cache(self, cache_service):
+        """削除時にL1キャッシュからも削除されることを確認"""
+        from lunch_roulette.models.database import init_database
+        init_database(cache_service.db_path)
+        cache_service.set_cached_data('key', {'a': 1}, ttl=300)
+
+        cache_service.delete_cached_data('key')
+
+        assert 'key' not in cache_service.memory_cache
+        assert cache_service.get_cached_data('key') is None
+
+    def _insert_expired_row(self, cache_service, key, data, seconds_ago):
+        """有効期限がseconds_ago秒前に切れた行をSQLiteに直接挿入"""
+        from lunch_roulette.models.database import init_database, get_db_connection
+        init_database(cache_service.db_path)
+        with get_db_connection(cache_service.db_path) as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO cache (cache_key, data, expires_at) VALUES (?, ?, ?)',
+                (key, json.dumps(data), datetime.now() - timedelta(seconds=seconds_ago))
+            )
+
+    def test_stale_data_served_and_refresh_scheduled(self, temp_db_path):
+        """猶予期間内の期限切れデータは返され、更新が予約されることを確認"""
+        refresher = MagicMock()
+        cache = CacheService(db_path=temp_db_path, stale_ttl=600, refresher=refresher)
+        self._insert_expired_row(cache, 'stale_key', {'temp': 18}, seconds_ago=30)
+        refresh = MagicMock()
+
+        assert cache.get_cached_data('stale_key', refresh=refresh) == {'temp': 18}
+        refresher.schedule.assert_called_once_with('stale_key', refresh)
+
+        # L1からも古いデータとして返され、再度更新が予約される（重複はrefresher側で排除）
+        assert cache.get_cached_data('stale_key', refresh=refresh) == {'temp': 18}
+        assert refresher.schedule.call_count == 2
+        assert cache.get_tier_stats()['stale']['served'] == 2
+
+    def test_stale_data_without_refresh_is_kept(self, temp_db_path):
+        """refreshがない場合は期限切れ扱いだが、フォールバック用に行は残ることを確認"""
+        cache = CacheService(db_path=temp_db_path, stale_ttl=600, refresher=MagicMock())
+        self._insert_expired_row(cache, 'stale_key', {'temp': 18}, seconds_ago=30)
+
+        assert cache.get_cached_data('stale_key') is None
+        assert cache.get_cache_info('stale_key') is not None
+
+    def test_data_beyond_stale_ttl_is_not_returned(self, temp_db_path):
+        """猶予期間も過ぎたデータは返さず、期限切れの削除で消えることを確認"""
+        refresher = MagicMock()
+        cache = CacheService(db_path=temp_db_path, stale_ttl=60, refresher=refresher)
+        self._insert_expired_row(cache, 'old_key', {'temp': 18}, seconds_ago=120)
+
+        assert cache.get_cached_data('old_key', refresh=MagicMock()) is None
+        refresher.schedule.assert_not_called()
+
+        assert cache.clear_expired_cache() == 1
+        assert cache.get_cache_info('old_key') is None
+
+    def test_set_many_and_get_many(self, cache_service):
+        """まとめて保存したデータをまとめて取得でき、ないキーは結果に含まれないことを確認"""
+        from lunch_roulette.models.database import init_database
+        init_database(cache_service.db_path)
+        assert cache_service.set_many({'tile_a': ['J001'], 'tile_b': [], 'tile_c': {'temp': 20}}, ttl=300)
+        cache_service.memory_cache.clear()
+
+        found = cache_service.get_many(['tile_a', 'tile_b', 'missing', 'tile_c', 'tile_a'])
+
+        assert found == {'tile_a': ['J001'], 'tile_b': [], 'tile_c': {'temp': 20}}
+        assert cache_service.get_tier_stats()['l2']['hits'] == 3
+        # L2から読み込んだデータはL1にも入る
+        assert cache_service.get_many(['tile_a']) == {'tile_a': ['J001']}
+        assert cache_service.get_tier_stats()['l1']['hits'] == 1
+
+    def test_get_many_splits_large_key_lists(self, cache_service):
+        """SQLiteの変数の上限を超えないように、多数のキーは分割して取得する"""
+        from lunch_roulette.models.database import init_database
+        from lunch_roulette.services import cache_backend
+        init_database(cache_service.db_path)
+        cache_service.set_many([(f'key_{i}', i) for i in range(7)], ttl=300)
+        cache_service.memory_cache.clear()
+
+        with patch.object(cache_backend, 'MAX_KEYS_PER_QUERY', 3):
+            found = cache_service.get_many(f'key_{i}' for i in range(8))
+
+        assert found == {f'key_{i}': i for i in range(7)}
+
+    def test_get_many_stale_data_refreshed_per_key(self, temp_db_path):
+        """猶予期間内の古いデータは、refreshesを指定したキーだけ返して更新を予約する"""
+        refresher = MagicMock()
+        cache = CacheService(db_path=temp_db_path, stale_ttl=600, refresher=refresher)
+        self._insert_expired_row(cache, 'stale_a', ['J001'], seconds_ago=30)
+        self._insert_expired_row(cache, 'stale_b', ['J002'], seconds_ago=30)
+        refresh = MagicMock()
+
+        found = cache.get_many(['stale_a', 'stale_b'], refreshes={'stale_a': refresh})
+
+        assert found == {'stale_a': ['J001']}
+        refresher.schedule.assert_called_once_with('stale_a', refresh)
+
+    def test_set_many_failure_saves_nothing(self, cache_service):
+        """保存できないデータがある場合は1件も保存しない"""
+        class Unserializable:
+            pass
+
+        assert cache_service.set_many({'ok': 1, 'ng': Unserializable()}) is False
+        assert cache_service.get_many(['ok', 'ng']) == {}
+
+    def test_get_cache_info_many(self, cache_service):
+        """複数のキャッシュ情報をまとめて取得できることを確認"""
+        from lunch_roulette.models.database import init_database
+        init_database(cache_service.db_path)
+        cache_service.set_many({'tile_a': ['J001'], 'tile_b': []}, ttl=300)
+
+        infos = cache_service.get_cache_info_many(['tile_a', 'tile_b', 'missing'])
+
+        assert set(infos) == {'tile_a', 'tile_b'}
+        assert infos['tile_a']['expires_at'] == cache_service.get_cache_info('tile_a')['expires_at']
+        assert infos['tile_b']['is_valid'] is True
+
+    def test_legacy_datetime_rows_are_converted(self, temp_db_path):
+        """以前の形式（日時の文字列）で書き込まれた日時はUNIX時刻（ミリ秒）に変換されることを確認"""
+        from lunch_roulette.models.database import init_database, get_db_connection
+        init_database(temp_db_path)
+        expires_at = datetime.now() + timedelta(minutes=5)
+        with get_db_connection(temp_db_path) as conn:
+            conn.execute('INSERT INTO cache (cache_key, data, expires_at) VALUES (?, ?, ?)',
+                         ('legacy_key', json.dumps({'temp': 20}), expires_at))
+            row = conn.execute("SELECT typeof(expires_at), expires_at, typeof(created_at) FROM cache").fetchone()
+
+        assert row[0] == 'integer'
+        assert abs(row[1] - to_epoch_ms(expires_at)) < 1000
+        assert row[2] == 'integer'
+        assert CacheService(db_path=temp_db_path).get_cached_data('legacy_key') == {'temp': 20}
+
+    def test_init_database_migrates_existing_datetime_rows(self, temp_db_path):
+        """以前のバージョンのcache.dbの日時の文字列が、初期化時に変換されることを確認"""
+        import sqlite3
+        from lunch_roulette.models.database import init_database
+        valid_until = datetime.now() + timedelta(minutes=5)
+        with sqlite3.connect(temp_db_path) as conn:
+            conn.execute('''
+                CREATE TABLE cache (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    cache_key TEXT UNIQUE NOT NULL,
+                    data TEXT NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    expires_at TIMESTAMP NOT NULL
+                )
+            ''')
+            conn.executemany('INSERT INTO cache (cache_key, data, expires_at) VALUES (?, ?, ?)', [
+                ('valid_key', json.dumps({'temp': 20}), valid_until.isoformat(' ')),
+                ('expired_key', json.dumps({'temp': 18}), (datetime.now() - timedelta(hours=1)).isoformat(' ')),
+            ])
+
+        assert init_database(temp_db_path) is True
+
+        cache = CacheService(db_path=temp_db_path, stale_ttl=0)
+        info = cache.get_cache_info('valid_key')
+        assert abs((info['expires_at'] - valid_until).total_seconds()) < 1
+        assert abs((info['created_at'] - datetime.now()).total_seconds()) < 60
+        assert cache.get_cached_data('valid_key') == {'temp': 20}
+        assert cache.get_cached_data('expired_key') is None
+        assert cache.clear_expired_cache() == 1
+
 
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CacheSweeper（キャッシュの定期削除）の単体テスト
+期限切れの分割削除、件数・サイズの上限による LRU / LFU 削除、利用記録の書き込みを検証
+"""
+
+import os
+import tempfile
+import time
+from unittest.mock import patch
+
+import pytest
+
+from lunch_roulette.config import Config
+from lunch_roulette.models.database import (evict_cache_entries, get_db_connection, incremental_vacuum,
+                                            init_database, now_ms)
+from lunch_roulette.services.cache_service import CacheService
+from lunch_roulette.services.cache_sweeper import CacheSweeper
+
+
+class TestCacheSweeper:
+    """CacheSweeperクラスの単体テスト"""
+
+    @pytest.fixture
+    def temp_db_path(self):
+        """テスト用の一時データベースファイルパス"""
+        with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as temp_file:
+            temp_path = temp_file.name
+        init_database(temp_path)
+        yield temp_path
+        try:
+            os.unlink(temp_path)
+        except (PermissionError, OSError):
+            pass
+
+    @pytest.fixture
+    def cache_service(self, temp_db_path):
+        """利用記録を有効にしたCacheService"""
+        cache = CacheService(db_path=temp_db_path, stale_ttl=0)
+        cache.track_access = True
+        return cache
+
+    def _insert(self, db_path, key, expires_in, last_accessed=None, hit_count=0, size=10):
+        """有効期限・利用記録を指定して行を直接挿入"""
+        now = now_ms()
+        with get_db_connection(db_path) as conn:
+            conn.execute('''
+                INSERT INTO cache (cache_key, data, codec, created_at, expires_at, last_accessed, hit_count)
+                VALUES (?, ?, 'json', ?, ?, ?, ?)
+            ''', (key, b'"' + b'x' * (size - 2) + b'"', now, now + expires_in * 1000,
+                  last_accessed, hit_count))
+            conn.commit()
+
+    def _keys(self, db_path):
+        """残っているキャッシュキーの一覧"""
+        with get_db_connection(db_path) as conn:
+            return {row[0] for row in conn.execute('SELECT cache_key FROM cache')}
+
+    def test_expired_rows_deleted_in_batches_after_retention(self, temp_db_path, cache_service):
+        """期限切れから retention 秒を過ぎた行だけを分割して削除する"""
+        for i in range(7):
+            self._insert(temp_db_path, f'old_{i}', expires_in=-7200)
+        self._insert(temp_db_path, 'recently_expired', expires_in=-60)
+        self._insert(temp_db_path, 'valid', expires_in=600)
+
+        sweeper = CacheSweeper(cache_service, max_rows=0, max_bytes=0, batch_size=3, retention=3600)
+        report = sweeper.run_once()
+
+        assert report['expired'] == 7
+        assert self._keys(temp_db_path) == {'recently_expired', 'valid'}
+        assert sweeper.get_last_report()['expired'] == 7
+
+    def test_lru_evicts_least_recently_used(self, temp_db_path):
+        """件数の上限を超えた分は、期限切れ → 最後に使われた日時が古い順に削除する"""
+        now = now_ms()
+        self._insert(temp_db_path, 'expired', expires_in=-60, last_accessed=now)
+        self._insert(temp_db_path, 'old', expires_in=600, last_accessed=now - 60000)
+        self._insert(temp_db_path, 'recent', expires_in=600, last_accessed=now)
+        self._insert(temp_db_path, 'frequent_but_old', expires_in=600, last_accessed=now - 30000, hit_count=50)
+
+        assert evict_cache_entries(temp_db_path, max_rows=2, policy='lru') == 2
+        assert self._keys(temp_db_path) == {'recent', 'frequent_but_old'}
+
+    def test_lfu_evicts_least_frequently_used(self, temp_db_path):
+        """LFUでは使われた回数が少ない行から削除する"""
+        now = now_ms()
+        self._insert(temp_db_path, 'rare', expires_in=600, last_accessed=now, hit_count=1)
+        self._insert(temp_db_path, 'frequent', expires_in=600, last_accessed=now - 60000, hit_count=50)
+        self._insert(temp_db_path, 'medium', expires_in=600, last_accessed=now, hit_count=10)
+
+        assert evict_cache_entries(temp_db_path, max_rows=2, policy='lfu') == 1
+        assert self._keys(temp_db_path) == {'frequent', 'medium'}
+
+    def test_evicts_until_under_max_bytes(self, temp_db_path):
+        """データの合計サイズが上限以下になるまで削除する"""
+        now = now_ms()
+        for i in range(5):
+            self._insert(temp_db_path, f'key_{i}', expires_in=600, last_accessed=now + i, size=1000)
+
+        assert evict_cache_entries(temp_db_path, max_bytes=2500, policy='lru', batch_size=2) == 3
+        assert self._keys(temp_db_path) == {'key_3', 'key_4'}
+
+    def test_invalid_policy_raises(self, temp_db_path):
+        """削除方式が正しくない場合は ValueError"""
+        with pytest.raises(ValueError):
+            evict_cache_entries(temp_db_path, max_rows=1, policy='fifo')
+
+    def test_access_stats_flushed_before_eviction(self, temp_db_path, cache_service):
+        """取得した記録がまとめて書き込まれ、使われたキャッシュが残る"""
+        cache_service.set_cached_data('used', {'a': 1}, ttl=600)
+        time.sleep(0.01)
+        cache_service.set_cached_data('unused', {'b': 2}, ttl=600)
+        time.sleep(0.01)
+        cache_service.get_cached_data('used')  # L1ヒットも記録される
+        cache_service.memory_cache.clear()
+        cache_service.get_cached_data('used')
+
+        report = CacheSweeper(cache_service, max_rows=1, max_bytes=0).run_once()
+
+        assert report['access_flushed'] == 1
+        assert report['evicted'] == 1
+        assert self._keys(temp_db_path) == {'used'}
+        with get_db_connection(temp_db_path) as conn:
+            assert conn.execute("SELECT hit_count FROM cache WHERE cache_key = 'used'").fetchone()[0] == 2
+
+    def test_access_not_tracked_without_limits(self, temp_db_path):
+        """上限を設定していない場合は利用記録をためない"""
+        with patch.object(Config, 'CACHE_MAX_ROWS', 0), patch.object(Config, 'CACHE_MAX_BYTES', 0):
+            cache = CacheService(db_path=temp_db_path)
+        cache.set_cached_data('key', {'a': 1}, ttl=600)
+        cache.get_cached_data('key')
+
+        assert cache.flush_access_stats() == 0
+
+    def test_incremental_vacuum_releases_free_pages(self, temp_db_path):
+        """削除で空いたページを解放する"""
+        for i in range(200):
+            self._insert(temp_db_path, f'key_{i}', expires_in=-7200, size=4000)
+        with get_db_connection(temp_db_path) as conn:
+            conn.execute('DELETE FROM cache')
+            conn.commit()
+            assert conn.execute('PRAGMA auto_vacuum').fetchone()[0] == 2
+
+        assert incremental_vacuum(temp_db_path, min_free_pages=10) > 0
+        assert incremental_vacuum(temp_db_path, min_free_pages=10) == 0
+
+    def test_start_and_stop(self, cache_service):
+        """開始したスレッドは1つだけで、停止できる"""
+        sweeper = CacheSweeper(cache_service, interval=3600)
+
+        assert sweeper.start() is True
+        assert sweeper.start() is False
+        sweeper.stop(timeout=1)
+        assert sweeper._thread is None
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ServiceContainer（共有サービスの入れ物）の単体テスト
+サービスの共有、Flaskアプリへの登録、終了処理の動作を検証
+"""
+
+import tempfile
+import os
+import pytest
+from unittest.mock import Mock, patch
+from flask import Flask
+from lunch_roulette.app import app, services
+from lunch_roulette.config import Config
+from lunch_roulette.container import ServiceContainer, get_services
+
+
+class TestServiceContainer:
+    """ServiceContainerクラスの単体テスト"""
+
+    @pytest.fixture
+    def temp_db_path(self):
+        """テスト用の一時データベースファイルパス"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            yield os.path.join(temp_dir, 'test_cache.db')
+
+    def test_create_shares_cache_service(self, temp_db_path):
+        """各サービスが同じキャッシュサービス・エラーハンドラーを共有する"""
+        container = ServiceContainer.create(db_path=temp_db_path)
+
+        assert container.cache_service.db_path == temp_db_path
+        assert container.location_service.cache_service is container.cache_service
+        assert container.weather_service.cache_service is container.cache_service
+        assert container.restaurant_service.cache_service is container.cache_service
+        assert container.restaurant_selector.distance_calculator is container.distance_calculator
+        assert container.restaurant_service.distance_calculator is container.distance_calculator
+        assert container.distance_calculator.error_handler is container.error_handler
+
+    def test_init_app_and_get_services(self, temp_db_path):
+        """Flaskアプリに登録したコンテナをビューから取得できる"""
+        flask_app = Flask(__name__)
+        container = ServiceContainer.create(db_path=temp_db_path)
+
+        with patch('lunch_roulette.container.atexit.register') as mock_register:
+            container.init_app(flask_app)
+
+        mock_register.assert_called_once_with(container.shutdown)
+        with flask_app.app_context():
+            assert get_services() is container
+
+    def test_startup_initializes_database_once(self, temp_db_path):
+        """起動処理でデータベースが作成され、2回目以降は何もしない"""
+        container = ServiceContainer.create(db_path=temp_db_path)
+
+        with patch('lunch_roulette.container.init_database') as mock_init:
+            container.startup()
+            container.startup()
+
+        mock_init.assert_called_once_with(temp_db_path)
+
+    def test_startup_starts_area_prewarmer(self, temp_db_path):
+        """起動処理でエリア指定検索の事前取得を開始する"""
+        container = ServiceContainer.create(db_path=temp_db_path)
+        container.area_prewarmer = Mock()
+
+        with patch('lunch_roulette.container.init_database'), \
+                patch.object(Config, 'AREA_PREWARM_ENABLED', True):
+            container.startup()
+
+        container.area_prewarmer.start.assert_called_once_with()
+
+    def test_startup_starts_cache_sweeper(self, temp_db_path):
+        """起動処理でキャッシュの定期削除を開始する"""
+        container = ServiceContainer.create(db_path=temp_db_path)
+        container.area_prewarmer = None
+        container.cache_sweeper = Mock()
+
+        with patch('lunch_roulette.container.init_database'), \
+                patch.object(Config, 'CACHE_SWEEP_ENABLED', True):
+            container.startup()
+
+        container.cache_sweeper.start.assert_called_once_with()
+
+    def test_shutdown_flushes_write_behind_queue(self, temp_db_path):
+        """終了処理で遅延書き込みのキューに残った行をSQLiteに書き込む"""
+        with patch.object(Config, 'CACHE_WRITE_BEHIND_ENABLED', True), \
+                patch.object(Config, 'CACHE_WRITE_BEHIND_FLUSH_INTERVAL_MS', 60000):
+            container = ServiceContainer.create(db_path=temp_db_path)
+        container.startup()
+        cache = container.cache_service
+        cache.set_cached_data('key', {'temp': 25}, ttl=300)
+        assert cache.write_behind.get_stats()['pending'] == 1
+
+        container.shutdown()
+
+        cache.memory_cache.clear()
+        assert cache.get_cached_data('key') == {'temp': 25}
+        assert cache.write_behind.get_stats()['written'] == 1
+
+    def test_shutdown_runs_hooks_once_in_reverse_order(self, temp_db_path):
+        """終了処理は登録の逆順に1回だけ実行され、例外が出ても続行する"""
+        container = ServiceContainer(*[Mock() for _ in range(7)])
+        calls = []
+        container.add_shutdown_hook(lambda: calls.append('first'))
+        container.add_shutdown_hook(Mock(side_effect=RuntimeError('close error')))
+        container.add_shutdown_hook(lambda: calls.append('last'))
+
+        container.shutdown()
+        container.shutdown()
+
+        assert calls == ['last', 'first']
+
+    def test_services_not_rebuilt_per_request(self):
+        """リクエストごとにサービスを作り直さない"""
+        app.config['TESTING'] = True
+
+        with patch('lunch_roulette.services.location_service.LocationService') as mock_location_class, \
+                patch.object(services, 'location_service') as mock_location_service, \
+                patch.object(services, 'weather_service') as mock_weather_service:
+            mock_location_service.get_location_from_ip.return_value = {
+                'city': '東京', 'region': '東京都', 'latitude': 35.6812, 'longitude': 139.7671
+            }
+            mock_weather_service.get_current_weather.return_value = {
+                'temperature': 25.0, 'description': '晴れ', 'uv_index': 5.0, 'condition': 'sunny'
+            }
+
+            with app.test_client() as client:
+                client.get('/')
+                client.get('/')
+
+            mock_location_class.assert_not_called()
+            assert mock_location_service.get_location_from_ip.call_count == 2
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
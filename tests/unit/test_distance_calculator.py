@@ -10,6 +10,7 @@ import pytest
 from unittest.mock import Mock, patch
 from lunch_roulette.utils.distance_calculator import DistanceCalculator
 from lunch_roulette.utils.error_handler import ErrorHandler
+from lunch_roulette.utils.restaurant_selector import RestaurantSelector
 
 
 class TestDistanceCalculator:
@@ -259,6 +260,91 @@ class TestDistanceCalculator:
         # ±5分の誤差を許容
         assert abs(result['walking_time_minutes'] - expected_time) <= 5
 
+    def test_calculate_distances_batch_matches_scalar(self, distance_calculator):
+        """まとめて計算した結果が1件ずつの計算と一致することを確認"""
+        import random
+        rng = random.Random(42)
+        user_lat, user_lon = 35.6812, 139.7671
+        lats = [user_lat + rng.uniform(-0.02, 0.02) for _ in range(100)]
+        lngs = [user_lon + rng.uniform(-0.02, 0.02) for _ in range(100)]
+
+        result = distance_calculator.calculate_distances_batch(user_lat, user_lon, lats, lngs)
+
+        assert len(result['distance_km']) == 100
+        for i, (lat, lng) in enumerate(zip(lats, lngs)):
+            expected = distance_calculator.calculate_walking_distance(user_lat, user_lon, lat, lng)
+            assert result['straight_km'][i] == pytest.approx(
+                distance_calculator.calculate_distance(user_lat, user_lon, lat, lng), abs=0.001
+            )
+            assert result['distance_km'][i] == pytest.approx(expected['distance_km'], abs=0.002)
+            assert abs(result['distance_m'][i] - expected['distance_m']) <= 2
+            assert abs(result['walking_time_minutes'][i] - expected['walking_time_minutes']) <= 1
+
+        straight = result['straight_km'][0]
+        assert result['distance_display'][0] == distance_calculator.walking_info_from_distance(straight)['distance_display']
+
+    def test_calculate_distances_batch_without_numpy(self, distance_calculator):
+        """NumPyがない環境でも標準ライブラリで同じ結果になることを確認"""
+        lats, lngs = [35.6812, 35.6896], [139.7671, 139.7006]
+
+        with patch('lunch_roulette.utils.distance_calculator.np', None):
+            result = distance_calculator.calculate_distances_batch(35.6812, 139.7671, lats, lngs)
+
+        assert result['straight_km'][0] == 0.0
+        assert result['straight_km'][1] == distance_calculator.calculate_distance(
+            35.6812, 139.7671, 35.6896, 139.7006
+        )
+        assert result['walking_time_minutes'][1] == distance_calculator.calculate_walking_distance(
+            35.6812, 139.7671, 35.6896, 139.7006
+        )['walking_time_minutes']
+
+    def test_calculate_distances_batch_empty(self, distance_calculator):
+        """お店が0件の場合は空のリストを返す"""
+        result = distance_calculator.calculate_distances_batch(35.0, 139.0, [], [])
+
+        assert result == {'straight_km': [], 'distance_km': [], 'distance_m': [], 'walking_time_minutes': [],
+                          'distance_display': []}
+
+    def test_calculate_distances_batch_invalid_input(self, distance_calculator):
+        """範囲外の座標や件数の不一致はValueErrorになる"""
+        with pytest.raises(ValueError):
+            distance_calculator.calculate_distances_batch(95.0, 139.0, [35.0], [139.0])
+        with pytest.raises(ValueError):
+            distance_calculator.calculate_distances_batch(35.0, 139.0, [35.0, 95.0], [139.0, 139.0])
+        with pytest.raises(ValueError):
+            distance_calculator.calculate_distances_batch(35.0, 139.0, [35.0], [139.0, 139.0])
+
+    def test_walking_info_from_distance(self, distance_calculator):
+        """直線距離から表示用の情報を作成できることを確認"""
+        result = distance_calculator.walking_info_from_distance(1.0)
+
+        assert result['distance_km'] == 1.3
+        assert result['distance_m'] == 1300
+        assert result['walking_time_minutes'] == 19
+        assert result['distance_display'] == '1.3km'
+        assert result['time_display'] == '徒歩約19分'
+
+    def test_selector_uses_batch_results_directly(self, distance_calculator):
+        """複数選択の距離情報は一括計算の結果から作り、1件ずつの計算は呼ばない"""
+        selector = RestaurantSelector(distance_calculator=distance_calculator)
+        restaurants = [
+            {'id': 'a', 'name': '店A', 'lat': 35.6896, 'lng': 139.7006},
+            {'id': 'b', 'name': '店B', 'lat': 35.6820, 'lng': 139.7680},
+        ]
+
+        with patch.object(distance_calculator, 'walking_info_from_distance',
+                          wraps=distance_calculator.walking_info_from_distance) as per_shop:
+            result = selector.select_multiple_restaurants(restaurants, 35.6812, 139.7671, count=2)
+
+        per_shop.assert_not_called()
+        assert [r['id'] for r in result] == ['b', 'a']
+        for restaurant in result:
+            expected = distance_calculator.calculate_walking_distance(
+                35.6812, 139.7671, restaurant['lat'], restaurant['lng']
+            )
+            assert restaurant['distance_info'] == expected
+            assert restaurant['display_info']['time_display'] == expected['time_display']
+
 
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
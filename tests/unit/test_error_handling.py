@@ -61,7 +61,7 @@ class TestErrorHandling:
         with pytest.raises(ValueError, match="データのデシリアライズに失敗"):
             cache_service.deserialize_data("invalid json {")
 
-    @patch('lunch_roulette.services.location_service.requests.get')
+    @patch('lunch_roulette.services.location_service.requests.Session.get')
     def test_location_service_network_error_handling(self, mock_get, cache_service):
         """LocationService ネットワークエラーハンドリングテスト"""
         location_service = LocationService(cache_service=cache_service)
@@ -77,7 +77,7 @@ class TestErrorHandling:
         assert result['latitude'] == 35.6812
         assert result['longitude'] == 139.7671
 
-    @patch('lunch_roulette.services.location_service.requests.get')
+    @patch('lunch_roulette.services.location_service.requests.Session.get')
     def test_location_service_api_error_handling(self, mock_get, cache_service):
         """LocationService APIエラーハンドリングテスト"""
         location_service = LocationService(cache_service=cache_service)
@@ -96,7 +96,7 @@ class TestErrorHandling:
         # デフォルト位置が返されることを確認
         assert result['source'] == 'default'
 
-    @patch('lunch_roulette.services.location_service.requests.get')
+    @patch('lunch_roulette.services.location_service.requests.Session.get')
     def test_location_service_rate_limit_handling(self, mock_get, cache_service):
         """LocationService レート制限ハンドリングテスト"""
         location_service = LocationService(cache_service=cache_service)
@@ -115,7 +115,7 @@ class TestErrorHandling:
         # デフォルト位置またはフォールバックキャッシュが返されることを確認
         assert result['source'] in ['default', 'fallback_cache']
 
-    @patch('lunch_roulette.services.weather_service.requests.get')
+    @patch('lunch_roulette.services.weather_service.requests.Session.get')
     def test_weather_service_api_error_handling(self, mock_get, cache_service):
         """WeatherService APIエラーハンドリングテスト"""
         weather_service = WeatherService(api_key="test_key", cache_service=cache_service)
@@ -144,7 +144,7 @@ class TestErrorHandling:
         # デフォルト天気情報が返されることを確認
         assert result['source'] == 'default'
 
-    @patch('lunch_roulette.services.restaurant_service.requests.get')
+    @patch('lunch_roulette.services.restaurant_service.requests.Session.get')
     def test_restaurant_service_api_error_handling(self, mock_get, cache_service):
         """RestaurantService APIエラーハンドリングテスト"""
         restaurant_service = RestaurantService(api_key="test_key", cache_service=cache_service)
@@ -243,7 +243,7 @@ class TestErrorHandling:
         # すべてのサービスでエラーが発生する状況をシミュレート
 
         # LocationService: ネットワークエラー
-        with patch('lunch_roulette.services.location_service.requests.get', side_effect=requests.exceptions.ConnectionError("Network error")):
+        with patch('lunch_roulette.services.location_service.requests.Session.get', side_effect=requests.exceptions.ConnectionError("Network error")):
             location_service = LocationService(cache_service=cache_service)
             location_result = location_service.get_location_from_ip('192.168.1.1')
             assert location_result['source'] == 'default'
@@ -280,7 +280,7 @@ class TestErrorHandling:
         assert location_result['source'] in ['default', 'ipapi.co', 'cache']
 
         # WeatherService: APIエラー → デフォルト天気
-        with patch('lunch_roulette.services.weather_service.requests.get') as mock_get:
+        with patch('lunch_roulette.services.weather_service.requests.Session.get') as mock_get:
             mock_response = Mock()
             mock_response.status_code = 500
             http_error = requests.exceptions.HTTPError("API Error")
@@ -293,7 +293,7 @@ class TestErrorHandling:
             assert weather_result['source'] == 'default'
 
         # RestaurantService: APIエラー → 空リスト
-        with patch('lunch_roulette.services.restaurant_service.requests.get') as mock_get:
+        with patch('lunch_roulette.services.restaurant_service.requests.Session.get') as mock_get:
             mock_response = Mock()
             mock_response.status_code = 500
             http_error = requests.exceptions.HTTPError("API Error")
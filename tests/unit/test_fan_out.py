@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+FanOutExecutor（並列実行）の単体テストと、/roulette での並列取得のテスト
+天気とレストランの同時取得、締め切り（Deadline）の動作を検証
+"""
+
+import time
+import pytest
+from unittest.mock import patch
+from lunch_roulette.app import app, services
+from lunch_roulette.config import Config
+from lunch_roulette.utils.fan_out import Deadline, FanOutExecutor
+
+
+class TestFanOutExecutor:
+    """FanOutExecutorクラスの単体テスト"""
+
+    @pytest.fixture
+    def fan_out(self):
+        """テスト用FanOutExecutorインスタンス"""
+        fan_out = FanOutExecutor(max_workers=4)
+        yield fan_out
+        fan_out.shutdown()
+
+    def test_submit_runs_concurrently(self, fan_out):
+        """複数の処理が同時に実行されることを確認"""
+        started = time.monotonic()
+        futures = [fan_out.submit(time.sleep, 0.2) for _ in range(3)]
+        for future in futures:
+            fan_out.result(future, timeout=1)
+
+        assert time.monotonic() - started < 0.5
+        assert fan_out.get_stats()['submitted'] == 3
+
+    def test_result_returns_default_on_timeout(self, fan_out):
+        """時間切れの場合はdefaultを返し、時間切れ数を記録する"""
+        future = fan_out.submit(time.sleep, 0.3)
+
+        assert fan_out.result(future, timeout=0.01, default='fallback') == 'fallback'
+        assert fan_out.get_stats()['timeouts'] == 1
+
+    def test_result_raises_on_timeout(self, fan_out):
+        """raise_on_timeout=True の場合は TimeoutError を送出する"""
+        future = fan_out.submit(time.sleep, 0.3)
+
+        with pytest.raises(TimeoutError):
+            fan_out.result(future, timeout=0.01, raise_on_timeout=True)
+
+    def test_result_propagates_exception(self, fan_out):
+        """処理中の例外は呼び出し元に伝わる"""
+        def fail():
+            raise ValueError('error')
+
+        with pytest.raises(ValueError):
+            fan_out.result(fan_out.submit(fail), timeout=1)
+
+    def test_deadline_remaining(self):
+        """締め切りまでの残り時間が減っていくことを確認"""
+        deadline = Deadline(0.05)
+        assert 0 < deadline.remaining() <= 0.05
+        time.sleep(0.06)
+        assert deadline.remaining() == 0
+        assert deadline.expired()
+
+
+class TestRouletteFanOut:
+    """/roulette で天気とレストランを並列に取得するテスト"""
+
+    RESTAURANT = {
+        'id': 'J001234567',
+        'name': 'テストレストラン',
+        'genre': '和食',
+        'address': '東京都千代田区',
+        'catch': 'おいしいレストラン',
+        'display_info': {
+            'budget_display': '〜1000円',
+            'photo_url': 'http://example.com/photo.jpg',
+            'hotpepper_url': 'http://example.com',
+            'map_url': 'https://maps.google.com',
+            'summary': 'テストレストラン - 和食',
+            'access_display': '徒歩5分',
+            'hours_display': '11:00-14:00'
+        },
+        'distance_info': {
+            'distance_km': 0.5,
+            'distance_display': '500m',
+            'walking_time_minutes': 8,
+            'time_display': '徒歩8分'
+        }
+    }
+
+    WEATHER = {
+        'temperature': 25.0,
+        'description': '曇り',
+        'uv_index': 5.0,
+        'condition': 'cloudy',
+        'icon': 1003
+    }
+
+    @pytest.fixture
+    def client(self):
+        """テスト用Flaskクライアント"""
+        app.config['TESTING'] = True
+        with app.test_client() as client:
+            yield client
+
+    def _post_roulette(self, client, weather_delay, restaurant_delay):
+        """天気・レストランの取得に遅延を入れて /roulette を呼び出す"""
+        def get_current_weather(lat, lon):
+            time.sleep(weather_delay)
+            return dict(self.WEATHER)
+
+        def search_restaurants(*args, **kwargs):
+            time.sleep(restaurant_delay)
+            return [dict(self.RESTAURANT)]
+
+        with patch.object(services, 'restaurant_service') as mock_restaurant_service, \
+                patch.object(services, 'weather_service') as mock_weather_service, \
+                patch.object(services, 'restaurant_selector') as mock_selector:
+            mock_restaurant_service.search_restaurants.side_effect = search_restaurants
+            mock_restaurant_service.LUNCH_BUDGET_LIMIT = 1200
+            mock_weather_service.get_current_weather.side_effect = get_current_weather
+            mock_weather_service.is_good_weather_for_walking.return_value = True
+            mock_selector.select_random_restaurant.return_value = dict(self.RESTAURANT)
+
+            started = time.monotonic()
+            response = client.post('/roulette', json={'latitude': 35.6812, 'longitude': 139.7671})
+            return response, time.monotonic() - started
+
+    def test_weather_and_restaurants_fetched_concurrently(self, client):
+        """待ち時間が天気とレストランの合計ではなく、遅い方の1回分になる"""
+        response, elapsed = self._post_roulette(client, weather_delay=0.3, restaurant_delay=0.3)
+
+        assert response.status_code == 200
+        assert response.get_json()['weather']['description'] == '曇り'
+        assert elapsed < 0.55
+
+    def test_slow_weather_falls_back_to_default(self, client):
+        """天気の取得が間に合わない場合は標準的な天気で応答する"""
+        with patch.object(Config, 'ROULETTE_WEATHER_GRACE_SECONDS', 0.05):
+            response, elapsed = self._post_roulette(client, weather_delay=0.5, restaurant_delay=0.0)
+
+        assert response.status_code == 200
+        assert response.get_json()['weather']['description'] == '晴れ'
+        assert elapsed < 0.4
+
+    def test_restaurant_deadline_exceeded(self, client):
+        """レストラン検索が締め切りを過ぎた場合は504を返す"""
+        with patch.object(Config, 'ROULETTE_DEADLINE_SECONDS', 0.1):
+            response, elapsed = self._post_roulette(client, weather_delay=0.0, restaurant_delay=0.5)
+
+        assert response.status_code == 504
+        assert response.get_json()['success'] is False
+        assert elapsed < 0.4
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ジオハッシュ（geohash）モジュールの単体テスト
+座標とタイルの変換、検索範囲と重なるタイルの計算を検証
+"""
+
+import pytest
+from lunch_roulette.utils.geohash import (
+    covering_tiles, decode_bbox, encode, tile_center, tile_half_diagonal_km
+)
+
+
+class TestGeohash:
+    """ジオハッシュ関数の単体テスト"""
+
+    def test_encode_known_values(self):
+        """既知の座標が正しいジオハッシュになることを確認"""
+        assert encode(57.64911, 10.40744, 11) == 'u4pruydqqvj'
+        assert encode(35.6812, 139.7671, 6) == 'xn76ur'
+
+    def test_decode_bbox_contains_point(self):
+        """タイルの範囲に元の座標が含まれることを確認"""
+        lat_min, lat_max, lon_min, lon_max = decode_bbox(encode(35.6812, 139.7671, 6))
+
+        assert lat_min <= 35.6812 <= lat_max
+        assert lon_min <= 139.7671 <= lon_max
+
+    def test_decode_invalid_character(self):
+        """使えない文字はValueErrorになる"""
+        with pytest.raises(ValueError):
+            decode_bbox('xn7a')
+
+    def test_tile_center_round_trip(self):
+        """タイルの中心をジオハッシュにすると同じタイルになる"""
+        tile = encode(35.6812, 139.7671, 6)
+        assert encode(*tile_center(tile), 6) == tile
+
+    def test_tile_half_diagonal_km(self):
+        """精度6のタイルは東京付近で中心から角まで約0.6km"""
+        assert tile_half_diagonal_km('xn76ur') == pytest.approx(0.58, abs=0.02)
+
+    def test_covering_tiles(self):
+        """検索範囲と重なるタイルを、中心のタイルから順に返すことを確認"""
+        tiles = covering_tiles(35.6812, 139.7671, 0.56, 6)
+
+        assert tiles[0] == encode(35.6812, 139.7671, 6)
+        assert len(tiles) == len(set(tiles))
+        # 半径内の地点は、どれかのタイルに含まれる
+        for lat, lon in [(35.6862, 139.7671), (35.6812, 139.7731), (35.6762, 139.7611)]:
+            assert encode(lat, lon, 6) in tiles
+        # 遠い地点のタイルは含まれない
+        assert encode(35.7000, 139.7671, 6) not in tiles
+
+    def test_covering_tiles_small_radius(self):
+        """半径0の場合は中心のタイルだけを返す"""
+        assert covering_tiles(35.6812, 139.7671, 0, 6) == ['xn76ur']
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+http_client（外部API用の共有セッション）の単体テスト
+セッションの共有、接続の再利用、再試行の動作をローカルのスタブサーバーで検証
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from lunch_roulette.utils.http_client import (
+    create_http_session, get_http_session, close_all_http_sessions
+)
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """keep-alive対応のテスト用ハンドラー（最初のfail_count回は503を返す）"""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True  # ヘッダーと本文の分割送信で遅延ACK待ちが起きないようにする
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_GET(self):
+        self.server.requests += 1
+        status = 503 if self.server.requests <= self.server.fail_count else 200
+        body = b'{"ok": true}'
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    """ローカルのスタブサーバーを起動"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _StubHandler)
+    server.connections = 0
+    server.requests = 0
+    server.fail_count = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class TestHttpClient:
+    """http_clientモジュールの単体テスト"""
+
+    def test_session_is_shared_per_upstream(self):
+        """同じ名前には同じセッション、異なる名前には別のセッションが返る"""
+        try:
+            assert get_http_session('hotpepper') is get_http_session('hotpepper')
+            assert get_http_session('hotpepper') is not get_http_session('weatherapi')
+        finally:
+            close_all_http_sessions()
+
+    def test_connection_is_reused(self, stub_server):
+        """同じセッションからの連続リクエストで接続が再利用される"""
+        session = create_http_session(pool_size=2, max_retries=0)
+        url = f'http://127.0.0.1:{stub_server.server_port}/'
+
+        for _ in range(5):
+            assert session.get(url, timeout=(1, 1)).status_code == 200
+        session.close()
+
+        assert stub_server.requests == 5
+        assert stub_server.connections == 1
+
+    def test_retry_on_service_unavailable(self, stub_server):
+        """503が返った場合は設定回数まで再試行する"""
+        stub_server.fail_count = 2
+        session = create_http_session(pool_size=1, max_retries=2)
+        url = f'http://127.0.0.1:{stub_server.server_port}/'
+
+        response = session.get(url, timeout=(1, 1))
+        session.close()
+
+        assert response.status_code == 200
+        assert stub_server.requests == 3
+
+    def test_no_retry_returns_last_response(self, stub_server):
+        """再試行しない設定では503がそのまま返り、raise_for_statusで判定できる"""
+        stub_server.fail_count = 1
+        session = create_http_session(pool_size=1, max_retries=0)
+        url = f'http://127.0.0.1:{stub_server.server_port}/'
+
+        response = session.get(url, timeout=(1, 1))
+        session.close()
+
+        assert response.status_code == 503
+        assert stub_server.requests == 1
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
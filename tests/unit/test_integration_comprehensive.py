@@ -20,10 +20,10 @@ import requests
 from unittest.mock import patch, Mock
 from datetime import datetime, timedelta
 
-from lunch_roulette.app import app
+from lunch_roulette.app import app, services
 from lunch_roulette.models.database import init_database, cleanup_expired_cache, get_cache_stats
 from lunch_roulette.services.cache_service import CacheService
-from lunch_roulette.services.location_service import LocationService
+from lunch_roulette.services.location_service import LOCATION_CACHE_KEY, LocationService
 from lunch_roulette.services.weather_service import WeatherService
 from lunch_roulette.services.restaurant_service import RestaurantService
 from lunch_roulette.utils.distance_calculator import DistanceCalculator
@@ -80,8 +80,8 @@ class TestComprehensiveIntegration:
             assert 'ページが見つかりません' in data['message']
 
         # 500エラーテスト（サービスエラーを発生させる）
-        with patch('lunch_roulette.services.restaurant_service.RestaurantService') as mock_restaurant_service:
-            mock_restaurant_service.side_effect = Exception("Test error")
+        with patch.object(services, 'restaurant_service') as mock_restaurant_service:
+            mock_restaurant_service.search_restaurants.side_effect = Exception("Test error")
 
             request_data = {
                 'latitude': 35.6812,
@@ -146,7 +146,7 @@ class TestComprehensiveIntegration:
         delete_result = cache_service.delete_cached_data('test_key')
         assert delete_result is False
 
-    @patch('lunch_roulette.services.location_service.requests.get')
+    @patch('lunch_roulette.services.location_service.requests.Session.get')
     def test_location_service_error_handling_integration(self, mock_get, cache_service):
         """LocationService エラーハンドリング統合テスト"""
         location_service = LocationService(cache_service=cache_service)
@@ -281,7 +281,7 @@ class TestComprehensiveIntegration:
 
         # LocationService: 成功し、キャッシュから取得
         location_service = LocationService(cache_service=cache_service)
-        cache_key = cache_service.generate_cache_key('location', ip='auto')
+        cache_key = LOCATION_CACHE_KEY.build('auto')
         cache_service.set_cached_data(cache_key, {
             'latitude': 35.6812,
             'longitude': 139.7671,
@@ -10,10 +10,14 @@ import pytest
 import tempfile
 import os
 import sqlite3
+import threading
+import time
 from datetime import datetime, timedelta
+from unittest.mock import PropertyMock, patch
 from lunch_roulette.models.database import (
     init_database, get_db_connection, cleanup_expired_cache,
-    get_cache_stats
+    get_cache_stats, get_connection_pool, get_pool_stats, ConnectionPool,
+    get_storage_profile
 )
 from lunch_roulette.services.cache_service import CacheService
 
@@ -229,7 +233,8 @@ class TestDatabaseIntegration:
 
             assert row is not None
             assert row['cache_key'] == cache_key
-            assert '"message": "Hello Integration"' in row['data']
+            assert row['codec'] is not None
+            assert cache_service.deserialize_data(row['data'], row['codec'])['message'] == 'Hello Integration'
 
         # CacheService経由でデータ取得
         retrieved_data = cache_service.get_cached_data(cache_key)
@@ -301,6 +306,112 @@ class TestDatabaseIntegration:
         file_size = os.path.getsize(temp_db_path)
         assert file_size > 0
 
+    def test_connection_pool_reuses_connection(self, temp_db_path):
+        """接続プールが同じ接続を再利用することを確認"""
+        init_database(temp_db_path)
+
+        with get_db_connection(temp_db_path) as conn1:
+            first_id = id(conn1)
+        with get_db_connection(temp_db_path) as conn2:
+            second_id = id(conn2)
+
+        assert first_id == second_id
+        stats = get_pool_stats(temp_db_path)
+        assert stats['in_use'] == 0
+        assert stats['size'] >= 1
+        assert stats['acquired'] >= 2
+
+    def test_connection_pool_shared_by_path(self, temp_db_path):
+        """同じファイルパスには同じプールが返されることを確認"""
+        pool1 = get_connection_pool(temp_db_path)
+        pool2 = get_connection_pool(os.path.join(os.path.dirname(temp_db_path), '.', os.path.basename(temp_db_path)))
+
+        assert pool1 is pool2
+
+    def test_connection_pool_timeout(self, temp_db_path):
+        """接続プール枯渇時にタイムアウトすることを確認"""
+        pool = ConnectionPool(temp_db_path, max_size=1, timeout=0.05)
+
+        conn = pool.acquire()
+        with pytest.raises(sqlite3.OperationalError):
+            pool.acquire()
+        pool.release(conn)
+
+        stats = pool.get_stats()
+        assert stats['timeouts'] == 1
+        assert stats['waits'] == 1
+        pool.close()
+
+    def test_connection_pool_discard_wakes_waiter(self, temp_db_path):
+        """返却時に破棄された接続の枠は、待っているスレッドがすぐに使えることを確認"""
+        pool = ConnectionPool(temp_db_path, max_size=1, timeout=2.0)
+        conn = pool.acquire()
+        acquired = []
+
+        def waiter():
+            started = time.perf_counter()
+            waiter_conn = pool.acquire()
+            acquired.append(time.perf_counter() - started)
+            pool.release(waiter_conn)
+
+        thread = threading.Thread(target=waiter)
+        thread.start()
+        time.sleep(0.1)
+
+        # ロールバックに失敗した接続は返却されずに破棄される
+        with patch.object(type(conn), 'in_transaction', new_callable=PropertyMock,
+                          side_effect=sqlite3.Error('broken')):
+            pool.release(conn)
+        thread.join(timeout=2.0)
+
+        assert len(acquired) == 1
+        assert acquired[0] < 1.0
+        stats = pool.get_stats()
+        assert stats['timeouts'] == 0
+        assert stats['size'] == 1
+        pool.close()
+
+    def test_connection_pool_rolls_back_on_release(self, temp_db_path):
+        """未コミットのまま返却された接続がロールバックされることを確認"""
+        init_database(temp_db_path)
+        pool = ConnectionPool(temp_db_path, max_size=1)
+
+        conn = pool.acquire()
+        conn.execute("""
+            INSERT INTO cache (cache_key, data, expires_at)
+            VALUES (?, ?, ?)
+        """, ('uncommitted', '{}', datetime.now() + timedelta(hours=1)))
+        pool.release(conn)
+
+        conn = pool.acquire()
+        count = conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        pool.release(conn)
+        pool.close()
+
+        assert count == 0
+
+    def test_init_database_enables_wal(self, temp_db_path):
+        """データベース初期化でWALモードが設定されることを確認"""
+        init_database(temp_db_path)
+
+        with sqlite3.connect(temp_db_path) as conn:
+            journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+
+        assert journal_mode.upper() == get_storage_profile()['journal_mode']
+
+    def test_pooled_connection_storage_profile(self, temp_db_path):
+        """プール接続にストレージ設定が適用されることを確認"""
+        init_database(temp_db_path)
+        profile = get_storage_profile()
+
+        with get_db_connection(temp_db_path) as conn:
+            busy_timeout = conn.execute("PRAGMA busy_timeout").fetchone()[0]
+            synchronous = conn.execute("PRAGMA synchronous").fetchone()[0]
+
+        assert busy_timeout == profile['busy_timeout_ms']
+        # synchronous: 0=OFF, 1=NORMAL, 2=FULL, 3=EXTRA
+        assert synchronous == ['OFF', 'NORMAL', 'FULL', 'EXTRA'].index(profile['synchronous'])
+
 
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -9,8 +9,8 @@ Flask エンドポイントの統合テスト
 import pytest
 import json
 import os
-from unittest.mock import patch, Mock
-from lunch_roulette.app import app
+from unittest.mock import patch
+from lunch_roulette.app import app, services
 from lunch_roulette.models.database import init_database
 
 
@@ -43,11 +43,11 @@ class TestFlaskEndpointsIntegration:
 
     def test_main_page_endpoint_success(self, client):
         """メインページエンドポイント成功テスト"""
-        with patch('lunch_roulette.services.location_service.LocationService') as mock_location_service, \
-                patch('lunch_roulette.services.weather_service.WeatherService') as mock_weather_service:
+        with patch.object(services, 'location_service') as mock_location_service, \
+                patch.object(services, 'weather_service') as mock_weather_service:
 
-            # モックサービスの設定
-            mock_location_instance = Mock()
+            # モックサービスの設定（起動時に作成されたサービスをモックに差し替え）
+            mock_location_instance = mock_location_service
             mock_location_instance.get_location_from_ip.return_value = {
                 'city': '東京',
                 'region': '東京都',
@@ -55,9 +55,8 @@ class TestFlaskEndpointsIntegration:
                 'longitude': 139.7671,
                 'source': 'ipapi.co'
             }
-            mock_location_service.return_value = mock_location_instance
 
-            mock_weather_instance = Mock()
+            mock_weather_instance = mock_weather_service
             mock_weather_instance.get_current_weather.return_value = {
                 'temperature': 25.0,
                 'description': '晴れ',
@@ -68,7 +67,6 @@ class TestFlaskEndpointsIntegration:
             mock_weather_instance.get_weather_icon_emoji.return_value = '☀️'
             mock_weather_instance.get_weather_summary.return_value = '晴れ 25°C UV指数 5'
             mock_weather_instance.is_good_weather_for_walking.return_value = True
-            mock_weather_service.return_value = mock_weather_instance
 
             response = client.get('/')
 
@@ -83,12 +81,12 @@ class TestFlaskEndpointsIntegration:
 
     def test_main_page_endpoint_service_error(self, client):
         """メインページエンドポイント（サービスエラー）テスト"""
-        with patch('lunch_roulette.services.location_service.LocationService') as mock_location_service, \
-                patch('lunch_roulette.services.weather_service.WeatherService') as mock_weather_service:
+        with patch.object(services, 'location_service') as mock_location_service, \
+                patch.object(services, 'weather_service') as mock_weather_service:
 
             # サービスでエラーが発生する場合
-            mock_location_service.side_effect = Exception("Location service error")
-            mock_weather_service.side_effect = Exception("Weather service error")
+            mock_location_service.get_location_from_ip.side_effect = Exception("Location service error")
+            mock_weather_service.get_current_weather.side_effect = Exception("Weather service error")
 
             response = client.get('/')
 
@@ -114,10 +112,10 @@ class TestFlaskEndpointsIntegration:
 
     def test_roulette_endpoint_service_error(self, client):
         """ルーレットエンドポイント（サービスエラー）テスト"""
-        with patch('lunch_roulette.services.restaurant_service.RestaurantService') as mock_restaurant_service:
+        with patch.object(services, 'restaurant_service') as mock_restaurant_service:
 
             # サービスでエラーが発生する場合
-            mock_restaurant_service.side_effect = Exception("Service error")
+            mock_restaurant_service.search_restaurants.side_effect = Exception("Service error")
 
             request_data = {
                 'latitude': 35.6812,
@@ -152,9 +150,9 @@ class TestFlaskEndpointsIntegration:
     def test_500_error_handler(self, client):
         """500エラーハンドラーテスト"""
         # 既存のエンドポイントでエラーを発生させる
-        with patch('lunch_roulette.services.restaurant_service.RestaurantService') as mock_restaurant_service:
+        with patch.object(services, 'restaurant_service') as mock_restaurant_service:
             # サービスでエラーが発生する場合
-            mock_restaurant_service.side_effect = Exception("Test error")
+            mock_restaurant_service.search_restaurants.side_effect = Exception("Test error")
 
             request_data = {
                 'latitude': 35.6812,
@@ -210,11 +208,11 @@ class TestFlaskEndpointsIntegration:
 
     def test_concurrent_requests_simulation(self, client):
         """同時リクエストシミュレーションテスト"""
-        with patch('lunch_roulette.services.restaurant_service.RestaurantService') as mock_restaurant_service, \
-                patch('lunch_roulette.utils.restaurant_selector.RestaurantSelector') as mock_restaurant_selector, \
-                patch('lunch_roulette.services.weather_service.WeatherService') as mock_weather_service:
+        with patch.object(services, 'restaurant_service') as mock_restaurant_service, \
+                patch.object(services, 'restaurant_selector') as mock_restaurant_selector, \
+                patch.object(services, 'weather_service') as mock_weather_service:
 
-            mock_restaurant_instance = Mock()
+            mock_restaurant_instance = mock_restaurant_service
             mock_restaurant_instance.search_lunch_restaurants.return_value = [{
                 'id': 'J001234567',
                 'name': 'テストレストラン',
@@ -226,9 +224,8 @@ class TestFlaskEndpointsIntegration:
                 'urls': {'pc': 'http://example.com'},
                 'photo': 'http://example.com/photo.jpg'
             }]
-            mock_restaurant_service.return_value = mock_restaurant_instance
 
-            mock_selector_instance = Mock()
+            mock_selector_instance = mock_restaurant_selector
             mock_selector_instance.select_random_restaurant.return_value = {
                 'id': 'J001234567',
                 'name': 'テストレストラン',
@@ -251,9 +248,8 @@ class TestFlaskEndpointsIntegration:
                     'time_display': '徒歩8分'
                 }
             }
-            mock_restaurant_selector.return_value = mock_selector_instance
 
-            mock_weather_instance = Mock()
+            mock_weather_instance = mock_weather_service
             mock_weather_instance.get_current_weather.return_value = {
                 'temperature': 25.0,
                 'description': '晴れ',
@@ -261,7 +257,6 @@ class TestFlaskEndpointsIntegration:
                 'icon': '01d'
             }
             mock_weather_instance.is_good_weather_for_walking.return_value = True
-            mock_weather_service.return_value = mock_weather_instance
 
             # 複数のリクエストを同時に実行（同時実行テスト）
             request_data = {
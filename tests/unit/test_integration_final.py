@@ -291,7 +291,7 @@ class TestIntegrationFinal:
         delete_result = cache_service.delete_cached_data('test_key')
         assert delete_result is False
 
-    @patch('lunch_roulette.services.location_service.requests.get')
+    @patch('lunch_roulette.services.location_service.requests.Session.get')
     def test_location_service_network_error_handling(self, mock_get, cache_service):
         """LocationService ネットワークエラーハンドリングテスト"""
         location_service = LocationService(cache_service=cache_service)
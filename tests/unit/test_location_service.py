@@ -8,7 +8,7 @@ IPアドレスから位置情報を取得する機能をテスト
 
 import pytest
 import requests
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, patch
 from lunch_roulette.services.location_service import LocationService
 from lunch_roulette.services.cache_service import CacheService
 
@@ -22,6 +22,7 @@ class TestLocationService:
         mock_cache = Mock(spec=CacheService)
         mock_cache.generate_cache_key.return_value = "location_test_key"
         mock_cache.get_cached_data.return_value = None
+        mock_cache.get_fallback_data.return_value = None
         mock_cache.set_cached_data.return_value = True
         return mock_cache
 
@@ -44,7 +45,7 @@ class TestLocationService:
         assert LocationService.DEFAULT_LOCATION['city'] == '東京'
         assert LocationService.DEFAULT_LOCATION['country'] == '日本'
 
-    @patch('lunch_roulette.services.location_service.requests.get')
+    @patch('lunch_roulette.services.location_service.requests.Session.get')
     def test_get_location_from_ip_success(self, mock_get, location_service, mock_cache_service):
         """位置情報取得成功テスト"""
         # モックAPIレスポンス
@@ -81,7 +82,7 @@ class TestLocationService:
         # キャッシュに保存されたことを確認
         mock_cache_service.set_cached_data.assert_called_once()
 
-    @patch('lunch_roulette.services.location_service.requests.get')
+    @patch('lunch_roulette.services.location_service.requests.Session.get')
     def test_get_location_from_ip_auto_detect(self, mock_get, location_service):
         """自動IP検出テスト"""
         # モックAPIレスポンス
@@ -122,7 +123,7 @@ class TestLocationService:
         # APIが呼ばれなかったことを確認
         mock_cache_service.get_cached_data.assert_called_once()
 
-    @patch('lunch_roulette.services.location_service.requests.get')
+    @patch('lunch_roulette.services.location_service.requests.Session.get')
     def test_get_location_from_ip_http_error(self, mock_get, location_service):
         """HTTP エラー時のテスト"""
         # HTTPエラーをシミュレート
@@ -141,7 +142,7 @@ class TestLocationService:
         assert result['latitude'] == 35.6812
         assert result['longitude'] == 139.7671
 
-    @patch('lunch_roulette.services.location_service.requests.get')
+    @patch('lunch_roulette.services.location_service.requests.Session.get')
     def test_get_location_from_ip_rate_limit(self, mock_get, location_service, mock_cache_service):
         """レート制限エラー時のテスト"""
         # レート制限エラーをシミュレート
@@ -166,7 +167,7 @@ class TestLocationService:
             # フォールバックデータが返されることを確認
             assert result == fallback_data
 
-    @patch('lunch_roulette.services.location_service.requests.get')
+    @patch('lunch_roulette.services.location_service.requests.Session.get')
     def test_get_location_from_ip_network_error(self, mock_get, location_service):
         """ネットワークエラー時のテスト"""
         # ネットワークエラーをシミュレート
@@ -178,7 +179,7 @@ class TestLocationService:
         assert result['source'] == 'default'
         assert result['city'] == '東京'
 
-    @patch('lunch_roulette.services.location_service.requests.get')
+    @patch('lunch_roulette.services.location_service.requests.Session.get')
     def test_get_location_from_ip_api_error_response(self, mock_get, location_service):
         """API エラーレスポンス時のテスト"""
         # APIエラーレスポンスをシミュレート
@@ -329,21 +330,23 @@ class TestLocationService:
 
         assert location_service.validate_location_data(invalid_type_data) is False
 
-    @patch('lunch_roulette.models.database.get_db_connection')
-    def test_get_fallback_cache_data_not_found(self, mock_get_db_connection, location_service):
+    def test_get_fallback_cache_data_not_found(self, mock_cache_service, location_service):
         """フォールバックキャッシュデータ取得（データなし）テスト"""
-        # モックデータベース接続を設定
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_get_db_connection.return_value.__enter__.return_value = mock_conn
-        mock_conn.execute.return_value = mock_cursor
-
         # データが見つからない場合をモック
-        mock_cursor.fetchone.return_value = None
+        mock_cache_service.get_fallback_data.return_value = None
 
         result = location_service._get_fallback_cache_data('test_key')
 
         assert result is None
+        mock_cache_service.get_fallback_data.assert_called_once_with('test_key')
+
+    def test_get_fallback_cache_data_found(self, mock_cache_service, location_service):
+        """フォールバックキャッシュデータ取得（期限切れのデータあり）テスト"""
+        mock_cache_service.get_fallback_data.return_value = {'city': '東京', 'source': 'ipapi'}
+
+        result = location_service._get_fallback_cache_data('test_key')
+
+        assert result == {'city': '東京', 'source': 'fallback_cache'}
 
     def test_get_default_location(self, location_service):
         """デフォルト位置取得テスト"""
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+MemoryCache（L1キャッシュ）の単体テスト
+LRU追い出し、有効期限、統計情報の動作を検証
+"""
+
+import time
+import pytest
+from lunch_roulette.services.memory_cache import MemoryCache
+
+
+class TestMemoryCache:
+    """MemoryCacheクラスの単体テスト"""
+
+    @pytest.fixture
+    def memory_cache(self):
+        """テスト用MemoryCacheインスタンス"""
+        return MemoryCache(max_entries=3, max_bytes=1000)
+
+    def test_set_and_get(self, memory_cache):
+        """保存・取得テスト"""
+        memory_cache.set('key1', {'temp': 25}, time.time() + 60, size=10)
+
+        assert memory_cache.get('key1') == {'temp': 25}
+        assert 'key1' in memory_cache
+
+    def test_get_missing_returns_default(self, memory_cache):
+        """存在しないキーはdefaultを返す"""
+        sentinel = object()
+
+        assert memory_cache.get('missing') is None
+        assert memory_cache.get('missing', sentinel) is sentinel
+
+    def test_falsy_value_is_cached(self, memory_cache):
+        """空リストなどの値もキャッシュされることを確認"""
+        sentinel = object()
+        memory_cache.set('empty', [], time.time() + 60)
+
+        assert memory_cache.get('empty', sentinel) == []
+
+    def test_expired_entry(self, memory_cache):
+        """期限切れデータは返されず削除される"""
+        memory_cache.set('key1', 'value', time.time() + 0.05)
+        time.sleep(0.1)
+
+        assert memory_cache.get('key1') is None
+        assert len(memory_cache) == 0
+        assert memory_cache.get_stats()['expirations'] == 1
+
+    def test_already_expired_is_not_stored(self, memory_cache):
+        """保存時点で期限切れのデータは保存しない"""
+        memory_cache.set('key1', 'value', time.time() - 1)
+
+        assert len(memory_cache) == 0
+
+    def test_lru_eviction_by_entries(self, memory_cache):
+        """件数上限を超えると最も古く使われたキーが追い出される"""
+        expires_at = time.time() + 60
+        memory_cache.set('a', 1, expires_at)
+        memory_cache.set('b', 2, expires_at)
+        memory_cache.set('c', 3, expires_at)
+
+        # aを参照して最近使用扱いにする
+        memory_cache.get('a')
+        memory_cache.set('d', 4, expires_at)
+
+        assert 'a' in memory_cache
+        assert 'b' not in memory_cache
+        assert memory_cache.get_stats()['evictions'] == 1
+
+    def test_eviction_by_bytes(self, memory_cache):
+        """サイズ上限を超えると古いキーから追い出される"""
+        expires_at = time.time() + 60
+        memory_cache.set('a', 'x', expires_at, size=600)
+        memory_cache.set('b', 'y', expires_at, size=600)
+
+        assert 'a' not in memory_cache
+        assert 'b' in memory_cache
+        assert memory_cache.get_stats()['bytes'] == 600
+
+    def test_oversized_value_is_not_stored(self, memory_cache):
+        """単体で上限を超えるデータは保存しない"""
+        memory_cache.set('huge', 'x', time.time() + 60, size=5000)
+
+        assert 'huge' not in memory_cache
+        assert memory_cache.get_stats()['bytes'] == 0
+
+    def test_replace_keeps_expiry_only_for_expected_value(self, memory_cache):
+        """replace() は保持しているデータが expected のときだけ、有効期限を変えずに置き換える"""
+        ids = ['J001']
+        expires_at = time.time() + 60
+        memory_cache.set('tile', ids, expires_at, size=10)
+
+        assert memory_cache.replace('tile', ['J001'], [{'id': 'J001'}], size=50) is False  # 同じ値でも別のオブジェクト
+        assert memory_cache.replace('tile', ids, [{'id': 'J001'}], size=50) is True
+        assert memory_cache.get_entry('tile') == ([{'id': 'J001'}], expires_at)
+        assert memory_cache.get_stats()['bytes'] == 50
+        assert memory_cache.replace('missing', None, 1) is False
+
+    def test_purge_expired(self, memory_cache):
+        """期限切れデータの一括削除"""
+        memory_cache.set('old', 1, time.time() + 0.05)
+        memory_cache.set('new', 2, time.time() + 60)
+        time.sleep(0.1)
+
+        assert memory_cache.purge_expired() == 1
+        assert 'new' in memory_cache
+
+    def test_stats(self, memory_cache):
+        """ヒット・ミス数の統計情報"""
+        memory_cache.set('key1', 'value', time.time() + 60)
+        memory_cache.get('key1')
+        memory_cache.get('missing')
+
+        stats = memory_cache.get_stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['hit_rate'] == 0.5
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
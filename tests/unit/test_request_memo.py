@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+リクエスト内メモ化（request_memo）の単体テスト
+1回のリクエストで同じ天気情報が1回だけ取得されることを検証
+"""
+
+import pytest
+from unittest.mock import Mock
+from lunch_roulette.app import app
+from lunch_roulette.services.weather_service import WeatherService
+from lunch_roulette.utils.request_memo import (
+    RequestMemo, current_request_memo, get_request_memo_stats, start_request_memo
+)
+
+
+class TestRequestMemo:
+    """RequestMemoクラスとデコレーターの単体テスト"""
+
+    @pytest.fixture
+    def weather_service(self):
+        """キャッシュをモックにしたWeatherService（APIキーなし = デフォルト天気）"""
+        cache_service = Mock()
+        cache_service.generate_cache_key.return_value = 'weather_test'
+        cache_service.get_cached_data.return_value = None
+        service = WeatherService(cache_service=cache_service)
+        service.api_key = None  # 環境変数にAPIキーがあっても外部APIを呼ばない
+        return service
+
+    def test_get_or_compute(self):
+        """同じキーは2回目以降は計算しない"""
+        memo = RequestMemo()
+        fn = Mock(return_value={'temp': 20})
+
+        assert memo.get_or_compute('key', fn) == {'temp': 20}
+        assert memo.get_or_compute('key', fn) == {'temp': 20}
+
+        fn.assert_called_once()
+        assert memo.get_stats() == {'entries': 1, 'hits': 1, 'misses': 1}
+
+    def test_weather_resolved_once_per_request(self, weather_service):
+        """トップページと同じ呼び出し順でも天気の取得は1回だけ"""
+        with app.test_request_context('/'):
+            memo = start_request_memo()
+
+            weather_service.get_current_weather(35.6812, 139.7671)
+            weather_service.get_weather_summary(35.6812, 139.7671)
+            weather_service.is_good_weather_for_walking(35.6812, 139.7671)
+
+            assert weather_service.cache_service.get_cached_data.call_count == 1
+            assert memo.hits == 2
+            assert memo.misses == 1
+
+    def test_keyword_and_positional_arguments_share_key(self, weather_service):
+        """引数を名前付きで渡しても同じキーとして扱う"""
+        with app.test_request_context('/'):
+            memo = start_request_memo()
+
+            weather_service.get_current_weather(35.6812, 139.7671)
+            weather_service.get_current_weather(lat=35.6812, lon=139.7671)
+
+            assert memo.hits == 1
+
+    def test_no_memo_outside_request(self, weather_service):
+        """リクエストの外ではメモ化せず毎回取得する"""
+        assert current_request_memo() is None
+
+        weather_service.get_current_weather(35.6812, 139.7671)
+        weather_service.get_current_weather(35.6812, 139.7671)
+
+        assert weather_service.cache_service.get_cached_data.call_count == 2
+
+    def test_memo_is_reset_for_each_request(self):
+        """リクエストごとに新しいメモが作られる"""
+        before = get_request_memo_stats()['requests']
+        app.config['TESTING'] = True
+
+        with app.test_client() as client:
+            with app.app_context():
+                client.get('/api/genres')
+                client.get('/api/genres')
+
+        assert get_request_memo_stats()['requests'] - before == 2
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
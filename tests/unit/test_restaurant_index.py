@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+RestaurantIndex（ローカルのレストラン索引）の単体テスト
+お店の取り込み（UPSERT）、店舗IDでの取得、範囲検索、古いお店の削除を検証
+"""
+
+import pytest
+from datetime import datetime, timedelta
+from lunch_roulette.models.database import get_db_connection, init_database, to_epoch_ms
+from lunch_roulette.models.restaurant_index import SUMMARY_FIELDS, RestaurantIndex
+
+
+def _restaurant(restaurant_id, lat=35.6812, lng=139.7671, **kwargs):
+    """テスト用のお店（_format_restaurant_data と同じ形式の一部）"""
+    restaurant = {
+        'id': restaurant_id,
+        'name': f'お店{restaurant_id}',
+        'lat': lat,
+        'lng': lng,
+        'genre': '和食',
+        'genre_code': 'G004',
+        'budget_code': 'B010',
+        'budget_average': 1000,
+        'lunch': 'あり',
+    }
+    restaurant.update(kwargs)
+    return restaurant
+
+
+class TestRestaurantIndex:
+    """RestaurantIndexクラスの単体テスト"""
+
+    @pytest.fixture
+    def index(self, tmp_path):
+        """一時データベースを使うRestaurantIndexインスタンス"""
+        db_path = str(tmp_path / 'cache.db')
+        init_database(db_path)
+        return RestaurantIndex(db_path)
+
+    def test_upsert_and_get(self, index):
+        """取り込んだお店を店舗IDの順番どおりに取得できる"""
+        assert index.upsert_restaurants([_restaurant('J1'), _restaurant('J2')]) == 2
+
+        result = index.get_restaurants(['J2', 'missing', 'J1'])
+
+        assert [r['id'] for r in result] == ['J2', 'J1']
+        assert index.get_restaurant('J1')['name'] == 'お店J1'
+        assert index.get_restaurant('missing') is None
+
+    def test_upsert_updates_existing_shop(self, index):
+        """同じお店は1行だけで、内容と last_seen が更新され first_seen は変わらない"""
+        first_seen = datetime(2024, 1, 1, 12, 0)
+        index.upsert_restaurants([_restaurant('J1')], seen_at=first_seen)
+        index.upsert_restaurants([_restaurant('J1', name='新しい店名')],
+                                 seen_at=first_seen + timedelta(days=1))
+
+        with get_db_connection(index.db_path) as conn:
+            rows = conn.execute('SELECT name, first_seen, last_seen FROM restaurants').fetchall()
+
+        assert len(rows) == 1
+        assert rows[0]['name'] == '新しい店名'
+        assert rows[0]['first_seen'] == to_epoch_ms(first_seen)
+        assert rows[0]['last_seen'] == to_epoch_ms(first_seen + timedelta(days=1))
+        assert index.get_stats() == {'restaurants': 1}
+
+    def test_upsert_skips_invalid_shops(self, index):
+        """店舗IDや座標がないお店は取り込まない"""
+        assert index.upsert_restaurants([{'name': 'IDなし'}, _restaurant('', lat=35.0),
+                                         _restaurant('J1', lat=None)]) == 0
+
+    def test_find_in_bounds_with_conditions(self, index):
+        """範囲と検索条件（予算・ジャンル・ランチ）で絞り込める"""
+        index.upsert_restaurants([
+            _restaurant('inside'),
+            _restaurant('outside', lat=35.70),
+            _restaurant('expensive', budget_code='B011'),
+            _restaurant('chinese', genre_code='G007'),
+            _restaurant('no_lunch', lunch='なし'),
+        ])
+
+        def find(**kwargs):
+            return sorted(r['id'] for r in index.find_in_bounds(35.68, 35.69, 139.76, 139.77, **kwargs))
+
+        assert find() == ['chinese', 'expensive', 'inside', 'no_lunch']
+        assert find(budget_code='B010', genre_code='G004', lunch=1) == ['inside']
+
+    def test_spatial_index_matches_table_scan(self, index):
+        """R*Treeを使う検索と使わない検索で同じ結果になる"""
+        index.upsert_restaurants([
+            _restaurant(f'J{i}', lat=35.6705 + i * 0.001, lng=139.7505 + i * 0.001) for i in range(30)
+        ])
+        without_rtree = RestaurantIndex(index.db_path, use_spatial_index=False)
+
+        def find(target):
+            return sorted(r['id'] for r in target.find_in_bounds(35.675, 35.69, 139.755, 139.77))
+
+        assert find(index) == find(without_rtree)
+        assert len(find(index)) == 15
+        with get_db_connection(index.db_path) as conn:
+            assert index._spatial_index_available(conn) is True
+            assert without_rtree._spatial_index_available(conn) is False
+
+    def test_find_nearby_within_radius_sorted(self, index):
+        """半径以内のお店だけを近い順に返し、四角形の角にあるお店は含めない"""
+        index.upsert_restaurants([
+            _restaurant('far', lat=35.6852),      # 約440m北
+            _restaurant('near', lat=35.6817),     # 約56m北
+            _restaurant('corner', lat=35.6847, lng=139.7714),  # 約550m北東（四角形の中、円の外）
+            _restaurant('middle', lng=139.7700),  # 約260m東
+        ])
+
+        result = index.find_nearby(35.6812, 139.7671, radius_km=0.5)
+
+        assert [r['id'] for r in result] == ['near', 'middle', 'far']
+        assert [r['id'] for r in index.find_nearby(35.6812, 139.7671, 0.5, limit=1)] == ['near']
+
+    def test_spatial_index_follows_updates(self, index):
+        """お店の移転（座標の更新）と削除がR*Treeにも反映される"""
+        index.upsert_restaurants([_restaurant('moved'), _restaurant('old')],
+                                 seen_at=datetime.now() - timedelta(days=40))
+        index.upsert_restaurants([_restaurant('moved', lat=35.70)])
+        index.prune(max_age_days=30)
+
+        assert index.find_nearby(35.6812, 139.7671, 0.5) == []
+        assert [r['id'] for r in index.find_nearby(35.70, 139.7671, 0.5)] == ['moved']
+        with get_db_connection(index.db_path) as conn:
+            assert conn.execute('SELECT COUNT(*) FROM restaurants_rtree').fetchone()[0] == 1
+
+    def test_find_with_seen_since(self, index):
+        """seen_since 以降に見かけたお店だけを返す"""
+        synced_at = datetime.now()
+        index.upsert_restaurants([_restaurant('old')], seen_at=synced_at - timedelta(hours=1))
+        index.upsert_restaurants([_restaurant('new')], seen_at=synced_at)
+
+        result = index.find_nearby(35.6812, 139.7671, 0.5, seen_since=synced_at)
+
+        assert [r['id'] for r in result] == ['new']
+
+    def test_mark_and_get_synced(self, index):
+        """同期日時を記録・取得できる"""
+        synced_at = datetime(2024, 1, 1, 12, 0)
+
+        assert index.get_synced_at('tile') is None
+        index.mark_synced('tile', synced_at)
+        assert index.get_synced_at('tile') == synced_at
+
+    def test_summary_and_detail_stored_separately(self, index):
+        """検索用の要約には SUMMARY_FIELDS だけを保存し、全項目は詳細として取得できる"""
+        index.upsert_restaurants([_restaurant('J1', karaoke='あり', shop_detail_memo='メモ')])
+
+        summary = index.get_restaurant('J1')
+        detail = index.get_restaurant_detail('J1')
+
+        assert set(summary) <= set(SUMMARY_FIELDS)
+        assert summary['name'] == 'お店J1'
+        assert detail['karaoke'] == 'あり'
+        assert index.get_restaurant_detail('missing') is None
+        stats = index.get_size_stats()
+        assert stats['with_detail'] == 1
+        assert 0 < stats['avg_data_bytes'] < stats['avg_detail_bytes']
+
+    def test_upsert_without_details_keeps_previous_detail(self, tmp_path):
+        """詳細を保存しない設定では要約だけを保存し、以前に保存した詳細は残す"""
+        db_path = str(tmp_path / 'cache.db')
+        init_database(db_path)
+        index = RestaurantIndex(db_path, store_details=False)
+
+        index.upsert_restaurants([_restaurant('J1'), _restaurant('J2', karaoke='あり')])
+        assert index.get_restaurant_detail('J1') is None
+
+        index.upsert_restaurants([_restaurant('J2', karaoke='あり')], store_details=True)
+        index.upsert_restaurants([_restaurant('J2', name='新しい店名')])
+        assert index.get_restaurant('J2')['name'] == '新しい店名'
+        assert index.get_restaurant_detail('J2')['karaoke'] == 'あり'
+
+    def test_init_database_adds_detail_column(self, tmp_path):
+        """以前のバージョンで作成したrestaurantsテーブルに detail 列を追加する"""
+        db_path = str(tmp_path / 'old.db')
+        with get_db_connection(db_path) as conn:
+            conn.execute(
+                'CREATE TABLE restaurants (id TEXT PRIMARY KEY, name TEXT NOT NULL, lat REAL NOT NULL, '
+                'lng REAL NOT NULL, genre TEXT, genre_code TEXT, budget_code TEXT, budget_average INTEGER, '
+                'lunch INTEGER NOT NULL DEFAULT 0, data TEXT NOT NULL, first_seen TIMESTAMP NOT NULL, '
+                'last_seen TIMESTAMP NOT NULL)'
+            )
+            conn.commit()
+
+        assert init_database(db_path) is True
+        index = RestaurantIndex(db_path)
+        assert index.upsert_restaurants([_restaurant('J1')]) == 1
+        assert index.get_restaurant_detail('J1')['id'] == 'J1'
+
+    def test_init_database_migrates_datetime_text(self, tmp_path):
+        """以前のバージョンが日時の文字列で保存した見かけた日時・同期日時をUNIX時刻（ミリ秒）に変換する"""
+        db_path = str(tmp_path / 'old.db')
+        seen_at = datetime(2024, 1, 1, 12, 0, 0, 500000)
+        with get_db_connection(db_path) as conn:
+            conn.execute(
+                'CREATE TABLE restaurants (id TEXT PRIMARY KEY, name TEXT NOT NULL, lat REAL NOT NULL, '
+                'lng REAL NOT NULL, genre TEXT, genre_code TEXT, budget_code TEXT, budget_average INTEGER, '
+                'lunch INTEGER NOT NULL DEFAULT 0, data TEXT NOT NULL, first_seen TIMESTAMP NOT NULL, '
+                'last_seen TIMESTAMP NOT NULL)'
+            )
+            conn.execute('CREATE TABLE restaurant_sync (sync_key TEXT PRIMARY KEY, synced_at TIMESTAMP NOT NULL)')
+            conn.execute(
+                "INSERT INTO restaurants (id, name, lat, lng, data, first_seen, last_seen) "
+                "VALUES ('J1', 'お店J1', 35.6812, 139.7671, '{\"id\": \"J1\"}', ?, ?)",
+                (seen_at.isoformat(' '), seen_at.isoformat(' '))
+            )
+            conn.execute("INSERT INTO restaurant_sync VALUES ('tile', ?)", (seen_at.isoformat(' '),))
+            conn.commit()
+
+        assert init_database(db_path) is True
+
+        with get_db_connection(db_path) as conn:
+            row = conn.execute('SELECT first_seen, last_seen FROM restaurants').fetchone()
+        assert row['first_seen'] == row['last_seen'] == to_epoch_ms(seen_at)
+        index = RestaurantIndex(db_path)
+        assert index.get_synced_at('tile') == seen_at
+        assert [r['id'] for r in index.find_nearby(35.6812, 139.7671, 0.5, seen_since=seen_at)] == ['J1']
+
+    def test_prune_old_shops(self, index):
+        """長く見かけないお店を削除する"""
+        index.upsert_restaurants([_restaurant('old')], seen_at=datetime.now() - timedelta(days=40))
+        index.upsert_restaurants([_restaurant('new')])
+
+        assert index.prune(max_age_days=30) == 1
+        assert [r['id'] for r in index.get_restaurants(['old', 'new'])] == ['new']
+
+    def test_missing_table_returns_empty(self, tmp_path):
+        """テーブルがない場合もエラーにせず空の結果を返す"""
+        index = RestaurantIndex(str(tmp_path / 'empty.db'))
+
+        assert index.upsert_restaurants([_restaurant('J1')]) == 0
+        assert index.get_restaurants(['J1']) == []
+        assert index.find_nearby(35.6812, 139.7671, 0.5) == []
+        assert index.get_synced_at('tile') is None
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -8,9 +8,18 @@ Hot Pepper Gourmet APIからレストラン情報を取得する機能をテス
 
 import pytest
 import os
+import threading
+import time
+import requests
+from datetime import datetime, timedelta
 from unittest.mock import Mock, patch
 from lunch_roulette.services.restaurant_service import RestaurantService
 from lunch_roulette.services.cache_service import CacheService
+from lunch_roulette.models.database import init_database
+from lunch_roulette.models.restaurant_index import RestaurantIndex
+from lunch_roulette.utils.geohash import covering_tiles
+from lunch_roulette.utils.fan_out import Deadline, FanOutExecutor
+from lunch_roulette.utils.geohash import encode as geohash_encode
 
 
 class TestRestaurantService:
@@ -22,6 +31,8 @@ class TestRestaurantService:
         mock_cache = Mock(spec=CacheService)
         mock_cache.generate_cache_key.return_value = "restaurant_test_key"
         mock_cache.get_cached_data.return_value = None
+        mock_cache.get_fallback_data.return_value = None
+        mock_cache.get_many.return_value = {}
         mock_cache.set_cached_data.return_value = True
         return mock_cache
 
@@ -127,11 +138,12 @@ class TestRestaurantService:
 
         assert restaurant_service.validate_restaurant_data(invalid_data) is False
 
-    @patch('lunch_roulette.services.restaurant_service.requests.get')
+    @patch('lunch_roulette.services.restaurant_service.requests.Session.get')
     def test_search_restaurants_with_genre_code(self, mock_get, restaurant_service, mock_cache_service):
         """ジャンルコード指定でのレストラン検索テスト"""
         # キャッシュなし
         mock_cache_service.get_cached_data.return_value = None
+        mock_cache_service.get_many.return_value = {}
         
         # APIレスポンスのモック
         mock_response = Mock()
@@ -198,6 +210,417 @@ class TestRestaurantService:
             assert len(result) == 1  # 1200円以下は1件のみ
             assert result[0]['id'] == '1'
 
+    def test_walking_time_to_radius_km(self, restaurant_service):
+        """徒歩時間をカバーする直線距離の半径を返すことを確認"""
+        assert restaurant_service.walking_time_to_radius_km(10) == 0.564  # 11分 × 時速4km ÷ 1.3
+        assert restaurant_service.walking_time_to_radius_km(5) == 0.308
+        assert restaurant_service.walking_time_to_radius_km(20) == 1.077
+
+    def test_filter_by_walking_time(self, restaurant_service):
+        """実際の徒歩時間で絞り込み、近い順に並べることを確認"""
+        restaurants = [
+            {'id': 'far', 'lat': 35.6900, 'lng': 139.7671},    # 約1km（徒歩約19分）
+            {'id': 'near', 'lat': 35.6822, 'lng': 139.7671},   # 約110m（徒歩約2分）
+            {'id': 'mid', 'lat': 35.6850, 'lng': 139.7671},    # 約420m（徒歩約8分）
+            {'id': 'no_coords', 'lat': None, 'lng': None},
+        ]
+
+        result = restaurant_service.filter_by_walking_time(restaurants, 35.6812, 139.7671, 10)
+
+        assert [r['id'] for r in result] == ['near', 'mid']
+        for restaurant in result:
+            distance_info = restaurant_service.distance_calculator.calculate_walking_distance(
+                35.6812, 139.7671, restaurant['lat'], restaurant['lng']
+            )
+            assert distance_info['walking_time_minutes'] <= 10
+        assert 'distance_info' not in restaurants[1]
+
+    @pytest.fixture
+    def tile_service(self, tmp_path):
+        """実際のキャッシュ（一時データベース）を使うRestaurantServiceインスタンス"""
+        db_path = str(tmp_path / 'cache.db')
+        init_database(db_path)
+        return RestaurantService(api_key='test_api_key', cache_service=CacheService(db_path=db_path))
+
+    @staticmethod
+    def _tile_api_response(shops):
+        """タイルの中心で検索されたときに、全てのお店を返すAPIレスポンスのモック"""
+        mock_response = Mock()
+        mock_response.json.return_value = {'results': {'shop': shops}}
+        mock_response.raise_for_status.return_value = None
+        return mock_response
+
+    @patch('lunch_roulette.services.restaurant_service.requests.Session.get')
+    def test_search_with_walking_time_reuses_tiles(self, mock_get, tile_service):
+        """広い徒歩時間の検索で取得したタイルを、狭い徒歩時間の検索で使い回すことを確認"""
+        mock_get.return_value = self._tile_api_response([
+            {'id': 'near', 'name': '近いお店', 'lat': 35.6822, 'lng': 139.7671},
+            {'id': 'far', 'name': '遠いお店', 'lat': 35.6900, 'lng': 139.7671},
+        ])
+
+        wide = tile_service.search_restaurants(35.6812, 139.7671, max_walking_time_min=20)
+        calls_after_wide = mock_get.call_count
+        narrow = tile_service.search_restaurants(35.6812, 139.7671, max_walking_time_min=5)
+
+        assert calls_after_wide == len(covering_tiles(35.6812, 139.7671, 1.077))
+        assert mock_get.call_count == calls_after_wide  # 2回目はAPIを呼ばない
+        assert mock_get.call_args.kwargs['params']['range'] == 3  # タイル全体を含む1km
+        assert [r['id'] for r in wide] == ['near', 'far']
+        assert [r['id'] for r in narrow] == ['near']
+
+    @patch('lunch_roulette.services.restaurant_service.requests.Session.get')
+    def test_nearby_users_share_tiles(self, mock_get, tile_service):
+        """少し離れた地点からの検索でも、同じタイルのキャッシュを使うことを確認"""
+        mock_get.return_value = self._tile_api_response([
+            {'id': 'shop', 'name': 'お店', 'lat': 35.6815, 'lng': 139.7660},
+        ])
+
+        first = tile_service.search_restaurants(35.6812, 139.7671, radius=0.3)
+        calls_after_first = mock_get.call_count
+        second = tile_service.search_restaurants(35.6813, 139.7672, radius=0.3)
+
+        assert mock_get.call_count == calls_after_first
+        assert [r['id'] for r in first] == [r['id'] for r in second] == ['shop']
+
+    @patch('lunch_roulette.services.restaurant_service.requests.Session.get')
+    def test_tiles_read_with_single_batch_query(self, mock_get, tile_service):
+        """検索範囲のタイルのキャッシュは、1回の get_many でまとめて読み込むことを確認"""
+        mock_get.return_value = self._tile_api_response([
+            {'id': 'shop', 'name': 'お店', 'lat': 35.6815, 'lng': 139.7660},
+        ])
+        tile_service.search_restaurants(35.6812, 139.7671, radius=1.0)
+        tile_service.cache_service.memory_cache.clear()
+        calls_after_first = mock_get.call_count
+
+        cache = tile_service.cache_service
+        with patch.object(cache, 'get_many', wraps=cache.get_many) as get_many, \
+                patch.object(cache, 'get_cached_data', wraps=cache.get_cached_data) as get_cached_data:
+            result = tile_service.search_restaurants(35.6812, 139.7671, radius=1.0)
+
+        assert [r['id'] for r in result] == ['shop']
+        assert mock_get.call_count == calls_after_first
+        assert get_many.call_count == 1
+        assert len(get_many.call_args.args[0]) > 1
+        get_cached_data.assert_not_called()
+
+    def _slow_tile_api(self, delay):
+        """delay秒かけて応答し、同時に処理中だったAPI呼び出しの最大数を記録するモック"""
+        state = {'in_flight': 0, 'max_in_flight': 0}
+        lock = threading.Lock()
+
+        def get(*args, **kwargs):
+            with lock:
+                state['in_flight'] += 1
+                state['max_in_flight'] = max(state['max_in_flight'], state['in_flight'])
+            time.sleep(delay)
+            with lock:
+                state['in_flight'] -= 1
+            return self._tile_api_response([])
+
+        return get, state
+
+    @patch('lunch_roulette.services.restaurant_service.requests.Session.get')
+    def test_cold_search_fetches_missing_tiles_concurrently(self, mock_get, tmp_path):
+        """キャッシュが空の検索では、タイルごとに1回ずつAPIを呼び、タイルを並列に取得することを確認"""
+        db_path = str(tmp_path / 'cache.db')
+        init_database(db_path)
+        service = RestaurantService(api_key='test_api_key', cache_service=CacheService(db_path=db_path),
+                                    tile_executor=FanOutExecutor(max_workers=4))
+        mock_get.side_effect, state = self._slow_tile_api(0.05)
+        tiles = covering_tiles(35.6812, 139.7671, service.walking_time_to_radius_km(10), service.tile_precision)
+
+        service.search_restaurants(35.6812, 139.7671, max_walking_time_min=10)
+
+        assert len(tiles) > 1
+        assert mock_get.call_count == len(tiles)  # 1タイル1ページ
+        assert state['max_in_flight'] > 1
+        assert service.get_page_stats()['tile_fetches'] == len(tiles)
+
+        service.search_restaurants(35.6812, 139.7671, max_walking_time_min=10)
+        assert mock_get.call_count == len(tiles)  # 2回目はキャッシュから
+        service.tile_executor.shutdown()
+
+    @patch('lunch_roulette.services.restaurant_service.requests.Session.get')
+    def test_tile_fetch_bounded_by_deadline(self, mock_get, tmp_path):
+        """リクエストの締め切りの少し前までに取得できなかったタイルは待たずに返し、取得は裏で続けることを確認"""
+        db_path = str(tmp_path / 'cache.db')
+        init_database(db_path)
+        service = RestaurantService(api_key='test_api_key', cache_service=CacheService(db_path=db_path),
+                                    tile_executor=FanOutExecutor(max_workers=4))
+        mock_get.side_effect, _ = self._slow_tile_api(0.5)
+
+        started = time.monotonic()
+        # タイルの取得は締め切り（0.6秒後）の TILE_DEADLINE_MARGIN_SECONDS（0.5秒）前まで待つ
+        result = service.search_restaurants(35.6812, 139.7671, radius=1.0, deadline=Deadline(0.6))
+        elapsed = time.monotonic() - started
+
+        assert result == []
+        assert 0.05 < elapsed < 0.45
+        assert service.get_page_stats()['tile_timeouts'] > 1
+        service.tile_executor.shutdown(wait=True)
+        tile = geohash_encode(35.6812, 139.7671, 6)
+        assert service.cache_service.get_cached_data(service._tile_cache_key(tile, None, None, None)) == []
+
+    @patch('lunch_roulette.services.restaurant_service.requests.Session.get')
+    def test_single_missing_tile_bounded_by_deadline(self, mock_get, tmp_path):
+        """キャッシュにないタイルが1つだけの場合も、締め切りを過ぎたら待たないことを確認"""
+        db_path = str(tmp_path / 'cache.db')
+        init_database(db_path)
+        service = RestaurantService(api_key='test_api_key', cache_service=CacheService(db_path=db_path),
+                                    tile_executor=FanOutExecutor(max_workers=1))
+        mock_get.side_effect, _ = self._slow_tile_api(0.3)
+        tile = geohash_encode(35.6812, 139.7671, 6)
+
+        started = time.monotonic()
+        entries = service._get_tiles_entries([tile], None, None, None, {}, Deadline(0.05))
+
+        assert entries == {}
+        assert time.monotonic() - started < 0.25
+        assert service.get_page_stats()['tile_timeouts'] == 1
+        service.tile_executor.shutdown(wait=True)
+
+    @patch('lunch_roulette.services.restaurant_service.requests.Session.get')
+    def test_l1_hit_skips_index_query(self, mock_get, tile_service):
+        """L2から読み込んだ店舗IDは1回だけ索引で戻し、以降のL1ヒットでは索引を検索しないことを確認"""
+        mock_get.return_value = self._tile_api_response([
+            {'id': 'shop', 'name': 'お店', 'lat': 35.6815, 'lng': 139.7660},
+        ])
+        tile_service.search_restaurants(35.6812, 139.7671, radius=1.0)
+        tile_service.cache_service.memory_cache.clear()
+
+        index = tile_service.restaurant_index
+        cache = tile_service.cache_service
+        with patch.object(index, 'get_restaurants', wraps=index.get_restaurants) as get_restaurants, \
+                patch.object(cache, 'serialize_data', wraps=cache.serialize_data) as serialize_data:
+            first = tile_service.search_restaurants(35.6812, 139.7671, radius=1.0)
+            second = tile_service.search_restaurants(35.6812, 139.7671, radius=1.0)
+
+        assert [r['id'] for r in first] == [r['id'] for r in second] == ['shop']
+        assert get_restaurants.call_count == 1  # L2ヒットの1回だけ（全タイル分をまとめて検索）
+        serialize_data.assert_not_called()  # L1のサイズはシリアライズせずに見積もる
+        tile = geohash_encode(35.6815, 139.7660, 6)
+        cache_key = tile_service._tile_cache_key(tile, None, None, None)
+        assert tile_service.cache_service.memory_cache.get(cache_key)[0]['name'] == 'お店'
+        tile_service.cache_service.memory_cache.clear()
+        assert tile_service.cache_service.get_cached_data(cache_key) == ['shop']  # L2は店舗IDのまま
+
+    @patch('lunch_roulette.services.restaurant_service.requests.Session.get')
+    def test_tile_stores_only_its_own_shops(self, mock_get, tile_service):
+        """タイルにはタイルの中のお店だけを保存し、空のタイルもキャッシュすることを確認"""
+        tile = geohash_encode(35.6812, 139.7671, 6)
+        mock_get.return_value = self._tile_api_response([
+            {'id': 'inside', 'name': '中のお店', 'lat': 35.6812, 'lng': 139.7671},
+            {'id': 'outside', 'name': '外のお店', 'lat': 35.7000, 'lng': 139.7671},
+        ])
+
+        assert [r['id'] for r in tile_service._get_tile_restaurants(tile, None, None, None)] == ['inside']
+
+        mock_get.return_value = self._tile_api_response([])
+        empty_tile = geohash_encode(35.7000, 139.8000, 6)
+        assert tile_service._get_tile_restaurants(empty_tile, None, None, None) == []
+        assert tile_service._get_tile_restaurants(empty_tile, None, None, None) == []
+        assert mock_get.call_count == 2
+
+    @patch('lunch_roulette.services.restaurant_service.requests.Session.get')
+    def test_cache_stores_ids_and_index_stores_shops(self, mock_get, tile_service):
+        """キャッシュには店舗IDだけを保存し、お店の情報は索引に1件ずつ保存することを確認"""
+        shop = {'id': 'J001', 'name': 'お店', 'lat': 35.6812, 'lng': 139.7671,
+                'genre': {'code': 'G004', 'name': '和食'}, 'budget': {'code': 'B010', 'name': '〜1000円'}}
+        mock_get.return_value = self._tile_api_response([shop])
+        tile = geohash_encode(35.6812, 139.7671, 6)
+
+        tile_service._get_tile_restaurants(tile, None, None, None)
+        tile_service._get_tile_restaurants(tile, 'B010', None, None)  # 別の条件でも同じお店
+
+        cache_key = tile_service._tile_cache_key(tile, None, None, None)
+        assert tile_service.cache_service.get_cached_data(cache_key) == ['J001']
+        assert tile_service.restaurant_index.get_stats() == {'restaurants': 1}
+
+        restaurant = tile_service._get_tile_restaurants(tile, None, None, None)[0]
+        assert restaurant['genre_code'] == 'G004'
+        assert restaurant['budget_code'] == 'B010'
+        assert tile_service.get_restaurant_by_id('J001')['name'] == 'お店'
+        assert mock_get.call_count == 2  # get_restaurant_by_id はAPIを呼ばない
+
+    @patch('lunch_roulette.services.restaurant_service.requests.Session.get')
+    def test_synced_tile_answered_from_index(self, mock_get, tile_service):
+        """キャッシュが切れても、最近APIと同期したタイルは索引から答えてAPIを呼ばないことを確認"""
+        mock_get.return_value = self._tile_api_response([
+            {'id': 'inside', 'name': '中のお店', 'lat': 35.6812, 'lng': 139.7671},
+        ])
+        tile = geohash_encode(35.6812, 139.7671, 6)
+        cache_key = tile_service._tile_cache_key(tile, None, None, None)
+
+        tile_service._get_tile_restaurants(tile, None, None, None)
+        tile_service.cache_service.clear_all_cache()
+        result = tile_service._get_tile_restaurants(tile, None, None, None)
+
+        assert [r['id'] for r in result] == ['inside']
+        assert mock_get.call_count == 1
+        assert tile_service.cache_service.get_cached_data(cache_key) == ['inside']
+
+        # 同期が古い場合はAPIから取得し直す
+        tile_service.cache_service.clear_all_cache()
+        tile_service.restaurant_index.mark_synced(cache_key, datetime.now() - timedelta(days=1))
+        tile_service._get_tile_restaurants(tile, None, None, None)
+        assert mock_get.call_count == 2
+
+    @staticmethod
+    def _paged_api(total, fail_start=None):
+        """start に応じて100件ずつお店を返すAPIのモック（results_available=total）"""
+        def get(url, params=None, timeout=None):
+            start = params.get('start', 1)
+            if start == fail_start:
+                raise requests.exceptions.ConnectionError('connection reset')
+            shops = [{'id': f'J{i:04d}', 'name': f'お店{i}', 'lat': 35.6895, 'lng': 139.7005}
+                     for i in range(start, min(start + 99, total) + 1)]
+            mock_response = Mock()
+            mock_response.json.return_value = {'results': {'results_available': total, 'shop': shops}}
+            mock_response.raise_for_status.return_value = None
+            return mock_response
+        return get
+
+    @patch('lunch_roulette.services.restaurant_service.requests.Session.get')
+    def test_search_fetches_all_pages(self, mock_get, tile_service):
+        """100件を超える検索結果は、全てのページを取得してページの順番どおりに並べることを確認"""
+        mock_get.side_effect = self._paged_api(250)
+
+        result = tile_service.search_restaurants(middle_area='Y055')
+
+        assert [r['id'] for r in result] == [f'J{i:04d}' for i in range(1, 251)]
+        assert sorted(call.kwargs['params'].get('start', 1) for call in mock_get.call_args_list) == [1, 101, 201]
+        assert tile_service.restaurant_index.get_stats() == {'restaurants': 250}
+        stats = tile_service.get_page_stats()
+        assert stats['searches'] == 1
+        assert stats['pages'] == stats['max_pages'] == 3
+        assert stats['truncated'] == 0
+
+        # 2回目はキャッシュから全件を返す
+        assert len(tile_service.search_restaurants(middle_area='Y055')) == 250
+        assert mock_get.call_count == 3
+
+    @patch('lunch_roulette.services.restaurant_service.requests.Session.get')
+    def test_search_pages_capped_and_failed_page_skipped(self, mock_get, tile_service):
+        """上限を超えるページは取得せず、失敗したページを除いた結果を返すことを確認"""
+        mock_get.side_effect = self._paged_api(1000, fail_start=101)
+
+        with patch.object(tile_service, 'max_results', 300):
+            result = tile_service.search_restaurants(middle_area='Y055')
+
+        assert len(result) == 200
+        assert mock_get.call_count == 3
+        stats = tile_service.get_page_stats()
+        assert stats['truncated'] == 1
+        assert stats['page_errors'] == 1
+        assert stats['pages_per_search'] == 2
+
+    @patch('lunch_roulette.services.restaurant_service.requests.Session.get')
+    def test_truncated_tile_not_marked_synced(self, mock_get, tile_service):
+        """全件を取得できなかったタイルは、同期済みとして記録しないことを確認"""
+        mock_get.side_effect = self._paged_api(1000)
+        tile = geohash_encode(35.6895, 139.7005, 6)
+
+        with patch.object(tile_service, 'max_results', 100):
+            tile_service._get_tile_restaurants(tile, None, None, None)
+
+        cache_key = tile_service._tile_cache_key(tile, None, None, None)
+        assert mock_get.call_count == 1
+        assert tile_service.restaurant_index.get_synced_at(cache_key) is None
+
+    @staticmethod
+    def _coded_shop(shop_id, budget_code, lunch, genre_code, lat=35.6812, lng=139.7671):
+        """予算・ランチ・ジャンルのコードを持つAPIレスポンスのお店"""
+        return {'id': shop_id, 'name': shop_id, 'lat': lat, 'lng': lng, 'lunch': lunch,
+                'genre': {'code': genre_code, 'name': 'ジャンル'},
+                'budget': {'code': budget_code, 'name': '予算', 'average': '1000円'}}
+
+    @patch('lunch_roulette.services.restaurant_service.requests.Session.get')
+    def test_filtered_searches_share_unfiltered_tiles(self, mock_get, tile_service):
+        """条件の違う検索は、条件なしで取得したタイルから絞り込み、APIを呼ばないことを確認"""
+        mock_get.return_value = self._tile_api_response([
+            self._coded_shop('washoku', 'B010', 'あり：11:00～', 'G004'),
+            self._coded_shop('chinese', 'B010', 'あり', 'G007', lat=35.6815),
+            self._coded_shop('dinner', 'B011', 'なし', 'G007', lat=35.6818),
+        ])
+
+        def search(**conditions):
+            restaurants = tile_service.search_restaurants(35.6812, 139.7671, radius=0.3, **conditions)
+            return sorted(r['id'] for r in restaurants)
+
+        assert search() == ['chinese', 'dinner', 'washoku']
+        calls_after_first = mock_get.call_count
+        assert search(budget_code='B010', lunch=1) == ['chinese', 'washoku']
+        assert search(lunch=1, genre_code='G007') == ['chinese']
+        assert search(budget_code='B011', genre_code='G004') == []
+
+        assert mock_get.call_count == calls_after_first
+        assert all('budget' not in call.kwargs['params'] for call in mock_get.call_args_list)
+        assert tile_service.get_page_stats()['local_filtered'] == 3
+
+    @patch('lunch_roulette.services.restaurant_service.requests.Session.get')
+    def test_truncated_area_falls_back_to_filtered_search(self, mock_get, tile_service):
+        """条件なしの検索で全件を取得できなかったエリアは、条件付きでAPIを呼ぶことを確認"""
+        mock_get.side_effect = self._paged_api(1000)
+
+        with patch.object(tile_service, 'max_results', 100):
+            result = tile_service.search_restaurants(middle_area='Y055', budget_code='B010')
+
+        assert len(result) == 100
+        assert [call.kwargs['params'].get('budget') for call in mock_get.call_args_list] == [None, 'B010']
+        assert tile_service.area_search_conditions('Y055', 'B010') == ('B010', None, None)
+
+    @patch('lunch_roulette.services.restaurant_service.requests.Session.get')
+    def test_complete_area_filtered_locally(self, mock_get, tile_service):
+        """条件なしの検索で全件を取得できたエリアは、条件付きの検索もそこから答えることを確認"""
+        mock_get.return_value = self._tile_api_response([
+            self._coded_shop('lunch', 'B010', 'あり', 'G004'),
+            self._coded_shop('expensive', 'B002', 'あり', 'G004'),
+        ])
+
+        result = tile_service.search_restaurants(middle_area='Y055', budget_code='B010', lunch=1)
+
+        assert [r['id'] for r in result] == ['lunch']
+        assert mock_get.call_count == 1
+        assert tile_service.area_search_conditions('Y055', 'B010', 1) == (None, None, None)
+
+    @patch('lunch_roulette.services.restaurant_service.requests.Session.get')
+    def test_search_returns_summary_and_detail_loaded_by_id(self, mock_get, tmp_path):
+        """検索結果は要約だけを返し、詳細は get_restaurant_by_id で必要なときに取得することを確認"""
+        db_path = str(tmp_path / 'cache.db')
+        init_database(db_path)
+        service = RestaurantService(api_key='test_api_key', cache_service=CacheService(db_path=db_path),
+                                    restaurant_index=RestaurantIndex(db_path, store_details=False))
+        shop = dict(self._coded_shop('J001', 'B010', 'あり', 'G004'), karaoke='あり', wedding='なし')
+        mock_get.return_value = self._tile_api_response([shop])
+
+        result = service.search_restaurants(35.6812, 139.7671, radius=0.3)
+        calls_after_search = mock_get.call_count
+
+        assert [r['id'] for r in result] == ['J001']
+        assert 'karaoke' not in result[0]
+        assert result[0]['budget_code'] == 'B010'
+
+        detail = service.get_restaurant_by_id('J001')
+        assert detail['karaoke'] == 'あり'
+        assert mock_get.call_args.kwargs['params']['id'] == 'J001'
+        assert service.get_restaurant_by_id('J001')['karaoke'] == 'あり'
+        assert mock_get.call_count == calls_after_search + 1  # 2回目は索引の詳細を使う
+
+    def test_search_without_api_key_uses_index(self, tmp_path):
+        """APIキーがない場合は、索引から半径以内のお店を探すことを確認"""
+        db_path = str(tmp_path / 'cache.db')
+        init_database(db_path)
+        with patch.dict(os.environ, {}, clear=True):
+            service = RestaurantService(cache_service=CacheService(db_path=db_path))
+        service.restaurant_index.upsert_restaurants([
+            {'id': 'near', 'name': '近いお店', 'lat': 35.6817, 'lng': 139.7671},
+            {'id': 'far', 'name': '遠いお店', 'lat': 35.6900, 'lng': 139.7671},
+        ])
+
+        result = service.search_restaurants(35.6812, 139.7671, max_walking_time_min=10)
+
+        assert [r['id'] for r in result] == ['near']
+
 
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
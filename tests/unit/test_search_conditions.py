@@ -71,7 +71,7 @@ class TestSearchRestaurantsWithConditions:
             cache_service=self.cache_service
         )
 
-    @patch('src.lunch_roulette.services.restaurant_service.requests.get')
+    @patch('src.lunch_roulette.services.restaurant_service.requests.Session.get')
     def test_search_with_budget_code(self, mock_get):
         """予算コード指定時にAPIパラメータに含まれることを確認"""
         # モックレスポンスの設定
@@ -84,6 +84,7 @@ class TestSearchRestaurantsWithConditions:
 
         # キャッシュがないことを設定
         self.cache_service.get_cached_data.return_value = None
+        self.cache_service.get_many.return_value = {}
 
         # 予算コード指定で検索
         self.restaurant_service.search_restaurants(
@@ -93,7 +94,7 @@ class TestSearchRestaurantsWithConditions:
             budget_code='B010'
         )
 
-        # requests.get が呼ばれたか確認
+        # Session.get が呼ばれたか確認
         assert mock_get.called
         call_args = mock_get.call_args
         params = call_args[1]['params']
@@ -102,7 +103,7 @@ class TestSearchRestaurantsWithConditions:
         assert 'budget' in params
         assert params['budget'] == 'B010'
 
-    @patch('src.lunch_roulette.services.restaurant_service.requests.get')
+    @patch('src.lunch_roulette.services.restaurant_service.requests.Session.get')
     def test_search_with_lunch_filter(self, mock_get):
         """ランチフィルタ指定時にAPIパラメータに含まれることを確認"""
         # モックレスポンスの設定
@@ -115,6 +116,7 @@ class TestSearchRestaurantsWithConditions:
 
         # キャッシュがないことを設定
         self.cache_service.get_cached_data.return_value = None
+        self.cache_service.get_many.return_value = {}
 
         # ランチフィルタ指定で検索
         self.restaurant_service.search_restaurants(
@@ -124,7 +126,7 @@ class TestSearchRestaurantsWithConditions:
             lunch=1
         )
 
-        # requests.get が呼ばれたか確認
+        # Session.get が呼ばれたか確認
         assert mock_get.called
         call_args = mock_get.call_args
         params = call_args[1]['params']
@@ -133,7 +135,7 @@ class TestSearchRestaurantsWithConditions:
         assert 'lunch' in params
         assert params['lunch'] == 1
 
-    @patch('src.lunch_roulette.services.restaurant_service.requests.get')
+    @patch('src.lunch_roulette.services.restaurant_service.requests.Session.get')
     def test_search_without_optional_params(self, mock_get):
         """オプションパラメータなしでも動作することを確認"""
         # モックレスポンスの設定
@@ -146,6 +148,7 @@ class TestSearchRestaurantsWithConditions:
 
         # キャッシュがないことを設定
         self.cache_service.get_cached_data.return_value = None
+        self.cache_service.get_many.return_value = {}
 
         # オプションパラメータなしで検索
         self.restaurant_service.search_restaurants(
@@ -154,7 +157,7 @@ class TestSearchRestaurantsWithConditions:
             radius=1
         )
 
-        # requests.get が呼ばれたか確認
+        # Session.get が呼ばれたか確認
         assert mock_get.called
         call_args = mock_get.call_args
         params = call_args[1]['params']
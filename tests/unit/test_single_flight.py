@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+SingleFlight（同時リクエスト集約）の単体テスト
+同じキーへの同時呼び出しが1回にまとめられることを検証
+"""
+
+import threading
+import time
+import pytest
+from unittest.mock import Mock, patch
+from lunch_roulette.utils.single_flight import SingleFlight
+from lunch_roulette.services.weather_service import WeatherService
+from lunch_roulette.services.cache_service import CacheService
+
+
+def _run_concurrently(count, target):
+    """count個のスレッドで同時にtargetを実行し、結果のリストを返す"""
+    results = [None] * count
+    barrier = threading.Barrier(count)
+
+    def worker(index):
+        barrier.wait()
+        results[index] = target()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+class TestSingleFlight:
+    """SingleFlightクラスの単体テスト"""
+
+    def test_sequential_calls_execute_each_time(self):
+        """同時でない呼び出しは毎回実行される"""
+        single_flight = SingleFlight()
+        fn = Mock(return_value='result')
+
+        assert single_flight.do('key', fn) == 'result'
+        assert single_flight.do('key', fn) == 'result'
+        assert fn.call_count == 2
+
+    def test_concurrent_calls_are_coalesced(self):
+        """同じキーの同時呼び出しは1回にまとめられる"""
+        single_flight = SingleFlight()
+        call_count = [0]
+
+        def slow_fetch():
+            call_count[0] += 1
+            time.sleep(0.2)
+            return {'value': 42}
+
+        results = _run_concurrently(8, lambda: single_flight.do('key', slow_fetch))
+
+        assert call_count[0] == 1
+        assert all(result == {'value': 42} for result in results)
+        stats = single_flight.get_stats()
+        assert stats['executions'] == 1
+        assert stats['shared'] == 7
+        assert stats['in_flight'] == 0
+
+    def test_different_keys_are_not_coalesced(self):
+        """異なるキーはそれぞれ実行される"""
+        single_flight = SingleFlight()
+        fn = Mock(side_effect=lambda: time.sleep(0.05))
+
+        _run_concurrently(2, lambda: single_flight.do(str(threading.get_ident()), fn))
+
+        assert fn.call_count == 2
+
+    def test_error_is_shared_with_waiters(self):
+        """先頭の呼び出しで発生した例外は待機中の呼び出しにも返される"""
+        single_flight = SingleFlight()
+
+        def failing_fetch():
+            time.sleep(0.1)
+            raise ValueError("upstream error")
+
+        def call():
+            try:
+                single_flight.do('key', failing_fetch)
+            except ValueError as e:
+                return str(e)
+
+        results = _run_concurrently(4, call)
+
+        assert results == ['upstream error'] * 4
+        assert single_flight.in_flight() == 0
+
+
+class TestServiceSingleFlight:
+    """サービスでの同時リクエスト集約テスト"""
+
+    @patch('lunch_roulette.services.weather_service.requests.Session.get')
+    def test_weather_concurrent_misses_call_api_once(self, mock_get):
+        """天気情報の同時キャッシュミスでAPIが1回だけ呼ばれる"""
+        def slow_response(*args, **kwargs):
+            time.sleep(0.2)
+            response = Mock()
+            response.json.return_value = {
+                'current': {'temp_c': 22.0, 'condition': {'text': 'Sunny', 'code': 1000}}
+            }
+            response.raise_for_status.return_value = None
+            return response
+
+        mock_get.side_effect = slow_response
+        mock_cache = Mock(spec=CacheService)
+        mock_cache.generate_cache_key.return_value = 'weather_single_flight_key'
+        mock_cache.get_cached_data.return_value = None
+        service = WeatherService(api_key='test_key', cache_service=mock_cache,
+                                 single_flight=SingleFlight())
+
+        results = _run_concurrently(5, lambda: service.get_current_weather(35.6812, 139.7671))
+
+        assert mock_get.call_count == 1
+        assert all(result['temperature'] == 22.0 for result in results)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
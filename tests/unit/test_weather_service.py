@@ -24,6 +24,7 @@ class TestWeatherService:
         mock_cache = Mock(spec=CacheService)
         mock_cache.generate_cache_key.return_value = "weather_test_key"
         mock_cache.get_cached_data.return_value = None
+        mock_cache.get_fallback_data.return_value = None
         mock_cache.set_cached_data.return_value = True
         return mock_cache
 
@@ -74,7 +75,7 @@ class TestWeatherService:
         assert mapping['cloudy'] == '曇り'
         assert mapping['light snow'] == '軽い雪'
 
-    @patch('lunch_roulette.services.weather_service.requests.get')
+    @patch('lunch_roulette.services.weather_service.requests.Session.get')
     def test_get_current_weather_success(self, mock_get, weather_service, mock_cache_service):
         """天気情報取得成功テスト"""
         # モックAPIレスポンス (WeatherAPI.com形式)
@@ -151,7 +152,7 @@ class TestWeatherService:
         assert result['condition'] == 'sunny'
         assert result['description'] == '晴れ'
 
-    @patch('lunch_roulette.services.weather_service.requests.get')
+    @patch('lunch_roulette.services.weather_service.requests.Session.get')
     def test_get_current_weather_http_error(self, mock_get, weather_service):
         """HTTPエラー時のテスト"""
         # HTTPエラーをシミュレート
@@ -167,7 +168,7 @@ class TestWeatherService:
         # デフォルト天気情報が返されることを確認
         assert result['source'] == 'default'
 
-    @patch('lunch_roulette.services.weather_service.requests.get')
+    @patch('lunch_roulette.services.weather_service.requests.Session.get')
     def test_get_current_weather_rate_limit(self, mock_get, weather_service, mock_cache_service):
         """レート制限エラー時のテスト"""
         # レート制限エラーをシミュレート
@@ -192,7 +193,7 @@ class TestWeatherService:
             # フォールバックデータが返されることを確認
             assert result == fallback_data
 
-    @patch('lunch_roulette.services.weather_service.requests.get')
+    @patch('lunch_roulette.services.weather_service.requests.Session.get')
     def test_get_current_weather_network_error(self, mock_get, weather_service):
         """ネットワークエラー時のテスト"""
         # ネットワークエラーをシミュレート
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+WriteBehindQueue（遅延書き込み）の単体テスト
+キューへの追加・置き換え・上限、まとめての書き込み、CacheServiceでの読み込みの一貫性を検証
+"""
+
+import os
+import tempfile
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from lunch_roulette.models.database import get_db_connection, init_database
+from lunch_roulette.services.cache_service import CacheService
+from lunch_roulette.utils.write_behind import WriteBehindQueue
+
+
+class TestWriteBehindQueue:
+    """WriteBehindQueueクラスの単体テスト"""
+
+    def test_rows_written_in_batches(self):
+        """キューの行は batch_size 行ずつ、古い順に書き込まれる"""
+        write_batch = MagicMock()
+        queue = WriteBehindQueue(write_batch, max_size=100, batch_size=2, flush_interval=60)
+        queue.enqueue([('a', 1), ('b', 2), ('c', 3)])
+
+        assert queue.flush() == 3
+        assert [call.args[0] for call in write_batch.call_args_list] == [[('a', 1), ('b', 2)], [('c', 3)]]
+        assert queue.get_stats()['batches'] == 2
+        queue.shutdown()
+
+    def test_same_key_coalesced_and_visible(self):
+        """同じキーは最新の行だけを書き込み、書き込み前でも get() で取得できる"""
+        write_batch = MagicMock()
+        queue = WriteBehindQueue(write_batch, max_size=100, flush_interval=60)
+        queue.enqueue([('a', 1)])
+        queue.enqueue([('a', 2)])
+
+        assert queue.get('a') == ('a', 2)
+        queue.flush()
+
+        write_batch.assert_called_once_with([('a', 2)])
+        assert queue.get('a') is None
+        assert queue.get_stats()['coalesced'] == 1
+        queue.shutdown()
+
+    def test_full_queue_rejects_new_keys(self):
+        """キューがいっぱいのときは新しいキーを1行も入れないが、入っているキーは置き換えられる"""
+        queue = WriteBehindQueue(MagicMock(), max_size=2, flush_interval=60)
+
+        assert queue.enqueue([('a', 1), ('b', 1)]) is True
+        assert queue.enqueue([('a', 2), ('c', 1)]) is False
+        assert queue.enqueue([('a', 3)]) is True
+        assert queue.get('a') == ('a', 3)
+        assert queue.get('c') is None
+        assert queue.get_stats()['rejected'] == 2
+        queue.shutdown()
+
+    def test_background_thread_flushes_when_batch_is_full(self):
+        """batch_size 行たまると、書き込みの間隔を待たずにバックグラウンドで書き込む"""
+        written = threading.Event()
+        queue = WriteBehindQueue(lambda rows: written.set(), max_size=100, batch_size=2, flush_interval=60)
+
+        queue.enqueue([('a', 1), ('b', 2)])
+
+        assert written.wait(timeout=5)
+        queue.shutdown()
+
+    def test_shutdown_flushes_and_rejects_later_writes(self):
+        """停止時に残りを書き込み、停止後は enqueue() が False を返す"""
+        write_batch = MagicMock()
+        queue = WriteBehindQueue(write_batch, max_size=100, flush_interval=60)
+        queue.enqueue([('a', 1)])
+
+        assert queue.shutdown() == 1
+        assert queue.enqueue([('b', 1)]) is False
+        write_batch.assert_called_once_with([('a', 1)])
+
+    def test_failed_batch_is_dropped(self):
+        """書き込みに失敗した行は捨てて、失敗数に記録する"""
+        queue = WriteBehindQueue(MagicMock(side_effect=RuntimeError('disk full')), max_size=100, flush_interval=60)
+        queue.enqueue([('a', 1)])
+
+        assert queue.flush() == 0
+        assert queue.get_stats()['failed'] == 1
+        assert queue.get_stats()['pending'] == 0
+        queue.shutdown()
+
+
+class TestCacheServiceWriteBehind:
+    """CacheServiceでの遅延書き込みを検証"""
+
+    @pytest.fixture
+    def temp_db_path(self):
+        """テスト用の一時データベースファイルパス"""
+        with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as temp_file:
+            temp_path = temp_file.name
+        init_database(temp_path)
+        yield temp_path
+        try:
+            os.unlink(temp_path)
+        except (PermissionError, OSError):
+            pass
+
+    @pytest.fixture
+    def cache(self, temp_db_path):
+        """バックグラウンドでは書き込まない（flush_writes() で書き込む）CacheService"""
+        cache = CacheService(db_path=temp_db_path)
+        cache.write_behind = WriteBehindQueue(cache._write_rows, max_size=3, flush_interval=60)
+        yield cache
+        cache.write_behind.shutdown()
+
+    def _row_count(self, db_path):
+        """SQLiteに書き込まれた行数"""
+        with get_db_connection(db_path) as conn:
+            return conn.execute('SELECT COUNT(*) FROM cache').fetchone()[0]
+
+    def test_new_value_visible_before_write(self, temp_db_path, cache):
+        """SQLiteに書き込む前でも、L1になくても保存した値が返る"""
+        cache.set_cached_data('key', {'temp': 25}, ttl=300)
+        cache.set_many({'tile_a': ['J001'], 'tile_b': []}, ttl=300)
+        cache.memory_cache.clear()
+
+        assert self._row_count(temp_db_path) == 0
+        assert cache.get_cached_data('key') == {'temp': 25}
+        assert cache.get_many(['tile_a', 'tile_b', 'missing']) == {'tile_a': ['J001'], 'tile_b': []}
+        assert cache.get_cache_info('key')['is_valid'] is True
+        assert set(cache.get_cache_info_many(['key', 'tile_a'])) == {'key', 'tile_a'}
+
+        assert cache.flush_writes() == 3
+        cache.memory_cache.clear()
+        assert self._row_count(temp_db_path) == 3
+        assert cache.get_cached_data('key') == {'temp': 25}
+
+    def test_delete_discards_pending_write(self, temp_db_path, cache):
+        """削除した値が後から書き込まれることはない"""
+        cache.set_cached_data('deleted', {'a': 1}, ttl=300)
+        cache.set_cached_data('cleared', {'b': 2}, ttl=300)
+
+        cache.delete_cached_data('deleted')
+        assert cache.get_cached_data('deleted') is None
+        cache.clear_all_cache()
+        cache.flush_writes()
+
+        assert self._row_count(temp_db_path) == 0
+
+    def test_full_queue_writes_immediately(self, temp_db_path, cache):
+        """キューがいっぱいのときはその場でSQLiteに書き込む"""
+        cache.set_many({'a': 1, 'b': 2, 'c': 3}, ttl=300)
+
+        assert cache.set_cached_data('d', 4, ttl=300) is True
+        assert self._row_count(temp_db_path) == 1
+        assert cache.get_tier_stats()['write_behind']['rejected'] == 1
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])